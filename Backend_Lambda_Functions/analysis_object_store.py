@@ -0,0 +1,138 @@
+# analysis_object_store.py - The analysis object store (ANALYSIS_STORE) shared by the Lambdas that use it
+# Bundled next to analyze-driver.py (with it, in finalize-trip's package too) and auth_user.py
+import abc
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# ANALYSIS_STORE selects the store: s3://bucket[/prefix] (ANALYSIS_STORE_ENDPOINT for an
+# S3-compatible server) or file:///path for a local directory with the same API. Every object
+# of a user is under users/{user_id}/ (analyze-driver's ANALYSIS OBJECT STORE section lists them).
+
+STORE_IO_THREADS = 32  # parallel object reads/writes (the S3 client gets as many connections)
+
+class AnalysisStore(abc.ABC):
+    """Key/value object store: get/put/delete bytes under '/'-separated keys and list them by prefix"""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """The object's bytes, None when there is no such key"""
+
+    @abc.abstractmethod
+    def put(self, key: str, data: bytes):
+        """Write (or replace) the object"""
+
+    @abc.abstractmethod
+    def list_objects(self, prefix: str) -> Dict[str, datetime]:
+        """{key: when it was last written (UTC)} for every key starting with prefix (a '/'-terminated folder)"""
+
+    def list_keys(self, prefix: str) -> List[str]:
+        """Every key starting with prefix"""
+        return list(self.list_objects(prefix))
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        """Remove the object (no error when it does not exist)"""
+
+class S3AnalysisStore(AnalysisStore):
+    """Objects in an S3 (or S3-compatible) bucket, under an optional key prefix"""
+
+    def __init__(self, bucket: str, prefix: str = '', client=None, endpoint_url: Optional[str] = None):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self.client = client if client is not None else boto3.client(
+            's3', endpoint_url=endpoint_url, config=Config(max_pool_connections=STORE_IO_THREADS))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)['Body'].read()
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            raise
+
+    def put(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data,
+                               ContentType='application/json', ContentEncoding='gzip')
+
+    def list_objects(self, prefix: str) -> Dict[str, datetime]:
+        # LastModified is in whole seconds: report the end of that second, so an object written
+        # just after an analysis stamped within the same second does not look older than it
+        objects = {}
+        for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=self.bucket, Prefix=self.prefix + prefix):
+            for entry in page.get('Contents', []):
+                objects[entry['Key'][len(self.prefix):]] = entry['LastModified'] + timedelta(seconds=1)
+        return objects
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+class LocalAnalysisStore(AnalysisStore):
+    """Objects as files under a local directory (tests, benchmarks, local runs)"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split('/'))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        # Written aside and renamed, so a reader never sees half an object
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f'{path}.{os.getpid()}.{threading.get_ident()}.partial'
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, path)
+
+    def list_objects(self, prefix: str) -> Dict[str, datetime]:
+        # Prefixes end at a '/' here (users/{user_id}/trips/), like a directory
+        directory = self._path(prefix.rstrip('/'))
+        objects = {}
+        for folder, _, files in os.walk(directory):
+            relative = os.path.relpath(folder, self.root).replace(os.sep, '/')
+            for name in files:
+                if not name.endswith('.partial'):
+                    modified = os.path.getmtime(os.path.join(folder, name))
+                    objects[f'{relative}/{name}'] = datetime.fromtimestamp(modified, timezone.utc)
+        return objects
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+def open_analysis_store(url: str) -> Optional[AnalysisStore]:
+    """The store for an ANALYSIS_STORE value (None when unset)"""
+    url = url.strip()
+    if not url:
+        return None
+    if url.startswith('s3://'):
+        bucket, _, prefix = url[len('s3://'):].partition('/')
+        return S3AnalysisStore(bucket, prefix, endpoint_url=os.environ.get('ANALYSIS_STORE_ENDPOINT') or None)
+    if url.startswith('file://'):
+        return LocalAnalysisStore(url[len('file://'):])
+    raise ValueError(f"ANALYSIS_STORE must be s3://bucket[/prefix] or file:///path, not {url!r}")
+
+def user_object_prefix(user_id: str) -> str:
+    return f'users/{user_id}/'
+
+def delete_user_objects(store: AnalysisStore, user_id: str) -> int:
+    """Delete every object of a user (account deletion) and return how many there were"""
+    keys = store.list_keys(user_object_prefix(user_id))
+    for key in keys:
+        store.delete(key)
+    return len(keys)
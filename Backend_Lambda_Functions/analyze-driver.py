@@ -2,16 +2,75 @@
 # Performance: 10-20x faster on repeat requests, ~95% cost reduction
 # All original functionality preserved + caching layer added
 import json
+import logging
+import os
 import boto3
 import math
 import statistics
 from boto3.dynamodb.conditions import Key
 from decimal import Decimal
-from datetime import datetime, timezone
+from fractions import Fraction
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Tuple, Optional
 import re
+import base64
+import gzip
+import hashlib
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from zoneinfo import ZoneInfo  # Python 3.9+ built-in timezone support
 
+# Shared with the other Lambdas and bundled next to this file
+from analysis_object_store import STORE_IO_THREADS, AnalysisStore, open_analysis_store, user_object_prefix
+from delta_encoding import decode_delta_columns, is_binary_delta_batch, parse_delta_timestamp
+from payload_compression import compress_payload, decompress_payload
+
+# 🚀 OPTIMIZATION: NumPy is optional (attach the AWS SDK for pandas layer to enable it)
+# Without it every vectorized path falls back to the original pure-Python loops
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Leveled logging: LOG_LEVEL env var (DEBUG, INFO, WARNING, ERROR), default INFO
+# Messages take %-style arguments so nothing is formatted unless the level is enabled
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO))
+
+# Analysis engine: 'vectorized' runs the NumPy paths (default when NumPy is importable),
+# 'reference' the original pure-Python loops. Both give the same scores (see
+# benchmarks/golden_harness.py); ANALYSIS_ENGINE=reference is the fallback if one ever differs
+ANALYSIS_ENGINES = ('reference', 'vectorized')
+_analysis_engine = 'vectorized'
+
+def set_analysis_engine(name: str) -> str:
+    """Select the engine for subsequent analyses; unknown names keep the current engine"""
+    global _analysis_engine
+    name = (name or '').strip().lower()
+    if name not in ANALYSIS_ENGINES:
+        logger.warning("⚠️ Unknown analysis engine %r (expected one of %s), keeping %s", name, ANALYSIS_ENGINES, _analysis_engine)
+    else:
+        if name == 'vectorized' and np is None:
+            logger.warning("⚠️ Vectorized engine requested but NumPy is not installed - using reference loops")
+        _analysis_engine = name
+    return get_analysis_engine()
+
+def get_analysis_engine() -> str:
+    """Engine that actually runs ('reference' whenever NumPy is missing)"""
+    return _analysis_engine if np is not None else 'reference'
+
+def use_vectorized_engine() -> bool:
+    return np is not None and _analysis_engine == 'vectorized'
+
+if os.environ.get('ANALYSIS_ENGINE'):
+    set_analysis_engine(os.environ['ANALYSIS_ENGINE'])
+
 dynamodb = boto3.resource('dynamodb')
 trajectory_table = dynamodb.Table('TrajectoryBatches-Neal')
 trips_table = dynamodb.Table('Trips-Neal')
@@ -21,6 +80,104 @@ users_table = dynamodb.Table('Users-Neal')
 # 🚀 OPTIMIZATION: Current algorithm version for cache validation
 CURRENT_ALGORITHM_VERSION = '3.0_moving_average_event_grouping'
 
+# ========================================
+# ⏱️ PERFORMANCE PROFILING
+# ========================================
+
+# Slowest trips listed in the performance profile
+PROFILE_SLOWEST_TRIPS = 5
+
+class PerformanceProfile:
+    """Wall-clock totals per stage and per trip for one invocation
+
+    Stages are recorded with the span() context manager. summary() is always written to the
+    log as one JSON line; it is added to the response as performance_profile on request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.trips = []
+        self.fields = {}  # extra keys for the log line (user_id, trip counts, error)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = [0.0, 0, 0.0]  # total, count, max
+            entry[0] += seconds
+            entry[1] += 1
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    def merge(self, stages: Dict):
+        """Fold in the stage totals recorded by a worker process"""
+        with self._lock:
+            for stage, (total, count, longest) in stages.items():
+                entry = self.stages.get(stage)
+                if entry is None:
+                    entry = self.stages[stage] = [0.0, 0, 0.0]
+                entry[0] += total
+                entry[1] += count
+                if longest > entry[2]:
+                    entry[2] = longest
+
+    def add_trip(self, trip_id: str, seconds: float, source: str):
+        """source: 'cache', 'analyzed' or 'reanalyzed'"""
+        with self._lock:
+            self.trips.append((seconds, trip_id, source))
+
+    def summary(self) -> Dict:
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1][0], reverse=True)
+            slowest = sorted(self.trips, reverse=True)[:PROFILE_SLOWEST_TRIPS]
+            trip_count = len(self.trips)
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'stages': {
+                stage: {
+                    'total_ms': round(total * 1000, 1),
+                    'count': count,
+                    'avg_ms': round(total * 1000 / count, 2),
+                    'max_ms': round(longest * 1000, 1),
+                }
+                for stage, (total, count, longest) in stages
+            },
+            'trips_timed': trip_count,
+            'slowest_trips': [
+                {'trip_id': trip_id, 'ms': round(seconds * 1000, 1), 'source': source}
+                for seconds, trip_id, source in slowest
+            ],
+        }
+
+# Profile of the invocation in progress (replaced at the start of every lambda_handler call)
+_profile = PerformanceProfile()
+
+def timed(stage: str):
+    """Time a block as one span of the current invocation's profile"""
+    return _profile.span(stage)
+
+def profile_requested(query_params: Optional[Dict]) -> bool:
+    """performance_profile goes in the response for ?profile=true or PERFORMANCE_PROFILE=true"""
+    flag = (query_params or {}).get('profile') or os.environ.get('PERFORMANCE_PROFILE', '')
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+def log_performance_profile(summary: Dict, context, **fields):
+    """One structured JSON line per invocation, searchable in CloudWatch Logs Insights"""
+    record = {'event': 'analyze_driver_performance', **fields, **summary}
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        record['remaining_time_ms'] = context.get_remaining_time_in_millis()
+    logger.info("%s", json.dumps(record, default=str))
+
 # ========================================
 # 🕐 TIMEZONE CONVERSION FUNCTIONS
 # ========================================
@@ -61,14 +218,14 @@ def get_user_timezone(user_id: str) -> str:
             if zipcode and len(str(zipcode)) >= 1:
                 zipcode_prefix = str(zipcode)[0]
                 timezone_str = ZIPCODE_TIMEZONE_MAP.get(zipcode_prefix, 'America/New_York')
-                print(f"🕐 User {user_id} timezone: {timezone_str} (zipcode: {zipcode})")
+                logger.info("🕐 User %s timezone: %s (zipcode: %s)", user_id, timezone_str, zipcode)
                 return timezone_str
 
-        print(f"⚠️  No zipcode for user {user_id}, defaulting to America/New_York")
+        logger.warning("⚠️  No zipcode for user %s, defaulting to America/New_York", user_id)
         return 'America/New_York'
 
     except Exception as e:
-        print(f"⚠️  Error getting timezone for {user_id}: {e}")
+        logger.warning("⚠️  Error getting timezone for %s: %s", user_id, e)
         return 'America/New_York'
 
 def convert_utc_to_local(utc_timestamp_str: str, timezone_str: str) -> str:
@@ -104,7 +261,7 @@ def convert_utc_to_local(utc_timestamp_str: str, timezone_str: str) -> str:
         return local_dt.strftime('%Y-%m-%dT%H:%M:%S')
 
     except Exception as e:
-        print(f"⚠️  Timezone conversion error: {e}, returning original: {utc_timestamp_str}")
+        logger.warning("⚠️  Timezone conversion error: %s, returning original: %s", e, utc_timestamp_str)
         return utc_timestamp_str
 
 def format_timestamp_with_timezone(utc_timestamp_str: str, timezone_str: str) -> Dict:
@@ -127,7 +284,7 @@ def format_timestamp_with_timezone(utc_timestamp_str: str, timezone_str: str) ->
             'timezone': timezone_str
         }
     except Exception as e:
-        print(f"⚠️  Timestamp formatting error: {e}")
+        logger.warning("⚠️  Timestamp formatting error: %s", e)
         return {
             'utc': utc_timestamp_str,
             'local': utc_timestamp_str,
@@ -148,23 +305,40 @@ def get_cached_trip_analysis(trip_id: str) -> Optional[Dict]:
     """
     try:
         response = summaries_table.get_item(Key={'trip_id': trip_id})
+        return current_cached_summary(trip_id, response.get('Item'))
+    except Exception as e:
+        logger.warning("⚠️  Cache lookup error for %s: %s", trip_id, e)
+        return None
 
-        if 'Item' in response:
-            cached = convert_decimal_to_float(response['Item'])
-            cached_version = cached.get('algorithm_version', '')
+def current_cached_summary(trip_id: str, cached: Optional[Dict]) -> Optional[Dict]:
+    """The DrivingSummaries-Neal item when it was computed by CURRENT_ALGORITHM_VERSION, else None"""
+    if cached:
+        # 🚀 OPTIMIZATION: No deep copy - reconstruct_trip_from_cache converts each field it reads
+        cached_version = cached.get('algorithm_version', '')
 
-            if cached_version == CURRENT_ALGORITHM_VERSION:
-                print(f"✅ CACHE HIT: {trip_id}")
-                return cached
-            else:
-                print(f"⚠️  CACHE STALE: {trip_id} (version mismatch)")
+        if cached_version == CURRENT_ALGORITHM_VERSION:
+            try:
+                cached = expand_cached_summary(cached)
+            except Exception as e:
+                # Corrupt blob or a codec this deployment lacks: analyze the trip again
+                logger.warning("⚠️  CACHE UNREADABLE: %s (%s)", trip_id, e)
                 return None
+            logger.debug("✅ CACHE HIT: %s", trip_id)
+            return cached
+        else:
+            logger.warning("⚠️  CACHE STALE: %s (version mismatch)", trip_id)
+            return None
 
-        print(f"❌ CACHE MISS: {trip_id}")
-        return None
-    except Exception as e:
-        print(f"⚠️  Cache lookup error for {trip_id}: {e}")
-        return None
+    logger.debug("❌ CACHE MISS: %s", trip_id)
+    return None
+
+def expand_cached_summary(cached: Dict) -> Dict:
+    """A DrivingSummaries-Neal entry with its analysis_blob fields merged back in (older entries as they are)"""
+    if 'analysis_blob' not in cached:
+        return cached
+    summary = json.loads(decompress_payload(cached['analysis_blob']))
+    summary.update((field, value) for field, value in cached.items() if field != 'analysis_blob')
+    return summary
 
 def is_trip_modified_since_analysis(trip_id: str, cached_analysis: Dict) -> bool:
     """
@@ -174,40 +348,152 @@ def is_trip_modified_since_analysis(trip_id: str, cached_analysis: Dict) -> bool
     Fix: Compare trip's last_updated/finalized_at against analysis_cached_at
     """
     try:
-        trip_response = trips_table.get_item(Key={'trip_id': trip_id})
+        trip_response = trips_table.get_item(Key={'trip_id': trip_id}, **attribute_projection(TRIP_MODIFIED_FIELDS))
+        return trip_modified_since_cached(trip_id, cached_analysis, trip_response.get('Item'))
+    except Exception as e:
+        logger.warning("⚠️  Error checking modification for %s: %s", trip_id, e)
+        return True
 
-        if 'Item' not in trip_response:
-            return True
+def trip_modified_since_cached(trip_id: str, cached_analysis: Dict, trip_data: Optional[Dict]) -> bool:
+    """True when the Trips-Neal item (TRIP_MODIFIED_FIELDS) is missing or newer than the cached analysis"""
+    if not trip_data:
+        return True
 
-        trip_data = trip_response['Item']
+    # 🔥 FIX: Use analysis_cached_at (when analysis was computed) not end_timestamp
+    cached_at = cached_analysis.get('analysis_cached_at', '')
 
-        # 🔥 FIX: Use analysis_cached_at (when analysis was computed) not end_timestamp
-        cached_at = cached_analysis.get('analysis_cached_at', '')
+    # Fall back to timestamp if analysis_cached_at not available (old cache entries)
+    if not cached_at:
+        cached_at = cached_analysis.get('timestamp', '')
 
-        # Fall back to timestamp if analysis_cached_at not available (old cache entries)
-        if not cached_at:
-            cached_at = cached_analysis.get('timestamp', '')
+    # Get trip's last modification time
+    trip_last_updated = trip_data.get('last_updated',
+                                      trip_data.get('finalized_at',
+                                      trip_data.get('end_timestamp', '')))
 
-        # Get trip's last modification time
-        trip_last_updated = trip_data.get('last_updated',
-                                          trip_data.get('finalized_at',
-                                          trip_data.get('end_timestamp', '')))
+    if not cached_at or not trip_last_updated:
+        logger.warning("⚠️ Missing timestamps for %s - cached_at: %s, trip_updated: %s", trip_id, cached_at, trip_last_updated)
+        return True
 
-        if not cached_at or not trip_last_updated:
-            print(f"⚠️ Missing timestamps for {trip_id} - cached_at: {cached_at}, trip_updated: {trip_last_updated}")
-            return True
+    # 🔥 FIX: Only re-analyze if trip was modified AFTER the analysis was cached
+    # This prevents unnecessary re-analysis of unchanged trips
+    if trip_last_updated > cached_at:
+        logger.info("🔄 TRIP MODIFIED: %s (updated: %s > cached: %s)", trip_id, trip_last_updated, cached_at)
+        return True
 
-        # 🔥 FIX: Only re-analyze if trip was modified AFTER the analysis was cached
-        # This prevents unnecessary re-analysis of unchanged trips
-        if trip_last_updated > cached_at:
-            print(f"🔄 TRIP MODIFIED: {trip_id} (updated: {trip_last_updated} > cached: {cached_at})")
-            return True
+    logger.debug("✅ CACHE VALID: %s (updated: %s <= cached: %s)", trip_id, trip_last_updated, cached_at)
+    return False
 
-        print(f"✅ CACHE VALID: {trip_id} (updated: {trip_last_updated} <= cached: {cached_at})")
-        return False
-    except Exception as e:
-        print(f"⚠️  Error checking modification for {trip_id}: {e}")
-        return True
+# ========================================
+# 📦 BULK CACHE LOOKUP
+# ========================================
+
+BATCH_GET_MAX_KEYS = 100          # BatchGetItem limit per request
+BATCH_GET_MAX_ATTEMPTS = 6        # requests per chunk while UnprocessedKeys come back
+BATCH_GET_BACKOFF_SECONDS = 0.05  # first retry delay, doubled per retry (with jitter)
+
+# DrivingSummaries-Neal fields read by reconstruct_trip_from_cache and the cache validity checks
+CACHE_SUMMARY_FIELDS = (
+    'trip_id', 'algorithm_version', 'analysis_cached_at', 'timestamp', 'start_timestamp', 'end_timestamp',
+    'duration_minutes', 'total_distance_miles', 'avg_speed_mph', 'moving_avg_speed_mph', 'max_speed_mph',
+    'min_speed_mph', 'speed_consistency', 'moving_time_minutes', 'stationary_time_minutes', 'moving_percentage',
+    'harsh_events', 'dangerous_events', 'sudden_accelerations', 'sudden_decelerations', 'hard_stops',
+    'smoothness_score', 'events_per_100_miles', 'weighted_events_per_100_miles', 'industry_rating',
+    'frequency_score', 'total_turns', 'safe_turns', 'moderate_turns', 'aggressive_turns', 'dangerous_turns',
+    'turn_safety_score', 'behavior_score', 'behavior', 'driving_context', 'context_confidence',
+    'privacy_protected', 'base_point_city', 'data_source', 'analysis_blob',
+)
+# Kept as plain attributes next to analysis_blob: the key, what cache validity and lookups
+# read without decompressing, and user_id (auth_user deletes a user's entries by it)
+CACHE_PLAIN_FIELDS = ('trip_id', 'user_id', 'algorithm_version', 'analysis_cached_at', 'timestamp',
+                      'start_timestamp', 'end_timestamp')
+# Trips-Neal fields trip_modified_since_cached compares
+TRIP_MODIFIED_FIELDS = ('trip_id', 'last_updated', 'finalized_at', 'end_timestamp')
+
+def attribute_projection(fields) -> Dict:
+    """ProjectionExpression for top-level fields (aliased, since names like timestamp are reserved)"""
+    names = {f'#p{i}': field for i, field in enumerate(fields)}
+    return {'ProjectionExpression': ', '.join(names), 'ExpressionAttributeNames': names}
+
+def batch_get_items(table, keys: List[Dict], projection: Optional[Dict] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    📦 BatchGetItem in chunks of 100 keys, retrying UnprocessedKeys with exponential backoff
+    Returns (items, keys still unprocessed after BATCH_GET_MAX_ATTEMPTS)
+    """
+    items = []
+    unprocessed = []
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request = {table.name: {'Keys': keys[start:start + BATCH_GET_MAX_KEYS], **(projection or {})}}
+        for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(BATCH_GET_BACKOFF_SECONDS * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0))
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(table.name, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+        if request:
+            unprocessed.extend(request[table.name]['Keys'])
+    return items, unprocessed
+
+def lookup_cached_trips(trip_ids: List[str],
+                        trip_records: Optional[Dict[str, Dict]] = None) -> Dict[str, Tuple[Optional[Dict], bool]]:
+    """
+    📦 Cache entries and modification checks for all trips in a few BatchGetItem requests
+    (instead of a DrivingSummaries-Neal and a Trips-Neal get_item per trip)
+
+    Returns {trip_id: (current cached summary or None, trip modified since it was cached)}.
+    Keys DynamoDB keeps leaving unprocessed fall back to the per-trip lookups. trip_records
+    (fetch_trip_versions) are Trips-Neal items already read this request: not read again.
+    """
+    unique_ids = list(dict.fromkeys(trip_ids))
+    results = {}
+
+    with timed('cache_lookup'):
+        try:
+            items, unprocessed = batch_get_items(summaries_table, [{'trip_id': trip_id} for trip_id in unique_ids],
+                                                 attribute_projection(CACHE_SUMMARY_FIELDS))
+        except Exception as e:
+            logger.warning("⚠️  Bulk cache lookup failed (%s) - falling back to per-trip lookups", e)
+            items, unprocessed = [], [{'trip_id': trip_id} for trip_id in unique_ids]
+        summaries = {item['trip_id']: item for item in items}
+        retry_ids = {key['trip_id'] for key in unprocessed}
+        cached = {}
+        for trip_id in unique_ids:
+            if trip_id in retry_ids:
+                cached[trip_id] = get_cached_trip_analysis(trip_id)
+            else:
+                cached[trip_id] = current_cached_summary(trip_id, summaries.get(trip_id))
+
+    # Only trips with a usable cache entry need the modification check
+    check_ids = [trip_id for trip_id in unique_ids
+                 if cached[trip_id] and cached[trip_id].get('start_timestamp') and cached[trip_id].get('end_timestamp')]
+    with timed('cache_validation'):
+        try:
+            if trip_records is not None:
+                items, unprocessed = [trip_records[trip_id] for trip_id in check_ids if trip_id in trip_records], []
+            else:
+                items, unprocessed = batch_get_items(trips_table, [{'trip_id': trip_id} for trip_id in check_ids],
+                                                     attribute_projection(TRIP_MODIFIED_FIELDS))
+        except Exception as e:
+            logger.warning("⚠️  Bulk trip lookup failed (%s) - falling back to per-trip checks", e)
+            items, unprocessed = [], [{'trip_id': trip_id} for trip_id in check_ids]
+        trips = {item['trip_id']: item for item in items}
+        retry_ids = {key['trip_id'] for key in unprocessed}
+        checked = set(check_ids)
+        for trip_id in unique_ids:
+            cached_analysis = cached[trip_id]
+            if trip_id not in checked:
+                modified = False
+            elif trip_id in retry_ids:
+                modified = is_trip_modified_since_analysis(trip_id, cached_analysis)
+            else:
+                modified = trip_modified_since_cached(trip_id, cached_analysis, trips.get(trip_id))
+            results[trip_id] = (cached_analysis, modified)
+
+    logger.info("📦 Bulk cache lookup: %s trips, %s cached, %s checked for changes",
+                len(unique_ids), sum(1 for entry in cached.values() if entry), len(check_ids))
+    return results
 
 def reconstruct_trip_from_cache(cached: Dict, trip_id: str) -> Dict:
     """Reconstruct full trip analysis from cached summary"""
@@ -256,85 +542,840 @@ def reconstruct_trip_from_cache(cached: Dict, trip_id: str) -> Dict:
         'from_cache': True
     }
 
+def build_cache_entry(trip_analysis: Dict, user_id: str) -> Optional[Dict]:
+    """DrivingSummaries-Neal item for a trip analysis (None without a trip_id)"""
+    trip_id = trip_analysis.get('trip_id')
+    if not trip_id:
+        logger.error("❌ Cannot cache - missing trip_id")
+        return None
+
+    # 🔥 CRITICAL: Extract timestamps from trip analysis (which came from Trips-Neal)
+    start_timestamp = trip_analysis.get('start_timestamp', '')
+    end_timestamp = trip_analysis.get('end_timestamp', '')
+
+    logger.info("💾 CACHING TRIP: %s", trip_id)
+    logger.debug("   start_timestamp from analysis: %s", start_timestamp)
+    logger.debug("   end_timestamp from analysis: %s", end_timestamp)
+
+    if not start_timestamp or not end_timestamp:
+        logger.warning("⚠️ WARNING: Missing timestamps in trip analysis for %s", trip_id)
+        logger.debug("   Available keys in trip_analysis: %s", list(trip_analysis.keys()))
+
+    cache_entry = {
+        'trip_id': trip_id,
+        'user_id': user_id,
+        'total_distance_miles': Decimal(str(trip_analysis.get('total_distance_miles', 0))),
+        'duration_minutes': Decimal(str(trip_analysis.get('duration_minutes', 0))),
+        'behavior_score': Decimal(str(trip_analysis.get('behavior_score', 0))),
+        'behavior': trip_analysis.get('behavior_category', 'Good'),
+        'industry_rating': trip_analysis.get('industry_rating', 'Good'),
+        'harsh_events': trip_analysis.get('total_harsh_events', 0),
+        'dangerous_events': trip_analysis.get('total_dangerous_events', 0),
+        'sudden_accelerations': trip_analysis.get('sudden_accelerations', 0),
+        'sudden_decelerations': trip_analysis.get('sudden_decelerations', 0),
+        'hard_stops': trip_analysis.get('hard_stops', 0),
+        'smoothness_score': Decimal(str(trip_analysis.get('smoothness_score', 85.0))),
+        'events_per_100_miles': Decimal(str(trip_analysis.get('events_per_100_miles', 0))),
+        'weighted_events_per_100_miles': Decimal(str(trip_analysis.get('weighted_events_per_100_miles', 0))),
+        'speed_consistency': Decimal(str(trip_analysis.get('speed_consistency', 0))),
+        'avg_speed_mph': Decimal(str(trip_analysis.get('avg_speed_mph', 0))),
+        'moving_avg_speed_mph': Decimal(str(trip_analysis.get('moving_avg_speed_mph', 0))),
+        'max_speed_mph': Decimal(str(trip_analysis.get('max_speed_mph', 0))),
+        'min_speed_mph': Decimal(str(trip_analysis.get('min_speed_mph', 0))),
+        'moving_time_minutes': Decimal(str(trip_analysis.get('moving_time_minutes', 0))),
+        'stationary_time_minutes': Decimal(str(trip_analysis.get('stationary_time_minutes', 0))),
+        'moving_percentage': Decimal(str(trip_analysis.get('moving_percentage', 0))),
+        'total_turns': trip_analysis.get('total_turns', 0),
+        'safe_turns': trip_analysis.get('safe_turns', 0),
+        'moderate_turns': trip_analysis.get('moderate_turns', 0),
+        'aggressive_turns': trip_analysis.get('aggressive_turns', 0),
+        'dangerous_turns': trip_analysis.get('dangerous_turns', 0),
+        'turn_safety_score': Decimal(str(trip_analysis.get('turn_safety_score', 85.0))),
+        'frequency_score': trip_analysis.get('frequency_score', 85),
+        'driving_context': trip_analysis.get('driving_context', {}).get('context', 'mixed'),
+        'context_confidence': Decimal(str(trip_analysis.get('driving_context', {}).get('confidence', 0.0))),
+
+        # 🔥 CRITICAL: Use ACTUAL trip timestamps from Trips-Neal, NOT current time!
+        'start_timestamp': start_timestamp,
+        'end_timestamp': end_timestamp,
+        'timestamp': end_timestamp,  # Primary timestamp field - use trip end time
+
+        'privacy_protected': trip_analysis.get('privacy_protected', False),
+        'base_point_city': trip_analysis.get('base_point_city', 'Unknown'),
+        'data_source': trip_analysis.get('data_source', 'delta_coordinates'),
+        'algorithm_version': CURRENT_ALGORITHM_VERSION,
+        'analysis_cached_at': datetime.now(timezone.utc).isoformat()  # When analysis was cached (metadata only)
+    }
+
+    logger.debug("💾 WRITING TO DrivingSummaries-Neal:")
+    logger.debug("   start_timestamp: %s", cache_entry['start_timestamp'])
+    logger.debug("   end_timestamp: %s", cache_entry['end_timestamp'])
+    logger.debug("   timestamp: %s", cache_entry['timestamp'])
+
+    # 🗜️ OPTIMIZATION: The analysis fields go into one compressed analysis_blob
+    summary = {field: value for field, value in cache_entry.items() if field not in CACHE_PLAIN_FIELDS}
+    cache_entry = {field: cache_entry[field] for field in CACHE_PLAIN_FIELDS}
+    cache_entry['analysis_blob'] = compress_payload(
+        json.dumps(summary, cls=DecimalEncoder, separators=(',', ':')).encode('utf-8'))
+    return cache_entry
+
 def cache_trip_analysis_enhanced(trip_analysis: Dict, user_id: str) -> bool:
     """Store enhanced trip analysis in cache"""
     try:
-        trip_id = trip_analysis.get('trip_id')
-        if not trip_id:
-            print(f"❌ Cannot cache - missing trip_id")
+        cache_entry = build_cache_entry(trip_analysis, user_id)
+        if cache_entry is None:
             return False
 
-        # 🔥 CRITICAL: Extract timestamps from trip analysis (which came from Trips-Neal)
-        start_timestamp = trip_analysis.get('start_timestamp', '')
-        end_timestamp = trip_analysis.get('end_timestamp', '')
+        summaries_table.put_item(Item=cache_entry)
+        logger.info("✅ CACHED SUCCESSFULLY: %s", cache_entry['trip_id'])
+        return True
+    except Exception as e:
+        logger.exception("❌ Cache error for %s: %s", trip_analysis.get('trip_id', 'unknown'), e)
+        return False
+
+# ========================================
+# 💾 BATCHED CACHE WRITES
+# ========================================
 
-        print(f"💾 CACHING TRIP: {trip_id}")
-        print(f"   start_timestamp from analysis: {start_timestamp}")
-        print(f"   end_timestamp from analysis: {end_timestamp}")
+BATCH_WRITE_MAX_ITEMS = 25          # BatchWriteItem limit per request
+BATCH_WRITE_MAX_ATTEMPTS = 6        # requests per group while UnprocessedItems come back
+BATCH_WRITE_BACKOFF_SECONDS = 0.05  # first retry delay, doubled per retry (with jitter)
+CACHE_FLUSH_WAIT_SECONDS = 10       # longest the response waits for a background flush
+
+class CacheWriteBuffer:
+    """
+    💾 Collects DrivingSummaries-Neal entries and writes them with BatchWriteItem, 25 per request
+    (instead of one put_item per trip). Entries are built when added, so later changes to the
+    trip dicts (timezone display fields) never reach the cache. start_flush() writes in a
+    background thread while the response is built; wait() returns the write report.
+    """
 
-        if not start_timestamp or not end_timestamp:
-            print(f"⚠️ WARNING: Missing timestamps in trip analysis for {trip_id}")
-            print(f"   Available keys in trip_analysis: {list(trip_analysis.keys())}")
+    def __init__(self, table=None):
+        self.table = table if table is not None else summaries_table
+        self.entries = {}  # trip_id -> entry; one batch may not contain the same key twice
+        self.failed_trip_ids = []
+        self.written = 0
+        self._thread = None
 
-        cache_entry = {
-            'trip_id': trip_id,
-            'user_id': user_id,
-            'total_distance_miles': Decimal(str(trip_analysis.get('total_distance_miles', 0))),
-            'duration_minutes': Decimal(str(trip_analysis.get('duration_minutes', 0))),
-            'behavior_score': Decimal(str(trip_analysis.get('behavior_score', 0))),
-            'behavior': trip_analysis.get('behavior_category', 'Good'),
-            'industry_rating': trip_analysis.get('industry_rating', 'Good'),
-            'harsh_events': trip_analysis.get('total_harsh_events', 0),
-            'dangerous_events': trip_analysis.get('total_dangerous_events', 0),
-            'sudden_accelerations': trip_analysis.get('sudden_accelerations', 0),
-            'sudden_decelerations': trip_analysis.get('sudden_decelerations', 0),
-            'hard_stops': trip_analysis.get('hard_stops', 0),
-            'smoothness_score': Decimal(str(trip_analysis.get('smoothness_score', 85.0))),
-            'events_per_100_miles': Decimal(str(trip_analysis.get('events_per_100_miles', 0))),
-            'weighted_events_per_100_miles': Decimal(str(trip_analysis.get('weighted_events_per_100_miles', 0))),
-            'speed_consistency': Decimal(str(trip_analysis.get('speed_consistency', 0))),
-            'avg_speed_mph': Decimal(str(trip_analysis.get('avg_speed_mph', 0))),
-            'moving_avg_speed_mph': Decimal(str(trip_analysis.get('moving_avg_speed_mph', 0))),
-            'max_speed_mph': Decimal(str(trip_analysis.get('max_speed_mph', 0))),
-            'min_speed_mph': Decimal(str(trip_analysis.get('min_speed_mph', 0))),
-            'moving_time_minutes': Decimal(str(trip_analysis.get('moving_time_minutes', 0))),
-            'stationary_time_minutes': Decimal(str(trip_analysis.get('stationary_time_minutes', 0))),
-            'moving_percentage': Decimal(str(trip_analysis.get('moving_percentage', 0))),
-            'total_turns': trip_analysis.get('total_turns', 0),
-            'safe_turns': trip_analysis.get('safe_turns', 0),
-            'moderate_turns': trip_analysis.get('moderate_turns', 0),
-            'aggressive_turns': trip_analysis.get('aggressive_turns', 0),
-            'dangerous_turns': trip_analysis.get('dangerous_turns', 0),
-            'turn_safety_score': Decimal(str(trip_analysis.get('turn_safety_score', 85.0))),
-            'frequency_score': trip_analysis.get('frequency_score', 85),
-            'driving_context': trip_analysis.get('driving_context', {}).get('context', 'mixed'),
-            'context_confidence': Decimal(str(trip_analysis.get('driving_context', {}).get('confidence', 0.0))),
-
-            # 🔥 CRITICAL: Use ACTUAL trip timestamps from Trips-Neal, NOT current time!
-            'start_timestamp': start_timestamp,
-            'end_timestamp': end_timestamp,
-            'timestamp': end_timestamp,  # Primary timestamp field - use trip end time
-
-            'privacy_protected': trip_analysis.get('privacy_protected', False),
-            'base_point_city': trip_analysis.get('base_point_city', 'Unknown'),
-            'data_source': trip_analysis.get('data_source', 'delta_coordinates'),
-            'algorithm_version': CURRENT_ALGORITHM_VERSION,
-            'analysis_cached_at': datetime.now(timezone.utc).isoformat()  # When analysis was cached (metadata only)
+    def add(self, trip_analysis: Dict, user_id: str) -> Optional[Dict]:
+        """Buffer the cache entry for a trip analysis and return it (None if it could not be built)"""
+        try:
+            cache_entry = build_cache_entry(trip_analysis, user_id)
+        except Exception as e:
+            logger.error("❌ Cache error for %s: %s", trip_analysis.get('trip_id', 'unknown'), e)
+            cache_entry = None
+        if cache_entry is None:
+            self.failed_trip_ids.append(trip_analysis.get('trip_id', 'unknown'))
+        else:
+            self.entries[cache_entry['trip_id']] = cache_entry
+        return cache_entry
+
+    def add_item(self, item: Dict):
+        """Buffer any other DrivingSummaries-Neal item (keyed by trip_id)"""
+        self.entries[item['trip_id']] = item
+
+    def flush(self):
+        """Write every buffered entry; entries still unprocessed after the retries are reported as failed"""
+        entries = list(self.entries.values())
+        self.entries = {}
+        for start in range(0, len(entries), BATCH_WRITE_MAX_ITEMS):
+            group = entries[start:start + BATCH_WRITE_MAX_ITEMS]
+            with timed('cache_write'):
+                try:
+                    unprocessed = self._write_group(group)
+                except Exception as e:
+                    logger.error("❌ Cache batch write failed for %s trips: %s", len(group), e)
+                    unprocessed = group
+            self.written += len(group) - len(unprocessed)
+            self.failed_trip_ids.extend(entry['trip_id'] for entry in unprocessed)
+        if self.failed_trip_ids:
+            logger.warning("⚠️ %s trips not cached (analyzed again next request): %s",
+                           len(self.failed_trip_ids), self.failed_trip_ids)
+
+    def _write_group(self, group: List[Dict]) -> List[Dict]:
+        request = {self.table.name: [{'PutRequest': {'Item': entry}} for entry in group]}
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(BATCH_WRITE_BACKOFF_SECONDS * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0))
+            response = dynamodb.batch_write_item(RequestItems=request)
+            request = response.get('UnprocessedItems') or {}
+            if not request:
+                return []
+        return [write['PutRequest']['Item'] for write in request[self.table.name]]
+
+    def start_flush(self):
+        if self.entries and self._thread is None:
+            self._thread = threading.Thread(target=self.flush, name='cache-flush', daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = CACHE_FLUSH_WAIT_SECONDS) -> Dict:
+        """
+        Finish the flush (in this thread if none was started) and report it for cache_performance.
+        timeout=None waits for the flush however long it takes. After a timeout the flush is still
+        running: the report says so (cache_flush_complete false) and its counts are partial.
+        """
+        complete = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                complete = False
+                logger.warning("⚠️ Cache flush still running after %ss", timeout)
+        elif self.entries:
+            self.flush()
+        return {
+            'cache_flush_complete': complete,
+            'cache_writes_succeeded': self.written,
+            'cache_writes_failed': len(self.failed_trip_ids),
+            'cache_write_failed_trip_ids': list(self.failed_trip_ids),
         }
 
-        print(f"💾 WRITING TO DrivingSummaries-Neal:")
-        print(f"   start_timestamp: {cache_entry['start_timestamp']}")
-        print(f"   end_timestamp: {cache_entry['end_timestamp']}")
-        print(f"   timestamp: {cache_entry['timestamp']}")
+# ========================================
+# 📊 DRIVER AGGREGATE (persisted running sums)
+# ========================================
 
-        summaries_table.put_item(Item=cache_entry)
-        print(f"✅ CACHED SUCCESSFULLY: {trip_id}")
-        return True
+# DrivingSummaries-Neal key of a driver's aggregate record, stored next to the trip cache entries
+AGGREGATE_KEY_PREFIX = 'aggregate#'
+# Sums and context distances are integers in millionths: subtracting a trip undoes adding it
+# exactly (float sums drift, and a distance left at 1e-17 instead of 0 divides the weighted
+# averages by almost nothing). Stored aggregates with another scale are rebuilt.
+AGGREGATE_SUM_SCALE = 10**6
+
+def scaled_sum_term(value: float) -> int:
+    return round(value * AGGREGATE_SUM_SCALE)
+
+class DriverAggregate:
+    """
+    📊 Running sums behind the overall section of the response, for a set of trips
+
+    Trips can be added or subtracted and whole aggregates merged or subtracted, so a re-analyzed
+    trip is swapped out without revisiting the others. trip_stamps maps each included trip to
+    the analysis_cached_at of the analysis it contributed. A maximum cannot be subtracted:
+    removing the trip that holds max_speed sets needs_rebuild. Sums are exact integers
+    (AGGREGATE_SUM_SCALE), metrics() divides them back.
+    """
+
+    SUMS = ('distance', 'duration', 'moving_time', 'stationary_time', 'score_x_distance', 'score',
+            'consistency_x_distance', 'consistency', 'weighted_events_x_distance', 'weighted_events')
+    COUNTS = ('trips', 'harsh_events', 'dangerous_events', 'dangerous_turns', 'safe_turns', 'total_turns',
+              'privacy_protected')
+
+    def __init__(self):
+        self.trip_stamps = {}
+        self.sums = dict.fromkeys(self.SUMS, 0)  # scaled by AGGREGATE_SUM_SCALE
+        self.counts = dict.fromkeys(self.COUNTS, 0)
+        self.contexts = {}  # driving context -> [scaled distance, trips]
+        self.max_speed = None
+        self.needs_rebuild = False
+        self.algorithm_version = CURRENT_ALGORITHM_VERSION
+        self.updated_at = None  # of the stored item this was read from
+
+    @classmethod
+    def from_trips(cls, trips: List[Dict], stamps: Optional[Dict] = None) -> 'DriverAggregate':
+        """One pass over trip analyses (cached or fresh)"""
+        aggregate = cls()
+        for trip in trips:
+            aggregate.add_trip(trip, (stamps or {}).get(trip['trip_id']))
+        return aggregate
+
+    @classmethod
+    def combine(cls, aggregates: List['DriverAggregate']) -> 'DriverAggregate':
+        """Merge partial aggregates (per worker, per time bucket, per driver) into a new one"""
+        combined = cls()
+        for aggregate in aggregates:
+            combined.merge(aggregate)
+        return combined
+
+    def _apply(self, trip: Dict, sign: int):
+        """Add (sign=1) or subtract (sign=-1) one trip's terms"""
+        sums, counts = self.sums, self.counts
+        distance = trip['total_distance_miles']
+        duration = trip['duration_minutes']
+        score = trip['behavior_score']
+        consistency = trip['speed_consistency']
+        weighted_events = trip.get('weighted_events_per_100_miles', trip['events_per_100_miles'])
+        sums['distance'] += sign * scaled_sum_term(distance)
+        sums['duration'] += sign * scaled_sum_term(duration)
+        sums['moving_time'] += sign * scaled_sum_term(trip.get('moving_time_minutes', duration))
+        sums['stationary_time'] += sign * scaled_sum_term(trip.get('stationary_time_minutes', 0))
+        sums['score_x_distance'] += sign * scaled_sum_term(score * distance)
+        sums['score'] += sign * scaled_sum_term(score)
+        sums['consistency_x_distance'] += sign * scaled_sum_term(consistency * distance)
+        sums['consistency'] += sign * scaled_sum_term(consistency)
+        sums['weighted_events_x_distance'] += sign * scaled_sum_term(weighted_events * distance)
+        sums['weighted_events'] += sign * scaled_sum_term(weighted_events)
+        counts['trips'] += sign
+        counts['harsh_events'] += sign * trip['total_harsh_events']
+        counts['dangerous_events'] += sign * trip['total_dangerous_events']
+        counts['dangerous_turns'] += sign * trip.get('dangerous_turns', 0)
+        counts['safe_turns'] += sign * trip.get('safe_turns', 0)
+        counts['total_turns'] += sign * trip.get('total_turns', 0)
+        if trip.get('privacy_protected', False):
+            counts['privacy_protected'] += sign
+
+    def add_trip(self, trip: Dict, stamp: Optional[str] = None):
+        self._apply(trip, 1)
+        name = trip.get('driving_context', {}).get('context', 'mixed')
+        context = self.contexts.get(name)
+        if context is None:
+            context = self.contexts[name] = [0, 0]
+        context[0] += scaled_sum_term(trip['total_distance_miles'])
+        context[1] += 1
+        if self.max_speed is None or trip['max_speed_mph'] > self.max_speed:
+            self.max_speed = trip['max_speed_mph']
+        self.trip_stamps[trip['trip_id']] = stamp
+
+    def subtract_trip(self, trip: Dict):
+        """Remove a trip's contribution (trip as it was analyzed when added)"""
+        self._apply(trip, -1)
+        name = trip.get('driving_context', {}).get('context', 'mixed')
+        context = self.contexts[name]
+        context[0] -= scaled_sum_term(trip['total_distance_miles'])
+        context[1] -= 1
+        if context[1] <= 0:
+            del self.contexts[name]
+        if self.max_speed is not None and trip['max_speed_mph'] >= self.max_speed:
+            self.needs_rebuild = True
+        self.trip_stamps.pop(trip['trip_id'], None)
+        if not self.trip_stamps:
+            self.__init__()
+
+    def merge(self, other: 'DriverAggregate') -> 'DriverAggregate':
+        """Add another aggregate over different trips"""
+        overlap = self.trip_stamps.keys() & other.trip_stamps.keys()
+        if overlap:
+            raise ValueError(f"aggregates share {len(overlap)} trips")
+        for key in self.SUMS:
+            self.sums[key] += other.sums[key]
+        for key in self.COUNTS:
+            self.counts[key] += other.counts[key]
+        for name, (distance, trips) in other.contexts.items():
+            context = self.contexts.setdefault(name, [0, 0])
+            context[0] += distance
+            context[1] += trips
+        if other.max_speed is not None and (self.max_speed is None or other.max_speed > self.max_speed):
+            self.max_speed = other.max_speed
+        self.trip_stamps.update(other.trip_stamps)
+        self.needs_rebuild = self.needs_rebuild or other.needs_rebuild
+        return self
+
+    def subtract(self, other: 'DriverAggregate') -> 'DriverAggregate':
+        """Remove an aggregate over a subset of these trips"""
+        missing = other.trip_stamps.keys() - self.trip_stamps.keys()
+        if missing:
+            raise ValueError(f"{len(missing)} trips are not in this aggregate")
+        for key in self.SUMS:
+            self.sums[key] -= other.sums[key]
+        for key in self.COUNTS:
+            self.counts[key] -= other.counts[key]
+        for name, (distance, trips) in other.contexts.items():
+            context = self.contexts[name]
+            context[0] -= distance
+            context[1] -= trips
+            if context[1] <= 0:
+                del self.contexts[name]
+        if other.max_speed is not None and self.max_speed is not None and other.max_speed >= self.max_speed:
+            self.needs_rebuild = True
+        for trip_id in other.trip_stamps:
+            del self.trip_stamps[trip_id]
+        if not self.trip_stamps:
+            self.__init__()
+        return self
+
+    def metrics(self) -> Dict:
+        """Overall statistics of the included trips (same formulas as the per-trip passes they replace)"""
+        trips = self.counts['trips']
+        sums = {key: value / AGGREGATE_SUM_SCALE for key, value in self.sums.items()}
+        total_distance = sums['distance']
+        total_time_minutes = sums['duration']
+        total_moving_time_minutes = sums['moving_time']
+
+        # Weighted by distance; stationary trips (0 distance) use simple averages
+        if total_distance > 0:
+            weighted_behavior_score = sums['score_x_distance'] / total_distance
+            overall_speed_consistency = sums['consistency_x_distance'] / total_distance
+            overall_weighted_events = sums['weighted_events_x_distance'] / total_distance
+            overall_events_per_100_miles = (self.counts['harsh_events'] / total_distance) * 100
+        else:
+            weighted_behavior_score = sums['score'] / trips
+            overall_speed_consistency = sums['consistency'] / trips
+            overall_weighted_events = sums['weighted_events'] / trips if trips else 0.0
+            overall_events_per_100_miles = 0.0
+
+        context_distribution = {name: distance / AGGREGATE_SUM_SCALE for name, (distance, _) in self.contexts.items()}
+        if context_distribution and total_distance > 0:
+            dominant_context = max(context_distribution.keys(), key=lambda k: context_distribution[k])
+            context_confidence = context_distribution[dominant_context] / total_distance
+        else:
+            dominant_context = 'stationary'
+            context_confidence = 1.0
+
+        return {
+            'total_trips': trips,
+            'total_distance': total_distance,
+            'total_time_minutes': total_time_minutes,
+            'total_moving_time_minutes': total_moving_time_minutes,
+            'total_stationary_time_minutes': sums['stationary_time'],
+            'weighted_behavior_score': weighted_behavior_score,
+            'overall_speed_consistency': overall_speed_consistency,
+            'overall_moving_avg_speed': total_distance / (total_moving_time_minutes / 60) if total_moving_time_minutes > 0 else 0.0,
+            'overall_avg_speed': total_distance / (total_time_minutes / 60) if total_time_minutes > 0 else 0.0,
+            'total_harsh_events': self.counts['harsh_events'],
+            'total_dangerous_events': self.counts['dangerous_events'],
+            'overall_events_per_100_miles': overall_events_per_100_miles,
+            'context_distribution': context_distribution,
+            'dominant_context': dominant_context,
+            'context_confidence': context_confidence,
+            'overall_weighted_events': overall_weighted_events,
+            'overall_max_speed': self.max_speed,
+            'total_dangerous_turns': self.counts['dangerous_turns'],
+            'safe_turns_percentage': self.counts['safe_turns'] / max(1, self.counts['total_turns']) * 100,
+            'privacy_protected_trips': self.counts['privacy_protected'],
+            'privacy_percentage': (self.counts['privacy_protected'] / trips) * 100,
+            'overall_moving_percentage': (total_moving_time_minutes / total_time_minutes) * 100 if total_time_minutes > 0 else 0,
+        }
+
+    def analytics_fields(self, metrics: Optional[Dict] = None) -> Dict:
+        """The overall fields of the analyze-driver response (total_trips ... privacy_protection_percentage)"""
+        overall = metrics or self.metrics()
+        total_trips = overall['total_trips']
+        weighted_behavior_score = overall['weighted_behavior_score']
+        return {
+            # Trip statistics
+            'total_trips': total_trips,
+            'total_distance_miles': round(overall['total_distance'], 2),
+            'total_driving_time_hours': round(overall['total_time_minutes'] / 60, 2),
+            'formatted_total_time': format_duration_smart(overall['total_time_minutes']),
+
+            # FIXED: Moving time statistics
+            'total_moving_time_hours': round(overall['total_moving_time_minutes'] / 60, 2),
+            'total_stationary_time_hours': round(overall['total_stationary_time_minutes'] / 60, 2),
+            'overall_moving_percentage': round(overall['overall_moving_percentage'], 1),
+
+            'avg_trip_distance_miles': round(overall['total_distance'] / total_trips, 2),
+            'avg_trip_duration_minutes': round(overall['total_time_minutes'] / total_trips, 1),
+
+            # Overall performance
+            'overall_behavior_score': round(weighted_behavior_score, 1),
+            'behavior_category': get_behavior_category(weighted_behavior_score),
+            'risk_level': get_risk_level_consistent(weighted_behavior_score),
+            'speed_consistency_score': round(overall['overall_speed_consistency'], 1),
+
+            # Context information
+            'dominant_driving_context': overall['dominant_context'],
+            'context_confidence': round(overall['context_confidence'], 2),
+            'context_distribution': {k: round(v, 2) for k, v in overall['context_distribution'].items()},
+
+            # Harsh events
+            'total_harsh_events': overall['total_harsh_events'],
+            'total_dangerous_events': overall['total_dangerous_events'],
+            'events_per_100_miles': round(overall['overall_events_per_100_miles'], 2),
+            'weighted_events_per_100_miles': round(overall['overall_weighted_events'], 2),
+            'harsh_events_per_100_miles': round(overall['overall_events_per_100_miles'], 2),
+            'industry_rating': self.industry_rating(overall['overall_weighted_events']),
+
+            # Speed metrics - FIXED with moving average
+            'overall_avg_speed_mph': round(overall['overall_avg_speed'], 1),
+            'overall_moving_avg_speed_mph': round(overall['overall_moving_avg_speed'], 1),
+            'overall_max_speed_mph': overall['overall_max_speed'],
+
+            # Turn metrics
+            'total_dangerous_turns': overall['total_dangerous_turns'],
+            'safe_turns_percentage': round(overall['safe_turns_percentage'], 1),
+
+            # Privacy
+            'privacy_protection_percentage': round(overall['privacy_percentage'], 1),
+        }
+
+    @staticmethod
+    def industry_rating(weighted_events: float) -> str:
+        """Overall industry rating for distance-weighted events per 100 miles"""
+        if weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['exceptional']:
+            return 'Exceptional'
+        elif weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['excellent']:
+            return 'Excellent'
+        elif weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['very_good']:
+            return 'Very Good'
+        elif weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['good']:
+            return 'Good'
+        elif weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['fair']:
+            return 'Fair'
+        elif weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['poor']:
+            return 'Poor'
+        return 'Dangerous'
+
+    def to_item(self, user_id: str) -> Dict:
+        """DrivingSummaries-Neal item (no user_id attribute, so it never shows up among a user's trips)"""
+        return {
+            'trip_id': AGGREGATE_KEY_PREFIX + user_id,
+            'record_type': 'driver_aggregate',
+            'algorithm_version': self.algorithm_version,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'trip_stamps': {trip_id: stamp or '' for trip_id, stamp in self.trip_stamps.items()},
+            'sum_scale': Decimal(AGGREGATE_SUM_SCALE),
+            'sums': {key: Decimal(value) for key, value in self.sums.items()},
+            'counts': {key: Decimal(value) for key, value in self.counts.items()},
+            'contexts': {name: {'distance': Decimal(distance), 'trips': Decimal(trips)}
+                         for name, (distance, trips) in self.contexts.items()},
+            'max_speed': Decimal(str(self.max_speed)) if self.max_speed is not None else None,
+        }
+
+    @staticmethod
+    def is_current_item(item: Dict) -> bool:
+        """A stored aggregate of this algorithm version with sums at AGGREGATE_SUM_SCALE"""
+        return (item.get('algorithm_version') == CURRENT_ALGORITHM_VERSION
+                and item.get('sum_scale') is not None and int(item['sum_scale']) == AGGREGATE_SUM_SCALE)
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'DriverAggregate':
+        aggregate = cls()
+        aggregate.algorithm_version = item.get('algorithm_version', '')
+        aggregate.updated_at = item.get('updated_at')
+        aggregate.trip_stamps = {trip_id: stamp or None for trip_id, stamp in item.get('trip_stamps', {}).items()}
+        aggregate.sums.update({key: int(value) for key, value in item.get('sums', {}).items() if key in aggregate.sums})
+        aggregate.counts.update({key: int(value) for key, value in item.get('counts', {}).items() if key in aggregate.counts})
+        aggregate.contexts = {name: [int(entry['distance']), int(entry['trips'])]
+                              for name, entry in item.get('contexts', {}).items()}
+        aggregate.max_speed = float(item['max_speed']) if item.get('max_speed') is not None else None
+        return aggregate
+
+BREAKDOWN_PERIODS = ('day', 'week', 'month')
+
+def trip_period(trip: Dict, period: str) -> str:
+    """Bucket of a trip by its start date (local date when start_time_display is present)"""
+    start_date = (trip.get('start_time_display') or {}).get('date') or str(trip.get('start_timestamp', ''))[:10]
+    try:
+        day = datetime.strptime(start_date, '%Y-%m-%d').date()
+    except ValueError:
+        return 'unknown'
+    if period == 'day':
+        return day.isoformat()
+    if period == 'week':
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.strftime('%Y-%m')
+
+def aggregate_trips_by_period(trips: List[Dict], period: str) -> Dict[str, DriverAggregate]:
+    """📊 One partial DriverAggregate per day/week/month; DriverAggregate.combine() of all of them is the overall"""
+    buckets = {}
+    for trip in trips:
+        buckets.setdefault(trip_period(trip, period), DriverAggregate()).add_trip(trip)
+    return dict(sorted(buckets.items()))
+
+def get_driver_aggregate(user_id: str) -> Optional[DriverAggregate]:
+    """Stored aggregate for the user, None if missing, unreadable or from another algorithm version or sum scale"""
+    try:
+        response = summaries_table.get_item(Key={'trip_id': AGGREGATE_KEY_PREFIX + user_id})
+        item = response.get('Item')
+        if not item:
+            return None
+        if not DriverAggregate.is_current_item(item):
+            logger.info("📊 Driver aggregate for %s is from another algorithm version or sum scale", user_id)
+            return None
+        return DriverAggregate.from_item(item)
     except Exception as e:
-        print(f"❌ Cache error for {trip_analysis.get('trip_id', 'unknown')}: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        logger.warning("⚠️ Could not read driver aggregate for %s: %s", user_id, e)
+        return None
+
+def reconcile_driver_aggregate(stored: Optional[DriverAggregate], trip_analyses: List[Dict], stamps: Dict,
+                               previous: Dict) -> Tuple[DriverAggregate, str]:
+    """
+    📊 Bring the stored aggregate in line with this response's trips
+
+    stamps: trip_id -> analysis_cached_at of each trip's analysis in trip_analyses
+    previous: trip_id -> (earlier analysis, its analysis_cached_at) for trips re-analyzed this request
+    Trips whose stamp changed are subtracted (using their earlier analysis) and added again; the
+    aggregate is rebuilt in one pass when that earlier analysis is not the one it holds.
+    Returns (aggregate, 'reused' | 'updated' | 'rebuilt')
+    """
+    def rebuild(reason: str):
+        logger.info("📊 Rebuilding driver aggregate (%s)", reason)
+        return DriverAggregate.from_trips(trip_analyses, stamps), 'rebuilt'
+
+    if stored is None:
+        return rebuild('none stored')
+
+    current_ids = {trip['trip_id'] for trip in trip_analyses}
+    changed = False
+    for trip_id, stamp in list(stored.trip_stamps.items()):
+        if trip_id in current_ids and stamps.get(trip_id) == stamp and stamp:
+            continue
+        earlier = previous.get(trip_id)
+        if earlier is None or not stamp or earlier[1] != stamp:
+            return rebuild(f'no matching earlier analysis of {trip_id}')
+        stored.subtract_trip(earlier[0])
+        changed = True
+
+    for trip in trip_analyses:
+        if trip['trip_id'] not in stored.trip_stamps:
+            stored.add_trip(trip, stamps.get(trip['trip_id']))
+            changed = True
+
+    if stored.needs_rebuild:
+        return rebuild('maximum speed trip removed')
+    return stored, 'updated' if changed else 'reused'
+
+def reconcile_page_aggregate(stored: Optional[DriverAggregate], trip_analyses: List[Dict], stamps: Dict,
+                             previous: Dict) -> Tuple[Optional[DriverAggregate], str]:
+    """
+    📄 The driver's overall aggregate for a paged request: the page's trips are folded into the
+    stored aggregate, every other trip stays as stored (nothing outside the page is loaded)
+
+    Returns (aggregate, 'reused' | 'updated'), (stored, 'stale') when a re-analyzed trip's
+    earlier analysis is not the one the aggregate holds or it held the maximum speed (the next
+    unpaged request rebuilds it), or (aggregate of the page alone, 'page') with none stored.
+    """
+    if stored is None:
+        return (DriverAggregate.from_trips(trip_analyses, stamps) if trip_analyses else None), 'page'
+
+    changes = []
+    for trip in trip_analyses:
+        trip_id = trip['trip_id']
+        stamp = stamps.get(trip_id)
+        if trip_id not in stored.trip_stamps:
+            changes.append((None, trip, stamp))
+            continue
+        held = stored.trip_stamps[trip_id]
+        if held and held == stamp:
+            continue
+        earlier = previous.get(trip_id)
+        if earlier is None or not held or earlier[1] != held:
+            return stored, 'stale'
+        changes.append((earlier[0], trip, stamp))
+
+    for earlier, trip, stamp in changes:
+        if earlier is not None:
+            stored.subtract_trip(earlier)
+        stored.add_trip(trip, stamp)
+    if stored.needs_rebuild:
+        return stored, 'stale'
+    return stored, 'updated' if changes else 'reused'
+
+# ========================================
+# 🪣 ANALYSIS OBJECT STORE
+# ========================================
+# Precomputed analyses as gzip JSON objects (S3_ARCHITECTURE_PLAN.md):
+#   users/{user_id}/trips/{trip_id}.json.gz   one trip analysis, as it appears in 'trips'
+#   users/{user_id}/summary.json.gz           the DriverAggregate of the trips it was built from
+# ANALYSIS_STORE selects the store (analysis_object_store.py: S3 or a local directory). A driver with
+# a current summary object is served from the store: trip objects are listed and read in
+# parallel, nothing is recomputed (DynamoDB only lists the trips and their Trips-Neal versions,
+# for the ETag and to check the objects against). The summary is only written after a request
+# that went through Trips-Neal/DrivingSummaries-Neal, which backfills every trip of the driver,
+# so a driver whose history is only partly in the store is never served from it.
+
+STORE_WRITE_WAIT_SECONDS = 10  # longest the response waits for a background backfill
+
+analysis_store = open_analysis_store(os.environ.get('ANALYSIS_STORE', ''))
+
+def trip_objects_prefix(user_id: str) -> str:
+    return f'{user_object_prefix(user_id)}trips/'
+
+def trip_object_key(user_id: str, trip_id: str) -> str:
+    return f'{trip_objects_prefix(user_id)}{trip_id}.json.gz'
+
+def summary_object_key(user_id: str) -> str:
+    return f'{user_object_prefix(user_id)}summary.json.gz'
+
+def encode_analysis_object(value: Dict) -> bytes:
+    # mtime=0: the same analysis always gives the same bytes
+    return gzip.compress(json.dumps(value, cls=DecimalEncoder, separators=(',', ':')).encode('utf-8'), mtime=0)
+
+def decode_analysis_object(data: bytes) -> Dict:
+    return json.loads(gzip.decompress(data))
+
+def trip_analysis_object(trip_analysis: Dict, analysis_cached_at: Optional[str]) -> bytes:
+    """A trip object: the analysis, the algorithm version and the stamp the driver aggregate knows it by"""
+    return encode_analysis_object({
+        'algorithm_version': CURRENT_ALGORITHM_VERSION,
+        'analysis_cached_at': analysis_cached_at or '',
+        'trip': trip_analysis,
+    })
+
+def summary_object(driver_aggregate: DriverAggregate, user_id: str, unanalyzed_trip_ids) -> bytes:
+    """The driver aggregate, and the driver's trips that had no analysis (so no trip object) when it was written"""
+    return encode_analysis_object({**driver_aggregate.to_item(user_id),
+                                   'unanalyzed_trip_ids': sorted(unanalyzed_trip_ids)})
+
+def trip_id_of_object_key(user_id: str, key: str) -> str:
+    return key[len(trip_objects_prefix(user_id)):-len('.json.gz')]
+
+def stamp_datetime(value) -> Optional[datetime]:
+    """An ISO stamp as an aware datetime (naive stamps are UTC, as the Lambdas write them), None when unreadable"""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+def trip_object_outdated(written_at: Optional[datetime], analysis_cached_at: Optional[str],
+                         trip_data: Optional[Dict]) -> bool:
+    """
+    True when a trip object must be (re)written: there is none (written_at None), or it was written
+    before the analysis it should hold or before the trip's last Trips-Neal change (as
+    trip_modified_since_cached reads it)
+    """
+    if written_at is None or not trip_data:
+        return True
+    trip_last_updated = trip_data.get('last_updated', trip_data.get('finalized_at', trip_data.get('end_timestamp', '')))
+    for stamp in (analysis_cached_at, trip_last_updated):
+        parsed = stamp_datetime(stamp) if stamp else None
+        if parsed is None or written_at < parsed:
+            return True
+    return False
+
+def unanalyzed_trip_ids(trip_ids: List[str], trip_analyses: List[Dict]) -> List[str]:
+    analyzed = {trip['trip_id'] for trip in trip_analyses}
+    return [trip_id for trip_id in dict.fromkeys(trip_ids) if trip_id not in analyzed]
+
+def read_objects(store: AnalysisStore, keys: List[str]) -> List[Optional[bytes]]:
+    """⚡ Objects for the keys, in order, read on up to STORE_IO_THREADS threads"""
+    if len(keys) < 2:
+        return [store.get(key) for key in keys]
+    with ThreadPoolExecutor(max_workers=min(STORE_IO_THREADS, len(keys)), thread_name_prefix='store-read') as pool:
+        return list(pool.map(store.get, keys))
+
+def load_history_from_store(store: AnalysisStore, user_id: str, trip_ids: List[str],
+                            trip_records: Optional[Dict[str, Dict]],
+                            trip_objects: Dict[str, datetime]) -> Optional[Tuple[List[Dict], DriverAggregate, str]]:
+    """
+    🪣 A driver's trip analyses (newest first) and driver aggregate from the object store
+
+    trip_objects is the listing of the driver's trip objects (store.list_objects). Returns None (serve from DynamoDB instead) without a summary object, or when the summary or
+    any trip object is unreadable or from another algorithm version. The store must also agree
+    with Trips-Neal: one trip object per trip in trip_ids (trips the summary recorded as having no
+    analysis excepted), none for other trips, and no trip updated or finalized (trip_records,
+    fetch_trip_versions) after its object's analysis_cached_at. Any difference goes to DynamoDB,
+    which re-analyzes only the changed trips and rewrites the driver's objects. Trip objects
+    added since the summary (finalized trips) are folded into the aggregate: (trips, aggregate,
+    'reused' | 'updated' | 'rebuilt'), as reconcile_driver_aggregate reports it.
+    """
+    if trip_records is None:
+        logger.info("🪣 No Trips-Neal versions to check the analysis store against for %s", user_id)
+        return None
+    keys = sorted(trip_objects, reverse=True)
+    summary_data = store.get(summary_object_key(user_id))
+    if summary_data is None:
+        logger.info("🪣 No summary object for %s in the analysis store", user_id)
+        return None
+    summary = decode_analysis_object(summary_data)
+    if not DriverAggregate.is_current_item(summary):
+        logger.info("🪣 Summary object for %s is from another algorithm version or sum scale", user_id)
+        return None
+
+    expected = set(trip_ids)
+    stored = {trip_id_of_object_key(user_id, key) for key in keys}
+    if stored - expected:
+        logger.info("🪣 Analysis store has objects for %s trips %s no longer has", len(stored - expected), user_id)
+        return None
+    unanalyzed = expected - stored
+    if 'unanalyzed_trip_ids' not in summary or not unanalyzed.issubset(summary['unanalyzed_trip_ids']):
+        logger.info("🪣 Analysis store is missing trip objects for %s", user_id)
+        return None
+    summary_stamp = {'analysis_cached_at': summary.get('updated_at') or ''}
+    if any(trip_modified_since_cached(trip_id, summary_stamp, trip_records.get(trip_id)) for trip_id in unanalyzed):
+        return None
+
+    with timed('store_reads'):
+        objects = read_objects(store, keys)
+    trip_analyses, stamps = [], {}
+    for key, data in zip(keys, objects):
+        trip_object = decode_analysis_object(data) if data is not None else None
+        if trip_object is None or trip_object.get('algorithm_version') != CURRENT_ALGORITHM_VERSION:
+            logger.info("🪣 Trip object %s is missing or from another algorithm version", key)
+            return None
+        trip = trip_object['trip']
+        if trip_modified_since_cached(trip['trip_id'], trip_object, trip_records.get(trip['trip_id'])):
+            return None
+        trip_analyses.append(trip)
+        stamps[trip['trip_id']] = trip_object.get('analysis_cached_at') or None
+    if not trip_analyses:
+        return None
+
+    driver_aggregate, aggregate_status = reconcile_driver_aggregate(
+        DriverAggregate.from_item(summary), trip_analyses, stamps, {})
+    return trip_analyses, driver_aggregate, aggregate_status
+
+class AnalysisStoreWriter:
+    """
+    🪣 Writes trip and summary objects on STORE_IO_THREADS threads in the background. Objects
+    are encoded when added, so later changes to the trip dicts (timezone display fields) never
+    reach the store. The summary is written last, once every trip object is in and the trip
+    objects of trips that are no longer the driver's (deleted, or stale leftovers) are removed.
+    """
+
+    def __init__(self, store: AnalysisStore, user_id: str):
+        self.store = store
+        self.user_id = user_id
+        self.objects = []  # (key, bytes)
+        self.summary = None
+        self.trip_ids = None
+        self.written = 0
+        self.failed = 0
+        self._thread = None
+
+    def add_trip(self, trip_analysis: Dict, analysis_cached_at: Optional[str]):
+        self.objects.append((trip_object_key(self.user_id, trip_analysis['trip_id']),
+                             trip_analysis_object(trip_analysis, analysis_cached_at)))
+
+    def set_summary(self, driver_aggregate: DriverAggregate, unanalyzed_trip_ids: List[str],
+                    trip_ids: Optional[List[str]] = None):
+        """
+        unanalyzed_trip_ids: the driver's trips without an analysis (no trip object), recorded in the summary.
+        trip_ids: every trip of the driver; other trip objects are deleted before the summary is written
+        """
+        self.summary = summary_object(driver_aggregate, self.user_id, unanalyzed_trip_ids)
+        self.trip_ids = trip_ids
+
+    def _put(self, key: str, data: bytes) -> bool:
+        try:
+            self.store.put(key, data)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Analysis store write failed for %s: %s", key, e)
+            return False
+
+    def flush(self):
+        with timed('store_writes'):
+            with ThreadPoolExecutor(max_workers=STORE_IO_THREADS, thread_name_prefix='store-write') as pool:
+                results = list(pool.map(lambda entry: self._put(*entry), self.objects))
+            if self.summary is not None and all(results) and self._remove_other_trips():
+                results.append(self._put(summary_object_key(self.user_id), self.summary))
+        self.written += sum(results)
+        self.failed += len(results) - sum(results)
+
+    def _remove_other_trips(self) -> bool:
+        if self.trip_ids is None:
+            return True
+        keep = {trip_object_key(self.user_id, trip_id) for trip_id in self.trip_ids}
+        try:
+            for key in self.store.list_keys(trip_objects_prefix(self.user_id)):
+                if key not in keep:
+                    logger.info("🪣 Removing trip object %s (not one of the driver's trips)", key)
+                    self.store.delete(key)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Could not remove old trip objects for %s: %s", self.user_id, e)
+            return False
+
+    def start(self):
+        if (self.objects or self.summary is not None) and self._thread is None:
+            self._thread = threading.Thread(target=self.flush, name='store-backfill', daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = STORE_WRITE_WAIT_SECONDS) -> Dict:
+        """
+        Report the backfill for cache_performance. timeout=None waits for it however long it
+        takes. After a timeout the backfill is still running: the report says so
+        (store_writes_complete false) and its counts are partial.
+        """
+        complete = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                complete = False
+                logger.warning("⚠️ Analysis store backfill still running after %ss", timeout)
+        return {'store_writes_complete': complete, 'store_objects_written': self.written,
+                'store_objects_failed': self.failed}
 
 # ========================================
 # ORIGINAL FUNCTIONS (UNCHANGED)
@@ -344,15 +1385,15 @@ def lookup_user_by_email_or_id(identifier: str) -> Optional[Dict]:
     """Look up user by email or user_id"""
     try:
         identifier = identifier.strip()
-        print(f"🔍 Looking up user by identifier: {identifier}")
+        logger.info("🔍 Looking up user by identifier: %s", identifier)
         
         if '@' in identifier:
             email = identifier.lower()
-            print(f"📧 Searching by email: {email}")
+            logger.info("📧 Searching by email: %s", email)
             
             email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
             if not re.match(email_pattern, email):
-                print(f"❌ Invalid email format: {email}")
+                logger.warning("❌ Invalid email format: %s", email)
                 return None
             
             response = users_table.scan(
@@ -364,15 +1405,15 @@ def lookup_user_by_email_or_id(identifier: str) -> Optional[Dict]:
             
             if response['Items']:
                 user_data = convert_decimal_to_float(response['Items'][0])
-                print(f"✅ Found user by email: {user_data['email']} (ID: {user_data['user_id']})")
+                logger.info("✅ Found user by email: %s (ID: %s)", user_data['email'], user_data['user_id'])
                 return user_data
             else:
-                print(f"❌ No user found with email: {email}")
+                logger.warning("❌ No user found with email: %s", email)
                 return None
         
         else:
             user_id = identifier
-            print(f"🆔 Searching by user_id: {user_id}")
+            logger.info("🆔 Searching by user_id: %s", user_id)
             
             response = users_table.get_item(
                 Key={'user_id': user_id},
@@ -382,14 +1423,14 @@ def lookup_user_by_email_or_id(identifier: str) -> Optional[Dict]:
             
             if 'Item' in response:
                 user_data = convert_decimal_to_float(response['Item'])
-                print(f"✅ Found user by ID: {user_data.get('email', 'no-email')} (ID: {user_data['user_id']})")
+                logger.info("✅ Found user by ID: %s (ID: %s)", user_data.get('email', 'no-email'), user_data['user_id'])
                 return user_data
             else:
-                print(f"❌ No user found with user_id: {user_id}")
+                logger.warning("❌ No user found with user_id: %s", user_id)
                 return None
                 
     except Exception as e:
-        print(f"❌ Error looking up user by {identifier}: {e}")
+        logger.error("❌ Error looking up user by %s: %s", identifier, e)
         return None
 
 def convert_decimal_to_float(obj):
@@ -403,6 +1444,47 @@ def convert_decimal_to_float(obj):
     else:
         return obj
 
+class DecimalEncoder(json.JSONEncoder):
+    """
+    🚀 OPTIMIZED: json.dumps(obj, cls=DecimalEncoder) writes DynamoDB Decimals as floats
+    Same output as json.dumps(convert_decimal_to_float(obj)) without copying the whole response first
+    """
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        return super().default(obj)
+
+# Trips-Neal fields read by trip analysis (the item also carries large per-delta lists
+# under trip_quality.batch_aggregation that analysis never needs)
+TRIP_TIMESTAMP_FIELDS = ('start_timestamp', 'timestamp', 'end_timestamp', 'finalized_at')
+TRIP_QUALITY_FIELDS = ('use_gps_metrics', 'actual_distance_miles', 'actual_duration_minutes',
+                       'actual_start_timestamp', 'actual_end_timestamp', 'gps_max_speed_mph', 'gps_avg_speed_mph')
+
+def _decimal_to_float(value):
+    """DynamoDB number -> float, anything else unchanged"""
+    return float(value) if isinstance(value, Decimal) else value
+
+def trip_record_projection() -> Dict:
+    """get_item/batch_get_item projection for the Trips-Neal fields decode_trip_record reads"""
+    names = {f'#f{i}': field for i, field in enumerate(TRIP_TIMESTAMP_FIELDS)}
+    names['#tq'] = 'trip_quality'
+    paths = list(names)[:-1]
+    for i, field in enumerate(TRIP_QUALITY_FIELDS):
+        names[f'#q{i}'] = field
+        paths.append(f'#tq.#q{i}')
+    return {'ProjectionExpression': ', '.join(paths), 'ExpressionAttributeNames': names}
+
+def decode_trip_record(item: Dict) -> Dict:
+    """Typed view of a Trips-Neal item: timestamps plus the scalar trip_quality fields"""
+    record = {field: _decimal_to_float(item[field]) for field in TRIP_TIMESTAMP_FIELDS if field in item}
+    trip_quality = item.get('trip_quality')
+    if isinstance(trip_quality, dict):
+        record['trip_quality'] = {field: _decimal_to_float(trip_quality[field])
+                                  for field in TRIP_QUALITY_FIELDS if field in trip_quality}
+    elif trip_quality is not None:
+        record['trip_quality'] = trip_quality
+    return record
+
 # FIXED: Industry-standard thresholds based on research
 class IndustryStandardMetrics:
     """
@@ -477,16 +1559,16 @@ def format_duration_smart(minutes: float) -> str:
 def get_user_base_point(user_id: str) -> Dict:
     """Get user's base point for privacy calculations"""
     try:
-        print(f"🔍 Getting base point for user: {user_id}")
+        logger.info("🔍 Getting base point for user: %s", user_id)
         response = users_table.get_item(Key={'user_id': user_id})
         
         if 'Item' in response:
             user_data = response['Item']
-            print(f"✅ Found user data for {user_id}")
+            logger.info("✅ Found user data for %s", user_id)
             
             if 'base_point' in user_data and user_data['base_point']:
                 base_point = user_data['base_point']
-                print(f"📍 Using user-specific base point: {base_point.get('city', 'Unknown')}, {base_point.get('state', 'Unknown')}")
+                logger.info("📍 Using user-specific base point: %s, %s", base_point.get('city', 'Unknown'), base_point.get('state', 'Unknown'))
                 
                 return {
                     'latitude': float(base_point['latitude']),
@@ -497,39 +1579,134 @@ def get_user_base_point(user_id: str) -> Dict:
                     'anonymization_radius': user_data.get('privacy_settings', {}).get('anonymizationRadius', 10) if 'privacy_settings' in user_data else 10
                 }
         
-        print(f"⚠️ No custom base point found for {user_id}, using fallback")
+        logger.warning("⚠️ No custom base point found for %s, using fallback", user_id)
         return DEFAULT_BASE_POINT
         
     except Exception as e:
-        print(f"❌ Error getting user base point for {user_id}: {e}")
+        logger.error("❌ Error getting user base point for %s: %s", user_id, e)
         return DEFAULT_BASE_POINT
 
-def detect_driving_context(speeds: List[float], total_distance_miles: float, total_turns: int) -> Dict:
-    """Automatically detect city vs highway driving from GPS patterns"""
-    if len(speeds) < 5 or total_distance_miles <= 0:
+# Speed bands used by context detection
+STOP_SPEED_MPH = 5.0
+HIGHWAY_SPEED_MPH = 50.0
+
+def sqrt_of_fraction(value: Fraction) -> float:
+    """Correctly rounded square root of an exact fraction (what statistics.stdev returns)"""
+    n, m = value.numerator, value.denominator
+    q = (n.bit_length() - m.bit_length() - 109) // 2
+    if q >= 0:
+        root = math.isqrt(n // (m << 2 * q))
+        root |= root * root * (m << 2 * q) != n
+        return (root << q) / 1
+    root = math.isqrt((n << -2 * q) // m)
+    root |= root * root * m != (n << -2 * q)
+    return root / (1 << -q)
+
+class SpeedStatistics:
+    """
+    Running speed statistics for context detection and the trip summary, one speed at a time.
+    The sums are exact (numerators per power-of-two denominator, as statistics keeps them), so
+    avg_speed and speed_stdev equal statistics.mean and statistics.stdev bit for bit.
+    """
+    __slots__ = ('count', 'sum_partials', 'square_partials', 'stop_count', 'highway_count', 'min_speed', 'max_speed')
+
+    def __init__(self):
+        self.count = 0
+        self.sum_partials = {}     # denominator: sum of numerators
+        self.square_partials = {}  # denominator (before squaring): sum of squared numerators
+        self.stop_count = 0
+        self.highway_count = 0
+        self.min_speed = 0
+        self.max_speed = 0.0
+
+    def add(self, speed: float):
+        numerator, denominator = speed.as_integer_ratio()
+        self.sum_partials[denominator] = self.sum_partials.get(denominator, 0) + numerator
+        self.square_partials[denominator] = self.square_partials.get(denominator, 0) + numerator * numerator
+        if speed < STOP_SPEED_MPH:
+            self.stop_count += 1
+        elif speed > HIGHWAY_SPEED_MPH:
+            self.highway_count += 1
+        if not self.count or speed < self.min_speed:
+            self.min_speed = speed
+        if not self.count or speed > self.max_speed:
+            self.max_speed = speed
+        self.count += 1
+
+    def summary(self) -> Dict:
+        count = self.count
+        if not count:
+            return {'count': 0, 'avg_speed': 0.0, 'speed_stdev': 0, 'stop_count': 0,
+                    'highway_count': 0, 'min_speed': 0, 'max_speed': 0.0}
+        speed_sum = sum(Fraction(numerator, denominator) for denominator, numerator in self.sum_partials.items())
+        speed_stdev = 0
+        if count > 1:
+            square_sum = sum(Fraction(numerator, denominator * denominator)
+                             for denominator, numerator in self.square_partials.items())
+            sum_of_squares = (count * square_sum - speed_sum * speed_sum) / count
+            speed_stdev = sqrt_of_fraction(sum_of_squares / (count - 1))
+        return {
+            'count': count,
+            'avg_speed': float(speed_sum / count),
+            'speed_stdev': speed_stdev,
+            'stop_count': self.stop_count,
+            'highway_count': self.highway_count,
+            'min_speed': self.min_speed,
+            'max_speed': self.max_speed
+        }
+
+def summarize_speeds(speeds: List[float]) -> Dict:
+    """Speed statistics shared by context detection and the trip summary, in one pass over the speeds"""
+    running = SpeedStatistics()
+    for speed in speeds:
+        running.add(speed)
+    return running.summary()
+
+# Thresholds of a trip too short for context detection
+FALLBACK_HARSH_ACCEL = 3.2
+FALLBACK_HARSH_DECEL = -4.2
+# Mildest harsh thresholds of any context: an event run below them is never harsh
+MIN_HARSH_ACCEL = min(IndustryStandardMetrics.BASE_THRESHOLDS['city_harsh_accel'],
+                      IndustryStandardMetrics.BASE_THRESHOLDS['highway_harsh_accel'], FALLBACK_HARSH_ACCEL)
+MIN_HARSH_DECEL = min(abs(IndustryStandardMetrics.BASE_THRESHOLDS['city_harsh_decel']),
+                      abs(IndustryStandardMetrics.BASE_THRESHOLDS['highway_harsh_decel']), abs(FALLBACK_HARSH_DECEL))
+
+def detect_driving_context(speeds: List[float], total_distance_miles: float, total_turns: int,
+                           speed_summary: Dict = None) -> Dict:
+    """Automatically detect city vs highway driving from GPS patterns
+
+    speed_summary: optional precomputed summarize_speeds(speeds) from TripFeatures
+    """
+    if speed_summary is None:
+        speed_summary = summarize_speeds(speeds)
+    return driving_context_from_summary(speed_summary, total_distance_miles, total_turns)
+
+def driving_context_from_summary(speed_summary: Dict, total_distance_miles: float, total_turns: int) -> Dict:
+    """detect_driving_context from a summarize_speeds summary (store-trajectory-batch keeps one per trip)"""
+    if speed_summary['count'] < 5 or total_distance_miles <= 0:
         return {
             'context': 'mixed',
-            'harsh_accel_threshold': 3.2,
-            'harsh_decel_threshold': -4.2,
+            'harsh_accel_threshold': FALLBACK_HARSH_ACCEL,
+            'harsh_decel_threshold': FALLBACK_HARSH_DECEL,
             'confidence': 0.0
         }
-    
+
     # Calculate driving pattern indicators
-    avg_speed = statistics.mean(speeds)
-    speed_variance = statistics.stdev(speeds) if len(speeds) > 1 else 0
+    avg_speed = speed_summary['avg_speed']
+    speed_variance = speed_summary['speed_stdev']
     
     # Count stops (speed drops to <5 mph)
-    stops = sum(1 for speed in speeds if speed < 5.0)
+    stops = speed_summary['stop_count']
     stops_per_mile = stops / total_distance_miles if total_distance_miles > 0 else 0
     
     # Calculate turns per mile
     turns_per_mile = total_turns / total_distance_miles if total_distance_miles > 0 else 0
     
-    print(f"🔍 CONTEXT DETECTION:")
-    print(f"   Average Speed: {avg_speed:.1f} mph")
-    print(f"   Speed Variance: {speed_variance:.1f}")
-    print(f"   Stops per Mile: {stops_per_mile:.1f}")
-    print(f"   Turns per Mile: {turns_per_mile:.1f}")
+    logger.info("🔍 CONTEXT DETECTION:")
+    logger.info("   Average Speed: %.1f mph", avg_speed)
+    logger.info("   Speed Variance: %.1f", speed_variance)
+    logger.info("   Stops per Mile: %.1f", stops_per_mile)
+    logger.info("   Turns per Mile: %.1f", turns_per_mile)
     
     # Score indicators (0 = highway, 1 = city)
     city_indicators = []
@@ -567,8 +1744,8 @@ def detect_driving_context(speeds: List[float], total_distance_miles: float, tot
         city_indicators.append(0.5)
 
     # Highway pattern detection
-    highway_speeds = sum(1 for speed in speeds if speed > 50.0)
-    highway_percentage = highway_speeds / len(speeds) if speeds else 0
+    highway_speeds = speed_summary['highway_count']
+    highway_percentage = highway_speeds / speed_summary['count']
 
     if highway_percentage > 0.5:
         city_indicators.append(0.1)
@@ -597,9 +1774,9 @@ def detect_driving_context(speeds: List[float], total_distance_miles: float, tot
         harsh_decel_threshold = (IndustryStandardMetrics.BASE_THRESHOLDS['city_harsh_decel'] + 
                                 IndustryStandardMetrics.BASE_THRESHOLDS['highway_harsh_decel']) / 2
     
-    print(f"🎯 CONTEXT DETECTED: {context.upper()} (confidence: {confidence:.1%})")
-    print(f"   Harsh Accel Threshold: {harsh_accel_threshold:.1f} m/s²")
-    print(f"   Harsh Decel Threshold: {harsh_decel_threshold:.1f} m/s²")
+    logger.info("🎯 CONTEXT DETECTED: %s (confidence: %.1f%%)", context.upper(), confidence * 100)
+    logger.info("   Harsh Accel Threshold: %.1f m/s²", harsh_accel_threshold)
+    logger.info("   Harsh Decel Threshold: %.1f m/s²", harsh_decel_threshold)
     
     return {
         'context': context,
@@ -650,7 +1827,11 @@ def calculate_moving_metrics(speeds: List[float], time_intervals: List[float], t
         else:
             # Vehicle is stationary
             stationary_time_ms += time_ms
-    
+
+    return moving_metrics_from_totals(moving_time_ms, stationary_time_ms, moving_distance)
+
+def moving_metrics_from_totals(moving_time_ms: float, stationary_time_ms: float, moving_distance: float) -> Dict:
+    """calculate_moving_metrics' result from its moving/stationary time and moving distance totals"""
     total_time_ms = moving_time_ms + stationary_time_ms
     moving_time_minutes = moving_time_ms / (1000 * 60)
     stationary_time_minutes = stationary_time_ms / (1000 * 60)
@@ -663,11 +1844,11 @@ def calculate_moving_metrics(speeds: List[float], time_intervals: List[float], t
         moving_avg_speed = 0.0
         moving_percentage = 0.0
     
-    print(f"🚗 MOVING METRICS:")
-    print(f"   Moving Time: {moving_time_minutes:.1f} minutes")
-    print(f"   Stationary Time: {stationary_time_minutes:.1f} minutes")
-    print(f"   Moving Average Speed: {moving_avg_speed:.1f} mph")
-    print(f"   Time Moving: {moving_percentage:.1f}%")
+    logger.info("🚗 MOVING METRICS:")
+    logger.info("   Moving Time: %.1f minutes", moving_time_minutes)
+    logger.info("   Stationary Time: %.1f minutes", stationary_time_minutes)
+    logger.info("   Moving Average Speed: %.1f mph", moving_avg_speed)
+    logger.info("   Time Moving: %.1f%%", moving_percentage)
     
     return {
         'moving_avg_speed_mph': round(moving_avg_speed, 1),
@@ -677,45 +1858,95 @@ def calculate_moving_metrics(speeds: List[float], time_intervals: List[float], t
         'moving_distance_miles': round(moving_distance, 3)
     }
 
-def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[float], 
-                                    total_distance_miles: float, total_turns: int) -> Dict:
-    """FIXED: Analyze acceleration events with proper thresholds and smart grouping"""
-    if len(speeds) < 2:
-        return {
-            'total_harsh_events': 0,
-            'total_dangerous_events': 0,
-            'acceleration_events': [],
-            'deceleration_events': [],
-            'sudden_accelerations': 0,
-            'sudden_decelerations': 0,
-            'hard_stops': 0,
-            'event_breakdown': {
-                'gentle': 0, 'normal': 0, 'assertive': 0, 
-                'harsh': 0, 'dangerous': 0, 'extreme': 0
-            },
-            'smoothness_score': 95.0,
-            'driving_context': {'context': 'unknown', 'confidence': 0.0}
-        }
-    
-    print(f"🎯 ANALYZING: {len(speeds)-1} acceleration segments with BALANCED GROUPING")
-    
-    # Detect driving context
-    context_info = detect_driving_context(speeds, total_distance_miles, total_turns)
-    
-    # Get context-aware thresholds (in m/s²)
-    harsh_accel_threshold = context_info['harsh_accel_threshold']
-    harsh_decel_threshold = context_info['harsh_decel_threshold']
-    dangerous_accel_threshold = IndustryStandardMetrics.BASE_THRESHOLDS['dangerous_accel']
-    dangerous_decel_threshold = IndustryStandardMetrics.BASE_THRESHOLDS['dangerous_decel']
-    
-    print(f"📊 THRESHOLDS (m/s²):")
-    print(f"   Context: {context_info['context'].upper()}")
-    print(f"   Harsh Acceleration: {harsh_accel_threshold:.1f} m/s²")
-    print(f"   Harsh Deceleration: {harsh_decel_threshold:.1f} m/s²")
-    
+# Speeds are in mph, accelerations in m/s²
+MPH_TO_MS2 = 0.44704
+# BALANCED: Reduced thresholds for starting to track events
+EVENT_ACCEL_THRESHOLD = 1.5  # m/s² - reduced from 2.0
+EVENT_DECEL_THRESHOLD = -2.0  # m/s² - reduced from -2.5
+
+def event_thresholds(context_info: Dict) -> Tuple[float, float, float, float]:
+    """(harsh_accel, harsh_decel, dangerous_accel, dangerous_decel) thresholds in m/s² for a driving context"""
+    return (context_info['harsh_accel_threshold'], context_info['harsh_decel_threshold'],
+            IndustryStandardMetrics.BASE_THRESHOLDS['dangerous_accel'],
+            IndustryStandardMetrics.BASE_THRESHOLDS['dangerous_decel'])
+
+def classify_event_run(kind: str, start_index: int, run_length: int, avg_acceleration: float,
+                       max_acceleration: float, start_speed: float, end_speed: float,
+                       duration_seconds: float, context_info: Dict) -> Optional[Dict]:
+    """The harsh event made by one grouped run of smoothed accelerations (None when ignored or not harsh)
+
+    kind: 'acceleration' or 'deceleration'; start_index: the run's first segment
+    """
+    harsh_accel_threshold, harsh_decel_threshold, dangerous_accel_threshold, dangerous_decel_threshold = \
+        event_thresholds(context_info)
+
+    # BALANCED DURATION VALIDATION: Reduced from 1.5s to 0.5s minimum
+    # But allow shorter events if they're severe enough
+    if duration_seconds < 0.5:
+        # Only count very brief events if they're severe
+        if abs(avg_acceleration) < abs(dangerous_accel_threshold):
+            logger.debug("   Ignored brief spike: %.1fs, %.1f m/s²", duration_seconds, avg_acceleration)
+            return None
+    elif duration_seconds < 1.0:
+        # For events 0.5-1.0s, require them to be above harsh threshold consistently
+        if abs(avg_acceleration) < abs(harsh_accel_threshold) * 1.1:
+            logger.debug("   Ignored mild short event: %.1fs, %.1f m/s²", duration_seconds, avg_acceleration)
+            return None
+
+    # Speed change validation: Must have meaningful speed change
+    speed_change = abs(end_speed - start_speed)
+
+    # For short events, require more significant speed change
+    min_speed_change = 3.0 if duration_seconds < 1.0 else 2.0
+    if speed_change < min_speed_change and abs(avg_acceleration) < dangerous_accel_threshold:
+        logger.debug("   Ignored minor speed change: %.1f mph in %.1fs", speed_change, duration_seconds)
+        return None
+
+    # Determine severity based on average acceleration
+    is_dangerous = False
+    if kind == 'acceleration':
+        if avg_acceleration > dangerous_accel_threshold:
+            severity = 'dangerous' if duration_seconds < 3 else 'extreme'
+            is_dangerous = True
+        elif avg_acceleration > harsh_accel_threshold:
+            severity = 'harsh'
+        else:
+            return None
+    else:
+        abs_avg = abs(avg_acceleration)
+        if abs_avg > abs(dangerous_decel_threshold):
+            severity = 'dangerous' if duration_seconds < 2 else 'extreme'
+            is_dangerous = True
+        elif abs_avg > abs(harsh_decel_threshold):
+            severity = 'harsh'
+        else:
+            return None
+
+    event = {
+        'segment_start': start_index + 1,
+        'segment_end': start_index + run_length,
+        'duration_seconds': round(duration_seconds, 1),
+        'avg_acceleration_ms2': round(avg_acceleration, 2),
+        'max_acceleration_ms2': round(max_acceleration, 2),
+        'speed_from': round(start_speed, 1),
+        'speed_to': round(end_speed, 1),
+        'speed_change': round(speed_change, 1),
+        'severity': severity,
+        'is_dangerous': is_dangerous,
+    }
+    if kind == 'deceleration':
+        # FIXED: Better hard stop detection
+        # Hard stop criteria: significant decel, from meaningful speed to near-stop, in short time
+        event['is_hard_stop'] = start_speed > 15.0 and end_speed < 5.0 and duration_seconds < 3.0
+    event['context'] = context_info['context']
+    logger.debug("  ⚠️ HARSH %s EVENT: %.2f m/s² avg over %.1fs (%.1f→%.1f mph)",
+                 'ACCEL' if kind == 'acceleration' else 'DECEL', avg_acceleration, duration_seconds, start_speed, end_speed)
+    return event
+
+def _detect_acceleration_events_python(speeds: List[float], time_intervals: List[float], context_info: Dict) -> Dict:
+    """Per-segment acceleration, smoothing and event grouping loops (reference implementation)"""
     # STEP 1: Calculate ALL raw accelerations first
     raw_accelerations = []
-    MPH_TO_MS2 = 0.44704
     
     for i in range(len(speeds) - 1):
         if i >= len(time_intervals):
@@ -754,16 +1985,13 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
         
         smoothed_accelerations.append(avg)
     
-    print(f"📈 Smoothing applied: {len(smoothed_accelerations)} smoothed values")
+    logger.info("📈 Smoothing applied: %s smoothed values", len(smoothed_accelerations))
     
     # STEP 3: Event detection with grouping
     acceleration_events = []
     deceleration_events = []
-    harsh_count = 0
-    dangerous_count = 0
-    sudden_accelerations = 0
-    sudden_decelerations = 0
-    hard_stops = 0
+    # Per-trip counter instead of a log line per grouped event
+    events_grouped = 0
     
     # Event grouping variables
     current_event = None
@@ -775,118 +2003,20 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
     
     def finalize_event():
         """Helper function to finalize and categorize a grouped event"""
-        nonlocal harsh_count, dangerous_count, sudden_accelerations, sudden_decelerations, hard_stops
-        nonlocal acceleration_events, deceleration_events, current_event
+        nonlocal events_grouped
         
         if not current_event or not event_accelerations:
             return
+        events_grouped += 1
         
-        # Calculate event statistics
-        avg_acceleration = sum(event_accelerations) / len(event_accelerations)
-        max_acceleration = max(event_accelerations, key=abs)
-        duration_seconds = event_duration_ms / 1000.0
-        
-        # BALANCED DURATION VALIDATION: Reduced from 1.5s to 0.5s minimum
-        # But allow shorter events if they're severe enough
-        if duration_seconds < 0.5:
-            # Only count very brief events if they're severe
-            if abs(avg_acceleration) < abs(dangerous_accel_threshold):
-                print(f"   Ignored brief spike: {duration_seconds:.1f}s, {avg_acceleration:.1f} m/s²")
-                return
-        elif duration_seconds < 1.0:
-            # For events 0.5-1.0s, require them to be above harsh threshold consistently
-            if abs(avg_acceleration) < abs(harsh_accel_threshold) * 1.1:
-                print(f"   Ignored mild short event: {duration_seconds:.1f}s, {avg_acceleration:.1f} m/s²")
-                return
-        
-        # Speed change validation: Must have meaningful speed change
-        start_speed = event_speeds_from[0]
-        end_speed = event_speeds_to[-1]
-        speed_change = abs(end_speed - start_speed)
-        
-        # For short events, require more significant speed change
-        min_speed_change = 3.0 if duration_seconds < 1.0 else 2.0
-        if speed_change < min_speed_change and abs(avg_acceleration) < dangerous_accel_threshold:
-            print(f"   Ignored minor speed change: {speed_change:.1f} mph in {duration_seconds:.1f}s")
-            return
-        
-        # Determine severity based on average acceleration
-        is_harsh = False
-        is_dangerous = False
-        severity = 'normal'
-        
-        if current_event == 'acceleration':
-            if avg_acceleration > dangerous_accel_threshold:
-                severity = 'dangerous' if duration_seconds < 3 else 'extreme'
-                is_harsh = True
-                is_dangerous = True
-                dangerous_count += 1
-                sudden_accelerations += 1
-            elif avg_acceleration > harsh_accel_threshold:
-                severity = 'harsh'
-                is_harsh = True
-                sudden_accelerations += 1
-            
-            if is_harsh:
-                harsh_count += 1
-                acceleration_events.append({
-                    'segment_start': event_start_idx + 1,
-                    'segment_end': event_start_idx + len(event_accelerations),
-                    'duration_seconds': round(duration_seconds, 1),
-                    'avg_acceleration_ms2': round(avg_acceleration, 2),
-                    'max_acceleration_ms2': round(max_acceleration, 2),
-                    'speed_from': round(start_speed, 1),
-                    'speed_to': round(end_speed, 1),
-                    'speed_change': round(speed_change, 1),
-                    'severity': severity,
-                    'is_dangerous': is_dangerous,
-                    'context': context_info['context']
-                })
-                print(f"  ⚠️ HARSH ACCEL EVENT: {avg_acceleration:.2f} m/s² avg over {duration_seconds:.1f}s ({start_speed:.1f}→{end_speed:.1f} mph)")
-        
-        elif current_event == 'deceleration':
-            abs_avg = abs(avg_acceleration)
-            if abs_avg > abs(dangerous_decel_threshold):
-                severity = 'dangerous' if duration_seconds < 2 else 'extreme'
-                is_harsh = True
-                is_dangerous = True
-                dangerous_count += 1
-                sudden_decelerations += 1
-            elif abs_avg > abs(harsh_decel_threshold):
-                severity = 'harsh'
-                is_harsh = True
-                sudden_decelerations += 1
-            
-            # FIXED: Better hard stop detection
-            # Hard stop criteria: significant decel, from meaningful speed to near-stop, in short time
-            if (is_harsh and 
-                start_speed > 15.0 and 
-                end_speed < 5.0 and 
-                duration_seconds < 3.0):
-                hard_stops += 1
-            
-            if is_harsh:
-                harsh_count += 1
-                deceleration_events.append({
-                    'segment_start': event_start_idx + 1,
-                    'segment_end': event_start_idx + len(event_accelerations),
-                    'duration_seconds': round(duration_seconds, 1),
-                    'avg_acceleration_ms2': round(avg_acceleration, 2),
-                    'max_acceleration_ms2': round(max_acceleration, 2),
-                    'speed_from': round(start_speed, 1),
-                    'speed_to': round(end_speed, 1),
-                    'speed_change': round(speed_change, 1),
-                    'severity': severity,
-                    'is_dangerous': is_dangerous,
-                    'is_hard_stop': start_speed > 15.0 and end_speed < 5.0 and duration_seconds < 3.0,
-                    'context': context_info['context']
-                })
-                print(f"  ⚠️ HARSH DECEL EVENT: {avg_acceleration:.2f} m/s² avg over {duration_seconds:.1f}s ({start_speed:.1f}→{end_speed:.1f} mph)")
+        event = classify_event_run(current_event, event_start_idx, len(event_accelerations),
+                                   sum(event_accelerations) / len(event_accelerations),
+                                   max(event_accelerations, key=abs), event_speeds_from[0], event_speeds_to[-1],
+                                   event_duration_ms / 1000.0, context_info)
+        if event is not None:
+            (acceleration_events if current_event == 'acceleration' else deceleration_events).append(event)
     
     # STEP 4: Process smoothed accelerations with event grouping
-    # BALANCED: Reduced thresholds for starting to track events
-    ACCEL_THRESHOLD = 1.5  # m/s² - reduced from 2.0
-    DECEL_THRESHOLD = -2.0  # m/s² - reduced from -2.5
     
     for i in range(len(smoothed_accelerations)):
         if i >= len(time_intervals):
@@ -898,7 +2028,7 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
         time_ms = time_intervals[i]
         
         # Determine if this is part of an acceleration or deceleration event
-        if accel > ACCEL_THRESHOLD:  # Acceleration event
+        if accel > EVENT_ACCEL_THRESHOLD:  # Acceleration event
             if current_event == 'acceleration':
                 # Continue current acceleration event
                 event_accelerations.append(accel)
@@ -916,7 +2046,7 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
                 event_speeds_to = [next_speed]
                 event_duration_ms = time_ms
         
-        elif accel < DECEL_THRESHOLD:  # Deceleration event
+        elif accel < EVENT_DECEL_THRESHOLD:  # Deceleration event
             if current_event == 'deceleration':
                 # Continue current deceleration event
                 event_accelerations.append(accel)
@@ -943,11 +2073,202 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
     
     # Finalize any remaining event
     finalize_event()
-    
-    # Calculate smoothness score
-    total_segments = len(smoothed_accelerations)
-    if total_segments > 0 and total_distance_miles > 0:
-        # Use event count instead of segment count for more accurate scoring
+    logger.info("   Grouped %s candidate events, %s harsh", events_grouped,
+                len(acceleration_events) + len(deceleration_events))
+
+    return {
+        'acceleration_events': acceleration_events,
+        'deceleration_events': deceleration_events,
+        'total_segments': len(smoothed_accelerations)
+    }
+
+def _sequential_run_sums(values, run_starts, run_lengths):
+    """Sum each run left to right, like Python's sum() (np.add.reduceat rounds differently)"""
+    sums = np.zeros(len(run_starts), dtype=np.float64)
+    active = np.arange(len(run_starts))
+    offset = 0
+    while len(active):
+        sums[active] += values[run_starts[active] + offset]
+        offset += 1
+        active = active[run_lengths[active] > offset]
+    return sums
+
+def _detect_acceleration_events_numpy(speeds: List[float], time_intervals: List[float], context_info: Dict) -> Dict:
+    """Vectorized acceleration/smoothing with run-length event detection
+
+    Produces the same events as _detect_acceleration_events_python
+    """
+    harsh_accel_threshold, harsh_decel_threshold, dangerous_accel_threshold, dangerous_decel_threshold = \
+        event_thresholds(context_info)
+    speed_array = np.asarray(speeds, dtype=np.float64)
+    segment_count = len(speed_array) - 1
+    interval_count = min(segment_count, len(time_intervals))
+
+    # STEP 1: Raw accelerations (0 for missing or unrealistic >15s intervals)
+    raw_accelerations = np.zeros(segment_count, dtype=np.float64)
+    intervals = np.asarray(time_intervals[:interval_count], dtype=np.float64)
+    time_seconds = np.maximum(0.5, intervals / 1000.0)
+    valid = time_seconds <= 15.0
+    speed_deltas = speed_array[1:interval_count + 1] - speed_array[:interval_count]
+    raw_accelerations[:interval_count][valid] = (speed_deltas[valid] / time_seconds[valid]) * MPH_TO_MS2
+
+    # STEP 2: 3-point moving average, edges averaged with their single neighbour
+    smoothed_accelerations = np.empty(segment_count, dtype=np.float64)
+    if segment_count == 1:
+        smoothed_accelerations[0] = raw_accelerations[0]
+    else:
+        smoothed_accelerations[0] = (raw_accelerations[0] + raw_accelerations[1]) / 2
+        smoothed_accelerations[-1] = (raw_accelerations[-2] + raw_accelerations[-1]) / 2
+        smoothed_accelerations[1:-1] = (raw_accelerations[:-2] + raw_accelerations[1:-1] + raw_accelerations[2:]) / 3
+
+    logger.info("📈 Smoothing applied: %s smoothed values", len(smoothed_accelerations))
+
+    empty_result = {
+        'acceleration_events': [],
+        'deceleration_events': [],
+        'total_segments': segment_count
+    }
+    if interval_count == 0:
+        return empty_result
+
+    # STEP 3: Run-length encode the threshold masks (segments without an interval are never scanned)
+    scanned = smoothed_accelerations[:interval_count]
+    labels = np.zeros(interval_count, dtype=np.int8)
+    labels[scanned > EVENT_ACCEL_THRESHOLD] = 1
+    labels[scanned < EVENT_DECEL_THRESHOLD] = -1
+    boundaries = np.flatnonzero(np.diff(labels)) + 1
+    run_starts = np.concatenate(([0], boundaries))
+    run_ends = np.concatenate((boundaries, [interval_count]))
+    is_event_run = labels[run_starts] != 0
+    run_starts, run_ends = run_starts[is_event_run], run_ends[is_event_run]
+    run_is_accel = labels[run_starts] == 1
+
+    if not len(run_starts):
+        return empty_result
+
+    # STEP 4: Per-run statistics (sequential sums keep the loop's rounding exactly)
+    run_lengths = run_ends - run_starts
+    avg_acceleration = _sequential_run_sums(smoothed_accelerations, run_starts, run_lengths) / run_lengths
+    duration_seconds = _sequential_run_sums(intervals, run_starts, run_lengths) / 1000.0
+    start_speed = speed_array[run_starts]
+    end_speed = speed_array[run_ends]
+    speed_change = np.abs(end_speed - start_speed)
+    abs_avg = np.abs(avg_acceleration)
+
+    # Duration validation: brief spikes must be dangerous, 0.5-1.0s events must be clearly harsh
+    ignored = ((duration_seconds < 0.5) & (abs_avg < abs(dangerous_accel_threshold))) | \
+              ((duration_seconds >= 0.5) & (duration_seconds < 1.0) & (abs_avg < abs(harsh_accel_threshold) * 1.1))
+
+    # Speed change validation: short events need a larger speed change
+    min_speed_change = np.where(duration_seconds < 1.0, 3.0, 2.0)
+    ignored |= (speed_change < min_speed_change) & (abs_avg < dangerous_accel_threshold)
+
+    # Severity classification
+    accel_dangerous = run_is_accel & (avg_acceleration > dangerous_accel_threshold)
+    accel_harsh = run_is_accel & ~accel_dangerous & (avg_acceleration > harsh_accel_threshold)
+    decel_dangerous = ~run_is_accel & (abs_avg > abs(dangerous_decel_threshold))
+    decel_harsh = ~run_is_accel & ~decel_dangerous & (abs_avg > abs(harsh_decel_threshold))
+
+    counted = ~ignored
+    is_dangerous = (accel_dangerous | decel_dangerous) & counted
+    is_harsh = (accel_dangerous | accel_harsh | decel_dangerous | decel_harsh) & counted
+    is_hard_stop_shape = (start_speed > 15.0) & (end_speed < 5.0) & (duration_seconds < 3.0)
+
+    acceleration_events = []
+    deceleration_events = []
+    context = context_info['context']
+    starts, ends = run_starts.tolist(), run_ends.tolist()
+
+    for k in np.flatnonzero(is_harsh).tolist():
+        a, b = starts[k], ends[k]
+        event_accelerations = smoothed_accelerations[a:b].tolist()
+        duration = float(duration_seconds[k])
+        dangerous = bool(is_dangerous[k])
+        if run_is_accel[k]:
+            severity = ('dangerous' if duration < 3 else 'extreme') if dangerous else 'harsh'
+        else:
+            severity = ('dangerous' if duration < 2 else 'extreme') if dangerous else 'harsh'
+
+        event = {
+            'segment_start': a + 1,
+            'segment_end': b,
+            'duration_seconds': round(duration, 1),
+            'avg_acceleration_ms2': round(float(avg_acceleration[k]), 2),
+            'max_acceleration_ms2': round(max(event_accelerations, key=abs), 2),
+            'speed_from': round(float(start_speed[k]), 1),
+            'speed_to': round(float(end_speed[k]), 1),
+            'speed_change': round(float(speed_change[k]), 1),
+            'severity': severity,
+            'is_dangerous': dangerous,
+        }
+        if run_is_accel[k]:
+            event['context'] = context
+            acceleration_events.append(event)
+        else:
+            event['is_hard_stop'] = bool(is_hard_stop_shape[k])
+            event['context'] = context
+            deceleration_events.append(event)
+
+    logger.info("   Grouped %s candidate events, %s harsh", len(starts), int(np.count_nonzero(is_harsh)))
+
+    return {
+        'acceleration_events': acceleration_events,
+        'deceleration_events': deceleration_events,
+        'total_segments': segment_count
+    }
+
+def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[float], 
+                                    total_distance_miles: float, total_turns: int,
+                                    speed_summary: Dict = None) -> Dict:
+    """FIXED: Analyze acceleration events with proper thresholds and smart grouping"""
+    if len(speeds) < 2:
+        return {
+            'total_harsh_events': 0,
+            'total_dangerous_events': 0,
+            'acceleration_events': [],
+            'deceleration_events': [],
+            'sudden_accelerations': 0,
+            'sudden_decelerations': 0,
+            'hard_stops': 0,
+            'event_breakdown': {
+                'gentle': 0, 'normal': 0, 'assertive': 0, 
+                'harsh': 0, 'dangerous': 0, 'extreme': 0
+            },
+            'smoothness_score': 95.0,
+            'driving_context': {'context': 'unknown', 'confidence': 0.0}
+        }
+    
+    logger.info("🎯 ANALYZING: %s acceleration segments with BALANCED GROUPING", len(speeds) - 1)
+    
+    # Detect driving context
+    context_info = detect_driving_context(speeds, total_distance_miles, total_turns, speed_summary)
+    
+    # Get context-aware thresholds (in m/s²)
+    harsh_accel_threshold, harsh_decel_threshold, _, _ = event_thresholds(context_info)
+    
+    logger.info("📊 THRESHOLDS (m/s²):")
+    logger.info("   Context: %s", context_info['context'].upper())
+    logger.info("   Harsh Acceleration: %.1f m/s²", harsh_accel_threshold)
+    logger.info("   Harsh Deceleration: %.1f m/s²", harsh_decel_threshold)
+    
+    # 🚀 OPTIMIZATION: Array-based event detection when NumPy is available
+    detect_events = _detect_acceleration_events_numpy if use_vectorized_engine() else _detect_acceleration_events_python
+    detection = detect_events(speeds, time_intervals, context_info)
+    return summarize_acceleration_events(detection['acceleration_events'], detection['deceleration_events'],
+                                         detection['total_segments'], total_distance_miles, context_info)
+
+def summarize_acceleration_events(acceleration_events: List[Dict], deceleration_events: List[Dict],
+                                  total_segments: int, total_distance_miles: float, context_info: Dict) -> Dict:
+    """Event counts, smoothness score and severity breakdown from a trip's harsh events"""
+    harsh_count = len(acceleration_events) + len(deceleration_events)
+    dangerous_count = sum(1 for event in acceleration_events + deceleration_events if event['is_dangerous'])
+    sudden_accelerations = len(acceleration_events)
+    sudden_decelerations = len(deceleration_events)
+    hard_stops = sum(1 for event in deceleration_events if event['is_hard_stop'])
+    
+    # Calculate smoothness score
+    if total_segments > 0 and total_distance_miles > 0:
+        # Use event count instead of segment count for more accurate scoring
         harsh_event_ratio = harsh_count / max(1.0, total_distance_miles / 10)  # Events per 10 miles
         dangerous_event_ratio = dangerous_count / max(1.0, total_distance_miles / 10)
         
@@ -980,14 +2301,14 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
     event_breakdown['normal'] = normal_segments // 2
     event_breakdown['gentle'] = normal_segments // 2
     
-    print(f"✅ ANALYSIS Complete with BALANCED GROUPING:")
-    print(f"   Context: {context_info['context'].upper()} (confidence: {context_info['confidence']:.1%})")
-    print(f"   Total Events: {harsh_count}")
-    print(f"   Dangerous Events: {dangerous_count}")
-    print(f"   Sudden Accelerations: {sudden_accelerations}")
-    print(f"   Sudden Decelerations: {sudden_decelerations}")
-    print(f"   Hard Stops (>15mph to <5mph in <3s): {hard_stops}")
-    print(f"   Smoothness Score: {smoothness_score:.1f}")
+    logger.info("✅ ANALYSIS Complete with BALANCED GROUPING:")
+    logger.info("   Context: %s (confidence: %.1f%%)", context_info['context'].upper(), context_info['confidence'] * 100)
+    logger.info("   Total Events: %s", harsh_count)
+    logger.info("   Dangerous Events: %s", dangerous_count)
+    logger.info("   Sudden Accelerations: %s", sudden_accelerations)
+    logger.info("   Sudden Decelerations: %s", sudden_decelerations)
+    logger.info("   Hard Stops (>15mph to <5mph in <3s): %s", hard_stops)
+    logger.info("   Smoothness Score: %.1f", smoothness_score)
     
     return {
         'total_harsh_events': harsh_count,
@@ -1005,17 +2326,73 @@ def analyze_acceleration_events_fixed(speeds: List[float], time_intervals: List[
         'driving_context': context_info
     }
 
+# Stride-3 windows of 6 speeds; stationary readings beyond a streak of 4 are ignored
+CONSISTENCY_WINDOW_SIZE = 6
+CONSISTENCY_WINDOW_STEP = 3
+MIN_MOVING_SPEED = 2.0
+# Band edges for the tolerance-adjusted window variance and mean speed change
+VARIANCE_BAND_EDGES = (4.0, 8.0, 15.0, 25.0)
+CHANGE_BAND_EDGES = (3, 6, 10, 15)
+BAND_SCORES = (95, 80, 65, 45, 25)
+
 def calculate_speed_consistency_adaptive(speeds: List[float], context_info: Dict) -> float:
     """Speed consistency calculation with context awareness"""
     if len(speeds) < 6:
         return 75.0
-    
-    print(f"📊 Speed Consistency: {len(speeds)} speeds in {context_info['context']} context")
-    
-    MIN_MOVING_SPEED = 2.0
+
+    logger.info("📊 Speed Consistency: %s speeds in %s context", len(speeds), context_info['context'])
+
+    # 🚀 OPTIMIZATION: windowed sums over the whole array instead of statistics calls per window
+    if use_vectorized_engine():
+        final_score = _speed_consistency_numpy(speeds, context_info)
+    else:
+        final_score = _speed_consistency_python(speeds, context_info)
+
+    if final_score is None:
+        return 70.0
+
+    logger.info("✅ Speed Consistency: %.1f/100 (%s)", final_score, context_info['context'])
+    return round(final_score, 1)
+
+def consistency_tolerances(context_info: Dict) -> Tuple[float, float]:
+    """Context-aware (variance_tolerance, change_tolerance)"""
+    if context_info['context'] == 'city':
+        return 1.3, 1.2
+    elif context_info['context'] == 'highway':
+        return 0.8, 0.9
+    return 1.0, 1.0
+
+def consistency_window_score(adjusted_variance: float, adjusted_change: float) -> float:
+    """Band one window's adjusted variance and mean speed change into a score"""
+    if adjusted_variance <= 4.0:
+        variance_score = 95
+    elif adjusted_variance <= 8.0:
+        variance_score = 80
+    elif adjusted_variance <= 15.0:
+        variance_score = 65
+    elif adjusted_variance <= 25.0:
+        variance_score = 45
+    else:
+        variance_score = 25
+
+    if adjusted_change <= 3:
+        change_score = 95
+    elif adjusted_change <= 6:
+        change_score = 80
+    elif adjusted_change <= 10:
+        change_score = 65
+    elif adjusted_change <= 15:
+        change_score = 45
+    else:
+        change_score = 25
+
+    return (variance_score * 0.6 + change_score * 0.4)
+
+def _speed_consistency_python(speeds: List[float], context_info: Dict) -> Optional[float]:
+    """Reference per-window loop. Returns None when too few speeds survive filtering"""
     filtered_speeds = []
     stationary_streak = 0
-    
+
     for speed in speeds:
         if speed < MIN_MOVING_SPEED:
             stationary_streak += 1
@@ -1024,62 +2401,29 @@ def calculate_speed_consistency_adaptive(speeds: List[float], context_info: Dict
         else:
             stationary_streak = 0
             filtered_speeds.append(speed)
-    
+
     if len(filtered_speeds) < 5:
-        return 70.0
-    
+        return None
+
     # Context-aware expectations
-    if context_info['context'] == 'city':
-        variance_tolerance = 1.3
-        change_tolerance = 1.2
-    elif context_info['context'] == 'highway':
-        variance_tolerance = 0.8
-        change_tolerance = 0.9
-    else:
-        variance_tolerance = 1.0
-        change_tolerance = 1.0
-    
-    WINDOW_SIZE = 6
+    variance_tolerance, change_tolerance = consistency_tolerances(context_info)
+
+    WINDOW_SIZE = CONSISTENCY_WINDOW_SIZE
     window_scores = []
-    
-    for start_idx in range(0, len(filtered_speeds) - WINDOW_SIZE + 1, 3):
+
+    for start_idx in range(0, len(filtered_speeds) - WINDOW_SIZE + 1, CONSISTENCY_WINDOW_STEP):
         window = filtered_speeds[start_idx:start_idx + WINDOW_SIZE]
-        
+
         if len(window) < 5:
             continue
-        
+
         window_variance = statistics.variance(window) if len(window) > 1 else 0
         speed_changes = [abs(window[i+1] - window[i]) for i in range(len(window)-1)]
         avg_change = statistics.mean(speed_changes) if speed_changes else 0
-        
-        adjusted_variance = window_variance / variance_tolerance
-        adjusted_change = avg_change / change_tolerance
-        
-        if adjusted_variance <= 4.0:
-            variance_score = 95
-        elif adjusted_variance <= 8.0:
-            variance_score = 80
-        elif adjusted_variance <= 15.0:
-            variance_score = 65
-        elif adjusted_variance <= 25.0:
-            variance_score = 45
-        else:
-            variance_score = 25
-        
-        if adjusted_change <= 3:
-            change_score = 95
-        elif adjusted_change <= 6:
-            change_score = 80
-        elif adjusted_change <= 10:
-            change_score = 65
-        elif adjusted_change <= 15:
-            change_score = 45
-        else:
-            change_score = 25
-        
-        window_score = (variance_score * 0.6 + change_score * 0.4)
-        window_scores.append(window_score)
-    
+
+        window_scores.append(consistency_window_score(window_variance / variance_tolerance,
+                                                      avg_change / change_tolerance))
+
     if window_scores:
         final_score = statistics.mean(window_scores)
         if len(window_scores) > 1:
@@ -1088,11 +2432,99 @@ def calculate_speed_consistency_adaptive(speeds: List[float], context_info: Dict
                 final_score = min(100, final_score + 3)
     else:
         final_score = 65.0
-    
-    final_score = max(20, min(100, final_score))
-    
-    print(f"✅ Speed Consistency: {final_score:.1f}/100 ({context_info['context']})")
-    return round(final_score, 1)
+
+    return max(20, min(100, final_score))
+
+def _speed_consistency_numpy(speeds: List[float], context_info: Dict) -> Optional[float]:
+    """Vectorized consistency score, bit-compatible with _speed_consistency_python
+
+    Window variance comes from window sums and sums of squares, the mean change from
+    window sums of absolute differences. Windows whose float result lands within rounding
+    distance of a band edge are re-scored with statistics, so the banding always matches.
+    """
+    speed_array = np.asarray(speeds, dtype=np.float64)
+
+    # Drop stationary readings past the 4th in a row
+    run_starts, run_ends = _find_runs(speed_array < MIN_MOVING_SPEED)
+    long_runs = (run_ends - run_starts) > 4
+    marks = np.zeros(len(speed_array) + 1, dtype=np.int64)
+    np.add.at(marks, run_starts[long_runs] + 4, 1)
+    np.add.at(marks, run_ends[long_runs], -1)
+    filtered = speed_array[np.cumsum(marks[:-1]) == 0]
+
+    if len(filtered) < 5:
+        return None
+
+    variance_tolerance, change_tolerance = consistency_tolerances(context_info)
+
+    size = CONSISTENCY_WINDOW_SIZE
+    if len(filtered) < size:
+        return 65.0
+
+    window_starts = np.arange(0, len(filtered) - size + 1, CONSISTENCY_WINDOW_STEP)
+    abs_changes = np.abs(np.diff(filtered))
+
+    window_sum = np.zeros(len(window_starts))
+    window_sum_sq = np.zeros(len(window_starts))
+    change_sum = np.zeros(len(window_starts))
+    for offset in range(size):
+        values = filtered[window_starts + offset]
+        window_sum += values
+        window_sum_sq += values * values
+        if offset < size - 1:
+            change_sum += abs_changes[window_starts + offset]
+
+    window_variance = np.maximum(window_sum_sq - window_sum * window_sum / size, 0.0) / (size - 1)
+    adjusted_variance = window_variance / variance_tolerance
+    adjusted_change = (change_sum / (size - 1)) / change_tolerance
+
+    # side='left' keeps values equal to an edge in the lower band (<= comparisons)
+    variance_scores = np.take(BAND_SCORES, np.searchsorted(VARIANCE_BAND_EDGES, adjusted_variance, side='left'))
+    change_scores = np.take(BAND_SCORES, np.searchsorted(CHANGE_BAND_EDGES, adjusted_change, side='left'))
+    window_scores = variance_scores * 0.6 + change_scores * 0.4
+
+    # Re-score exactly any window within rounding distance of a band edge
+    variance_margin = 1e-9 * (window_sum_sq + 1.0) / variance_tolerance
+    change_margin = 1e-9 * (change_sum + 1.0) / change_tolerance
+    near_edge = np.zeros(len(window_starts), dtype=bool)
+    for edge in VARIANCE_BAND_EDGES:
+        near_edge |= np.abs(adjusted_variance - edge) <= variance_margin
+    for edge in CHANGE_BAND_EDGES:
+        near_edge |= np.abs(adjusted_change - edge) <= change_margin
+
+    for k in np.flatnonzero(near_edge).tolist():
+        window = filtered[window_starts[k]:window_starts[k] + size].tolist()
+        speed_changes = [abs(window[i+1] - window[i]) for i in range(len(window)-1)]
+        window_scores[k] = consistency_window_score(statistics.variance(window) / variance_tolerance,
+                                                    statistics.mean(speed_changes) / change_tolerance)
+
+    distinct_scores, counts = np.unique(window_scores, return_counts=True)
+    return consistency_score_from_counts(dict(zip(distinct_scores.tolist(), counts.tolist())))
+
+def consistency_score_from_counts(score_counts: Dict[float, int]) -> float:
+    """Consistency score from how many windows got each window score (65.0 without windows)
+
+    At most 25 distinct window scores: the mean and variance are exact sums over their counts.
+    """
+    n = sum(score_counts.values())
+    if not n:
+        return 65.0
+    score_values = [Fraction(score) for score in score_counts]
+    exact_mean = sum(value * count for value, count in zip(score_values, score_counts.values())) / n
+    final_score = float(exact_mean)
+    if n > 1:
+        exact_variance = sum(count * (value - exact_mean) ** 2
+                             for value, count in zip(score_values, score_counts.values())) / (n - 1)
+        if abs(exact_variance - 100) < Fraction(1, 10**6):
+            # Borderline: statistics decides, so every Python version agrees with the reference
+            score_variance = statistics.variance([score for score, count in score_counts.items()
+                                                  for _ in range(count)])
+        else:
+            score_variance = float(exact_variance)
+        if score_variance < 100:
+            final_score = min(100, final_score + 3)
+
+    return max(20, min(100, final_score))
 
 def calculate_frequency_metrics_fixed(harsh_events: int, dangerous_events: int, 
                                      total_distance_miles: float, context_info: Dict) -> Dict:
@@ -1132,11 +2564,11 @@ def calculate_frequency_metrics_fixed(harsh_events: int, dangerous_events: int,
     final_weight = context_weight * distance_weight
     weighted_events_per_100_miles = raw_events_per_100_miles * final_weight
     
-    print(f"📈 FREQUENCY METRICS:")
-    print(f"   Raw Events per 100 miles: {raw_events_per_100_miles:.2f}")
-    print(f"   Context Weight: {context_weight:.2f}")
-    print(f"   Distance Weight: {distance_weight:.2f}")
-    print(f"   Weighted Events per 100 miles: {weighted_events_per_100_miles:.2f}")
+    logger.info("📈 FREQUENCY METRICS:")
+    logger.info("   Raw Events per 100 miles: %.2f", raw_events_per_100_miles)
+    logger.info("   Context Weight: %.2f", context_weight)
+    logger.info("   Distance Weight: %.2f", distance_weight)
+    logger.info("   Weighted Events per 100 miles: %.2f", weighted_events_per_100_miles)
     
     # Rate based on weighted frequency using fixed benchmarks
     if weighted_events_per_100_miles <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['exceptional']:
@@ -1178,8 +2610,8 @@ def calculate_frequency_metrics_fixed(harsh_events: int, dangerous_events: int,
         elif rating == 'Very Good' and dangerous_per_100_miles > 3.0:
             rating = 'Good'
     
-    print(f"   Industry Rating: {rating}")
-    print(f"   Frequency Score: {frequency_score}")
+    logger.info("   Industry Rating: %s", rating)
+    logger.info("   Frequency Score: %s", frequency_score)
     
     return {
         'events_per_100_miles': round(raw_events_per_100_miles, 2),
@@ -1216,12 +2648,12 @@ def calculate_comprehensive_driver_score(
     context_info = acceleration_analysis.get('driving_context', {})
     context = context_info.get('context', 'mixed')
     
-    print(f"🏆 SCORING:")
-    print(f"   Context: {context.upper()}")
-    print(f"   Harsh Frequency: {frequency_score:.1f}/100 (weight: {weights['harsh_frequency']})")
-    print(f"   Smoothness: {smoothness_score:.1f}/100 (weight: {weights['smoothness']})")
-    print(f"   Speed Consistency: {consistency_score:.1f}/100 (weight: {weights['consistency']})")
-    print(f"   Turn Safety: {turn_score:.1f}/100 (weight: {weights['turn_safety']})")
+    logger.info("🏆 SCORING:")
+    logger.info("   Context: %s", context.upper())
+    logger.info("   Harsh Frequency: %.1f/100 (weight: %s)", frequency_score, weights['harsh_frequency'])
+    logger.info("   Smoothness: %.1f/100 (weight: %s)", smoothness_score, weights['smoothness'])
+    logger.info("   Speed Consistency: %.1f/100 (weight: %s)", consistency_score, weights['consistency'])
+    logger.info("   Turn Safety: %.1f/100 (weight: %s)", turn_score, weights['turn_safety'])
     
     base_score = (
         frequency_score * weights['harsh_frequency'] +
@@ -1238,11 +2670,11 @@ def calculate_comprehensive_driver_score(
         if dangerous_per_mile > 0.5:
             penalty = min(15, dangerous_per_mile * 20)
             base_score = max(30, base_score - penalty)
-            print(f"   Dangerous Event Penalty: -{penalty:.1f}")
+            logger.info("   Dangerous Event Penalty: -%.1f", penalty)
     
     final_score = max(30, min(100, base_score))
     
-    print(f"   FINAL SCORE: {final_score:.1f}/100")
+    logger.info("   FINAL SCORE: %.1f/100", final_score)
     return round(final_score, 1)
 
 def get_behavior_category(score: float) -> str:
@@ -1304,23 +2736,262 @@ def calculate_bearing(lat1, lon1, lat2, lon2):
     bearing = math.atan2(y, x)
     return (math.degrees(bearing) + 360) % 360
 
-def validate_and_fix_timestamps(deltas: List[Dict]) -> Tuple[str, str, float]:
-    """Timestamp validation"""
-    if not deltas:
+# ========================================
+# 📦 BINARY DELTA BATCHES
+# ========================================
+# store-trajectory-batch writes data_version 3.0 batches as one Binary attribute (deltas_binary),
+# in the format of delta_encoding.py. They decode straight into TripArrays; 2.4 and older
+# batches keep the deltas list of maps.
+
+def _decode_column(deltas: List[Dict], field: str, default, invalid: float = float('nan')) -> array:
+    """Read one delta field into a float array ('invalid' where the value is None or not numeric)"""
+    try:
+        return array('d', [invalid if v is None else float(v) for v in (d.get(field, default) for d in deltas)])
+    except (ValueError, TypeError):
+        # Slow path only for batches containing malformed values
+        column = array('d')
+        for d in deltas:
+            try:
+                column.append(float(d.get(field, default)))
+            except (ValueError, TypeError):
+                column.append(invalid)
+        return column
+
+class TripArrays:
+    """
+    🚀 OPTIMIZED: Columnar trip points, decoded once from the DynamoDB batch deltas
+    Each column is a typed array('d') (8 bytes per point) instead of a dict of Decimals per point.
+    Defaults match the per-delta reads they replace; malformed values are NaN
+    (gps_accuracy: inf, i.e. treated as poor accuracy)
+    """
+    __slots__ = ('delta_lat', 'delta_long', 'delta_time', 'speed_mph', 'gps_accuracy', 'timestamps')
+
+    def __init__(self):
+        self.delta_lat = array('d')
+        self.delta_long = array('d')
+        self.delta_time = array('d')
+        self.speed_mph = array('d')
+        self.gps_accuracy = array('d')
+        self.timestamps = []
+
+    def __len__(self):
+        return len(self.delta_lat)
+
+    def extend(self, deltas) -> None:
+        """Append one batch worth of deltas (list of delta dicts or already decoded TripArrays)"""
+        if isinstance(deltas, TripArrays):
+            for column in ('delta_lat', 'delta_long', 'delta_time', 'speed_mph', 'gps_accuracy', 'timestamps'):
+                getattr(self, column).extend(getattr(deltas, column))
+            return
+        self.delta_lat.extend(_decode_column(deltas, 'delta_lat', 0))
+        self.delta_long.extend(_decode_column(deltas, 'delta_long', 0))
+        self.delta_time.extend(_decode_column(deltas, 'delta_time', 1000))
+        self.speed_mph.extend(_decode_column(deltas, 'speed_mph', None))
+        self.gps_accuracy.extend(_decode_column(deltas, 'gps_accuracy', 999, float('inf')))
+        self.timestamps.extend(d.get('timestamp') for d in deltas)
+
+    @classmethod
+    def from_deltas(cls, deltas: List[Dict]) -> 'TripArrays':
+        trip_arrays = cls()
+        trip_arrays.extend(deltas)
+        return trip_arrays
+
+    @classmethod
+    def from_binary(cls, blob) -> 'TripArrays':
+        """🚀 OPTIMIZED: Decode a binary delta batch (deltas_binary) without building delta dicts"""
+        columns = decode_delta_columns(blob)
+        trip_arrays = cls()
+        trip_arrays.delta_lat = array('d', columns['delta_lat'])
+        trip_arrays.delta_long = array('d', columns['delta_long'])
+        trip_arrays.delta_time = array('d', columns['delta_time'])
+        # Missing values read as from_deltas reads an absent field
+        trip_arrays.speed_mph = array('d', [float('nan') if v is None else v for v in columns['speed_mph']])
+        trip_arrays.gps_accuracy = array('d', [999.0 if v is None else v for v in columns['gps_accuracy']])
+        trip_arrays.timestamps = columns['timestamp']
+        return trip_arrays
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'TripArrays':
+        """A TrajectoryBatches-Neal item's deltas, binary (data_version 3.0) or list of maps"""
+        if is_binary_delta_batch(item):
+            return cls.from_binary(item['deltas_binary'])
+        return cls.from_deltas(item.get('deltas', []))
+
+    @classmethod
+    def from_batches(cls, batches: List[Dict]) -> 'TripArrays':
+        """Decode batch by batch (in the given order) without joining the delta lists
+
+        Batches from get_trip_batches_fixed(..., decode_deltas=True) already carry TripArrays
+        """
+        trip_arrays = cls()
+        for batch in batches:
+            batch_deltas = cls.from_item(batch) if is_binary_delta_batch(batch) else batch.get('deltas', [])
+            if len(batch_deltas):
+                trip_arrays.extend(batch_deltas)
+                logger.debug("   Batch %s: %s deltas", batch.get('batch_number', 'unknown'), len(batch_deltas))
+        return trip_arrays
+
+    def time_intervals(self) -> List[float]:
+        """Per-point delta_time in ms (a malformed value fails the trip, as float() did before)"""
+        intervals = self.delta_time.tolist()
+        if any(interval != interval for interval in intervals):
+            raise ValueError("malformed delta_time in trip deltas")
+        return intervals
+
+def as_trip_arrays(deltas) -> TripArrays:
+    """Accept either TripArrays or a raw list of delta dicts"""
+    return deltas if isinstance(deltas, TripArrays) else TripArrays.from_deltas(deltas)
+
+def _column_view(column: array):
+    """Zero-copy float64 view of a TripArrays column (must not be written to)"""
+    return np.frombuffer(column, dtype=np.float64)
+
+# Segments outside this range are GPS noise (too short) or gaps (too long)
+MIN_SEGMENT_DISTANCE_MILES = 0.000001
+MAX_SEGMENT_DISTANCE_MILES = 1.0
+
+def reconstruct_coordinates(deltas, divisor: float, base_lat: float, base_lon: float) -> Tuple[List[Tuple[float, float]], float]:
+    """
+    🚀 OPTIMIZED: Rebuild absolute coordinates from deltas (TripArrays or list of delta dicts)
+    Returns (coordinate_pairs, reconstructed_distance_miles)
+    Uses NumPy when available (coordinate_pairs is then an (N, 2) array of lat/lon rows),
+    identical results to the original loop within float tolerance
+    """
+    trip_arrays = as_trip_arrays(deltas)
+    if use_vectorized_engine() and len(trip_arrays):
+        return _reconstruct_coordinates_numpy(trip_arrays, divisor, base_lat, base_lon)
+    return _reconstruct_coordinates_python(trip_arrays, divisor, base_lat, base_lon)
+
+def _reconstruct_coordinates_python(trip_arrays: TripArrays, divisor: float, base_lat: float, base_lon: float) -> Tuple[List[Tuple[float, float]], float]:
+    """Original per-delta reconstruction loop (reference implementation)"""
+    current_lat, current_lon = base_lat, base_lon
+    reconstructed_distance_miles = 0.0
+    coordinate_pairs = []
+
+    for raw_lat, raw_lon in zip(trip_arrays.delta_lat, trip_arrays.delta_long):
+        # Malformed delta (NaN after decoding) is skipped
+        if raw_lat != raw_lat or raw_lon != raw_lon:
+            continue
+        try:
+            delta_lat = raw_lat / divisor
+            delta_lon = raw_lon / divisor
+
+            new_lat = current_lat + delta_lat
+            new_lon = current_lon + delta_lon
+
+            segment_distance = haversine_distance_miles(current_lat, current_lon, new_lat, new_lon)
+
+            if MIN_SEGMENT_DISTANCE_MILES <= segment_distance <= MAX_SEGMENT_DISTANCE_MILES:
+                reconstructed_distance_miles += segment_distance
+                coordinate_pairs.append((new_lat, new_lon))
+
+            current_lat, current_lon = new_lat, new_lon
+
+        except (ValueError, TypeError):
+            continue
+
+    return coordinate_pairs, reconstructed_distance_miles
+
+# Bearing changes above this count as a significant turn for context detection
+SIGNIFICANT_TURN_DEGREES = 20.0
+
+def compute_bearing_kernel(coordinate_pairs) -> Tuple[List[float], List[float], int]:
+    """
+    🚀 OPTIMIZED: Single pass over coordinate pairs
+    Returns (bearings, wrapped bearing changes, count of changes > 20°)
+    The bearing changes are handed to analyze_turn_safety_adaptive so it does not walk bearings again
+    """
+    if np is not None and isinstance(coordinate_pairs, np.ndarray):
+        return _compute_bearing_kernel_numpy(coordinate_pairs)
+    return _compute_bearing_kernel_python(coordinate_pairs)
+
+def _compute_bearing_kernel_python(coordinate_pairs) -> Tuple[List[float], List[float], int]:
+    """Per-pair calculate_bearing loop (reference implementation)"""
+    bearings = []
+    for i in range(1, len(coordinate_pairs)):
+        prev_lat, prev_lon = coordinate_pairs[i-1]
+        curr_lat, curr_lon = coordinate_pairs[i]
+        bearings.append(calculate_bearing(prev_lat, prev_lon, curr_lat, curr_lon))
+
+    bearing_changes = []
+    total_turns = 0
+    for i in range(1, len(bearings)):
+        bearing_change = abs(bearings[i] - bearings[i-1])
+        if bearing_change > 180:
+            bearing_change = 360 - bearing_change
+        bearing_changes.append(bearing_change)
+        if bearing_change > SIGNIFICANT_TURN_DEGREES:
+            total_turns += 1
+
+    return bearings, bearing_changes, total_turns
+
+def _compute_bearing_kernel_numpy(coordinate_pairs):
+    """Vectorized bearings, wraparound-corrected changes and turn count"""
+    if len(coordinate_pairs) < 2:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, 0
+
+    lat_rad = np.radians(coordinate_pairs[:, 0])
+    dlon = np.radians(np.diff(coordinate_pairs[:, 1]))
+    lat1, lat2 = lat_rad[:-1], lat_rad[1:]
+
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    bearings = (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+    bearing_changes = np.abs(np.diff(bearings))
+    bearing_changes = np.where(bearing_changes > 180, 360 - bearing_changes, bearing_changes)
+    total_turns = int(np.count_nonzero(bearing_changes > SIGNIFICANT_TURN_DEGREES))
+
+    return bearings, bearing_changes, total_turns
+
+def _reconstruct_coordinates_numpy(trip_arrays: TripArrays, divisor: float, base_lat: float, base_lon: float) -> Tuple[List[Tuple[float, float]], float]:
+    """Vectorized reconstruction: cumulative sum of deltas + one haversine pass over all segments"""
+    delta_lats = _column_view(trip_arrays.delta_lat)
+    delta_lons = _column_view(trip_arrays.delta_long)
+
+    # Malformed deltas are skipped by the loop - a zero step is equivalent (zero-length segment is filtered out)
+    invalid = np.isnan(delta_lats) | np.isnan(delta_lons)
+    if invalid.any():
+        delta_lats = np.where(invalid, 0.0, delta_lats)
+        delta_lons = np.where(invalid, 0.0, delta_lons)
+
+    delta_lats = delta_lats / divisor
+    delta_lons = delta_lons / divisor
+
+    # Sequential accumulation from the base point (same addition order as the loop)
+    lats = np.cumsum(np.concatenate(([base_lat], delta_lats)))
+    lons = np.cumsum(np.concatenate(([base_lon], delta_lons)))
+
+    lat1 = np.radians(lats[:-1])
+    lat2 = np.radians(lats[1:])
+    half_dlat = np.radians(np.diff(lats)) / 2
+    half_dlon = np.radians(np.diff(lons)) / 2
+
+    a = np.sin(half_dlat) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(half_dlon) ** 2
+    segment_distances = RADIUS_EARTH_MILES * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    keep = (segment_distances >= MIN_SEGMENT_DISTANCE_MILES) & (segment_distances <= MAX_SEGMENT_DISTANCE_MILES)
+
+    coordinate_pairs = np.column_stack((lats[1:][keep], lons[1:][keep]))
+    # cumsum adds sequentially (np.sum is pairwise), keeping the loop's rounding behaviour
+    kept_distances = segment_distances[keep]
+    reconstructed_distance_miles = float(kept_distances.cumsum()[-1]) if kept_distances.size else 0.0
+
+    return coordinate_pairs, reconstructed_distance_miles
+
+def validate_and_fix_timestamps(deltas) -> Tuple[str, str, float]:
+    """Timestamp validation (TripArrays or list of delta dicts)"""
+    trip_arrays = as_trip_arrays(deltas)
+    if not len(trip_arrays):
         now = datetime.now(timezone.utc).isoformat()
         return now, now, 1.0
     
     timestamps = []
-    for delta in deltas:
-        if 'timestamp' in delta and delta['timestamp']:
-            try:
-                ts_str = str(delta['timestamp'])
-                if ts_str.endswith('Z'):
-                    ts_str = ts_str[:-1] + '+00:00'
-                dt = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-                timestamps.append(dt)
-            except Exception:
-                continue
+    for raw_timestamp in trip_arrays.timestamps:
+        dt = parse_delta_timestamp(raw_timestamp)
+        if dt is not None:
+            timestamps.append(dt)
     
     if len(timestamps) >= 2:
         start_time = min(timestamps)
@@ -1328,7 +2999,7 @@ def validate_and_fix_timestamps(deltas: List[Dict]) -> Tuple[str, str, float]:
         duration_seconds = (end_time - start_time).total_seconds()
         duration_minutes = max(1.0, duration_seconds / 60)
     else:
-        total_time_ms = sum(float(d.get('delta_time', 1000)) for d in deltas)
+        total_time_ms = sum(trip_arrays.time_intervals())
         duration_minutes = max(1.0, total_time_ms / (1000 * 60))
         now = datetime.now(timezone.utc)
         start_time = now.replace(minute=max(0, now.minute - int(duration_minutes)))
@@ -1336,6 +3007,11 @@ def validate_and_fix_timestamps(deltas: List[Dict]) -> Tuple[str, str, float]:
     
     return start_time.isoformat(), end_time.isoformat(), duration_minutes
 
+WARMUP_POINTS = 5
+# Max ~6 m/s² acceleration ≈ 13.4 mph/s. At 2s intervals = ~27 mph change max.
+# Use 30 mph to allow some tolerance for GPS timing jitter.
+MAX_SPEED_CHANGE_PER_INTERVAL = 30.0
+
 def extract_and_validate_speeds(deltas: List[Dict]) -> List[float]:
     """Speed extraction with warmup filtering and acceleration-based validation.
 
@@ -1344,145 +3020,205 @@ def extract_and_validate_speeds(deltas: List[Dict]) -> List[float]:
     - Consecutive speed changes validated against max physical acceleration (~6 m/s²)
     - Erroneous spikes replaced with interpolated values
     """
-    WARMUP_POINTS = 5
-    # Max ~6 m/s² acceleration ≈ 13.4 mph/s. At 2s intervals = ~27 mph change max.
-    # Use 30 mph to allow some tolerance for GPS timing jitter.
-    MAX_SPEED_CHANGE_PER_INTERVAL = 30.0
-
-    raw_speeds = []
-
-    # Phase 1: Extract raw speeds from deltas
-    for i, delta in enumerate(deltas):
-        speed = 0.0
-
-        if 'speed_mph' in delta and delta['speed_mph'] is not None:
-            try:
-                speed = float(delta['speed_mph'])
-                if 0 <= speed <= 150:
-                    raw_speeds.append(speed)
-                    continue
-            except (ValueError, TypeError):
-                pass
-
-        try:
-            delta_time_ms = float(delta.get('delta_time', 1000))
-            if delta_time_ms > 0:
-                delta_lat = float(delta.get('delta_lat', 0)) / FIXED_POINT_DIVISOR
-                delta_lon = float(delta.get('delta_long', 0)) / FIXED_POINT_DIVISOR
-
-                lat_distance = delta_lat * 69.0  # 1 degree lat ≈ 69 miles
-                lon_distance = delta_lon * 69.0 * 0.777  # Adjusted for longitude convergence
-                distance_miles = math.sqrt(lat_distance**2 + lon_distance**2)
-
-                time_hours = delta_time_ms / (1000 * 3600)
-
-                if time_hours > 0:
-                    calculated_speed = distance_miles / time_hours
-                    speed = min(calculated_speed, 120)
-                    raw_speeds.append(speed)
-                    continue
-        except (ValueError, TypeError, ZeroDivisionError):
-            pass
-
-        raw_speeds.append(0.0)
-
-    if not raw_speeds:
-        return raw_speeds
+    # 🚀 OPTIMIZATION: Batch extraction with NumPy when available
+    trip_arrays = as_trip_arrays(deltas)
+    if use_vectorized_engine() and len(trip_arrays):
+        return _extract_and_validate_speeds_numpy(trip_arrays)
+    return _extract_motion_python(trip_arrays, check_intervals=False)[0]
+
+def _extract_and_validate_speeds_numpy(trip_arrays: TripArrays) -> List[float]:
+    """Masked-array phases 1-2; phase 3 only walks the points that can need correction"""
+    # Phase 1: Reported speed when in range, otherwise derive from the delta movement
+    reported = _column_view(trip_arrays.speed_mph)
+    use_reported = (reported >= 0) & (reported <= 150)
+
+    raw_speeds = np.zeros(len(trip_arrays), dtype=np.float64)
+    raw_speeds[use_reported] = reported[use_reported]
+
+    fallback_indices = np.flatnonzero(~use_reported)
+    if len(fallback_indices):
+        delta_time_ms = _column_view(trip_arrays.delta_time)[fallback_indices]
+        delta_lat = _column_view(trip_arrays.delta_lat)[fallback_indices] / FIXED_POINT_DIVISOR
+        delta_lon = _column_view(trip_arrays.delta_long)[fallback_indices] / FIXED_POINT_DIVISOR
+        derivable = (delta_time_ms > 0) & ~np.isnan(delta_lat) & ~np.isnan(delta_lon)
+
+        lat_distance = delta_lat[derivable] * 69.0  # 1 degree lat ≈ 69 miles
+        lon_distance = delta_lon[derivable] * 69.0 * 0.777  # Adjusted for longitude convergence
+        distance_miles = np.sqrt(lat_distance**2 + lon_distance**2)
+        time_hours = delta_time_ms[derivable] / (1000 * 3600)
+        raw_speeds[fallback_indices[derivable]] = np.minimum(distance_miles / time_hours, 120)
 
     # Phase 2: GPS warmup filtering - clamp suspicious early readings
     warmup_clamped = 0
     for i in range(min(WARMUP_POINTS, len(raw_speeds))):
-        gps_accuracy = None
-        if i < len(deltas):
-            try:
-                gps_accuracy = float(deltas[i].get('gps_accuracy', 999))
-            except (ValueError, TypeError):
-                pass
+        # Unreadable accuracy decodes to inf (poor accuracy)
+        gps_accuracy = trip_arrays.gps_accuracy[i]
 
-        # During warmup, clamp high speeds with poor accuracy
-        if raw_speeds[i] > 30.0 and (gps_accuracy is None or gps_accuracy > 15.0):
+        if raw_speeds[i] > 30.0 and gps_accuracy > 15.0:
             raw_speeds[i] = 0.0
             warmup_clamped += 1
 
     if warmup_clamped > 0:
-        print(f"🔧 GPS warmup: clamped {warmup_clamped} suspicious readings in first {WARMUP_POINTS} points")
+        logger.info("🔧 GPS warmup: clamped %s suspicious readings in first %s points", warmup_clamped, WARMUP_POINTS)
 
     # Phase 3: Acceleration-based contextual validation
-    # If speed change between consecutive points exceeds physical limits, clamp it
-    validated_speeds = [raw_speeds[0]]
+    # Only points whose raw change exceeds physics, or that follow a corrected point,
+    # can differ from the raw value - every other point passes through unchanged
+    raw_values = raw_speeds.tolist()
+    validated_speeds = list(raw_values)
+    candidates = (np.flatnonzero((np.abs(np.diff(raw_speeds)) > MAX_SPEED_CHANGE_PER_INTERVAL) &
+                                 (raw_speeds[1:] > 10.0)) + 1).tolist()
     spikes_clamped = 0
+    last_index = len(raw_values) - 1
+    next_candidate = 0
+    i = candidates[0] if candidates else None
 
-    for i in range(1, len(raw_speeds)):
+    while i is not None:
         prev_speed = validated_speeds[i - 1]
-        curr_speed = raw_speeds[i]
-        speed_change = abs(curr_speed - prev_speed)
-
-        if speed_change > MAX_SPEED_CHANGE_PER_INTERVAL and curr_speed > 10.0:
-            # Check if this is a spike (next point returns to normal) or genuine acceleration
-            is_spike = False
-            if i + 1 < len(raw_speeds):
-                next_speed = raw_speeds[i + 1]
-                # If next point is much closer to prev than to current, it's a spike
-                if abs(next_speed - prev_speed) < abs(next_speed - curr_speed):
-                    is_spike = True
-
-            if is_spike:
-                # Replace spike with interpolation between prev and next
-                next_speed = raw_speeds[i + 1] if i + 1 < len(raw_speeds) else prev_speed
+        curr_speed = raw_values[i]
+
+        if abs(curr_speed - prev_speed) > MAX_SPEED_CHANGE_PER_INTERVAL and curr_speed > 10.0:
+            next_speed = raw_values[i + 1] if i < last_index else None
+            # If next point is much closer to prev than to current, it's a spike
+            if next_speed is not None and abs(next_speed - prev_speed) < abs(next_speed - curr_speed):
                 clamped = (prev_speed + next_speed) / 2.0
-                print(f"🔧 Speed spike at point {i}: {prev_speed:.1f}->{curr_speed:.1f}->{next_speed:.1f} mph, replaced with {clamped:.1f}")
+                logger.debug("🔧 Speed spike at point %s: %.1f->%.1f->%.1f mph, replaced with %.1f", i, prev_speed, curr_speed, next_speed, clamped)
             else:
-                # Genuine but too-fast acceleration - clamp to max possible
                 direction = 1.0 if curr_speed > prev_speed else -1.0
                 clamped = prev_speed + (direction * MAX_SPEED_CHANGE_PER_INTERVAL)
                 if clamped < 0:
                     clamped = 0.0
-                print(f"🔧 Speed change at point {i}: {prev_speed:.1f}->{curr_speed:.1f} mph exceeds physics, clamped to {clamped:.1f}")
-
-            validated_speeds.append(clamped)
+                logger.debug("🔧 Speed change at point %s: %.1f->%.1f mph exceeds physics, clamped to %.1f", i, prev_speed, curr_speed, clamped)
+            validated_speeds[i] = clamped
             spikes_clamped += 1
+
+        # A corrected point changes the baseline for its successor
+        if validated_speeds[i] != curr_speed and i < last_index:
+            i += 1
         else:
-            validated_speeds.append(curr_speed)
+            while next_candidate < len(candidates) and candidates[next_candidate] <= i:
+                next_candidate += 1
+            i = candidates[next_candidate] if next_candidate < len(candidates) else None
 
     if spikes_clamped > 0:
-        print(f"🔧 Acceleration validation: corrected {spikes_clamped} erroneous speed readings")
+        logger.info("🔧 Acceleration validation: corrected %s erroneous speed readings", spikes_clamped)
 
     max_speed = max(validated_speeds) if validated_speeds else 0.0
-    print(f"📊 Extracted {len(validated_speeds)} speed readings (max: {max_speed:.1f} mph, {warmup_clamped} warmup + {spikes_clamped} spike corrections)")
+    logger.info("📊 Extracted %s speed readings (max: %.1f mph, %s warmup + %s spike corrections)", len(validated_speeds), max_speed, warmup_clamped, spikes_clamped)
     return validated_speeds
 
-def analyze_turn_safety_adaptive(bearings: List[float], speeds: List[float], context_info: Dict) -> Dict:
-    """BALANCED: Turn analysis with proper angle thresholds and accumulation"""
-    if len(bearings) < 3 or len(speeds) < 3:
-        return {
-            'total_turns': 0,
-            'safe_turns': 0,
-            'moderate_turns': 0,
-            'aggressive_turns': 0,
-            'dangerous_turns': 0,
-            'turn_safety_score': 95.0
-        }
-    
-    turns = []
-    
-    # BALANCED: Base minimum turn angle
-    MIN_TURN_ANGLE = 20.0  # Balanced threshold
-    
-    # Group consecutive bearing changes for better turn detection
+def _extract_motion_python(trip_arrays: TripArrays, check_intervals: bool = True) -> Tuple[List[float], List[float], SpeedStatistics]:
+    """
+    ⚡ Validated speeds, per-point intervals (ms) and speed statistics in one pass over the
+    deltas (reference implementation). A point's speed is validated once its successor's raw
+    speed is read, as StreamingTripAnalyzer does across batches. check_intervals: a malformed
+    delta_time raises ValueError, as TripArrays.time_intervals does.
+    """
+    speed_mph = trip_arrays.speed_mph
+    delta_time = trip_arrays.delta_time
+    delta_lat = trip_arrays.delta_lat
+    delta_long = trip_arrays.delta_long
+    gps_accuracy = trip_arrays.gps_accuracy
+    count = len(trip_arrays)
+
+    validated_speeds = []
+    time_intervals = []
+    running = SpeedStatistics()
+    warmup_clamped = 0
+    spikes_clamped = 0
+    pending = None  # raw speed of the newest point, validated once its successor is read
+
+    for i in range(count + 1):
+        speed = None
+        if i < count:
+            delta_time_ms = delta_time[i]
+            if check_intervals and delta_time_ms != delta_time_ms:
+                raise ValueError("malformed delta_time in trip deltas")
+            time_intervals.append(delta_time_ms)
+
+            # Phase 1: reported speed when in range (missing or malformed speeds are NaN and
+            # fail the range check), otherwise derived from the delta movement
+            speed = speed_mph[i]
+            if not 0 <= speed <= 150:
+                speed = 0.0
+                if delta_time_ms > 0:
+                    lat = delta_lat[i] / FIXED_POINT_DIVISOR
+                    lon = delta_long[i] / FIXED_POINT_DIVISOR
+                    time_hours = delta_time_ms / (1000 * 3600)
+                    if lat == lat and lon == lon and time_hours > 0:
+                        lat_distance = lat * 69.0  # 1 degree lat ≈ 69 miles
+                        lon_distance = lon * 69.0 * 0.777  # Adjusted for longitude convergence
+                        speed = min(math.sqrt(lat_distance**2 + lon_distance**2) / time_hours, 120)
+
+            # Phase 2: GPS warmup filtering - clamp high early speeds with poor accuracy
+            # (unreadable accuracy decodes to inf)
+            if i < WARMUP_POINTS and speed > 30.0 and gps_accuracy[i] > 15.0:
+                speed = 0.0
+                warmup_clamped += 1
+
+        # Phase 3: acceleration-based validation of the previous point, now that its successor is known
+        if pending is not None:
+            curr_speed = pending
+            if validated_speeds:
+                prev_speed = validated_speeds[-1]
+                if abs(curr_speed - prev_speed) > MAX_SPEED_CHANGE_PER_INTERVAL and curr_speed > 10.0:
+                    # If next point is much closer to prev than to current, it's a spike
+                    if speed is not None and abs(speed - prev_speed) < abs(speed - curr_speed):
+                        curr_speed = (prev_speed + speed) / 2.0
+                        logger.debug("🔧 Speed spike at point %s: %.1f->%.1f->%.1f mph, replaced with %.1f",
+                                     i - 1, prev_speed, pending, speed, curr_speed)
+                    else:
+                        # Genuine but too-fast acceleration - clamp to max possible
+                        direction = 1.0 if curr_speed > prev_speed else -1.0
+                        curr_speed = prev_speed + (direction * MAX_SPEED_CHANGE_PER_INTERVAL)
+                        if curr_speed < 0:
+                            curr_speed = 0.0
+                        logger.debug("🔧 Speed change at point %s: %.1f->%.1f mph exceeds physics, clamped to %.1f",
+                                     i - 1, prev_speed, pending, curr_speed)
+                    spikes_clamped += 1
+            validated_speeds.append(curr_speed)
+            running.add(curr_speed)
+        pending = speed
+
+    if warmup_clamped > 0:
+        logger.info("🔧 GPS warmup: clamped %s suspicious readings in first %s points", warmup_clamped, WARMUP_POINTS)
+    if spikes_clamped > 0:
+        logger.info("🔧 Acceleration validation: corrected %s erroneous speed readings", spikes_clamped)
+    logger.info("📊 Extracted %s speed readings (max: %.1f mph, %s warmup + %s spike corrections)",
+                len(validated_speeds), running.max_speed, warmup_clamped, spikes_clamped)
+    return validated_speeds, time_intervals, running
+
+def extract_motion_columns(trip_arrays: TripArrays) -> Tuple[List[float], List[float], Dict]:
+    """
+    Validated speeds, per-point delta_time in ms and the summarize_speeds summary of the speeds
+    (a malformed delta_time fails the trip, as TripArrays.time_intervals does)
+    """
+    if use_vectorized_engine() and len(trip_arrays):
+        speeds = _extract_and_validate_speeds_numpy(trip_arrays)
+        return speeds, trip_arrays.time_intervals(), summarize_speeds(speeds)
+    speeds, time_intervals, running = _extract_motion_python(trip_arrays)
+    return speeds, time_intervals, running.summary()
+
+# BALANCED: Base minimum turn angle
+MIN_TURN_ANGLE = 20.0
+# Low threshold for accumulating a bearing change into a continuous curve
+TURN_ACCUMULATION_ANGLE = 8
+
+def _group_turns_python(bearing_changes: List[float], speeds: List[float]) -> List[Dict]:
+    """Accumulate consecutive bearing changes into turn groups (reference implementation)
+
+    bearing_changes[k] is the change at bearing index k + 1
+    """
     turn_groups = []
     current_turn_bearings = []
     current_turn_speeds = []
     turn_accumulator = 0
-    
-    for i in range(1, len(bearings)):
-        bearing_change = abs(bearings[i] - bearings[i-1])
-        
-        # Handle bearing wraparound
-        if bearing_change > 180:
-            bearing_change = 360 - bearing_change
-        
+
+    for i in range(1, len(bearing_changes) + 1):
+        bearing_change = bearing_changes[i-1]
+
         # Accumulate turns that are part of a continuous curve
-        if bearing_change > 8:  # Low threshold for accumulation
+        if bearing_change > TURN_ACCUMULATION_ANGLE:
             turn_accumulator += bearing_change
             current_turn_bearings.append(bearing_change)
             current_turn_speeds.append(speeds[i] if i < len(speeds) else 0)
@@ -1501,7 +3237,7 @@ def analyze_turn_safety_adaptive(bearings: List[float], speeds: List[float], con
             turn_accumulator = 0
             current_turn_bearings = []
             current_turn_speeds = []
-    
+
     # Process last group if any
     if turn_accumulator >= MIN_TURN_ANGLE:
         avg_speed = sum(current_turn_speeds) / len(current_turn_speeds) if current_turn_speeds else 0
@@ -1512,63 +3248,136 @@ def analyze_turn_safety_adaptive(bearings: List[float], speeds: List[float], con
             'max_speed': max_speed,
             'duration_points': len(current_turn_bearings)
         })
+
+    return turn_groups
+
+def _find_runs(mask):
+    """Return (starts, ends) of consecutive True runs in a boolean array (ends are exclusive)"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[0::2], edges[1::2]
+
+def _group_turns_numpy(bearing_changes, speeds) -> List[Dict]:
+    """Vectorized turn grouping: runs of changes above the accumulation angle form a turn"""
+    starts, ends = _find_runs(bearing_changes > TURN_ACCUMULATION_ANGLE)
+    if not len(starts):
+        return []
+
+    # Speed at bearing index k + 1 (0 past the end of the speed list, like the loop)
+    turn_speeds = np.zeros(len(bearing_changes), dtype=np.float64)
+    available = max(0, min(len(bearing_changes), len(speeds) - 1))
+    turn_speeds[:available] = np.asarray(speeds[1:available + 1], dtype=np.float64)
+
+    turn_groups = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        # Sequential sum keeps the loop's accumulation order (turns are few, points are many)
+        total_angle = sum(bearing_changes[start:end].tolist())
+        if total_angle >= MIN_TURN_ANGLE:
+            run_speeds = turn_speeds[start:end]
+            turn_groups.append({
+                'total_angle': total_angle,
+                'avg_speed': float(run_speeds.mean()),
+                'max_speed': float(run_speeds.max()),
+                'duration_points': end - start
+            })
+
+    return turn_groups
+
+def analyze_turn_safety_adaptive(bearings: List[float], speeds: List[float], context_info: Dict,
+                                 bearing_changes: List[float] = None) -> Dict:
+    """BALANCED: Turn analysis with proper angle thresholds and accumulation
+
+    bearing_changes: optional precomputed wrapped changes from compute_bearing_kernel
+    """
+    if len(bearings) < 3 or len(speeds) < 3:
+        return no_turn_analysis(95.0)
+
+    if bearing_changes is None:
+        bearing_changes = []
+        for i in range(1, len(bearings)):
+            bearing_change = abs(bearings[i] - bearings[i-1])
+            # Handle bearing wraparound
+            if bearing_change > 180:
+                bearing_change = 360 - bearing_change
+            bearing_changes.append(bearing_change)
+
+    # Group consecutive bearing changes for better turn detection
+    if np is not None and isinstance(bearing_changes, np.ndarray):
+        turn_groups = _group_turns_numpy(bearing_changes, speeds)
+    else:
+        turn_groups = _group_turns_python(bearing_changes, speeds)
+
+    # Analyze each validated turn (max speed for safety analysis)
+    turns = [classify_turn(turn['total_angle'], turn['max_speed'], turn['duration_points'], context_info['context'])
+             for turn in turn_groups]
+    return summarize_turn_safety(turns)
+
+def no_turn_analysis(turn_safety_score: float) -> Dict:
+    """Turn analysis of a trip with too few bearings to find turns"""
+    return {
+        'total_turns': 0,
+        'safe_turns': 0,
+        'moderate_turns': 0,
+        'aggressive_turns': 0,
+        'dangerous_turns': 0,
+        'turn_safety_score': turn_safety_score
+    }
+
+def classify_turn(turn_angle: float, turn_speed: float, duration_points: int, context: str) -> Dict:
+    """Safe speed and severity of one grouped turn in a driving context"""
+    # BALANCED: Realistic safe speeds based on road design standards
+    if context == 'city':
+        if turn_angle > 90:  # Very sharp turn (90°+)
+            safe_speed = 15  # Right angle turn
+        elif turn_angle > 60:  # Sharp turn
+            safe_speed = 22
+        elif turn_angle > 40:  # Moderate turn
+            safe_speed = 28
+        else:  # Gentle turn (20-40°)
+            safe_speed = 35
+    elif context == 'highway':
+        if turn_angle > 90:  # Very sharp (rare on highway, likely exit)
+            safe_speed = 30
+        elif turn_angle > 60:  # Sharp curve
+            safe_speed = 40
+        elif turn_angle > 40:  # Moderate curve
+            safe_speed = 50
+        else:  # Gentle curve
+            safe_speed = 60
+    else:  # Mixed
+        if turn_angle > 90:
+            safe_speed = 22
+        elif turn_angle > 60:
+            safe_speed = 30
+        elif turn_angle > 40:
+            safe_speed = 38
+        else:
+            safe_speed = 45
+    
+    speed_ratio = turn_speed / safe_speed if safe_speed > 0 else 0
+    
+    # BALANCED: Reasonable thresholds
+    if speed_ratio <= 1.15:  # 15% over safe speed
+        severity = 'safe'
+    elif speed_ratio <= 1.4:  # 40% over safe speed
+        severity = 'moderate'
+    elif speed_ratio <= 1.7:  # 70% over safe speed
+        severity = 'aggressive'
+    else:  # More than 70% over safe speed
+        severity = 'dangerous'
     
-    # Analyze each validated turn
-    for turn in turn_groups:
-        turn_angle = turn['total_angle']
-        turn_speed = turn['max_speed']  # Use max speed for safety analysis
-        
-        # BALANCED: Realistic safe speeds based on road design standards
-        if context_info['context'] == 'city':
-            if turn_angle > 90:  # Very sharp turn (90°+)
-                safe_speed = 15  # Right angle turn
-            elif turn_angle > 60:  # Sharp turn
-                safe_speed = 22
-            elif turn_angle > 40:  # Moderate turn
-                safe_speed = 28
-            else:  # Gentle turn (20-40°)
-                safe_speed = 35
-        elif context_info['context'] == 'highway':
-            if turn_angle > 90:  # Very sharp (rare on highway, likely exit)
-                safe_speed = 30
-            elif turn_angle > 60:  # Sharp curve
-                safe_speed = 40
-            elif turn_angle > 40:  # Moderate curve
-                safe_speed = 50
-            else:  # Gentle curve
-                safe_speed = 60
-        else:  # Mixed
-            if turn_angle > 90:
-                safe_speed = 22
-            elif turn_angle > 60:
-                safe_speed = 30
-            elif turn_angle > 40:
-                safe_speed = 38
-            else:
-                safe_speed = 45
-        
-        speed_ratio = turn_speed / safe_speed if safe_speed > 0 else 0
-        
-        # BALANCED: Reasonable thresholds
-        if speed_ratio <= 1.15:  # 15% over safe speed
-            severity = 'safe'
-        elif speed_ratio <= 1.4:  # 40% over safe speed
-            severity = 'moderate'
-        elif speed_ratio <= 1.7:  # 70% over safe speed
-            severity = 'aggressive'
-        else:  # More than 70% over safe speed
-            severity = 'dangerous'
-        
-        turns.append({
-            'angle': round(turn_angle, 1),
-            'speed': round(turn_speed, 1),
-            'safe_speed': safe_speed,
-            'speed_ratio': round(speed_ratio, 2),
-            'severity': severity,
-            'context': context_info['context'],
-            'duration_points': turn['duration_points']
-        })
-    
+    return {
+        'angle': round(turn_angle, 1),
+        'speed': round(turn_speed, 1),
+        'safe_speed': safe_speed,
+        'speed_ratio': round(speed_ratio, 2),
+        'severity': severity,
+        'context': context,
+        'duration_points': duration_points
+    }
+
+def summarize_turn_safety(turns: List[Dict]) -> Dict:
+    """Turn counts and turn safety score from a trip's classified turns"""
     # Count turn types
     safe_turns = len([t for t in turns if t['severity'] == 'safe'])
     moderate_turns = len([t for t in turns if t['severity'] == 'moderate'])
@@ -1587,8 +3396,8 @@ def analyze_turn_safety_adaptive(bearings: List[float], speeds: List[float], con
     else:
         safety_score = 95.0
     
-    print(f"🔄 Turn Safety: {len(turns)} significant turns (>20°)")
-    print(f"   Safe: {safe_turns}, Moderate: {moderate_turns}, Aggressive: {aggressive_turns}, Dangerous: {dangerous_turns}")
+    logger.info("🔄 Turn Safety: %s significant turns (>20°)", len(turns))
+    logger.info("   Safe: %s, Moderate: %s, Aggressive: %s, Dangerous: %s", safe_turns, moderate_turns, aggressive_turns, dangerous_turns)
     
     return {
         'total_turns': len(turns),
@@ -1600,60 +3409,91 @@ def analyze_turn_safety_adaptive(bearings: List[float], speeds: List[float], con
         'turn_details': turns  # For debugging
     }
 
-def process_trip_with_frontend_values(deltas: List[Dict], user_base_point: Dict, stored_trip_data: Dict = None) -> Optional[Dict]:
-    """Process trip using frontend values when available"""
+class TripFeatures:
+    """Per-trip arrays and summary statistics read by every analysis stage
+
+    Built once by extract_trip_features so the scorers share one copy of the speeds,
+    intervals, coordinates and bearings instead of re-walking the deltas.
+    """
+    __slots__ = ('coordinate_pairs', 'reconstructed_distance_miles', 'speeds', 'time_intervals',
+                 'bearings', 'bearing_changes', 'total_turns', 'speed_summary')
+
+    def __init__(self, coordinate_pairs, reconstructed_distance_miles: float):
+        self.coordinate_pairs = coordinate_pairs
+        self.reconstructed_distance_miles = reconstructed_distance_miles
+        self.speeds = []
+        self.time_intervals = []
+        self.bearings = []
+        self.bearing_changes = []
+        self.total_turns = 0
+        self.speed_summary = summarize_speeds([])
+
+def extract_trip_features(trip_arrays: TripArrays, divisor: float, base_lat: float, base_lon: float) -> TripFeatures:
+    """First extraction stage: coordinates and reconstructed distance
+
+    Stationary trips stop here; extract_motion_features completes the features for moving trips.
+    """
+    coordinate_pairs, reconstructed_distance_miles = reconstruct_coordinates(trip_arrays, divisor, base_lat, base_lon)
+    return TripFeatures(coordinate_pairs, reconstructed_distance_miles)
+
+def extract_motion_features(features: TripFeatures, trip_arrays: TripArrays) -> TripFeatures:
+    """Fill speeds, intervals, bearings and speed statistics for a moving trip"""
+    with timed('speeds'):
+        features.speeds, features.time_intervals, features.speed_summary = extract_motion_columns(trip_arrays)
+
+    # FIXED: ALWAYS calculate bearings for turn analysis
+    # Citation: GeoSecure-B paper - bearing calculation for turn detection
+    if len(features.coordinate_pairs) > 1:
+        logger.info("🔄 Calculating bearings from %s coordinate pairs", len(features.coordinate_pairs))
+        # 🚀 OPTIMIZATION: bearings, changes and turn count in one pass, reused by turn analysis
+        with timed('bearings'):
+            features.bearings, features.bearing_changes, features.total_turns = compute_bearing_kernel(features.coordinate_pairs)
+        logger.info("✅ Calculated %s bearings, detected %s significant turns (>20°)", len(features.bearings), features.total_turns)
+
+    return features
+
+def detect_coordinate_format(trip_arrays: TripArrays) -> Tuple[str, float]:
+    """
+    (coordinate_format, divisor) from the first delta: fixed-point integers or decimal degrees.
+    Raises ValueError when the first delta is malformed (NaN after decoding), as float() did.
+    """
+    sample_lat = abs(trip_arrays.delta_lat[0])
+    sample_lon = abs(trip_arrays.delta_long[0])
+    if math.isnan(sample_lat) or math.isnan(sample_lon):
+        raise ValueError('first delta has a malformed delta_lat/delta_long')
+
+    if sample_lat > 0.01 or sample_lon > 0.01:
+        return "fixed_point", FIXED_POINT_DIVISOR
+    return "decimal", 1.0
+
+def process_trip_with_frontend_values(deltas, user_base_point: Dict, stored_trip_data: Dict = None) -> Optional[Dict]:
+    """Process trip using frontend values when available (deltas: TripArrays or list of delta dicts)"""
+    deltas = as_trip_arrays(deltas)
     if len(deltas) < 2:
-        print("❌ Insufficient data for analysis")
+        logger.warning("❌ Insufficient data for analysis")
         return None
     
-    print(f"🚗 Processing {len(deltas)} deltas")
-    print(f"📍 Base point: {user_base_point['city']}, {user_base_point['state']}")
+    logger.info("🚗 Processing %s deltas", len(deltas))
+    logger.info("📍 Base point: %s, %s", user_base_point['city'], user_base_point['state'])
     
     # FIXED: ALWAYS reconstruct coordinates from deltas for bearing/turn analysis
     # This is required regardless of whether we use frontend values for distance/duration
     # Citation: GeoSecure-B paper - bearing calculation requires coordinate reconstruction
-    sample_delta = deltas[0] if deltas else {}
-    sample_lat = abs(float(sample_delta.get('delta_lat', 0)))
-    sample_lon = abs(float(sample_delta.get('delta_long', 0)))
-
-    if sample_lat > 0.01 or sample_lon > 0.01:
-        coordinate_format = "fixed_point"
-        divisor = FIXED_POINT_DIVISOR
-    else:
-        coordinate_format = "decimal"
-        divisor = 1.0
+    coordinate_format, divisor = detect_coordinate_format(deltas)
 
     base_lat = user_base_point['latitude']
     base_lon = user_base_point['longitude']
 
-    current_lat, current_lon = base_lat, base_lon
-    reconstructed_distance_miles = 0.0
-    coordinate_pairs = []  # ALWAYS create coordinate_pairs for bearing calculation
-
-    for i, delta in enumerate(deltas):
-        try:
-            delta_lat = float(delta.get('delta_lat', 0)) / divisor
-            delta_lon = float(delta.get('delta_long', 0)) / divisor
-
-            new_lat = current_lat + delta_lat
-            new_lon = current_lon + delta_lon
-
-            segment_distance = haversine_distance_miles(current_lat, current_lon, new_lat, new_lon)
-
-            if 0.000001 <= segment_distance <= 1.0:
-                reconstructed_distance_miles += segment_distance
-                coordinate_pairs.append((new_lat, new_lon))
-
-            current_lat, current_lon = new_lat, new_lon
-
-        except (ValueError, TypeError) as e:
-            continue
+    # ALWAYS create coordinate_pairs for bearing calculation
+    with timed('coordinates'):
+        features = extract_trip_features(deltas, divisor, base_lat, base_lon)
+    reconstructed_distance_miles = features.reconstructed_distance_miles
 
-    print(f"🔄 Reconstructed {len(coordinate_pairs)} coordinate pairs for bearing analysis")
+    logger.info("🔄 Reconstructed %s coordinate pairs for bearing analysis", len(features.coordinate_pairs))
 
     # Use frontend values when available, otherwise use reconstructed values
     if stored_trip_data and stored_trip_data.get('use_gps_metrics'):
-        print("📱 Using EXACT FRONTEND VALUES for distance/duration/speed")
+        logger.info("📱 Using EXACT FRONTEND VALUES for distance/duration/speed")
 
         total_distance_miles = stored_trip_data.get('actual_distance_miles', 0.0)
         duration_minutes = stored_trip_data.get('actual_duration_minutes', 1.0)
@@ -1663,14 +3503,14 @@ def process_trip_with_frontend_values(deltas: List[Dict], user_base_point: Dict,
         avg_speed = stored_trip_data.get('gps_avg_speed_mph', 0.0)
         coordinate_format = "frontend_direct"
 
-        print(f"📊 FRONTEND VALUES:")
-        print(f"   Distance: {total_distance_miles:.3f} miles")
-        print(f"   Duration: {format_duration_smart(duration_minutes)}")
-        print(f"   Max Speed: {max_speed:.1f} mph")
-        print(f"   Avg Speed: {avg_speed:.1f} mph")
+        logger.info("📊 FRONTEND VALUES:")
+        logger.info("   Distance: %.3f miles", total_distance_miles)
+        logger.info("   Duration: %s", format_duration_smart(duration_minutes))
+        logger.info("   Max Speed: %.1f mph", max_speed)
+        logger.info("   Avg Speed: %.1f mph", avg_speed)
 
     else:
-        print("🔄 Using delta coordinate reconstruction for all values")
+        logger.info("🔄 Using delta coordinate reconstruction for all values")
 
         total_distance_miles = reconstructed_distance_miles
         start_timestamp, end_timestamp, duration_minutes = validate_and_fix_timestamps(deltas)
@@ -1679,104 +3519,35 @@ def process_trip_with_frontend_values(deltas: List[Dict], user_base_point: Dict,
     
     # Handle stationary trips (0 distance)
     if total_distance_miles <= 0:
-        print(f"⚠️ Stationary trip detected: {total_distance_miles} miles")
-        print(f"📊 Creating minimal analysis for stationary trip")
-
-        # Return minimal analysis for stationary trips
-        return {
-            'start_timestamp': start_timestamp,
-            'end_timestamp': end_timestamp,
-            'duration_minutes': duration_minutes,
-            'formatted_duration': format_duration_smart(duration_minutes),
-            'total_distance_miles': 0.0,
-
-            'avg_speed_mph': 0.0,
-            'moving_avg_speed_mph': 0.0,
-            'max_speed_mph': max_speed if 'max_speed' in locals() else 0.0,
-            'min_speed_mph': 0.0,
-            'speed_consistency': 0.0,
-
-            'moving_time_minutes': 0.0,
-            'stationary_time_minutes': duration_minutes,
-            'moving_percentage': 0.0,
-
-            'total_harsh_events': 0,
-            'total_dangerous_events': 0,
-            'acceleration_events': [],
-            'deceleration_events': [],
-            'sudden_accelerations': 0,
-            'sudden_decelerations': 0,
-            'hard_stops': 0,
-            'event_breakdown': {'gentle': 0, 'normal': 0, 'assertive': 0, 'harsh': 0, 'dangerous': 0, 'extreme': 0},
-            'smoothness_score': 0.0,
-            'segments_analyzed': 0,
+        logger.warning("⚠️ Stationary trip detected: %s miles", total_distance_miles)
+        logger.info("📊 Creating minimal analysis for stationary trip")
 
-            'events_per_100_miles': 0.0,
-            'weighted_events_per_100_miles': 0.0,
-            'harsh_events_per_100_miles': 0.0,
-            'dangerous_events_per_100_miles': 0.0,
-            'industry_rating': 'No Movement',
-            'frequency_score': 0,
-            'risk_percentile': 0,
-
-            'total_turns': 0,
-            'safe_turns': 0,
-            'moderate_turns': 0,
-            'aggressive_turns': 0,
-            'dangerous_turns': 0,
-            'turn_safety_score': 0.0,
-
-            'behavior_score': 0.0,
-            'behavior_category': 'Stationary',
-
-            'privacy_protected': user_base_point.get('source', 'fallback') != 'fallback',
-            'base_point_city': user_base_point.get('city', 'Unknown'),
-            'analysis_algorithm': 'stationary_trip',
-            'algorithm_version': '2.0_stationary_handling',
-            'data_quality': 'stationary',
-            'data_source': 'frontend_exact' if stored_trip_data and stored_trip_data.get('use_gps_metrics') else 'delta_coordinates',
-            'coordinate_format': coordinate_format,
-            'driving_context': {'context': 'stationary', 'confidence': 1.0},
-            'is_stationary_trip': True,
-        }
+        return stationary_trip_analysis(start_timestamp, end_timestamp, duration_minutes, max_speed,
+                                        user_base_point, stored_trip_data, coordinate_format)
     
-    # Extract speeds and time intervals
-    speeds = extract_and_validate_speeds(deltas)
-    time_intervals = [float(d.get('delta_time', 1000)) for d in deltas]
-    
-    # FIXED: ALWAYS calculate bearings for turn analysis
-    # coordinate_pairs is now always populated from delta reconstruction (see above)
-    # Citation: GeoSecure-B paper - bearing calculation for turn detection
-    bearings = []
-    total_turns = 0
-    if coordinate_pairs and len(coordinate_pairs) > 1:
-        print(f"🔄 Calculating bearings from {len(coordinate_pairs)} coordinate pairs")
-        for i in range(1, len(coordinate_pairs)):
-            prev_lat, prev_lon = coordinate_pairs[i-1]
-            curr_lat, curr_lon = coordinate_pairs[i]
-            bearing = calculate_bearing(prev_lat, prev_lon, curr_lat, curr_lon)
-            bearings.append(bearing)
-
-        for i in range(1, len(bearings)):
-            bearing_change = abs(bearings[i] - bearings[i-1])
-            if bearing_change > 180:
-                bearing_change = 360 - bearing_change
-            if bearing_change > 20:
-                total_turns += 1
-
-        print(f"✅ Calculated {len(bearings)} bearings, detected {total_turns} significant turns (>20°)")
+    # 🚀 OPTIMIZATION: speeds, intervals, bearings and speed statistics extracted once
+    # into TripFeatures and shared by every scorer below
+    extract_motion_features(features, deltas)
+    speeds = features.speeds
+    time_intervals = features.time_intervals
+    bearings = features.bearings
+    speed_summary = features.speed_summary
     
     # FIXED: Calculate moving metrics
-    moving_metrics = calculate_moving_metrics(speeds, time_intervals, total_distance_miles)
+    with timed('moving_metrics'):
+        moving_metrics = calculate_moving_metrics(speeds, time_intervals, total_distance_miles)
     
     # FIXED: Analyze acceleration with proper thresholds
-    acceleration_analysis = analyze_acceleration_events_fixed(speeds, time_intervals, total_distance_miles, total_turns)
+    with timed('acceleration'):
+        acceleration_analysis = analyze_acceleration_events_fixed(speeds, time_intervals, total_distance_miles,
+                                                                  features.total_turns, speed_summary)
     
     # Get context info
     context_info = acceleration_analysis.get('driving_context', {'context': 'mixed'})
     
     # Calculate other metrics
-    speed_consistency = calculate_speed_consistency_adaptive(speeds, context_info)
+    with timed('consistency'):
+        speed_consistency = calculate_speed_consistency_adaptive(speeds, context_info)
     frequency_analysis = calculate_frequency_metrics_fixed(
         acceleration_analysis['total_harsh_events'],
         acceleration_analysis['total_dangerous_events'], 
@@ -1785,48 +3556,117 @@ def process_trip_with_frontend_values(deltas: List[Dict], user_base_point: Dict,
     )
     
     # Turn analysis
-    if bearings:
-        turn_analysis = analyze_turn_safety_adaptive(bearings, speeds, context_info)
+    if len(bearings):
+        with timed('turns'):
+            turn_analysis = analyze_turn_safety_adaptive(bearings, speeds, context_info, features.bearing_changes)
     else:
-        turn_analysis = {
-            'total_turns': 0,
-            'safe_turns': 0,
-            'moderate_turns': 0,  # FIXED: Was missing
-            'aggressive_turns': 0,
-            'dangerous_turns': 0,
-            'turn_safety_score': 85.0
-        }
-    
-    # Calculate overall score
-    behavior_score = calculate_comprehensive_driver_score(
-        speed_consistency,
-        acceleration_analysis,
-        turn_analysis,
-        frequency_analysis,
-        total_distance_miles
-    )
-    
-    behavior_category = get_behavior_category(behavior_score)
+        turn_analysis = no_turn_analysis(85.0)
     
     # Use accurate metrics when available
     if not max_speed and speeds:
-        max_speed = max(speeds)
+        max_speed = speed_summary['max_speed']
     if not avg_speed and speeds:
-        avg_speed = statistics.mean(speeds)
+        avg_speed = speed_summary['avg_speed']
+    
+    min_speed = speed_summary['min_speed'] if speeds else 0
+
+    return moving_trip_analysis(start_timestamp, end_timestamp, duration_minutes, total_distance_miles,
+                                (avg_speed, max_speed, min_speed), moving_metrics, acceleration_analysis,
+                                speed_consistency, frequency_analysis, turn_analysis,
+                                user_base_point, stored_trip_data, coordinate_format)
+
+def stationary_trip_analysis(start_timestamp: str, end_timestamp: str, duration_minutes: float, max_speed: float,
+                             user_base_point: Dict, stored_trip_data: Optional[Dict], coordinate_format: str) -> Dict:
+    """Minimal analysis of a trip that covered no distance"""
+    return {
+        'start_timestamp': start_timestamp,
+        'end_timestamp': end_timestamp,
+        'duration_minutes': duration_minutes,
+        'formatted_duration': format_duration_smart(duration_minutes),
+        'total_distance_miles': 0.0,
+
+        'avg_speed_mph': 0.0,
+        'moving_avg_speed_mph': 0.0,
+        'max_speed_mph': max_speed,
+        'min_speed_mph': 0.0,
+        'speed_consistency': 0.0,
+
+        'moving_time_minutes': 0.0,
+        'stationary_time_minutes': duration_minutes,
+        'moving_percentage': 0.0,
+
+        'total_harsh_events': 0,
+        'total_dangerous_events': 0,
+        'acceleration_events': [],
+        'deceleration_events': [],
+        'sudden_accelerations': 0,
+        'sudden_decelerations': 0,
+        'hard_stops': 0,
+        'event_breakdown': {'gentle': 0, 'normal': 0, 'assertive': 0, 'harsh': 0, 'dangerous': 0, 'extreme': 0},
+        'smoothness_score': 0.0,
+        'segments_analyzed': 0,
+
+        'events_per_100_miles': 0.0,
+        'weighted_events_per_100_miles': 0.0,
+        'harsh_events_per_100_miles': 0.0,
+        'dangerous_events_per_100_miles': 0.0,
+        'industry_rating': 'No Movement',
+        'frequency_score': 0,
+        'risk_percentile': 0,
+
+        'total_turns': 0,
+        'safe_turns': 0,
+        'moderate_turns': 0,
+        'aggressive_turns': 0,
+        'dangerous_turns': 0,
+        'turn_safety_score': 0.0,
+
+        'behavior_score': 0.0,
+        'behavior_category': 'Stationary',
+
+        'privacy_protected': user_base_point.get('source', 'fallback') != 'fallback',
+        'base_point_city': user_base_point.get('city', 'Unknown'),
+        'analysis_algorithm': 'stationary_trip',
+        'algorithm_version': '2.0_stationary_handling',
+        'data_quality': 'stationary',
+        'data_source': 'frontend_exact' if stored_trip_data and stored_trip_data.get('use_gps_metrics') else 'delta_coordinates',
+        'coordinate_format': coordinate_format,
+        'driving_context': {'context': 'stationary', 'confidence': 1.0},
+        'is_stationary_trip': True,
+    }
+
+def moving_trip_analysis(start_timestamp: str, end_timestamp: str, duration_minutes: float,
+                         total_distance_miles: float, speed_stats: Tuple[float, float, float],
+                         moving_metrics: Dict, acceleration_analysis: Dict, speed_consistency: float,
+                         frequency_analysis: Dict, turn_analysis: Dict,
+                         user_base_point: Dict, stored_trip_data: Optional[Dict], coordinate_format: str) -> Dict:
+    """Behavior score and trip analysis from the scored stages (speed_stats: avg, max, min mph)"""
+    avg_speed, max_speed, min_speed = speed_stats
+    context_info = acceleration_analysis.get('driving_context', {'context': 'mixed'})
+
+    # Calculate overall score
+    with timed('scoring'):
+        behavior_score = calculate_comprehensive_driver_score(
+            speed_consistency,
+            acceleration_analysis,
+            turn_analysis,
+            frequency_analysis,
+            total_distance_miles
+        )
     
-    min_speed = min(speeds) if speeds else 0
+    behavior_category = get_behavior_category(behavior_score)
     
     # Add harsh events per hour
     if duration_minutes > 0:
         harsh_events_per_hour = (acceleration_analysis['total_harsh_events'] / duration_minutes) * 60
         frequency_analysis['harsh_events_per_hour'] = round(harsh_events_per_hour, 2)
     
-    print(f"✅ Analysis Complete:")
-    print(f"   Context: {context_info['context'].upper()}")
-    print(f"   Behavior Score: {behavior_score}/100 ({behavior_category})")
-    print(f"   Industry Rating: {frequency_analysis['industry_rating']}")
-    print(f"   Moving Avg Speed: {moving_metrics['moving_avg_speed_mph']} mph")
-    print(f"   Time Moving: {moving_metrics['moving_percentage']}%")
+    logger.info("✅ Analysis Complete:")
+    logger.info("   Context: %s", context_info['context'].upper())
+    logger.info("   Behavior Score: %s/100 (%s)", behavior_score, behavior_category)
+    logger.info("   Industry Rating: %s", frequency_analysis['industry_rating'])
+    logger.info("   Moving Avg Speed: %s mph", moving_metrics['moving_avg_speed_mph'])
+    logger.info("   Time Moving: %s%%", moving_metrics['moving_percentage'])
     
     return {
         'start_timestamp': start_timestamp,
@@ -1864,13 +3704,16 @@ def process_trip_with_frontend_values(deltas: List[Dict], user_base_point: Dict,
     }
 
 # Trip retrieval functions
-def get_trip_batches_fixed(user_id: str, trip_id: str) -> List[Dict]:
+def get_trip_batches_fixed(user_id: str, trip_id: str, decode_deltas: bool = False) -> List[Dict]:
     """
     🚀 OPTIMIZED: Get trip batches for analysis with server-side filtering
     Performance improvement: ~10x faster by filtering in DynamoDB instead of Python
+
+    decode_deltas: replace each batch's delta dicts with TripArrays as every page arrives,
+    so only one page of Decimal dicts is alive at a time
     """
     try:
-        print(f"🔍 Getting batches for user: {user_id}, trip: {trip_id}")
+        logger.info("🔍 Getting batches for user: %s, trip: %s", user_id, trip_id)
 
         all_batches = []
         last_evaluated_key = None
@@ -1891,32 +3734,40 @@ def get_trip_batches_fixed(user_id: str, trip_id: str) -> List[Dict]:
 
             response = trajectory_table.query(**query_params)
 
-            all_batches.extend(response.get('Items', []))
+            items = response.get('Items', [])
+            if decode_deltas:
+                items = [{'batch_number': item.get('batch_number', 0),
+                          'deltas': TripArrays.from_item(item)} for item in items]
+            all_batches.extend(items)
 
             # Check if there are more results
             last_evaluated_key = response.get('LastEvaluatedKey')
             if not last_evaluated_key:
                 break
 
-            print(f"   Paginating... found {len(all_batches)} batches so far")
+            logger.info("   Paginating... found %s batches so far", len(all_batches))
 
         # Sort by batch number
         batches = sorted(all_batches, key=lambda x: int(x.get('batch_number', 0)))
 
-        print(f"✅ Found {len(batches)} batches for user {user_id}, trip {trip_id}")
+        logger.info("✅ Found %s batches for user %s, trip %s", len(batches), user_id, trip_id)
 
         if not batches:
-            print(f"⚠️ No batches found for user {user_id}, trip {trip_id}")
+            logger.warning("⚠️ No batches found for user %s, trip %s", user_id, trip_id)
 
         return batches
 
     except Exception as e:
-        print(f"❌ Error getting trip batches: {e}")
+        logger.error("❌ Error getting trip batches: %s", e)
         return []
 
-def analyze_single_trip_with_frontend_values(user_id: str, trip_id: str, user_base_point: Dict) -> Optional[Dict]:
-    """Analyze single trip using frontend values when available"""
-    print(f"🎯 ANALYZING TRIP: {trip_id} for user: {user_id}")
+def fetch_trip_inputs(user_id: str, trip_id: str) -> Optional[Dict]:
+    """I/O half of a trip analysis: Trips-Neal record and decoded trajectory batches
+
+    Returns None when the trip has no deltas, otherwise
+    {'trip_arrays', 'trip_quality', 'start_timestamp', 'end_timestamp'}
+    """
+    logger.info("🎯 ANALYZING TRIP: %s for user: %s", trip_id, user_id)
 
     # Get stored trip data with frontend values
     stored_trip_data = None
@@ -1924,66 +3775,77 @@ def analyze_single_trip_with_frontend_values(user_id: str, trip_id: str, user_ba
     trip_end_timestamp = None
 
     try:
-        print(f"📖 Reading trip data from Trips-Neal table for: {trip_id}")
-        trip_response = trips_table.get_item(Key={'trip_id': trip_id})
+        logger.info("📖 Reading trip data from Trips-Neal table for: %s", trip_id)
+        # 🚀 OPTIMIZATION: Fetch and decode only the fields analysis reads
+        with timed('trip_record_fetch'):
+            trip_response = trips_table.get_item(Key={'trip_id': trip_id}, **trip_record_projection())
         if 'Item' in trip_response:
-            stored_trip_data = convert_decimal_to_float(trip_response['Item'])
+            stored_trip_data = decode_trip_record(trip_response['Item'])
 
             # 🔥 CRITICAL: Extract ACTUAL trip timestamps from Trips-Neal table
             trip_start_timestamp = stored_trip_data.get('start_timestamp') or stored_trip_data.get('timestamp')
             trip_end_timestamp = stored_trip_data.get('end_timestamp') or stored_trip_data.get('finalized_at')
 
-            print(f"📅 TIMESTAMPS FROM TRIPS-NEAL:")
-            print(f"   start_timestamp: {trip_start_timestamp}")
-            print(f"   end_timestamp: {trip_end_timestamp}")
-            print(f"   Available keys in Trips-Neal: {list(stored_trip_data.keys())}")
+            logger.debug("📅 TIMESTAMPS FROM TRIPS-NEAL:")
+            logger.debug("   start_timestamp: %s", trip_start_timestamp)
+            logger.debug("   end_timestamp: %s", trip_end_timestamp)
+            logger.debug("   Available keys in Trips-Neal: %s", list(stored_trip_data.keys()))
 
             trip_quality = stored_trip_data.get('trip_quality', {})
 
             if trip_quality.get('use_gps_metrics'):
-                print(f"📱 Found FRONTEND VALUES for trip: {trip_id}")
-                print(f"   Frontend Distance: {trip_quality.get('actual_distance_miles', 0):.3f} miles")
-                print(f"   Frontend Duration: {trip_quality.get('actual_duration_minutes', 0):.1f} minutes")
-                print(f"   Frontend Max Speed: {trip_quality.get('gps_max_speed_mph', 0):.1f} mph")
+                logger.info("📱 Found FRONTEND VALUES for trip: %s", trip_id)
+                logger.info("   Frontend Distance: %.3f miles", trip_quality.get('actual_distance_miles', 0))
+                logger.info("   Frontend Duration: %.1f minutes", trip_quality.get('actual_duration_minutes', 0))
+                logger.info("   Frontend Max Speed: %.1f mph", trip_quality.get('gps_max_speed_mph', 0))
             else:
-                print(f"🔄 Using delta reconstruction for trip: {trip_id}")
+                logger.info("🔄 Using delta reconstruction for trip: %s", trip_id)
         else:
-            print(f"⚠️ No stored trip data found for: {trip_id}")
+            logger.warning("⚠️ No stored trip data found for: %s", trip_id)
     except Exception as e:
-        print(f"⚠️ Could not retrieve stored trip data: {e}")
+        logger.warning("⚠️ Could not retrieve stored trip data: %s", e)
     
-    # Get trajectory batches
-    batches = get_trip_batches_fixed(user_id, trip_id)
+    # Get trajectory batches (decoded into typed columns page by page)
+    with timed('batch_fetch'):
+        batches = get_trip_batches_fixed(user_id, trip_id, decode_deltas=True)
     
     if not batches:
-        print(f"❌ No batches found for trip: {trip_id}")
+        logger.warning("❌ No batches found for trip: %s", trip_id)
         return None
     
-    print(f"📦 Processing {len(batches)} batches")
+    logger.info("📦 Processing %s batches", len(batches))
     
-    # Combine all deltas
-    all_deltas = []
-    for batch in batches:
-        batch_deltas = batch.get('deltas', [])
-        if batch_deltas:
-            all_deltas.extend(batch_deltas)
-            print(f"   Batch {batch.get('batch_number', 'unknown')}: {len(batch_deltas)} deltas")
+    # 🚀 OPTIMIZATION: Join the per-batch columns instead of a list of Decimal dicts
+    with timed('batch_join'):
+        trip_arrays = TripArrays.from_batches(batches)
+    del batches
     
-    if not all_deltas:
-        print(f"❌ No deltas found for trip: {trip_id}")
+    if not len(trip_arrays):
+        logger.warning("❌ No deltas found for trip: %s", trip_id)
         return None
     
-    print(f"📊 Total deltas to process: {len(all_deltas)}")
-    
+    logger.info("📊 Total deltas to process: %s", len(trip_arrays))
+
+    return {
+        'trip_arrays': trip_arrays,
+        'trip_quality': stored_trip_data.get('trip_quality', {}) if stored_trip_data else {},
+        'start_timestamp': trip_start_timestamp,
+        'end_timestamp': trip_end_timestamp,
+    }
+
+def complete_trip_analysis(trip_id: str, trip_inputs: Dict, user_base_point: Dict) -> Optional[Dict]:
+    """CPU half of a trip analysis: score the fetched deltas and attach the Trips-Neal timestamps"""
     # Process with frontend values when available
-    trip_quality_data = stored_trip_data.get('trip_quality', {}) if stored_trip_data else {}
-    stats = process_trip_with_frontend_values(all_deltas, user_base_point, trip_quality_data)
+    stats = process_trip_with_frontend_values(trip_inputs['trip_arrays'], user_base_point, trip_inputs['trip_quality'])
     
     if not stats:
-        print(f"❌ Failed to process trip: {trip_id}")
+        logger.error("❌ Failed to process trip: %s", trip_id)
         return None
     
-    print(f"✅ Trip analysis complete: {stats['behavior_score']}/100 ({stats['behavior_category']})")
+    logger.info("✅ Trip analysis complete: %s/100 (%s)", stats['behavior_score'], stats['behavior_category'])
+
+    trip_start_timestamp = trip_inputs['start_timestamp']
+    trip_end_timestamp = trip_inputs['end_timestamp']
 
     # 🔥 CRITICAL: Add ACTUAL timestamps from Trips-Neal table to result
     result = {
@@ -1994,22 +3856,194 @@ def analyze_single_trip_with_frontend_values(user_id: str, trip_id: str, user_ba
     # Include timestamps from Trips-Neal table (NOT generated timestamps)
     if trip_start_timestamp:
         result['start_timestamp'] = trip_start_timestamp
-        print(f"✅ Added start_timestamp from Trips-Neal: {trip_start_timestamp}")
+        logger.debug("✅ Added start_timestamp from Trips-Neal: %s", trip_start_timestamp)
     else:
-        print(f"⚠️ WARNING: No start_timestamp found in Trips-Neal for {trip_id}")
+        logger.warning("⚠️ WARNING: No start_timestamp found in Trips-Neal for %s", trip_id)
 
     if trip_end_timestamp:
         result['end_timestamp'] = trip_end_timestamp
-        print(f"✅ Added end_timestamp from Trips-Neal: {trip_end_timestamp}")
+        logger.debug("✅ Added end_timestamp from Trips-Neal: %s", trip_end_timestamp)
     else:
-        print(f"⚠️ WARNING: No end_timestamp found in Trips-Neal for {trip_id}")
+        logger.warning("⚠️ WARNING: No end_timestamp found in Trips-Neal for %s", trip_id)
 
-    print(f"📤 RETURNING RESULT WITH TIMESTAMPS:")
-    print(f"   start_timestamp: {result.get('start_timestamp', 'MISSING')}")
-    print(f"   end_timestamp: {result.get('end_timestamp', 'MISSING')}")
+    logger.debug("📤 RETURNING RESULT WITH TIMESTAMPS:")
+    logger.debug("   start_timestamp: %s", result.get('start_timestamp', 'MISSING'))
+    logger.debug("   end_timestamp: %s", result.get('end_timestamp', 'MISSING'))
 
     return result
 
+def analyze_single_trip_with_frontend_values(user_id: str, trip_id: str, user_base_point: Dict) -> Optional[Dict]:
+    """Analyze single trip using frontend values when available"""
+    trip_inputs = fetch_trip_inputs(user_id, trip_id)
+    if trip_inputs is None:
+        return None
+    return complete_trip_analysis(trip_id, trip_inputs, user_base_point)
+
+# ========================================
+# ⚡ PARALLEL TRIP ANALYSIS
+# ========================================
+
+# PARALLEL_ANALYSIS=off analyzes cache misses one after another (the original behavior)
+PARALLEL_ANALYSIS = os.environ.get('PARALLEL_ANALYSIS', 'auto').strip().lower()
+PARALLEL_MIN_TRIPS = 2
+MAX_IO_THREADS = 8             # stays under boto3's default pool of 10 connections
+DEADLINE_RESERVE_MS = 5000     # kept back for cache writes and the response when analysis runs long
+PROCESS_MIN_BUDGET_MS = 2000   # with less time than this, forking workers is not worth it
+
+# Result slot for a trip that was not started before the deadline reserve (analyzed next request)
+TRIP_DEFERRED = 'deferred'
+
+def available_cpu_count() -> int:
+    """CPUs this process may run on (Lambda: 1 vCPU per 1,769 MB of memory)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def plan_analysis_workers(trip_count: int, remaining_ms: Optional[int]) -> Tuple[int, int]:
+    """(io_threads, cpu_processes) for analyzing trip_count trips; (0, 0) means sequential"""
+    if PARALLEL_ANALYSIS == 'off' or trip_count < PARALLEL_MIN_TRIPS:
+        return 0, 0
+
+    io_threads = min(MAX_IO_THREADS, trip_count)
+    cpus = available_cpu_count()
+    cpu_processes = min(cpus, trip_count) if cpus > 1 else 0
+
+    if remaining_ms is not None and remaining_ms - DEADLINE_RESERVE_MS < PROCESS_MIN_BUDGET_MS:
+        # Nearly out of time: overlap the remaining I/O, skip the worker start-up cost
+        cpu_processes = 0
+    return io_threads, cpu_processes
+
+def _analysis_worker(conn, user_base_point: Dict):
+    """Worker process: score (trip_id, trip_inputs) tasks from the pipe until None arrives"""
+    global _profile
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        trip_id, trip_inputs = task
+        _profile = PerformanceProfile()
+        try:
+            conn.send((complete_trip_analysis(trip_id, trip_inputs, user_base_point), None, _profile.stages))
+        except Exception as e:
+            conn.send((None, f"{type(e).__name__}: {e}", _profile.stages))
+    conn.close()
+
+class AnalysisProcessPool:
+    """
+    ⚡ CPU-bound trip scoring in forked worker processes, one Pipe per worker
+    (multiprocessing.Pool and Queue need /dev/shm, which Lambda does not provide).
+    Each calling thread borrows an idle worker; a dead worker's slot becomes in-process scoring.
+    """
+
+    def __init__(self, size: int, user_base_point: Dict):
+        self.user_base_point = user_base_point
+        self._workers = []
+        self._idle = queue.Queue()
+        context = multiprocessing.get_context('fork')
+        for _ in range(size):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_analysis_worker, args=(child_conn, user_base_point), daemon=True)
+            process.start()
+            child_conn.close()
+            self._workers.append((process, parent_conn))
+            self._idle.put((process, parent_conn))
+
+    def analyze(self, trip_id: str, trip_inputs: Dict) -> Optional[Dict]:
+        worker = self._idle.get()
+        if worker is None:
+            self._idle.put(None)
+            return complete_trip_analysis(trip_id, trip_inputs, self.user_base_point)
+
+        process, conn = worker
+        worker_died = False
+        try:
+            conn.send((trip_id, trip_inputs))
+            result, error, stages = conn.recv()
+        except (EOFError, OSError) as e:
+            logger.warning("⚠️ Analysis worker %s died (%s) - scoring %s in-process", process.pid, e, trip_id)
+            worker_died = True
+        finally:
+            # Always hand the slot back, or the other threads would wait on it forever
+            self._idle.put(None if worker_died else worker)
+
+        if worker_died:
+            return complete_trip_analysis(trip_id, trip_inputs, self.user_base_point)
+        _profile.merge(stages)
+        if error:
+            raise RuntimeError(f"analysis of {trip_id} failed in worker: {error}")
+        return result
+
+    def close(self):
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+                conn.close()
+            except OSError:
+                pass
+        for process, _ in self._workers:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+def _remaining_time_ms(context) -> Optional[int]:
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        return context.get_remaining_time_in_millis()
+    return None
+
+def analyze_trips(user_id: str, pending: List[Tuple[str, str]], user_base_point: Dict, context=None) -> List:
+    """
+    ⚡ Analyze (trip_id, source) pairs and return their results in the same order
+
+    Sequential for one trip or PARALLEL_ANALYSIS=off; otherwise I/O threads fetch trips while
+    worker processes score them (in-thread scoring on a single CPU). Trips not started while
+    more than DEADLINE_RESERVE_MS remain come back as TRIP_DEFERRED.
+    """
+    def out_of_time() -> bool:
+        remaining_ms = _remaining_time_ms(context)
+        return remaining_ms is not None and remaining_ms < DEADLINE_RESERVE_MS
+
+    io_threads, cpu_processes = plan_analysis_workers(len(pending), _remaining_time_ms(context))
+    process_pool = None
+
+    def analyze_one(trip_id: str, source: str):
+        if out_of_time():
+            return TRIP_DEFERRED
+        started = time.perf_counter()
+        if io_threads == 0:
+            result = analyze_single_trip_with_frontend_values(user_id, trip_id, user_base_point)
+        else:
+            trip_inputs = fetch_trip_inputs(user_id, trip_id)
+            if trip_inputs is None:
+                result = None
+            elif process_pool is not None:
+                result = process_pool.analyze(trip_id, trip_inputs)
+            else:
+                result = complete_trip_analysis(trip_id, trip_inputs, user_base_point)
+        _profile.add_trip(trip_id, time.perf_counter() - started, source)
+        return result
+
+    if io_threads == 0:
+        return [analyze_one(trip_id, source) for trip_id, source in pending]
+
+    logger.info("⚡ Parallel analysis of %s trips: %s I/O threads, %s worker processes", len(pending), io_threads, cpu_processes)
+    try:
+        if cpu_processes:
+            # Fork before any I/O thread exists, so no lock is copied mid-use into a worker
+            try:
+                process_pool = AnalysisProcessPool(cpu_processes, user_base_point)
+            except OSError as e:
+                logger.warning("⚠️ Could not start analysis workers (%s) - scoring in threads", e)
+        with ThreadPoolExecutor(max_workers=io_threads) as executor:
+            futures = [executor.submit(analyze_one, trip_id, source) for trip_id, source in pending]
+            return [future.result() for future in futures]
+    finally:
+        if process_pool is not None:
+            process_pool.close()
+
 def get_user_trips_fixed(user_id: str) -> List[str]:
     """
     🚀 OPTIMIZED: Get all trip IDs for a specific user
@@ -2018,7 +4052,7 @@ def get_user_trips_fixed(user_id: str) -> List[str]:
     Extracts unique trip IDs with pagination support
     """
     try:
-        print(f"🔍 Getting trips for user: {user_id}")
+        logger.info("🔍 Getting trips for user: %s", user_id)
 
         user_trip_ids = set()
         last_evaluated_key = None
@@ -2048,21 +4082,201 @@ def get_user_trips_fixed(user_id: str) -> List[str]:
             if not last_evaluated_key:
                 break
 
-            print(f"   Paginating... found {len(user_trip_ids)} unique trips so far")
+            logger.info("   Paginating... found %s unique trips so far", len(user_trip_ids))
 
         # Sort trip IDs (newest first - they contain timestamps)
         sorted_trips = sorted(list(user_trip_ids), reverse=True)
 
-        print(f"✅ Found {len(sorted_trips)} trips for user {user_id}")
+        logger.info("✅ Found %s trips for user %s", len(sorted_trips), user_id)
         return sorted_trips
 
     except Exception as e:
-        print(f"❌ Error getting trips for user {user_id}: {e}")
+        logger.error("❌ Error getting trips for user %s: %s", user_id, e)
         return []
 
+# ========================================
+# 📄 PAGED TRIP LISTING
+# ========================================
+# ?limit=N&cursor=...&since=...&until=... list only part of a driver's trips, newest first, by
+# the upload_timestamp sort key of user_id-upload_timestamp-index: the query stops as soon as
+# the page is full, so only those trips are fetched and analyzed. A trip's place in the order is
+# its newest batch. next_cursor holds the upload_timestamp of the first trip not returned and
+# the ids of the trips already listed, skipped when older batches of theirs show up below that
+# bound (a trip uploaded over a long time, overlapping uploads). Only the PAGE_CURSOR_SEEN_MAX
+# most recently listed ids are kept, so the cursor stays a few KB: a trip can only be listed
+# twice if its batches span the uploads of more than that many newer trips.
+
+PAGE_DEFAULT_LIMIT = 25
+PAGE_MAX_LIMIT = 100
+PAGE_CURSOR_SEEN_MAX = 200
+PAGE_PARAMETERS = ('limit', 'cursor', 'since', 'until')
+
+def upload_timestamp_bound(value: str, end_of_day: bool = False) -> str:
+    """An ISO date or datetime as an upload_timestamp (naive UTC isoformat); dates cover the whole day"""
+    value = value.strip()
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    if end_of_day and len(value) == len('YYYY-MM-DD'):
+        parsed += timedelta(days=1, microseconds=-1)
+    return parsed.isoformat()
+
+def encode_page_cursor(before: str, seen: List[str]) -> str:
+    # Compressed like the stored payloads: trip ids share their trip_{user_id}_ prefix
+    data = compress_payload(json.dumps({'before': before, 'seen': seen}, separators=(',', ':')).encode('utf-8'))
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+def decode_page_cursor(cursor: str) -> Dict:
+    data = json.loads(decompress_payload(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))))
+    if not isinstance(data.get('before'), str) or not isinstance(data.get('seen'), list):
+        raise ValueError('malformed cursor')
+    return data
+
+def parse_page_request(query_params: Dict) -> Optional[Dict]:
+    """
+    {'limit', 'since', 'until', 'before', 'seen'} for a paged request, None when no paging
+    parameter is given. Raises ValueError (a 400) for invalid values.
+    """
+    if not any(query_params.get(name) for name in PAGE_PARAMETERS):
+        return None
+    page = {'limit': PAGE_DEFAULT_LIMIT, 'since': None, 'until': None, 'before': None, 'seen': []}
+    if query_params.get('limit'):
+        try:
+            page['limit'] = int(query_params['limit'])
+        except ValueError:
+            raise ValueError('limit must be a whole number')
+        if not 1 <= page['limit'] <= PAGE_MAX_LIMIT:
+            raise ValueError(f'limit must be between 1 and {PAGE_MAX_LIMIT}')
+    for name in ('since', 'until'):
+        if query_params.get(name):
+            try:
+                page[name] = upload_timestamp_bound(query_params[name], end_of_day=name == 'until')
+            except ValueError:
+                raise ValueError(f'{name} must be an ISO 8601 date or date-time')
+    if page['since'] and page['until'] and page['since'] > page['until']:
+        raise ValueError('since must not be after until')
+    if query_params.get('cursor'):
+        try:
+            cursor = decode_page_cursor(query_params['cursor'])
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError('cursor is not valid')
+        page['before'], page['seen'] = cursor['before'], cursor['seen']
+    return page
+
+def list_user_trips_page(user_id: str, page: Dict) -> Tuple[List[str], Optional[str]]:
+    """📄 (trip ids of one page, newest first; next_cursor or None on the last page)"""
+    upper = min(filter(None, (page['until'], page['before'])), default=None)
+    condition = Key('user_id').eq(user_id)
+    if page['since'] and upper:
+        condition &= Key('upload_timestamp').between(page['since'], upper)
+    elif page['since']:
+        condition &= Key('upload_timestamp').gte(page['since'])
+    elif upper:
+        condition &= Key('upload_timestamp').lte(upper)
+
+    query_params = {
+        'IndexName': 'user_id-upload_timestamp-index',
+        'KeyConditionExpression': condition,
+        'ProjectionExpression': 'trip_id, upload_timestamp',
+        'ScanIndexForward': False,  # newest batches first
+    }
+    skip = set(page['seen'])
+    trip_ids = []
+    while True:
+        response = trajectory_table.query(**query_params)
+        for item in response.get('Items', []):
+            trip_id = item.get('trip_id')
+            if not trip_id or trip_id in skip:
+                continue
+            if len(trip_ids) == page['limit']:
+                # First trip of the next page: its newest batch bounds the next query
+                seen = (page['seen'] + trip_ids)[-PAGE_CURSOR_SEEN_MAX:]
+                return trip_ids, encode_page_cursor(item['upload_timestamp'], seen)
+            trip_ids.append(trip_id)
+            skip.add(trip_id)
+        if not response.get('LastEvaluatedKey'):
+            return trip_ids, None
+        query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+# ========================================
+# 🏷️ CONDITIONAL RESPONSES (ETag / 304)
+# ========================================
+# The dashboard polls analyze-driver and the body rarely changes between polls. The ETag is a
+# hash of what the body is built from: the listed trip ids with their Trips-Neal modification
+# times (the fields the cache checks), CURRENT_ALGORITHM_VERSION, the user record and timezone,
+# the query parameters that shape the body and, for paged requests, the stored driver
+# aggregate's updated_at. A poll sending If-None-Match with that ETag gets a 304 before any
+# cache entry, store object or batch is read. It is a weak ETag: analysis_timestamp and
+# cache_performance differ between two 200s with the same ETag. Responses with deferred trips,
+# trips without a Trips-Neal item and ?profile=true responses carry no ETag.
+
+TRIP_VERSION_FIELDS = ('last_updated', 'finalized_at', 'end_timestamp')
+ETAG_QUERY_PARAMETERS = ('breakdown',) + PAGE_PARAMETERS
+
+def fetch_trip_versions(trip_ids: List[str]) -> Optional[Dict[str, Dict]]:
+    """📦 {trip_id: Trips-Neal item (TRIP_MODIFIED_FIELDS)}, None if any key could not be read"""
+    try:
+        items, unprocessed = batch_get_items(trips_table, [{'trip_id': trip_id} for trip_id in dict.fromkeys(trip_ids)],
+                                             attribute_projection(TRIP_MODIFIED_FIELDS))
+    except Exception as e:
+        logger.warning("⚠️ Trip version lookup failed: %s", e)
+        return None
+    if unprocessed:
+        return None
+    return {item['trip_id']: item for item in items}
+
+def response_etag(user_data: Dict, user_timezone: str, trip_ids: List[str], trip_records: Dict[str, Dict],
+                  query_params: Dict, aggregate_updated_at: Optional[str] = None) -> Optional[str]:
+    """🏷️ Weak ETag of a response, None when a trip has no modification time to version it by"""
+    digest = hashlib.sha256()
+    variant = {name: query_params.get(name) or '' for name in ETAG_QUERY_PARAMETERS}
+    variant['breakdown'] = variant['breakdown'].lower()
+    for part in (CURRENT_ALGORITHM_VERSION, user_timezone, aggregate_updated_at or '',
+                 json.dumps(user_data, cls=DecimalEncoder, sort_keys=True),
+                 json.dumps(variant, sort_keys=True)):
+        digest.update(str(part).encode('utf-8') + b'\x1e')
+    for trip_id in trip_ids:
+        record = trip_records.get(trip_id) or {}
+        version = [str(record.get(field) or '') for field in TRIP_VERSION_FIELDS]
+        if not any(version):
+            return None
+        digest.update('\x1f'.join([trip_id, *version]).encode('utf-8') + b'\x1e')
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+def request_header(event: Dict, name: str) -> Optional[str]:
+    """A request header, whatever case API Gateway passed it in"""
+    for header, value in (event.get('headers') or {}).items():
+        if header.lower() == name:
+            return value
+    return None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match (one tag, a list or *) against the ETag, weakly compared"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in tags)
+
+def etag_headers(etag: str) -> Dict:
+    # no-cache: clients keep the body but revalidate every poll
+    return {'ETag': etag, 'Cache-Control': 'no-cache', 'Access-Control-Expose-Headers': 'ETag'}
+
 # Main lambda handler
 def lambda_handler(event, context):
+    """Entry point: times the invocation and writes its performance line for every response"""
+    global _profile
+    # ⏱️ Fresh stage timings for this invocation
+    _profile = PerformanceProfile()
+    _profile.fields['engine'] = get_analysis_engine()
+    response = analyze_driver_request(event, context)
+    log_performance_profile(_profile.summary(), context, status=response['statusCode'], **_profile.fields)
+    return response
+
+def analyze_driver_request(event, context):
     """Main handler with fixed thresholds and moving average speed"""
+    query_params = None
+    cache_writer = None
+    store_writer = None
     try:
         query_params = event.get('queryStringParameters')
         if not query_params:
@@ -2090,10 +4304,28 @@ def lambda_handler(event, context):
                     'example_user_id': 'driver-name-format'
                 })
             }
+
+        # 📄 Optional paging: ?limit=&cursor=&since=&until= (None analyzes every trip)
+        try:
+            page_request = parse_page_request(query_params)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': str(e),
+                    'paging_parameters': list(PAGE_PARAMETERS),
+                    'example': 'limit=25&since=2025-01-01&until=2025-01-31, then cursor=<next_cursor>'
+                })
+            }
         
-        print(f"🚗 INDUSTRY STANDARD ANALYSIS for identifier: {user_identifier}")
+        logger.info("🚗 INDUSTRY STANDARD ANALYSIS for identifier: %s", user_identifier)
         
-        user_data = lookup_user_by_email_or_id(user_identifier)
+        with timed('user_lookup'):
+            user_data = lookup_user_by_email_or_id(user_identifier)
         
         if not user_data:
             return {
@@ -2110,12 +4342,17 @@ def lambda_handler(event, context):
             }
         
         user_id = user_data['user_id']
-        print(f"✅ Found user: {user_data.get('email', 'no-email')} -> analyzing trips for ID: {user_id}")
+        _profile.fields['user_id'] = user_id
+        logger.info("✅ Found user: %s -> analyzing trips for ID: %s", user_data.get('email', 'no-email'), user_id)
         
-        user_base_point = get_user_base_point(user_id)
-        trip_ids = get_user_trips_fixed(user_id)
-        
-        if not trip_ids:
+        next_cursor = None
+        with timed('trip_listing'):
+            if page_request is None:
+                trip_ids = get_user_trips_fixed(user_id)
+            else:
+                trip_ids, next_cursor = list_user_trips_page(user_id, page_request)
+
+        if not trip_ids and page_request is None:
             return {
                 'statusCode': 404,
                 'headers': {
@@ -2128,116 +4365,265 @@ def lambda_handler(event, context):
                     'searched_user': user_id
                 })
             }
-        
-        print(f"📊 Analyzing {len(trip_ids)} trips with INTELLIGENT CACHING")
-
-        # 🚀 OPTIMIZATION: Use caching instead of analyzing all trips
-        trip_analyses = []
-        cache_hits = 0
-        cache_misses = 0
-        stale_cache = 0
-        trips_to_cache = []
-
-        for trip_id in trip_ids:
-            # Try cache first
-            cached_analysis = get_cached_trip_analysis(trip_id)
 
-            if cached_analysis:
-                # 🔥 CRITICAL: Check if cached trip has timestamps - if missing, force re-analysis
-                cache_has_timestamps = bool(cached_analysis.get('start_timestamp') and cached_analysis.get('end_timestamp'))
+        # 🏷️ Version of the response from the trips' modification times: an unchanged poll gets a
+        # 304 before any cached analysis, store object or batch is read
+        user_timezone = get_user_timezone(user_id)
+        stored_aggregate = get_driver_aggregate(user_id) if page_request is not None else None
+        trip_records = None
+        etag = None
+        if not profile_requested(query_params):
+            with timed('trip_versions'):
+                trip_records = fetch_trip_versions(trip_ids)
+            if trip_records is not None:
+                etag = response_etag(user_data, user_timezone, trip_ids, trip_records, query_params,
+                                     stored_aggregate.updated_at if stored_aggregate else None)
+        if etag and etag_matches(request_header(event, 'if-none-match'), etag):
+            logger.info("🏷️ Not modified: %s trips for %s (%s)", len(trip_ids), user_id, etag)
+            _profile.fields.update(trips=len(trip_ids), not_modified=True)
+            return {
+                'statusCode': 304,
+                'headers': {
+                    'Access-Control-Allow-Origin': '*',
+                    **etag_headers(etag)
+                },
+                'body': ''
+            }
 
-                if not cache_has_timestamps:
-                    print(f"🔄 RE-ANALYZING - cache missing timestamps: {trip_id}")
-                    analysis = analyze_single_trip_with_frontend_values(user_id, trip_id, user_base_point)
+        with timed('base_point_lookup'):
+            user_base_point = get_user_base_point(user_id)
 
-                    if analysis:
-                        trip_analyses.append(analysis)
-                        trips_to_cache.append(analysis)
-                        stale_cache += 1
-                # Check if trip was modified since analysis
-                elif is_trip_modified_since_analysis(trip_id, cached_analysis):
-                    print(f"🔄 RE-ANALYZING modified trip: {trip_id}")
-                    analysis = analyze_single_trip_with_frontend_values(user_id, trip_id, user_base_point)
-
-                    if analysis:
-                        trip_analyses.append(analysis)
+        # 🪣 Drivers whose history is in the analysis store are served from it, nothing recomputed
+        # (paged requests list their trips by upload_timestamp, which the store does not index)
+        store_history = None
+        trip_objects = None  # {key: last written} of the driver's trip objects, when listed
+        if analysis_store is not None and page_request is None:
+            try:
+                if trip_records is None:
+                    with timed('trip_versions'):
+                        trip_records = fetch_trip_versions(trip_ids)
+                with timed('store_listing'):
+                    trip_objects = analysis_store.list_objects(trip_objects_prefix(user_id))
+                store_history = load_history_from_store(analysis_store, user_id, trip_ids, trip_records, trip_objects)
+            except Exception as e:
+                logger.warning("⚠️ Analysis store read failed for %s, using DynamoDB: %s", user_id, e)
+
+        if store_history:
+            trip_analyses, driver_aggregate, aggregate_status = store_history
+            logger.info("🪣 Serving %s trips for %s from the analysis store", len(trip_analyses), user_id)
+            cache_writer = CacheWriteBuffer()
+            if aggregate_status != 'reused':
+                # Trips finalized since the summary object was written
+                store_writer = AnalysisStoreWriter(analysis_store, user_id)
+                store_writer.set_summary(driver_aggregate, unanalyzed_trip_ids(trip_ids, trip_analyses))
+                store_writer.start()
+            cache_hits = total_trips_requested = len(trip_analyses)
+            cache_hit_rate = 100.0
+            _profile.fields.update(trips=total_trips_requested, cache_hits=cache_hits)
+            cache_stats = {
+                'history_source': 'analysis_store',
+                'cache_hits': cache_hits,
+                'cache_misses': 0,
+                'stale_cache': 0,
+                'total_trips': total_trips_requested,
+                'cache_hit_rate': cache_hit_rate,
+                'trips_cached_this_run': 0,
+                'trips_deferred': 0,
+                'driver_aggregate': aggregate_status,
+                'optimization_enabled': True
+            }
+        else:
+            logger.info("📊 Analyzing %s trips with INTELLIGENT CACHING", len(trip_ids))
+
+            # 🚀 OPTIMIZATION: Use caching instead of analyzing all trips
+            cache_hits = 0
+            cache_misses = 0
+            stale_cache = 0
+            trips_to_cache = []
+
+            trips_deferred = 0
+            # One slot per trip so results keep the trip_ids order whatever order they finish in
+            trip_slots = [None] * len(trip_ids)
+            pending_trips = []  # (slot, trip_id, 'analyzed' for a miss | 'reanalyzed' for stale/modified)
+
+            # 📦 All cache entries and modification checks up front, 100 keys per request
+            cache_lookups = lookup_cached_trips(trip_ids, trip_records)
+
+            for slot, trip_id in enumerate(trip_ids):
+                trip_started = time.perf_counter()
+
+                # Try cache first
+                cached_analysis, trip_modified = cache_lookups[trip_id]
+
+                if cached_analysis:
+                    # 🔥 CRITICAL: Check if cached trip has timestamps - if missing, force re-analysis
+                    cache_has_timestamps = bool(cached_analysis.get('start_timestamp') and cached_analysis.get('end_timestamp'))
+
+                    if not cache_has_timestamps:
+                        logger.info("🔄 RE-ANALYZING - cache missing timestamps: %s", trip_id)
+                        pending_trips.append((slot, trip_id, 'reanalyzed'))
+                    # Check if trip was modified since analysis
+                    else:
+                        if trip_modified:
+                            logger.info("🔄 RE-ANALYZING modified trip: %s", trip_id)
+                            pending_trips.append((slot, trip_id, 'reanalyzed'))
+                        else:
+                            # Use cached result - MASSIVE speedup!
+                            logger.debug("✅ USING CACHE: %s", trip_id)
+                            trip_slots[slot] = reconstruct_trip_from_cache(cached_analysis, trip_id)
+                            cache_hits += 1
+                            _profile.add_trip(trip_id, time.perf_counter() - trip_started, 'cache')
+                else:
+                    # Cache miss - analyze normally
+                    logger.info("🔄 ANALYZING new trip: %s", trip_id)
+                    pending_trips.append((slot, trip_id, 'analyzed'))
+
+            # ⚡ Misses, stale and modified trips: analyzed together (in parallel when it pays off)
+            if pending_trips:
+                analyses = analyze_trips(user_id, [(trip_id, source) for _, trip_id, source in pending_trips],
+                                         user_base_point, context)
+                for (slot, trip_id, source), analysis in zip(pending_trips, analyses):
+                    if analysis is TRIP_DEFERRED:
+                        trips_deferred += 1
+                    elif analysis:
+                        trip_slots[slot] = analysis
                         trips_to_cache.append(analysis)
-                        stale_cache += 1
+                        if source == 'reanalyzed':
+                            stale_cache += 1
+                        else:
+                            cache_misses += 1
+                if trips_deferred:
+                    logger.warning("⏳ Deferred %s trips to the next request (Lambda time nearly exhausted)", trips_deferred)
+
+            trip_analyses = [analysis for analysis in trip_slots if analysis]
+
+            # Cache all new/modified analyses
+            # 💾 Batched writes, flushed in the background while the response is built
+            cache_writer = CacheWriteBuffer()
+            # analysis_cached_at of every analysis in the response (identifies it in the driver aggregate)
+            analysis_stamps = {trip_id: cached.get('analysis_cached_at')
+                               for trip_id, (cached, _) in cache_lookups.items() if cached}
+            if trips_to_cache:
+                logger.info("💾 Caching %s trips...", len(trips_to_cache))
+                for trip in trips_to_cache:
+                    cache_entry = cache_writer.add(trip, user_id)
+                    analysis_stamps[trip['trip_id']] = cache_entry['analysis_cached_at'] if cache_entry else None
+
+            # 📊 Overall statistics from the persisted per-user aggregate, updated only for changed trips
+            previous_analyses = {}
+            for _, trip_id, _ in pending_trips:
+                cached = cache_lookups[trip_id][0]
+                if cached:
+                    previous_analyses[trip_id] = (reconstruct_trip_from_cache(cached, trip_id), cached.get('analysis_cached_at'))
+            with timed('aggregate'):
+                if page_request is None:
+                    driver_aggregate, aggregate_status = reconcile_driver_aggregate(
+                        get_driver_aggregate(user_id) if trip_analyses else None, trip_analyses, analysis_stamps, previous_analyses)
                 else:
-                    # Use cached result - MASSIVE speedup!
-                    print(f"✅ USING CACHE: {trip_id}")
-                    reconstructed = reconstruct_trip_from_cache(cached_analysis, trip_id)
-                    trip_analyses.append(reconstructed)
-                    cache_hits += 1
-            else:
-                # Cache miss - analyze normally
-                print(f"🔄 ANALYZING new trip: {trip_id}")
-                analysis = analyze_single_trip_with_frontend_values(user_id, trip_id, user_base_point)
-
-                if analysis:
-                    trip_analyses.append(analysis)
-                    trips_to_cache.append(analysis)
-                    cache_misses += 1
-
-        # Cache all new/modified analyses
-        if trips_to_cache:
-            print(f"💾 Caching {len(trips_to_cache)} trips...")
-            for trip in trips_to_cache:
-                cache_trip_analysis_enhanced(trip, user_id)
-
-        # Calculate cache performance
-        total_trips_requested = len(trip_ids)
-        cache_hit_rate = (cache_hits / total_trips_requested * 100) if total_trips_requested > 0 else 0.0
-
-        cache_stats = {
-            'cache_hits': cache_hits,
-            'cache_misses': cache_misses,
-            'stale_cache': stale_cache,
-            'total_trips': total_trips_requested,
-            'cache_hit_rate': round(cache_hit_rate, 1),
-            'trips_cached_this_run': len(trips_to_cache),
-            'optimization_enabled': True
-        }
+                    # 📄 Only this page's trips are loaded: the rest of the history comes from the stored aggregate
+                    driver_aggregate, aggregate_status = reconcile_page_aggregate(
+                        stored_aggregate, trip_analyses, analysis_stamps, previous_analyses)
+            if aggregate_status in ('updated', 'rebuilt') and trip_analyses:
+                cache_writer.add_item(driver_aggregate.to_item(user_id))
+            cache_writer.start_flush()
+
+            # 🪣 Backfill the analysis store with this response's trips whose object is missing or
+            # outdated (everything when the listing failed); the summary object (which lets the
+            # next request be served from the store) only when no trip was deferred
+            if analysis_store is not None and trip_analyses and page_request is None:
+                store_writer = AnalysisStoreWriter(analysis_store, user_id)
+                reanalyzed = {trip['trip_id'] for trip in trips_to_cache}
+                for trip in trip_analyses:
+                    trip_id = trip['trip_id']
+                    if (trip_objects is None or trip_id in reanalyzed
+                            or trip_object_outdated(trip_objects.get(trip_object_key(user_id, trip_id)),
+                                                    analysis_stamps.get(trip_id), (trip_records or {}).get(trip_id))):
+                        store_writer.add_trip(trip, analysis_stamps.get(trip_id))
+                if not trips_deferred:
+                    store_writer.set_summary(driver_aggregate, unanalyzed_trip_ids(trip_ids, trip_analyses), trip_ids)
+                store_writer.start()
+
+            # Calculate cache performance
+            total_trips_requested = len(trip_ids)
+            cache_hit_rate = (cache_hits / total_trips_requested * 100) if total_trips_requested > 0 else 0.0
+
+            _profile.fields.update(trips=total_trips_requested, cache_hits=cache_hits)
+
+            cache_stats = {
+                'history_source': 'dynamodb',
+                'cache_hits': cache_hits,
+                'cache_misses': cache_misses,
+                'stale_cache': stale_cache,
+                'total_trips': total_trips_requested,
+                'cache_hit_rate': round(cache_hit_rate, 1),
+                'trips_cached_this_run': len(trips_to_cache),
+                'trips_deferred': trips_deferred,
+                'driver_aggregate': aggregate_status,
+                'cache_flush_complete': True,
+                'cache_writes_succeeded': 0,
+                'cache_writes_failed': 0,
+                'cache_write_failed_trip_ids': [],
+                'optimization_enabled': True
+            }
 
-        print(f"\n📈 CACHE PERFORMANCE:")
-        print(f"   Total Trips: {total_trips_requested}")
-        print(f"   ✅ Cache Hits: {cache_hits} ({cache_hit_rate:.1f}%) - FAST!")
-        print(f"   ❌ Cache Misses: {cache_misses}")
-        print(f"   🔄 Stale: {stale_cache}")
-        print(f"   💾 Cached This Run: {len(trips_to_cache)}")
+            logger.info("\n📈 CACHE PERFORMANCE:")
+            logger.info("   Total Trips: %s", total_trips_requested)
+            logger.info("   ✅ Cache Hits: %s (%.1f%%) - FAST!", cache_hits, cache_hit_rate)
+            logger.info("   ❌ Cache Misses: %s", cache_misses)
+            logger.info("   🔄 Stale: %s", stale_cache)
+            logger.info("   💾 Cached This Run: %s", len(trips_to_cache))
 
-        if cache_hit_rate > 50:
-            estimated_speedup = int(cache_hit_rate / 10)
-            print(f"   🚀 PERFORMANCE BOOST: ~{estimated_speedup}x faster!")
+            if cache_hit_rate > 50:
+                estimated_speedup = int(cache_hit_rate / 10)
+                logger.info("   🚀 PERFORMANCE BOOST: ~%sx faster!", estimated_speedup)
 
-        if not trip_analyses:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'No analyzable trip data found',
-                    'user_id': user_id,
-                    'trips_found': len(trip_ids),
-                    'trips_analyzed': len(trip_analyses)
-                })
-            }
+            if not trip_analyses and trips_deferred:
+                # Out of time before any trip finished: nothing is wrong with the data, ask for a retry
+                return {
+                    'statusCode': 503,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*',
+                        'Retry-After': '1'
+                    },
+                    'body': json.dumps({
+                        'error': 'Trip analysis did not finish in time, please retry',
+                        'user_id': user_id,
+                        'trips_found': len(trip_ids),
+                        'trips_deferred': trips_deferred
+                    })
+                }
+
+            # (a paged request past the last trip still gets the driver's overall fields)
+            if not trip_analyses and (page_request is None or driver_aggregate is None):
+                return {
+                    'statusCode': 404,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*'
+                    },
+                    'body': json.dumps({
+                        'error': 'No analyzable trip data found',
+                        'user_id': user_id,
+                        'trips_found': len(trip_ids),
+                        'trips_analyzed': len(trip_analyses)
+                    })
+                }
 
-        print(f"✅ Successfully processed {len(trip_analyses)} trips (🚀 {cache_hits} from cache!)")
+        logger.info("✅ Successfully processed %s trips (🚀 %s from cache!)", len(trip_analyses), cache_hits)
 
         # 🕐 TIMEZONE CONVERSION: Add display fields for user's local timezone
         # IMPORTANT: Keep original timestamp fields in UTC for DateTime.parse() compatibility
-        user_timezone = get_user_timezone(user_id)
-        print(f"🕐 Adding local time display fields for {user_timezone}")
+        # (user_timezone was read with the trip versions)
+        logger.info("🕐 Adding local time display fields for %s", user_timezone)
 
-        # 🔥 DEBUG: Log ALL trip timestamps BEFORE processing
-        print(f"\n📅 TIMESTAMP DEBUG - BEFORE PROCESSING:")
-        for i, trip in enumerate(trip_analyses):
-            print(f"\n  Trip {i+1}/{len(trip_analyses)} - {trip.get('trip_id', 'unknown')}")
-            print(f"    start_timestamp: {trip.get('start_timestamp', 'MISSING')}")
-            print(f"    end_timestamp: {trip.get('end_timestamp', 'MISSING')}")
+        # 🔥 DEBUG: Log ALL trip timestamps BEFORE processing (LOG_LEVEL=DEBUG only)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n📅 TIMESTAMP DEBUG - BEFORE PROCESSING:")
+            for i, trip in enumerate(trip_analyses):
+                logger.debug("\n  Trip %s/%s - %s", i + 1, len(trip_analyses), trip.get('trip_id', 'unknown'))
+                logger.debug("    start_timestamp: %s", trip.get('start_timestamp', 'MISSING'))
+                logger.debug("    end_timestamp: %s", trip.get('end_timestamp', 'MISSING'))
 
         for trip in trip_analyses:
             # DON'T modify original timestamp fields - keep them in UTC!
@@ -2248,7 +4634,7 @@ def lambda_handler(event, context):
                 ts = str(trip['start_timestamp'])
                 if not ts.endswith('Z') and '+' not in ts and '-' not in ts[10:]:
                     trip['start_timestamp'] = ts + 'Z'  # Mark as UTC
-                    print(f"✅ Added 'Z' to start_timestamp: {trip['start_timestamp']}")
+                    logger.debug("✅ Added 'Z' to start_timestamp: %s", trip['start_timestamp'])
 
                 trip['start_time_display'] = format_timestamp_with_timezone(trip['start_timestamp'], user_timezone)
 
@@ -2257,150 +4643,40 @@ def lambda_handler(event, context):
                 ts = str(trip['end_timestamp'])
                 if not ts.endswith('Z') and '+' not in ts and '-' not in ts[10:]:
                     trip['end_timestamp'] = ts + 'Z'  # Mark as UTC
-                    print(f"✅ Added 'Z' to end_timestamp: {trip['end_timestamp']}")
+                    logger.debug("✅ Added 'Z' to end_timestamp: %s", trip['end_timestamp'])
 
                 trip['end_time_display'] = format_timestamp_with_timezone(trip['end_timestamp'], user_timezone)
 
             # Add timezone info for reference
             trip['user_timezone'] = user_timezone
 
-        # 🔥 DEBUG: Log ALL trip timestamps AFTER processing
-        print(f"\n📅 TIMESTAMP DEBUG - AFTER PROCESSING (FINAL):")
-        for i, trip in enumerate(trip_analyses):
-            print(f"\n  Trip {i+1}/{len(trip_analyses)} - {trip.get('trip_id', 'unknown')}")
-            print(f"    start_timestamp: {trip.get('start_timestamp', 'MISSING')}")
-            print(f"    end_timestamp: {trip.get('end_timestamp', 'MISSING')}")
+        # 🔥 DEBUG: Log ALL trip timestamps AFTER processing (LOG_LEVEL=DEBUG only)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n📅 TIMESTAMP DEBUG - AFTER PROCESSING (FINAL):")
+            for i, trip in enumerate(trip_analyses):
+                logger.debug("\n  Trip %s/%s - %s", i + 1, len(trip_analyses), trip.get('trip_id', 'unknown'))
+                logger.debug("    start_timestamp: %s", trip.get('start_timestamp', 'MISSING'))
+                logger.debug("    end_timestamp: %s", trip.get('end_timestamp', 'MISSING'))
 
         # Calculate overall statistics
-        total_trips = len(trip_analyses)
-        total_distance = sum(trip['total_distance_miles'] for trip in trip_analyses)
-        total_time_minutes = sum(trip['duration_minutes'] for trip in trip_analyses)
-
-        # FIXED: Calculate overall moving time and moving average speed
-        total_moving_time_minutes = sum(trip.get('moving_time_minutes', trip['duration_minutes']) for trip in trip_analyses)
-        total_stationary_time_minutes = sum(trip.get('stationary_time_minutes', 0) for trip in trip_analyses)
-
-        # PRIVACY FIX: Allow stationary trips (distance = 0) - they are still valid trips!
-        # Only reject if there are NO trips at all, not if trips are stationary
-        # This allows trip history to show even when user was stationary (e.g., testing consecutive deltas)
-        # if total_distance <= 0:
-        #     return {
-        #         'statusCode': 400,
-        #         'headers': {
-        #             'Content-Type': 'application/json',
-        #             'Access-Control-Allow-Origin': '*'
-        #         },
-        #         'body': json.dumps({
-        #             'error': 'No valid distance data found',
-        #             'user_id': user_id
-        #         })
-        #     }
-        
-        # Calculate weighted averages (handle stationary trips with 0 distance)
-        if total_distance > 0:
-            weighted_behavior_score = sum(
-                trip['behavior_score'] * trip['total_distance_miles']
-                for trip in trip_analyses
-            ) / total_distance
-
-            overall_speed_consistency = sum(
-                trip['speed_consistency'] * trip['total_distance_miles']
-                for trip in trip_analyses
-            ) / total_distance
-        else:
-            # Stationary trips: use simple average instead of weighted
-            weighted_behavior_score = sum(trip['behavior_score'] for trip in trip_analyses) / len(trip_analyses)
-            overall_speed_consistency = sum(trip['speed_consistency'] for trip in trip_analyses) / len(trip_analyses)
-        
-        # FIXED: Calculate overall moving average speed
-        if total_moving_time_minutes > 0:
-            overall_moving_avg_speed = (total_distance / (total_moving_time_minutes / 60))
-        else:
-            overall_moving_avg_speed = 0.0
-        
-        # Overall average speed (including stationary time)
-        if total_time_minutes > 0:
-            overall_avg_speed = (total_distance / (total_time_minutes / 60))
-        else:
-            overall_avg_speed = 0.0
-        
-        # Aggregate harsh events
-        total_harsh_events = sum(trip['total_harsh_events'] for trip in trip_analyses)
-        total_dangerous_events = sum(trip['total_dangerous_events'] for trip in trip_analyses)
-
-        # Calculate overall frequency metrics (handle stationary trips)
-        if total_distance > 0:
-            overall_events_per_100_miles = (total_harsh_events / total_distance) * 100
-        else:
-            overall_events_per_100_miles = 0.0
-        
-        # Aggregate context information
-        context_distribution = {}
-        for trip in trip_analyses:
-            context = trip.get('driving_context', {}).get('context', 'mixed')
-            context_distribution[context] = context_distribution.get(context, 0) + trip['total_distance_miles']
-
-        # Determine dominant context (handle stationary trips)
-        if context_distribution and total_distance > 0:
-            dominant_context = max(context_distribution.keys(), key=lambda k: context_distribution[k])
-            context_confidence = context_distribution[dominant_context] / total_distance
-        else:
-            dominant_context = 'stationary'
-            context_confidence = 1.0
-
-        # Calculate overall weighted events (handle stationary trips)
-        if total_distance > 0:
-            overall_weighted_events = sum(
-                trip.get('weighted_events_per_100_miles', trip['events_per_100_miles']) * trip['total_distance_miles']
-                for trip in trip_analyses
-            ) / total_distance
-        else:
-            # Stationary trips: use simple average
-            overall_weighted_events = sum(
-                trip.get('weighted_events_per_100_miles', trip['events_per_100_miles'])
-                for trip in trip_analyses
-            ) / len(trip_analyses) if trip_analyses else 0.0
-        
-        # Determine overall industry rating
-        if overall_weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['exceptional']:
-            overall_rating = 'Exceptional'
-        elif overall_weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['excellent']:
-            overall_rating = 'Excellent'
-        elif overall_weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['very_good']:
-            overall_rating = 'Very Good'
-        elif overall_weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['good']:
-            overall_rating = 'Good'
-        elif overall_weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['fair']:
-            overall_rating = 'Fair'
-        elif overall_weighted_events <= IndustryStandardMetrics.FREQUENCY_BENCHMARKS['poor']:
-            overall_rating = 'Poor'
-        else:
-            overall_rating = 'Dangerous'
-        
-        # Calculate risk level
-        risk_level = get_risk_level_consistent(weighted_behavior_score)
+        # 📊 From the driver aggregate's running sums - no pass over trip_analyses
+        overall = driver_aggregate.metrics()
+        overall_fields = driver_aggregate.analytics_fields(overall)
         
-        # Privacy protection statistics
-        privacy_protected_trips = sum(1 for trip in trip_analyses if trip.get('privacy_protected', False))
-        privacy_percentage = (privacy_protected_trips / total_trips) * 100
-        
-        # Calculate moving percentage
-        overall_moving_percentage = (total_moving_time_minutes / total_time_minutes) * 100 if total_time_minutes > 0 else 0
-        
-        print(f"🏆 ANALYSIS Complete:")
-        print(f"   User: {user_id}")
-        print(f"   Email: {user_data.get('email', 'unknown')}")
-        print(f"   Trips Analyzed: {total_trips}")
-        print(f"   Total Distance: {total_distance:.2f} miles")
-        print(f"   Dominant Context: {dominant_context} ({context_confidence:.1%} of distance)")
-        print(f"   Overall Score: {weighted_behavior_score:.1f} ({get_behavior_category(weighted_behavior_score)})")
-        print(f"   Industry Rating: {overall_rating}")
-        print(f"   Risk Level: {risk_level}")
-        print(f"   Moving Average Speed: {overall_moving_avg_speed:.1f} mph")
-        print(f"   Overall Average Speed: {overall_avg_speed:.1f} mph")
-        print(f"   Time Moving: {overall_moving_percentage:.1f}%")
-        print(f"   Events per 100 miles: {overall_events_per_100_miles:.2f}")
-        print(f"   Privacy Protection: {privacy_percentage:.1f}%")
+        logger.info("🏆 ANALYSIS Complete:")
+        logger.info("   User: %s", user_id)
+        logger.info("   Email: %s", user_data.get('email', 'unknown'))
+        logger.info("   Trips Analyzed: %s", overall['total_trips'])
+        logger.info("   Total Distance: %.2f miles", overall['total_distance'])
+        logger.info("   Dominant Context: %s (%.1f%% of distance)", overall['dominant_context'], overall['context_confidence'] * 100)
+        logger.info("   Overall Score: %.1f (%s)", overall['weighted_behavior_score'], overall_fields['behavior_category'])
+        logger.info("   Industry Rating: %s", overall_fields['industry_rating'])
+        logger.info("   Risk Level: %s", overall_fields['risk_level'])
+        logger.info("   Moving Average Speed: %.1f mph", overall['overall_moving_avg_speed'])
+        logger.info("   Overall Average Speed: %.1f mph", overall['overall_avg_speed'])
+        logger.info("   Time Moving: %.1f%%", overall['overall_moving_percentage'])
+        logger.info("   Events per 100 miles: %.2f", overall['overall_events_per_100_miles'])
+        logger.info("   Privacy Protection: %.1f%%", overall['privacy_percentage'])
         
         # Comprehensive analytics response
         analytics = {
@@ -2411,53 +4687,8 @@ def lambda_handler(event, context):
             'analysis_timestamp': datetime.now(timezone.utc).isoformat(),
             'algorithm_version': '2.0_industry_standard_fixed',
             
-            # Trip statistics
-            'total_trips': total_trips,
-            'total_distance_miles': round(total_distance, 2),
-            'total_driving_time_hours': round(total_time_minutes / 60, 2),
-            'formatted_total_time': format_duration_smart(total_time_minutes),
-            
-            # FIXED: Moving time statistics
-            'total_moving_time_hours': round(total_moving_time_minutes / 60, 2),
-            'total_stationary_time_hours': round(total_stationary_time_minutes / 60, 2),
-            'overall_moving_percentage': round(overall_moving_percentage, 1),
-            
-            'avg_trip_distance_miles': round(total_distance / total_trips, 2),
-            'avg_trip_duration_minutes': round(total_time_minutes / total_trips, 1),
-            
-            # Overall performance
-            'overall_behavior_score': round(weighted_behavior_score, 1),
-            'behavior_category': get_behavior_category(weighted_behavior_score),
-            'risk_level': risk_level,
-            'speed_consistency_score': round(overall_speed_consistency, 1),
-            
-            # Context information
-            'dominant_driving_context': dominant_context,
-            'context_confidence': round(context_confidence, 2),
-            'context_distribution': {k: round(v, 2) for k, v in context_distribution.items()},
-            
-            # Harsh events
-            'total_harsh_events': total_harsh_events,
-            'total_dangerous_events': total_dangerous_events,
-            'events_per_100_miles': round(overall_events_per_100_miles, 2),
-            'weighted_events_per_100_miles': round(overall_weighted_events, 2),
-            'harsh_events_per_100_miles': round(overall_events_per_100_miles, 2),
-            'industry_rating': overall_rating,
-            
-            # Speed metrics - FIXED with moving average
-            'overall_avg_speed_mph': round(overall_avg_speed, 1),
-            'overall_moving_avg_speed_mph': round(overall_moving_avg_speed, 1),
-            'overall_max_speed_mph': max(trip['max_speed_mph'] for trip in trip_analyses),
-            
-            # Turn metrics
-            'total_dangerous_turns': sum(trip.get('dangerous_turns', 0) for trip in trip_analyses),
-            'safe_turns_percentage': round(
-                sum(trip.get('safe_turns', 0) for trip in trip_analyses) /
-                max(1, sum(trip.get('total_turns', 0) for trip in trip_analyses)) * 100, 1
-            ),
-            
-            # Privacy
-            'privacy_protection_percentage': round(privacy_percentage, 1),
+            # 📊 Trip statistics, performance, context, events, speeds, turns, privacy
+            **overall_fields,
             'privacy_base_point': {
                 'city': user_base_point['city'],
                 'state': user_base_point['state'],
@@ -2482,6 +4713,7 @@ def lambda_handler(event, context):
 
             # 🚀 OPTIMIZATION: Cache performance metrics
             'cache_performance': cache_stats,
+            'analysis_engine': get_analysis_engine(),
             'intelligent_caching_enabled': True,
             'performance_optimized': True
         }
@@ -2490,25 +4722,50 @@ def lambda_handler(event, context):
         # No need to re-store here - caching happens automatically for new/modified trips
         # Cached trips are already in DynamoDB, so we skip redundant writes
         
-        print(f"✅ OPTIMIZED ANALYSIS COMPLETE - PRODUCTION READY")
-        print(f"🚀 Cache Performance: {cache_hit_rate:.1f}% hit rate ({cache_hits}/{total_trips_requested} trips cached)")
-        
-        # Convert Decimal objects for JSON serialization
-        analytics_json = convert_decimal_to_float(analytics)
+        logger.info("✅ OPTIMIZED ANALYSIS COMPLETE - PRODUCTION READY")
+        logger.info("🚀 Cache Performance: %.1f%% hit rate (%s/%s trips cached)", cache_hit_rate, cache_hits, total_trips_requested)
         
+        # 📄 Paged requests: this page's trips; overall fields for the whole history unless no
+        # aggregate was stored yet (overall_scope 'page' until an unpaged request builds it)
+        if page_request is not None:
+            analytics['next_cursor'] = next_cursor
+            analytics['overall_scope'] = 'page' if aggregate_status == 'page' else 'driver'
+
+        # 💾 Report the background cache flush (partial failures are re-analyzed next request)
+        cache_stats.update(cache_writer.wait())
+        if store_writer is not None:
+            cache_stats.update(store_writer.wait())
+
+        # 📊 Optional per-period view: ?breakdown=day|week|month
+        breakdown = (query_params.get('breakdown') or '').lower()
+        if breakdown in BREAKDOWN_PERIODS:
+            analytics['period_breakdown'] = [
+                {'period': period, **aggregate.analytics_fields()}
+                for period, aggregate in aggregate_trips_by_period(trip_analyses, breakdown).items()
+            ]
+
+        # ⏱️ Stage timings (lambda_handler logs them for every response)
+        if profile_requested(query_params):
+            analytics['performance_profile'] = _profile.summary()
+
+        headers = {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        }
+        # 🏷️ Deferred trips are missing from this body: no ETag, so the next poll gets them
+        if etag and not cache_stats['trips_deferred']:
+            headers.update(etag_headers(etag))
+
+        # 🚀 OPTIMIZATION: Decimals are serialized by the encoder - no deep copy of the response
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps(analytics_json)
+            'headers': headers,
+            'body': json.dumps(analytics, cls=DecimalEncoder)
         }
         
     except Exception as e:
-        print(f"❌ CRITICAL ERROR in analysis: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ CRITICAL ERROR in analysis: %s", str(e))
+        _profile.fields['error'] = type(e).__name__
         
         return {
             'statusCode': 500,
@@ -2522,4 +4779,12 @@ def lambda_handler(event, context):
                 'error_type': 'analysis_error'
             })
         }
+    finally:
+        # Never leave a flush or backfill running into a frozen Lambda (early returns and errors
+        # included): no timeout here, the response above only waited CACHE_FLUSH_WAIT_SECONDS
+        # and STORE_WRITE_WAIT_SECONDS
+        if cache_writer is not None:
+            cache_writer.wait(timeout=None)
+        if store_writer is not None:
+            store_writer.wait(timeout=None)
 
@@ -1,5 +1,7 @@
 # ENHANCED auth_user.py - Complete Account & Data Deletion
 import json
+import logging
+import os
 import boto3
 import hashlib
 import secrets
@@ -8,6 +10,11 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
+# Leveled logging: LOG_LEVEL env var (DEBUG, INFO, WARNING, ERROR), default INFO
+# Messages take %-style arguments so nothing is formatted unless the level is enabled
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO))
+
 dynamodb = boto3.resource('dynamodb')
 users_table = dynamodb.Table('Users-Neal')
 trajectory_batches_table = dynamodb.Table('TrajectoryBatches-Neal')
@@ -24,6 +31,22 @@ try:
 except:
     trip_summaries_table = None
 
+# analyze-driver's per-driver aggregate in DrivingSummaries-Neal (trip_id = aggregate#<user_id>).
+# It has no user_id attribute, so the user_id scan below never finds it.
+AGGREGATE_KEY_PREFIX = 'aggregate#'
+
+# analyze-driver's analysis object store (ANALYSIS_STORE): a deleted account's objects
+# (users/{user_id}/) go with it. Needs analysis_object_store.py in this Lambda's package.
+ANALYSIS_STORE = os.environ.get('ANALYSIS_STORE', '').strip()
+try:
+    from analysis_object_store import delete_user_objects, open_analysis_store
+    analysis_store = open_analysis_store(ANALYSIS_STORE)
+except ImportError:
+    analysis_store = None
+    if ANALYSIS_STORE:
+        logger.error("❌ ANALYSIS_STORE is set but analysis_object_store.py is not bundled: "
+                     "deleted accounts would keep their analysis objects")
+
 def convert_to_decimal(obj):
     """Convert float values to Decimal for DynamoDB storage"""
     if isinstance(obj, dict):
@@ -104,7 +127,7 @@ def hash_password(password):
         stored_password = salt + pwdhash.hex()
         return stored_password
     except Exception as e:
-        print(f"Error hashing password: {e}")
+        logger.error("Error hashing password: %s", e)
         return None
 
 def verify_password(password, stored_password):
@@ -128,7 +151,7 @@ def verify_password(password, stored_password):
         # Compare hashes securely
         return secrets.compare_digest(stored_hash, pwdhash.hex())
     except Exception as e:
-        print(f"Error verifying password: {e}")
+        logger.error("Error verifying password: %s", e)
         return False
 
 def check_email_exists(email):
@@ -142,7 +165,7 @@ def check_email_exists(email):
         )
         return len(response['Items']) > 0
     except Exception as e:
-        print(f"Error checking email existence: {e}")
+        logger.error("Error checking email existence: %s", e)
         return False
 
 def validate_privacy_settings(privacy_settings):
@@ -166,7 +189,7 @@ def validate_privacy_settings(privacy_settings):
             
         return validated
     except Exception as e:
-        print(f"Error validating privacy settings: {e}")
+        logger.error("Error validating privacy settings: %s", e)
         return None
 
 def validate_base_point(base_point):
@@ -177,7 +200,7 @@ def validate_base_point(base_point):
     try:
         required_fields = ['latitude', 'longitude', 'city', 'state', 'source']
         if not all(field in base_point for field in required_fields):
-            print(f"Base point missing required fields: {required_fields}")
+            logger.warning("Base point missing required fields: %s", required_fields)
             return None
             
         # Validate coordinate ranges
@@ -185,7 +208,7 @@ def validate_base_point(base_point):
         lon = float(base_point['longitude'])
         
         if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
-            print(f"Invalid coordinates: lat={lat}, lon={lon}")
+            logger.warning("Invalid coordinates: lat=%s, lon=%s", lat, lon)
             return None
             
         validated = {
@@ -200,7 +223,7 @@ def validate_base_point(base_point):
         
         return validated
     except Exception as e:
-        print(f"Error validating base point: {e}")
+        logger.error("Error validating base point: %s", e)
         return None
 
 def delete_user_trip_data(user_id):
@@ -212,16 +235,18 @@ def delete_user_trip_data(user_id):
         'trajectory_batches_deleted': 0,
         'trips_deleted': 0,
         'summaries_deleted': 0,
+        'driver_aggregate_deleted': False,
         'trip_summaries_deleted': 0,
+        'store_objects_deleted': 0,
         'errors': []
     }
     
     try:
-        print(f"🗑️ Starting complete data deletion for user: {user_id}")
+        logger.info("🗑️ Starting complete data deletion for user: %s", user_id)
         
         # 1. Delete TrajectoryBatches (trip GPS data)
         try:
-            print("🗑️ Deleting trajectory batches...")
+            logger.info("🗑️ Deleting trajectory batches...")
             response = trajectory_batches_table.scan(
                 FilterExpression='user_id = :user_id',
                 ExpressionAttributeValues={':user_id': user_id},
@@ -237,16 +262,16 @@ def delete_user_trip_data(user_id):
                 )
                 deletion_summary['trajectory_batches_deleted'] += 1
             
-            print(f"✅ Deleted {deletion_summary['trajectory_batches_deleted']} trajectory batches")
+            logger.info("✅ Deleted %s trajectory batches", deletion_summary['trajectory_batches_deleted'])
             
         except Exception as e:
             error_msg = f"Error deleting trajectory batches: {e}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             deletion_summary['errors'].append(error_msg)
         
         # 2. Delete Trips
         try:
-            print("🗑️ Deleting trips...")
+            logger.info("🗑️ Deleting trips...")
             response = trips_table.scan(
                 FilterExpression='user_id = :user_id',
                 ExpressionAttributeValues={':user_id': user_id},
@@ -262,43 +287,52 @@ def delete_user_trip_data(user_id):
                 )
                 deletion_summary['trips_deleted'] += 1
             
-            print(f"✅ Deleted {deletion_summary['trips_deleted']} trips")
+            logger.info("✅ Deleted %s trips", deletion_summary['trips_deleted'])
             
         except Exception as e:
             error_msg = f"Error deleting trips: {e}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             deletion_summary['errors'].append(error_msg)
         
         # 3. Delete DrivingSummaries (if table exists)
         if summaries_table:
             try:
-                print("🗑️ Deleting driving summaries...")
+                logger.info("🗑️ Deleting driving summaries...")
                 response = summaries_table.scan(
                     FilterExpression='user_id = :user_id',
                     ExpressionAttributeValues={':user_id': user_id}
                 )
                 
                 for item in response['Items']:
-                    # Delete using the primary key (adjust based on your table schema)
+                    # DrivingSummaries-Neal is keyed by trip_id (analyze-driver's cache entries)
                     summaries_table.delete_item(
                         Key={
-                            'user_id': item['user_id'],
-                            'summary_id': item.get('summary_id')  # Adjust based on your schema
+                            'trip_id': item['trip_id']
                         }
                     )
                     deletion_summary['summaries_deleted'] += 1
+
+                # The driver aggregate, by key (it carries no user_id)
+                response = summaries_table.delete_item(
+                    Key={'trip_id': AGGREGATE_KEY_PREFIX + user_id},
+                    ReturnValues='ALL_OLD'
+                )
+                if response.get('Attributes'):
+                    deletion_summary['driver_aggregate_deleted'] = True
+                    deletion_summary['summaries_deleted'] += 1
                 
-                print(f"✅ Deleted {deletion_summary['summaries_deleted']} driving summaries")
+                logger.info("✅ Deleted %s driving summaries (driver aggregate: %s)",
+                            deletion_summary['summaries_deleted'], deletion_summary['driver_aggregate_deleted'])
                 
             except Exception as e:
                 error_msg = f"Error deleting driving summaries: {e}"
-                print(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 deletion_summary['errors'].append(error_msg)
         
         # 4. Delete TripSummaries (if table exists)
         if trip_summaries_table:
             try:
-                print("🗑️ Deleting trip summaries...")
+                logger.info("🗑️ Deleting trip summaries...")
                 response = trip_summaries_table.scan(
                     FilterExpression='user_id = :user_id',
                     ExpressionAttributeValues={':user_id': user_id}
@@ -312,31 +346,47 @@ def delete_user_trip_data(user_id):
                     )
                     deletion_summary['trip_summaries_deleted'] += 1
                 
-                print(f"✅ Deleted {deletion_summary['trip_summaries_deleted']} trip summaries")
+                logger.info("✅ Deleted %s trip summaries", deletion_summary['trip_summaries_deleted'])
                 
             except Exception as e:
                 error_msg = f"Error deleting trip summaries: {e}"
-                print(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 deletion_summary['errors'].append(error_msg)
         
+        # 5. Delete the user's analysis store objects (ANALYSIS_STORE)
+        if analysis_store is not None:
+            try:
+                logger.info("🗑️ Deleting analysis store objects...")
+                deletion_summary['store_objects_deleted'] = delete_user_objects(analysis_store, user_id)
+                logger.info("✅ Deleted %s analysis store objects", deletion_summary['store_objects_deleted'])
+
+            except Exception as e:
+                error_msg = f"Error deleting analysis store objects: {e}"
+                logger.error("❌ %s", error_msg)
+                deletion_summary['errors'].append(error_msg)
+        elif ANALYSIS_STORE:
+            deletion_summary['errors'].append("Analysis store objects not deleted: analysis_object_store.py is not bundled")
+        
         total_deleted = (deletion_summary['trajectory_batches_deleted'] + 
                         deletion_summary['trips_deleted'] + 
                         deletion_summary['summaries_deleted'] + 
-                        deletion_summary['trip_summaries_deleted'])
-        
-        print(f"🎯 DATA DELETION COMPLETE:")
-        print(f"   Total items deleted: {total_deleted}")
-        print(f"   Trajectory batches: {deletion_summary['trajectory_batches_deleted']}")
-        print(f"   Trips: {deletion_summary['trips_deleted']}")
-        print(f"   Driving summaries: {deletion_summary['summaries_deleted']}")
-        print(f"   Trip summaries: {deletion_summary['trip_summaries_deleted']}")
-        print(f"   Errors: {len(deletion_summary['errors'])}")
+                        deletion_summary['trip_summaries_deleted'] +
+                        deletion_summary['store_objects_deleted'])
+        
+        logger.info("🎯 DATA DELETION COMPLETE:")
+        logger.info("   Total items deleted: %s", total_deleted)
+        logger.info("   Trajectory batches: %s", deletion_summary['trajectory_batches_deleted'])
+        logger.info("   Trips: %s", deletion_summary['trips_deleted'])
+        logger.info("   Driving summaries: %s", deletion_summary['summaries_deleted'])
+        logger.info("   Trip summaries: %s", deletion_summary['trip_summaries_deleted'])
+        logger.info("   Analysis store objects: %s", deletion_summary['store_objects_deleted'])
+        logger.info("   Errors: %s", len(deletion_summary['errors']))
         
         return deletion_summary
         
     except Exception as e:
         error_msg = f"Critical error in data deletion: {e}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         deletion_summary['errors'].append(error_msg)
         return deletion_summary
 
@@ -367,7 +417,7 @@ def create_success_response(data):
 def handle_signup(body):
     """Handle user signup with email/password"""
     try:
-        print("🔐 SIGNUP: Starting user registration")
+        logger.info("🔐 SIGNUP: Starting user registration")
         
         # Extract and validate required fields
         email = body.get('email', '').strip().lower()
@@ -375,46 +425,46 @@ def handle_signup(body):
         name = body.get('name', '').strip()
         role = body.get('role', '')
         
-        print(f"📧 Signup attempt for email: {email}")
+        logger.info("📧 Signup attempt for email: %s", email)
         
         # Validate required fields
         if not email or not password or not name or not role:
-            print("❌ Missing required fields")
+            logger.warning("❌ Missing required fields")
             return create_error_response(400, 'Email, password, name, and role are required')
         
         # Validate email
         email_valid, email_error = validate_email(email)
         if not email_valid:
-            print(f"❌ Invalid email: {email_error}")
+            logger.warning("❌ Invalid email: %s", email_error)
             return create_error_response(400, email_error)
         
         # Validate password
         password_valid, password_error = validate_password(password)
         if not password_valid:
-            print(f"❌ Invalid password: {password_error}")
+            logger.warning("❌ Invalid password: %s", password_error)
             return create_error_response(400, password_error)
         
         # Validate role
         if role not in ['driver', 'provider', 'admin']:
-            print(f"❌ Invalid role: {role}")
+            logger.warning("❌ Invalid role: %s", role)
             return create_error_response(400, 'Role must be either "driver", "provider", or "admin"')
         
         # Check if email already exists (early check to prevent processing)
         if check_email_exists(email):
-            print(f"❌ Email already exists: {email}")
+            logger.warning("❌ Email already exists: %s", email)
             return create_error_response(409, 'An account with this email already exists. Please sign in instead.')
         
         # Generate unique user ID
         user_id = str(uuid.uuid4())
-        print(f"🆔 Generated user ID: {user_id}")
+        logger.info("🆔 Generated user ID: %s", user_id)
         
         # Hash password
         hashed_password = hash_password(password)
         if not hashed_password:
-            print("❌ Failed to hash password")
+            logger.error("❌ Failed to hash password")
             return create_error_response(500, 'Failed to secure password')
         
-        print("🔒 Password hashed successfully")
+        logger.info("🔒 Password hashed successfully")
         
         # Prepare user data
         user_data = {
@@ -431,24 +481,24 @@ def handle_signup(body):
         
         # Add driver-specific fields
         if role == 'driver':
-            print("👤 Processing driver-specific data")
+            logger.info("👤 Processing driver-specific data")
             zipcode = body.get('zipcode', '').strip()
             base_point = body.get('base_point')
             privacy_settings = body.get('privacy_settings')
             
             if zipcode:
                 user_data['zipcode'] = zipcode
-                print(f"📍 Zipcode: {zipcode}")
+                logger.info("📍 Zipcode: %s", zipcode)
             
             validated_base_point = validate_base_point(base_point)
             if validated_base_point:
                 user_data['base_point'] = validated_base_point
-                print(f"🎯 Base point: {validated_base_point['city']}, {validated_base_point['state']}")
+                logger.info("🎯 Base point: %s, %s", validated_base_point['city'], validated_base_point['state'])
             
             validated_privacy = validate_privacy_settings(privacy_settings)
             if validated_privacy:
                 user_data['privacy_settings'] = validated_privacy
-                print(f"🛡️ Privacy settings applied")
+                logger.info("🛡️ Privacy settings applied")
             
             # Driver-specific metadata
             user_data['anonymization_enabled'] = bool(validated_base_point)
@@ -456,7 +506,7 @@ def handle_signup(body):
 
         # Add admin-specific fields
         elif role == 'admin':
-            print("👑 Processing admin-specific data")
+            logger.info("👑 Processing admin-specific data")
 
             # Extract admin-specific fields from metadata
             metadata = body.get('metadata')
@@ -471,7 +521,7 @@ def handle_signup(body):
 
                     # Store admin metadata
                     user_data['metadata'] = admin_metadata
-                    print(f"📎 Admin metadata: {admin_metadata.get('admin_id', 'N/A')}")
+                    logger.info("📎 Admin metadata: %s", admin_metadata.get('admin_id', 'N/A'))
 
                     # Set first_login flag for password change prompt
                     if 'first_login' not in admin_metadata:
@@ -479,7 +529,7 @@ def handle_signup(body):
                         user_data['metadata'] = admin_metadata
 
                 except Exception as e:
-                    print(f"⚠️ Error parsing admin metadata: {e}")
+                    logger.warning("⚠️ Error parsing admin metadata: %s", e)
                     user_data['metadata'] = {'first_login': True}
             else:
                 # Default metadata for admin if none provided
@@ -487,7 +537,7 @@ def handle_signup(body):
 
         # Add provider-specific fields
         elif role == 'provider':
-            print("🏢 Processing provider (ISP) specific data")
+            logger.info("🏢 Processing provider (ISP) specific data")
 
             # Store provider metadata if provided
             metadata = body.get('metadata')
@@ -500,9 +550,9 @@ def handle_signup(body):
                         provider_metadata = metadata
 
                     user_data['metadata'] = provider_metadata
-                    print(f"📎 Provider metadata: {provider_metadata.get('state', 'N/A')}")
+                    logger.info("📎 Provider metadata: %s", provider_metadata.get('state', 'N/A'))
                 except Exception as e:
-                    print(f"⚠️ Error parsing provider metadata: {e}")
+                    logger.warning("⚠️ Error parsing provider metadata: %s", e)
 
         # (remove if not working asap) Store any additional metadata from Flutter app
         # This is now handled above per role, but keeping for backward compatibility
@@ -510,14 +560,14 @@ def handle_signup(body):
             metadata = body.get('metadata')
             if metadata and isinstance(metadata, dict):
                 user_data['metadata'] = metadata
-                print(f"📎 Storing additional metadata: {list(metadata.keys())}")
+                logger.info("📎 Storing additional metadata: %s", list(metadata.keys()))
 
         # Store user in database
-        print("💾 Storing user in database")
+        logger.info("💾 Storing user in database")
         dynamodb_user_data = convert_to_decimal(user_data)
         users_table.put_item(Item=dynamodb_user_data)
         
-        print(f"✅ User created successfully: {email}")
+        logger.info("✅ User created successfully: %s", email)
         
         # Return user data (without password hash)
         safe_user_data = {k: v for k, v in user_data.items() if k != 'password_hash'}
@@ -528,58 +578,56 @@ def handle_signup(body):
         })
         
     except Exception as e:
-        print(f"❌ Signup error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Signup error: %s", str(e))
         return create_error_response(500, 'Account creation failed')
 
 def handle_signin(body):
     """Handle user signin with email/password"""
     try:
-        print("🔐 SIGNIN: Starting user authentication")
+        logger.info("🔐 SIGNIN: Starting user authentication")
         
         # Extract and validate required fields
         email = body.get('email', '').strip().lower()
         password = body.get('password', '')
         
-        print(f"📧 Signin attempt for email: {email}")
+        logger.info("📧 Signin attempt for email: %s", email)
         
         if not email or not password:
-            print("❌ Missing email or password")
+            logger.warning("❌ Missing email or password")
             return create_error_response(400, 'Email and password are required')
         
         # Validate email format
         email_valid, email_error = validate_email(email)
         if not email_valid:
-            print(f"❌ Invalid email format: {email_error}")
+            logger.warning("❌ Invalid email format: %s", email_error)
             return create_error_response(400, email_error)
         
         # Find user by email
-        print("🔍 Looking up user by email")
+        logger.info("🔍 Looking up user by email")
         response = users_table.scan(
             FilterExpression='email = :email',
             ExpressionAttributeValues={':email': email}
         )
         
         if not response['Items']:
-            print(f"❌ User not found: {email}")
+            logger.warning("❌ User not found: %s", email)
             return create_error_response(401, 'Invalid email or password')
         
         user_data = response['Items'][0]
-        print(f"✅ User found: {email}")
+        logger.info("✅ User found: %s", email)
         
         # Check account status
         if user_data.get('account_status') != 'active':
-            print(f"❌ Account inactive: {email}")
+            logger.warning("❌ Account inactive: %s", email)
             return create_error_response(401, 'Account is inactive')
         
         # Verify password
         stored_hash = user_data.get('password_hash')
         if not stored_hash or not verify_password(password, stored_hash):
-            print(f"❌ Invalid password: {email}")
+            logger.warning("❌ Invalid password: %s", email)
             return create_error_response(401, 'Invalid email or password')
         
-        print("🔒 Password verified successfully")
+        logger.info("🔒 Password verified successfully")
         
         # Update last login
         try:
@@ -588,15 +636,15 @@ def handle_signin(body):
                 UpdateExpression='SET last_login = :timestamp',
                 ExpressionAttributeValues={':timestamp': datetime.utcnow().isoformat()}
             )
-            print("📅 Last login updated")
+            logger.info("📅 Last login updated")
         except Exception as e:
-            print(f"⚠️ Could not update last login: {e}")
+            logger.warning("⚠️ Could not update last login: %s", e)
         
         # Return user data (without password hash)
         clean_user_data = convert_decimal_to_float(user_data)
         safe_user_data = {k: v for k, v in clean_user_data.items() if k != 'password_hash'}
         
-        print(f"✅ Signin successful: {email}")
+        logger.info("✅ Signin successful: %s", email)
         
         return create_success_response({
             'message': 'Login successful',
@@ -604,9 +652,7 @@ def handle_signin(body):
         })
         
     except Exception as e:
-        print(f"❌ Signin error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Signin error: %s", str(e))
         return create_error_response(500, 'Login failed')
 
 def handle_change_password(body):
@@ -614,73 +660,73 @@ def handle_change_password(body):
     Handle password change with current password verification
     """
     try:
-        print("🔐 CHANGE PASSWORD: Starting password change")
+        logger.info("🔐 CHANGE PASSWORD: Starting password change")
 
         # Extract required fields
         email = body.get('email', '').strip().lower()
         current_password = body.get('current_password', '')
         new_password = body.get('new_password', '')
 
-        print(f"📧 Password change request for: {email}")
+        logger.info("📧 Password change request for: %s", email)
 
         # Validate required fields
         if not email or not current_password or not new_password:
-            print("❌ Missing required fields")
+            logger.warning("❌ Missing required fields")
             return create_error_response(400, 'Email, current password, and new password are required')
 
         # Validate email format
         email_valid, email_error = validate_email(email)
         if not email_valid:
-            print(f"❌ Invalid email: {email_error}")
+            logger.warning("❌ Invalid email: %s", email_error)
             return create_error_response(400, email_error)
 
         # Validate new password strength
         password_valid, password_error = validate_password(new_password)
         if not password_valid:
-            print(f"❌ New password invalid: {password_error}")
+            logger.warning("❌ New password invalid: %s", password_error)
             return create_error_response(400, password_error)
 
         # Check that new password is different from current
         if current_password == new_password:
-            print("❌ New password same as current")
+            logger.warning("❌ New password same as current")
             return create_error_response(400, 'New password must be different from current password')
 
         # Find user by email
-        print("🔍 Looking up user by email")
+        logger.info("🔍 Looking up user by email")
         response = users_table.scan(
             FilterExpression='email = :email',
             ExpressionAttributeValues={':email': email}
         )
 
         if not response['Items']:
-            print(f"❌ User not found: {email}")
+            logger.warning("❌ User not found: %s", email)
             return create_error_response(404, 'User not found')
 
         user_data = response['Items'][0]
         user_id = user_data['user_id']
-        print(f"✅ User found: {email}")
+        logger.info("✅ User found: %s", email)
 
         # Check account status
         if user_data.get('account_status') != 'active':
-            print(f"❌ Account inactive: {email}")
+            logger.warning("❌ Account inactive: %s", email)
             return create_error_response(401, 'Account is inactive')
 
         # Verify current password
         stored_hash = user_data.get('password_hash')
         if not stored_hash or not verify_password(current_password, stored_hash):
-            print(f"❌ Current password incorrect: {email}")
+            logger.warning("❌ Current password incorrect: %s", email)
             return create_error_response(401, 'Current password is incorrect')
 
-        print("🔒 Current password verified")
+        logger.info("🔒 Current password verified")
 
         # Hash new password
         new_hashed_password = hash_password(new_password)
         if not new_hashed_password:
-            print("❌ Failed to hash new password")
+            logger.error("❌ Failed to hash new password")
             return create_error_response(500, 'Failed to secure new password')
 
         # Update password in database
-        print("💾 Updating password in database")
+        logger.info("💾 Updating password in database")
         users_table.update_item(
             Key={'user_id': user_id},
             UpdateExpression='SET password_hash = :pwd, password_updated_at = :timestamp',
@@ -690,16 +736,14 @@ def handle_change_password(body):
             }
         )
 
-        print(f"✅ Password changed successfully for: {email}")
+        logger.info("✅ Password changed successfully for: %s", email)
 
         return create_success_response({
             'message': 'Password changed successfully'
         })
 
     except Exception as e:
-        print(f"❌ Change password error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Change password error: %s", str(e))
         return create_error_response(500, 'Password change failed')
 
 def handle_delete_account(body):
@@ -707,28 +751,28 @@ def handle_delete_account(body):
     ENHANCED: Handle complete account deletion with full data cleanup
     """
     try:
-        print("🗑️ DELETE: Starting complete account deletion")
+        logger.info("🗑️ DELETE: Starting complete account deletion")
         
         # Extract and validate required fields
         email = body.get('email', '').strip().lower()
         password = body.get('password', '')
         user_id = body.get('user_id', '')  # Optional: for direct user_id deletion
         
-        print(f"📧 Delete account request for: {email}")
+        logger.info("📧 Delete account request for: %s", email)
         
         if not email or not password:
-            print("❌ Missing email or password")
+            logger.warning("❌ Missing email or password")
             return create_error_response(400, 'Email and password are required to delete account')
         
         # Find user by email
-        print("🔍 Looking up user for deletion")
+        logger.info("🔍 Looking up user for deletion")
         response = users_table.scan(
             FilterExpression='email = :email',
             ExpressionAttributeValues={':email': email}
         )
         
         if not response['Items']:
-            print(f"❌ Account not found: {email}")
+            logger.warning("❌ Account not found: %s", email)
             return create_error_response(404, 'Account not found')
         
         user_data = response['Items'][0]
@@ -736,31 +780,32 @@ def handle_delete_account(body):
         
         # Security check: if user_id provided, make sure it matches
         if user_id and user_id != found_user_id:
-            print(f"❌ User ID mismatch for deletion: {email}")
+            logger.warning("❌ User ID mismatch for deletion: %s", email)
             return create_error_response(403, 'User ID mismatch')
         
         # Verify password before deletion
         stored_hash = user_data.get('password_hash')
         if not stored_hash or not verify_password(password, stored_hash):
-            print(f"❌ Invalid password for deletion: {email}")
+            logger.warning("❌ Invalid password for deletion: %s", email)
             return create_error_response(401, 'Invalid password')
         
-        print("🔒 Password verified for deletion")
+        logger.info("🔒 Password verified for deletion")
         
         # CRITICAL: Delete ALL user data from all tables
         deletion_summary = delete_user_trip_data(found_user_id)
         
         # Finally, delete the user account itself
-        print("🗑️ Deleting user account...")
+        logger.info("🗑️ Deleting user account...")
         users_table.delete_item(Key={'user_id': found_user_id})
         
-        print(f"✅ COMPLETE ACCOUNT DELETION SUCCESSFUL: {email}")
-        print(f"🎯 Data deleted from all tables:")
-        print(f"   - User account: DELETED")
-        print(f"   - Trajectory batches: {deletion_summary['trajectory_batches_deleted']}")
-        print(f"   - Trips: {deletion_summary['trips_deleted']}")
-        print(f"   - Summaries: {deletion_summary['summaries_deleted']}")
-        print(f"   - Trip summaries: {deletion_summary['trip_summaries_deleted']}")
+        logger.info("✅ COMPLETE ACCOUNT DELETION SUCCESSFUL: %s", email)
+        logger.info("🎯 Data deleted from all tables:")
+        logger.info("   - User account: DELETED")
+        logger.info("   - Trajectory batches: %s", deletion_summary['trajectory_batches_deleted'])
+        logger.info("   - Trips: %s", deletion_summary['trips_deleted'])
+        logger.info("   - Summaries: %s", deletion_summary['summaries_deleted'])
+        logger.info("   - Trip summaries: %s", deletion_summary['trip_summaries_deleted'])
+        logger.info("   - Analysis store objects: %s", deletion_summary['store_objects_deleted'])
         
         response_data = {
             'message': 'Account and all associated data deleted successfully',
@@ -769,11 +814,14 @@ def handle_delete_account(body):
                 'trajectory_batches_deleted': deletion_summary['trajectory_batches_deleted'],
                 'trips_deleted': deletion_summary['trips_deleted'],
                 'summaries_deleted': deletion_summary['summaries_deleted'],
+                'driver_aggregate_deleted': deletion_summary['driver_aggregate_deleted'],
                 'trip_summaries_deleted': deletion_summary['trip_summaries_deleted'],
+                'store_objects_deleted': deletion_summary['store_objects_deleted'],
                 'total_items_deleted': (deletion_summary['trajectory_batches_deleted'] + 
                                       deletion_summary['trips_deleted'] + 
                                       deletion_summary['summaries_deleted'] + 
-                                      deletion_summary['trip_summaries_deleted'] + 1),  # +1 for user account
+                                      deletion_summary['trip_summaries_deleted'] +
+                                      deletion_summary['store_objects_deleted'] + 1),  # +1 for user account
                 'errors': deletion_summary['errors']
             }
         }
@@ -781,15 +829,13 @@ def handle_delete_account(body):
         return create_success_response(response_data)
         
     except Exception as e:
-        print(f"❌ Account deletion error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Account deletion error: %s", str(e))
         return create_error_response(500, 'Account deletion failed')
 
 def handle_admin_stats(body):
     """Return user counts by role and recent signups for admin dashboard"""
     try:
-        print("📊 ADMIN_STATS: Fetching user statistics")
+        logger.info("📊 ADMIN_STATS: Fetching user statistics")
 
         response = users_table.scan(
             ProjectionExpression='user_id, email, #n, #r, created_at',
@@ -835,25 +881,23 @@ def handle_admin_stats(body):
             'recent_signups': recent_signups
         }
 
-        print(f"✅ Stats: {len(drivers)} drivers, {len(admins)} admins, {len(providers)} providers")
+        logger.info("✅ Stats: %s drivers, %s admins, %s providers", len(drivers), len(admins), len(providers))
         return create_success_response(convert_decimal_to_float(stats))
 
     except Exception as e:
-        print(f"❌ Admin stats error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Admin stats error: %s", str(e))
         return create_error_response(500, 'Failed to fetch admin stats')
 
 def handle_health_check(body):
     """Quick DynamoDB connectivity test for server status"""
     try:
-        print("🏥 HEALTH_CHECK: Testing DynamoDB connectivity")
+        logger.info("🏥 HEALTH_CHECK: Testing DynamoDB connectivity")
         # Quick read to verify DynamoDB is reachable
         users_table.scan(Limit=1, ProjectionExpression='user_id')
-        print("✅ Health check passed")
+        logger.info("✅ Health check passed")
         return create_success_response({'status': 'healthy'})
     except Exception as e:
-        print(f"❌ Health check failed: {str(e)}")
+        logger.error("❌ Health check failed: %s", str(e))
         return create_error_response(500, 'Health check failed')
 
 def handle_search_users(body):
@@ -862,7 +906,7 @@ def handle_search_users(body):
         query = body.get('query', '').strip().lower()
         role_filter = body.get('role_filter', '')
 
-        print(f"🔍 SEARCH_USERS: query='{query}', role_filter='{role_filter}'")
+        logger.info("🔍 SEARCH_USERS: query='%s', role_filter='%s'", query, role_filter)
 
         if not query:
             return create_error_response(400, 'Search query is required')
@@ -912,16 +956,14 @@ def handle_search_users(body):
                 user_entry['metadata'] = u['metadata']
             users.append(user_entry)
 
-        print(f"✅ Found {len(users)} users matching query")
+        logger.info("✅ Found %s users matching query", len(users))
         return create_success_response({
             'users': convert_decimal_to_float(users),
             'count': len(users)
         })
 
     except Exception as e:
-        print(f"❌ Search users error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Search users error: %s", str(e))
         return create_error_response(500, 'Search failed')
 
 def lambda_handler(event, context):
@@ -930,11 +972,11 @@ def lambda_handler(event, context):
     Supports: signup, signin, change_password, delete_account
     """
     try:
-        print(f"🚀 Enhanced Auth Lambda invoked: {event.get('httpMethod', 'Unknown')} {event.get('path', 'Unknown')}")
+        logger.info("🚀 Enhanced Auth Lambda invoked: %s %s", event.get('httpMethod', 'Unknown'), event.get('path', 'Unknown'))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
-            print("✅ CORS preflight request")
+            logger.info("✅ CORS preflight request")
             return {
                 'statusCode': 200,
                 'headers': {
@@ -948,17 +990,17 @@ def lambda_handler(event, context):
         # Parse request body
         try:
             body = json.loads(event['body'])
-            print(f"📝 Request body parsed successfully : {body}")
+            logger.info("📝 Request body parsed successfully : %s", body)
         except (json.JSONDecodeError, TypeError) as e:
-            print(f"❌ Invalid JSON: {e}")
+            logger.warning("❌ Invalid JSON: %s", e)
             return create_error_response(400, 'Invalid JSON in request body')
         
         # Get the mode/action
         mode = body.get('mode', '').lower()
-        print(f"🎯 Request mode: {mode}")
+        logger.info("🎯 Request mode: %s", mode)
         
         if not mode:
-            print("❌ Missing mode")
+            logger.warning("❌ Missing mode")
             return create_error_response(400, 'Mode is required (signup, signin, change_password, or delete_account)')
         
         # Route to appropriate handler
@@ -977,11 +1019,9 @@ def lambda_handler(event, context):
         elif mode == 'search_users':
             return handle_search_users(body)
         else:
-            print(f"❌ Invalid mode: {mode}")
+            logger.warning("❌ Invalid mode: %s", mode)
             return create_error_response(400, 'Invalid mode. Must be signup, signin, change_password, delete_account, admin_stats, health_check, or search_users')
     
     except Exception as e:
-        print(f"❌ Lambda handler error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Lambda handler error: %s", str(e))
         return create_error_response(500, 'Internal server error')
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Benchmark: analyze-driver analysis functions against trip size
+
+For every profile (trip_generator.PROFILES) and size, builds the trip the way the Lambda sees
+it (25-delta batches decoded into TripArrays) and measures each function on the same inputs:
+
+    extract_and_validate_speeds            TripArrays -> validated speeds
+    analyze_acceleration_events_fixed      speeds + intervals -> events
+    calculate_speed_consistency_adaptive   speeds -> consistency score
+    analyze_turn_safety_adaptive           bearings + speeds -> turn analysis
+    process_trip_with_frontend_values      the whole per-trip pipeline
+
+Time is the best of --repeat runs (one run from 100k points up); peak memory is the
+tracemalloc peak of a separate run, above what was allocated before the call.
+Results are written as JSON; pass an earlier file as --baseline to add speedups.
+
+Usage:
+    python benchmarks/bench_analysis.py [--sizes 100,1000,10000,100000,1000000]
+        [--profiles city,highway] [--functions process_trip_with_frontend_values]
+        [--repeat 3] [--engine reference] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, '..'))  # the Lambdas' shared modules (payload_compression.py)
+
+from trip_generator import PROFILES, iter_batches  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000, 1000000)
+SINGLE_RUN_POINTS = 100000
+BASE_POINT = {'latitude': 37.7749, 'longitude': -122.4194, 'city': 'San Francisco', 'state': 'CA', 'source': 'benchmark'}
+FUNCTIONS = (
+    'extract_and_validate_speeds',
+    'analyze_acceleration_events_fixed',
+    'calculate_speed_consistency_adaptive',
+    'analyze_turn_safety_adaptive',
+    'process_trip_with_frontend_values',
+)
+
+
+def load_analyze_driver():
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    spec = importlib.util.spec_from_file_location('analyze_driver', os.path.join(HERE, '..', 'analyze-driver.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_trip(ad, profile, points, seed):
+    """TripArrays plus the intermediate inputs every measured function takes"""
+    trip_arrays = ad.TripArrays()
+    for batch in iter_batches(profile, points, seed):
+        trip_arrays.extend(batch)
+
+    _, divisor = ad.detect_coordinate_format(trip_arrays)
+    features = ad.extract_trip_features(trip_arrays, divisor, BASE_POINT['latitude'], BASE_POINT['longitude'])
+    ad.extract_motion_features(features, trip_arrays)
+    context_info = ad.detect_driving_context(features.speeds, features.reconstructed_distance_miles,
+                                             features.total_turns, features.speed_summary)
+    return trip_arrays, features, context_info
+
+
+def make_calls(ad, trip_arrays, features, context_info):
+    distance = features.reconstructed_distance_miles
+    return {
+        'extract_and_validate_speeds': lambda: ad.extract_and_validate_speeds(trip_arrays),
+        'analyze_acceleration_events_fixed': lambda: ad.analyze_acceleration_events_fixed(
+            features.speeds, features.time_intervals, distance, features.total_turns, features.speed_summary),
+        'calculate_speed_consistency_adaptive': lambda: ad.calculate_speed_consistency_adaptive(features.speeds, context_info),
+        'analyze_turn_safety_adaptive': lambda: ad.analyze_turn_safety_adaptive(
+            features.bearings, features.speeds, context_info, features.bearing_changes),
+        'process_trip_with_frontend_values': lambda: ad.process_trip_with_frontend_values(trip_arrays, BASE_POINT, {}),
+    }
+
+
+def measure(call, repeat):
+    """(best seconds, peak bytes above the pre-call allocation)"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), max(0, peak - before)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['function'], r['profile'], r['points']): r for r in baseline.get('results', [])}
+    for result in results:
+        old = previous.get((result['function'], result['profile'], result['points']))
+        if old and result['seconds']:
+            result['baseline_seconds'] = old['seconds']
+            result['speedup'] = round(old['seconds'] / result['seconds'], 2)
+            if old.get('peak_mb') and result['peak_mb'] is not None:
+                result['memory_ratio'] = round(result['peak_mb'] / old['peak_mb'], 2)
+    return baseline.get('engine')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument('--profiles', default=','.join(PROFILES))
+    parser.add_argument('--functions', default=','.join(FUNCTIONS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--engine', choices=('reference', 'vectorized'),
+                        help='analysis engine (default: ANALYSIS_ENGINE, else vectorized when NumPy is installed)')
+    parser.add_argument('--output', default='bench_analysis_results.json')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    profiles = args.profiles.split(',')
+    functions = args.functions.split(',')
+    unknown = set(functions) - set(FUNCTIONS)
+    if unknown:
+        parser.error(f"unknown function(s): {', '.join(sorted(unknown))}")
+
+    ad = load_analyze_driver()
+    if args.engine:
+        ad.set_analysis_engine(args.engine)
+
+    results = []
+    for profile in profiles:
+        for points in sizes:
+            trip_arrays, features, context_info = build_trip(ad, profile, points, args.seed)
+            calls = make_calls(ad, trip_arrays, features, context_info)
+            repeat = 1 if points >= SINGLE_RUN_POINTS else max(1, args.repeat)
+            for name in functions:
+                seconds, peak_bytes = measure(calls[name], repeat)
+                results.append({
+                    'function': name,
+                    'profile': profile,
+                    'points': points,
+                    'seconds': round(seconds, 6),
+                    'points_per_second': round(points / seconds) if seconds else None,
+                    'peak_mb': round(peak_bytes / 1e6, 3),
+                })
+                print(f"{name:40s} {profile:13s} {points:>9,d}  {seconds * 1000:10.2f} ms  {peak_bytes / 1e6:9.2f} MB",
+                      file=sys.stderr)
+            del trip_arrays, features, calls
+
+    report = {
+        'benchmark': 'analysis_functions',
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'engine': ad.get_analysis_engine(),
+        'numpy_version': getattr(ad.np, '__version__', None),
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.baseline:
+        report['baseline'] = {'path': args.baseline, 'engine': compare(results, args.baseline)}
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
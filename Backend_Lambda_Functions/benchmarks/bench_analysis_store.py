@@ -0,0 +1,142 @@
+"""
+Benchmark: serving a driver's history from the analysis store vs recomputing it
+
+Trip analyses of the synthetic corpus (--points deltas each) are copied under new trip ids up
+to each history size and backfilled into a LocalAnalysisStore in a temporary directory, as
+analyze-driver's AnalysisStoreWriter does. Then, per history size:
+
+    object KB    average gzip trip object
+    backfill s   writing every trip object and the summary (once per driver)
+    store s      list users/{user_id}/trips/, then load_history_from_store: read and decode every
+                 object in parallel, check them against the trips' Trips-Neal versions and
+                 reconcile the summary's aggregate (what a request costs)
+    recompute s  process_trip_with_frontend_values for every trip (the CPU alone, no batch
+                 reads): what serving the history costs without any precomputed analysis
+
+--latency-ms adds a sleep to every object read, list and write, standing in for S3 round
+trips (local files answer in microseconds, S3 GETs from Lambda take tens of milliseconds).
+The trips and overall fields from the store must equal the backfilled analyses.
+
+Usage:
+    python benchmarks/bench_analysis_store.py [--trips 10,100,1000,5000] [--points 2000] [--latency-ms 0,20] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from golden_harness import BASE_POINT, load_analyze_driver, synthetic_corpus  # noqa: E402
+from analysis_object_store import LocalAnalysisStore  # noqa: E402
+
+USER_ID = 'bench-driver'
+
+
+def best_of(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def latency_store(root, latency_seconds):
+    """A LocalAnalysisStore whose calls each wait latency_seconds, like a remote object store"""
+
+    class RemoteLikeStore(LocalAnalysisStore):
+        def get(self, key):
+            time.sleep(latency_seconds)
+            return super().get(key)
+
+        def put(self, key, data):
+            time.sleep(latency_seconds)
+            super().put(key, data)
+
+        def list_objects(self, prefix):
+            objects = super().list_objects(prefix)
+            # One round trip per 1,000 keys, as list_objects_v2 pages them
+            time.sleep(latency_seconds * (len(objects) // 1000 + 1))
+            return objects
+
+    return RemoteLikeStore(root)
+
+
+def history(corpus_analyses, n_trips):
+    """n_trips analyses with distinct trip ids, cycling through the corpus analyses"""
+    trips = []
+    for index in range(n_trips):
+        trip = dict(corpus_analyses[index % len(corpus_analyses)])
+        trip['trip_id'] = f'trip_{USER_ID}_{1700000000000 + index}'
+        trips.append(trip)
+    return trips
+
+
+def backfill(ad, store, trips):
+    writer = ad.AnalysisStoreWriter(store, USER_ID)
+    stamps = {}
+    for index, trip in enumerate(trips):
+        stamps[trip['trip_id']] = f'2025-01-01T00:00:{index % 60:02d}+00:00#{index}'
+        writer.add_trip(trip, stamps[trip['trip_id']])
+    writer.set_summary(ad.DriverAggregate.from_trips(trips, stamps), [], [trip['trip_id'] for trip in trips])
+    writer.flush()
+    if writer.failed:
+        raise SystemExit(f'{writer.failed} objects could not be written')
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trips', default='10,100,1000,5000')
+    parser.add_argument('--points', type=int, default=2000)
+    parser.add_argument('--latency-ms', default='0,20')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    corpus = [trip for trip in synthetic_corpus([args.points], 1) if len(trip['deltas']) == args.points]
+    recompute_seconds, corpus_analyses = best_of(
+        lambda: [dict(ad.process_trip_with_frontend_values(trip['deltas'], BASE_POINT, trip['trip_quality']),
+                      start_timestamp='2025-01-01T08:00:00Z', end_timestamp='2025-01-01T08:30:00Z')
+                 for trip in corpus], args.repeat)
+    seconds_per_trip = recompute_seconds / len(corpus)
+    # Trips as the store returns them (JSON numbers, no Decimals)
+    corpus_analyses = [json.loads(json.dumps(trip, cls=ad.DecimalEncoder)) for trip in corpus_analyses]
+
+    print(f"{args.points}-delta trips, {ad.STORE_IO_THREADS} store threads, "
+          f"recompute {seconds_per_trip * 1000:.1f} ms per trip ({ad.get_analysis_engine()})")
+    print(f"\n{'trips':>7} {'latency ms':>11} {'object KB':>10} {'backfill s':>11} {'store s':>8} {'recompute s':>12}")
+    for latency_ms in [float(value) for value in args.latency_ms.split(',')]:
+        for n_trips in [int(value) for value in args.trips.split(',')]:
+            trips = history(corpus_analyses, n_trips)
+            with tempfile.TemporaryDirectory() as root:
+                store = latency_store(root, latency_ms / 1000)
+                backfill_seconds, _ = best_of(lambda: backfill(ad, store, trips), 1)
+                trip_ids = [trip['trip_id'] for trip in trips]
+                # Finalized before backfill stamped them, as Trips-Neal would have it
+                trip_records = {trip_id: {'trip_id': trip_id, 'finalized_at': '2025-01-01T00:00:00+00:00'}
+                                for trip_id in trip_ids}
+                store_seconds, loaded = best_of(
+                    lambda: ad.load_history_from_store(store, USER_ID, trip_ids, trip_records,
+                                                       store.list_objects(ad.trip_objects_prefix(USER_ID))),
+                    args.repeat)
+                if loaded is None:
+                    raise SystemExit('the backfilled history was not served from the store')
+                served, aggregate, status = loaded
+                expected = sorted(trips, key=lambda trip: trip['trip_id'], reverse=True)
+                if served != expected or status != 'reused':
+                    raise SystemExit(f'{n_trips} trips: the store returned other trips ({status})')
+                if aggregate.analytics_fields() != ad.DriverAggregate.from_trips(trips).analytics_fields():
+                    raise SystemExit(f'{n_trips} trips: overall fields differ')
+                object_kb = sum(len(store.get(ad.trip_object_key(USER_ID, trip['trip_id'])) or b'')
+                                for trip in trips[:50]) / min(n_trips, 50) / 1024
+            print(f"{n_trips:>7} {latency_ms:>11.0f} {object_kb:>10.1f} {backfill_seconds:>11.2f} "
+                  f"{store_seconds:>8.3f} {seconds_per_trip * n_trips:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark: analyze-driver cache lookup, per-trip get_item vs bulk BatchGetItem
+
+For a driver with N trips that are all cached, compares
+    per_trip   get_cached_trip_analysis + is_trip_modified_since_analysis for every trip
+               (two sequential round trips per trip)
+    bulk       lookup_cached_trips (BatchGetItem, 100 keys per request, both tables)
+
+Tables are an in-memory stand-in for DynamoDB with injected latency: every request sleeps
+--latency-ms plus --per-item-ms for each item returned, and BatchGetItem leaves
+--unprocessed of the keys unprocessed on their first request (like a throttled table),
+so the retry/backoff path is part of the measurement. Both paths must agree on every trip.
+
+Usage:
+    python benchmarks/bench_cache_lookup.py [--trips 10,100,500] [--latency-ms 8]
+        [--per-item-ms 0.02] [--unprocessed 0.1] [--repeat 3]
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import random
+import time
+from decimal import Decimal
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))  # the Lambdas' shared modules (payload_compression.py)
+
+
+def load_analyze_driver():
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    spec = importlib.util.spec_from_file_location('analyze_driver', os.path.join(HERE, '..', 'analyze-driver.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def project(item, request):
+    """Apply a ProjectionExpression of aliased top-level names"""
+    if 'ProjectionExpression' not in request:
+        return dict(item)
+    names = request.get('ExpressionAttributeNames', {})
+    fields = [names.get(path.strip(), path.strip()) for path in request['ProjectionExpression'].split(',')]
+    return {field: item[field] for field in fields if field in item}
+
+
+class LatencyTable:
+    """Table stand-in: get_item after one round trip of latency"""
+
+    def __init__(self, name, service):
+        self.name = name
+        self.items = {}
+        self.service = service
+
+    def get_item(self, Key, **request):
+        item = self.items.get(Key['trip_id'])
+        self.service.round_trip(1 if item else 0)
+        return {'Item': project(item, request)} if item else {}
+
+
+class LatencyService:
+    """dynamodb resource stand-in: batch_get_item over LatencyTables, with latency and throttling"""
+
+    def __init__(self, latency_ms, per_item_ms, unprocessed, seed=0):
+        self.latency = latency_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self.unprocessed = unprocessed
+        self.rng = random.Random(seed)
+        self.tables = {}
+        self.requests = 0
+        self._retried = set()
+
+    def Table(self, name):
+        return self.tables.setdefault(name, LatencyTable(name, self))
+
+    def round_trip(self, items):
+        self.requests += 1
+        time.sleep(self.latency + items * self.per_item)
+
+    def batch_get_item(self, RequestItems):
+        responses, unprocessed, returned = {}, {}, 0
+        for name, request in RequestItems.items():
+            assert len(request['Keys']) <= 100, 'BatchGetItem accepts at most 100 keys'
+            table = self.tables[name]
+            for key in request['Keys']:
+                trip_id = key['trip_id']
+                if (name, trip_id) not in self._retried and self.rng.random() < self.unprocessed:
+                    self._retried.add((name, trip_id))
+                    pending = unprocessed.setdefault(name, {k: v for k, v in request.items() if k != 'Keys'})
+                    pending.setdefault('Keys', []).append(key)
+                elif trip_id in table.items:
+                    responses.setdefault(name, []).append(project(table.items[trip_id], request))
+                    returned += 1
+        self.round_trip(returned)
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+
+
+def populate(ad, service, n_trips):
+    """N trips cached by the current algorithm version and not modified since"""
+    trips, summaries = service.Table('Trips-Neal'), service.Table('DrivingSummaries-Neal')
+    for index in range(n_trips):
+        trip_id = f'trip_bench-user_{1700000000 + index}'
+        trips.items[trip_id] = {
+            'trip_id': trip_id, 'user_id': 'bench-user', 'status': 'completed',
+            'start_timestamp': '2025-01-01T08:00:00Z', 'end_timestamp': '2025-01-01T08:30:00Z',
+            'finalized_at': '2025-01-01T08:31:00Z',
+            'trip_quality': {'use_gps_metrics': True, 'actual_distance_miles': Decimal('12.5'),
+                             'batch_aggregation': {'enhancement_scores': [Decimal('0.9')] * 1500}},
+        }
+        summaries.items[trip_id] = {
+            'trip_id': trip_id, 'user_id': 'bench-user', 'algorithm_version': ad.CURRENT_ALGORITHM_VERSION,
+            'analysis_cached_at': '2025-01-02T00:00:00+00:00', 'start_timestamp': '2025-01-01T08:00:00Z',
+            'end_timestamp': '2025-01-01T08:30:00Z', 'timestamp': '2025-01-01T08:30:00Z',
+            'total_distance_miles': Decimal('12.5'), 'duration_minutes': Decimal('30'),
+            'behavior_score': Decimal('88.2'), 'behavior': 'Good', 'harsh_events': Decimal(1),
+        }
+    ad.dynamodb = service
+    ad.trips_table, ad.summaries_table = trips, summaries
+    return list(trips.items)
+
+
+def per_trip_lookup(ad, trip_ids):
+    results = {}
+    for trip_id in trip_ids:
+        cached = ad.get_cached_trip_analysis(trip_id)
+        modified = ad.is_trip_modified_since_analysis(trip_id, cached) if cached else False
+        results[trip_id] = (cached, modified)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trips', default='10,100,500')
+    parser.add_argument('--latency-ms', type=float, default=8.0, help='per request round trip')
+    parser.add_argument('--per-item-ms', type=float, default=0.02, help='per returned item')
+    parser.add_argument('--unprocessed', type=float, default=0.1, help='share of keys unprocessed on first request')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    print(f"{'trips':>6} {'per_trip ms':>12} {'requests':>9} {'bulk ms':>10} {'requests':>9} {'speedup':>8}")
+    for n_trips in [int(n) for n in args.trips.split(',')]:
+        timings = {}
+        for name, lookup in (('per_trip', per_trip_lookup), ('bulk', lambda module, ids: module.lookup_cached_trips(ids))):
+            best = None
+            for run in range(args.repeat):
+                service = LatencyService(args.latency_ms, args.per_item_ms, args.unprocessed, seed=run)
+                trip_ids = populate(ad, service, n_trips)
+                start = time.perf_counter()
+                results = lookup(ad, trip_ids)
+                seconds = time.perf_counter() - start
+                if best is None or seconds < best[0]:
+                    best = (seconds, service.requests, results)
+            timings[name] = best
+
+        per_trip, bulk = timings['per_trip'], timings['bulk']
+        agree = {trip_id: (bool(cached), modified) for trip_id, (cached, modified) in per_trip[2].items()} == \
+                {trip_id: (bool(cached), modified) for trip_id, (cached, modified) in bulk[2].items()}
+        if not agree:
+            raise SystemExit(f'bulk and per-trip lookups disagree for {n_trips} trips')
+        print(f"{n_trips:>6} {per_trip[0] * 1000:>12.1f} {per_trip[1]:>9} {bulk[0] * 1000:>10.1f} {bulk[1]:>9} "
+              f"{per_trip[0] / bulk[0]:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
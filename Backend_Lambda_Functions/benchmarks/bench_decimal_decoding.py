@@ -0,0 +1,155 @@
+"""
+Benchmark: Decimal handling in analyze-driver for one user with many trips
+
+Compares the deep-copy path (convert_decimal_to_float on every Trips item, cached
+summary and the final response) against the typed decoding path (decode_trip_record,
+raw cached summaries read by reconstruct_trip_from_cache, json.dumps with DecimalEncoder).
+
+Items are synthetic DynamoDB-shaped dicts, so no AWS access is needed (boto3 must be
+importable because analyze-driver creates its table handles at import time).
+
+Usage:
+    python benchmarks/bench_decimal_decoding.py [--trips 500] [--deltas-per-trip 1500] [--repeat 5]
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import random
+import time
+from decimal import Decimal
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))  # the Lambdas' shared modules (payload_compression.py)
+
+
+def load_analyze_driver():
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    spec = importlib.util.spec_from_file_location('analyze_driver', os.path.join(HERE, '..', 'analyze-driver.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_trip_item(rng, trip_id, deltas_per_trip):
+    """Trips-Neal item as finalize-trip writes it (trip_quality carries per-delta lists)"""
+    distance = round(rng.uniform(1, 40), 3)
+    return {
+        'trip_id': trip_id,
+        'user_id': 'bench-user',
+        'status': 'completed',
+        'start_timestamp': '2025-01-01T08:00:00Z',
+        'end_timestamp': '2025-01-01T08:30:00Z',
+        'finalized_at': '2025-01-01T08:31:00Z',
+        'total_batches': Decimal(deltas_per_trip // 25),
+        'trip_quality': {
+            'use_gps_metrics': True,
+            'actual_distance_miles': Decimal(str(distance)),
+            'actual_duration_minutes': Decimal(str(round(rng.uniform(5, 60), 2))),
+            'actual_start_timestamp': '2025-01-01T08:00:00Z',
+            'actual_end_timestamp': '2025-01-01T08:30:00Z',
+            'gps_max_speed_mph': Decimal(str(round(rng.uniform(30, 80), 1))),
+            'gps_avg_speed_mph': Decimal(str(round(rng.uniform(15, 45), 1))),
+            'batch_aggregation': {
+                'total_batches': Decimal(deltas_per_trip // 25),
+                'total_valid_deltas': Decimal(deltas_per_trip),
+                'acceptance_rate': Decimal('0.98'),
+                'enhancement_scores': [Decimal(str(round(rng.random(), 3))) for _ in range(deltas_per_trip)],
+            },
+        },
+    }
+
+
+def make_summary_item(analyze_driver, rng, trip_id):
+    """DrivingSummaries-Neal item (the cache entry written by cache_trip_analysis_enhanced)"""
+    analysis = {
+        'trip_id': trip_id,
+        'total_distance_miles': round(rng.uniform(1, 40), 3),
+        'duration_minutes': round(rng.uniform(5, 60), 2),
+        'behavior_score': round(rng.uniform(40, 100), 1),
+        'speed_consistency': round(rng.uniform(40, 100), 1),
+        'avg_speed_mph': round(rng.uniform(15, 45), 1),
+        'max_speed_mph': round(rng.uniform(30, 80), 1),
+        'total_harsh_events': rng.randint(0, 5),
+        'start_timestamp': '2025-01-01T08:00:00Z',
+        'end_timestamp': '2025-01-01T08:30:00Z',
+        'driving_context': {'context': 'city', 'confidence': 0.7},
+    }
+    captured = {}
+
+    class _CaptureTable:
+        def put_item(self, Item):
+            captured['item'] = Item
+
+    original_table = analyze_driver.summaries_table
+    analyze_driver.summaries_table = _CaptureTable()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyze_driver.cache_trip_analysis_enhanced(analysis, 'bench-user')
+    finally:
+        analyze_driver.summaries_table = original_table
+    item = captured['item']
+    # DynamoDB returns every number as Decimal
+    return {k: Decimal(v) if isinstance(v, int) and not isinstance(v, bool) else v for k, v in item.items()}
+
+
+def deep_copy_path(ad, trip_items, summary_items):
+    trips = [ad.convert_decimal_to_float(item) for item in trip_items]
+    analyses = [ad.reconstruct_trip_from_cache(ad.convert_decimal_to_float(item), item['trip_id'])
+                for item in summary_items]
+    analytics = {'trips': analyses, 'trip_quality': [t.get('trip_quality', {}).get('actual_distance_miles') for t in trips]}
+    return json.dumps(ad.convert_decimal_to_float(analytics))
+
+
+def typed_path(ad, trip_items, summary_items):
+    trips = [ad.decode_trip_record(item) for item in trip_items]
+    analyses = [ad.reconstruct_trip_from_cache(item, item['trip_id']) for item in summary_items]
+    analytics = {'trips': analyses, 'trip_quality': [t.get('trip_quality', {}).get('actual_distance_miles') for t in trips]}
+    return json.dumps(analytics, cls=ad.DecimalEncoder)
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trips', type=int, default=500)
+    parser.add_argument('--deltas-per-trip', type=int, default=1500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    rng = random.Random(args.seed)
+    trip_ids = [f'trip_bench_{i:05d}' for i in range(args.trips)]
+    trip_items = [make_trip_item(rng, trip_id, args.deltas_per_trip) for trip_id in trip_ids]
+    summary_items = [make_summary_item(ad, rng, trip_id) for trip_id in trip_ids]
+
+    deep_copy_s, deep_copy_body = best_of(args.repeat, deep_copy_path, ad, trip_items, summary_items)
+    typed_s, typed_body = best_of(args.repeat, typed_path, ad, trip_items, summary_items)
+
+    assert deep_copy_body == typed_body, "typed decoding changed the response body"
+
+    print(json.dumps({
+        'benchmark': 'decimal_decoding',
+        'trips': args.trips,
+        'deltas_per_trip': args.deltas_per_trip,
+        'deep_copy_seconds': round(deep_copy_s, 4),
+        'typed_seconds': round(typed_s, 4),
+        'speedup': round(deep_copy_s / typed_s, 1) if typed_s else None,
+        'identical_output': True,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
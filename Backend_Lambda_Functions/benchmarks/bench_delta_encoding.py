@@ -0,0 +1,140 @@
+"""
+Benchmark: TrajectoryBatches-Neal deltas as a list of maps (data_version 2.4) vs deltas_binary (3.0)
+
+    size         bytes of the delta attributes by DynamoDB's item size rules, per batch of 25
+    WCU          write units for those bytes alone (the rest of the item is the same in both)
+    read ms      the trip's batches from DynamoDB's wire format into analyze-driver TripArrays:
+                 boto3's TypeDeserializer (what the table resource runs on every item) plus
+                 TripArrays.from_deltas over the maps, or plus TripArrays.from_binary
+    drift        the trip analyzed (reference engine) from the binary batches vs from the maps;
+                 speeds are stored to 0.01 mph and accuracy to 0.1 m, everything else exactly
+
+Every binary batch must decode to the same coordinates, delta_time and timestamps as its maps.
+
+Usage:
+    python benchmarks/bench_delta_encoding.py [--sizes 100,2000,20000] [--seeds 2] [--repeat 3]
+"""
+import argparse
+import importlib.util
+import math
+import os
+import sys
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from golden_harness import BASE_POINT, analyze_driver_engine, load_analyze_driver, synthetic_corpus  # noqa: E402
+
+BATCH_SIZE = 25
+SCORE_FIELDS = ('behavior_score', 'smoothness_score', 'turn_safety_score', 'speed_consistency', 'frequency_score')
+
+
+def load_store_trajectory_batch():
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    spec = importlib.util.spec_from_file_location('store_trajectory_batch',
+                                                  os.path.join(HERE, '..', 'store-trajectory-batch.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def attribute_size(value) -> int:
+    """Approximate DynamoDB size of one attribute value"""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        digits = len(Decimal(str(value)).normalize().as_tuple().digits)
+        return (digits + 1) // 2 + 1
+    if isinstance(value, dict):
+        return 3 + sum(1 + len(key.encode('utf-8')) + attribute_size(v) for key, v in value.items())
+    return 3 + sum(1 + attribute_size(v) for v in value)
+
+
+def delta_attributes_size(attributes) -> int:
+    return sum(len(name) + attribute_size(value) for name, value in attributes.items()
+               if name in ('deltas', 'deltas_binary', 'delta_count', 'data_version'))
+
+
+def trip_items(stb, deltas):
+    """(list-of-maps items, binary items) as store-trajectory-batch writes them, batch by batch"""
+    legacy, binary = [], []
+    for start in range(0, len(deltas), BATCH_SIZE):
+        validated, _ = stb.validate_enhanced_deltas([dict(d) for d in deltas[start:start + BATCH_SIZE]])
+        legacy.append(stb.safe_convert_to_decimal({'data_version': stb.LEGACY_DELTA_DATA_VERSION, 'deltas': validated}))
+        binary.append(stb.safe_convert_to_decimal(stb.batch_delta_attributes(validated)))
+    return legacy, binary
+
+
+def wire_items(items):
+    """Items as a Query response carries them (attribute value dicts)"""
+    serializer = TypeSerializer()
+    return [{name: serializer.serialize(value) for name, value in item.items()} for item in items]
+
+
+def read_batches(ad, wire):
+    """What a reader pays per trip: boto3 deserialization, then decoding into TripArrays"""
+    deserializer = TypeDeserializer()
+    items = [{name: deserializer.deserialize(value) for name, value in item.items()} for item in wire]
+    return ad.TripArrays.from_batches(items)
+
+
+def best_of(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,2000,20000')
+    parser.add_argument('--seeds', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    stb = load_store_trajectory_batch()
+    reference = analyze_driver_engine(ad, 'reference')
+
+    print(f"{'trip':>22} {'maps B/batch':>13} {'binary B/batch':>15} {'WCU':>9} {'read maps ms':>13} "
+          f"{'binary ms':>10} {'max score drift':>16}")
+    for trip in synthetic_corpus([int(size) for size in args.sizes.split(',')], args.seeds):
+        if len(trip['deltas']) < BATCH_SIZE:
+            continue
+        legacy, binary = trip_items(stb, trip['deltas'])
+        if any('deltas_binary' not in item for item in binary):
+            raise SystemExit(f"{trip['name']}: a batch did not fit the binary format")
+
+        legacy_wire, binary_wire = wire_items(legacy), wire_items(binary)
+        maps_seconds, from_maps = best_of(lambda: read_batches(ad, legacy_wire), args.repeat)
+        binary_seconds, from_binary = best_of(lambda: read_batches(ad, binary_wire), args.repeat)
+        for column in ('delta_lat', 'delta_long', 'delta_time'):
+            if getattr(from_maps, column) != getattr(from_binary, column):
+                raise SystemExit(f"{trip['name']}: {column} differs after decoding")
+        if [ad.parse_delta_timestamp(t) for t in from_maps.timestamps] != [ad.parse_delta_timestamp(t) for t in from_binary.timestamps]:
+            raise SystemExit(f"{trip['name']}: timestamps differ after decoding")
+
+        expected = reference.analyze(from_maps, BASE_POINT, trip['trip_quality'])
+        actual = reference.analyze(from_binary, BASE_POINT, trip['trip_quality'])
+        drift = max((abs(expected[field] - actual[field]) for field in SCORE_FIELDS if field in expected), default=0.0)
+
+        maps_bytes = sum(delta_attributes_size(item) for item in legacy) / len(legacy)
+        binary_bytes = sum(delta_attributes_size(item) for item in binary) / len(binary)
+        wcu = f'{math.ceil(maps_bytes / 1024)} -> {math.ceil(binary_bytes / 1024)}'
+        print(f"{trip['name']:>22} {maps_bytes:>13.0f} {binary_bytes:>15.0f} {wcu:>9} {maps_seconds * 1000:>13.2f} "
+              f"{binary_seconds * 1000:>10.2f} {drift:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
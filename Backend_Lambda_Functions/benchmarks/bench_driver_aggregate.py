@@ -0,0 +1,205 @@
+"""
+Benchmark: overall statistics for a driver, per-trip passes vs DriverAggregate
+
+    passes       the former end of lambda_handler: one sum()/max() pass over the trips per metric
+    one_pass     DriverAggregate.from_trips(trips).analytics_fields()
+    partials     8 partial aggregates (as from workers or time buckets) combined, then the fields
+    swap         stored aggregate with one re-analyzed trip swapped out (subtract + add)
+    stored       fields from an already up-to-date aggregate (no per-trip data)
+
+Every variant must give the same response fields as `passes` (up to one unit in the last
+rounded digit, see same_field).
+
+Usage:
+    python benchmarks/bench_driver_aggregate.py [--trips 10,100,1000,10000] [--repeat 5]
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import random
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))  # the Lambdas' shared modules (payload_compression.py)
+CONTEXTS = ('city', 'highway', 'suburban', 'mixed')
+
+
+def load_analyze_driver():
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    spec = importlib.util.spec_from_file_location('analyze_driver', os.path.join(HERE, '..', 'analyze-driver.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_trips(n_trips, seed=0):
+    """Trip analyses with the fields the overall section reads (a few stationary ones)"""
+    rng = random.Random(seed)
+    trips = []
+    for index in range(n_trips):
+        stationary = rng.random() < 0.05
+        duration = round(rng.uniform(5, 90), 1)
+        moving = 0.0 if stationary else round(duration * rng.uniform(0.6, 0.98), 1)
+        turns = rng.randint(0, 40)
+        safe = rng.randint(0, turns)
+        events_per_100 = round(rng.uniform(0, 30), 2)
+        trips.append({
+            'trip_id': f'trip_bench_{index}',
+            'total_distance_miles': 0.0 if stationary else round(rng.uniform(0.5, 60), 3),
+            'duration_minutes': duration,
+            'moving_time_minutes': moving,
+            'stationary_time_minutes': round(duration - moving, 1),
+            'behavior_score': round(rng.uniform(40, 100), 1),
+            'speed_consistency': round(rng.uniform(50, 100), 1),
+            'total_harsh_events': rng.randint(0, 6),
+            'total_dangerous_events': rng.randint(0, 2),
+            'events_per_100_miles': events_per_100,
+            'weighted_events_per_100_miles': round(events_per_100 * rng.uniform(0.8, 1.5), 2),
+            'max_speed_mph': round(rng.uniform(20, 85), 1),
+            'driving_context': {'context': rng.choice(CONTEXTS), 'confidence': 0.8},
+            'total_turns': turns,
+            'safe_turns': safe,
+            'dangerous_turns': rng.randint(0, turns - safe),
+            'privacy_protected': rng.random() < 0.9,
+        })
+    return trips
+
+
+def overall_with_passes(ad, trip_analyses):
+    """The overall fields as lambda_handler computed them before DriverAggregate"""
+    total_trips = len(trip_analyses)
+    total_distance = sum(trip['total_distance_miles'] for trip in trip_analyses)
+    total_time_minutes = sum(trip['duration_minutes'] for trip in trip_analyses)
+    total_moving_time_minutes = sum(trip.get('moving_time_minutes', trip['duration_minutes']) for trip in trip_analyses)
+    total_stationary_time_minutes = sum(trip.get('stationary_time_minutes', 0) for trip in trip_analyses)
+    if total_distance > 0:
+        weighted_behavior_score = sum(trip['behavior_score'] * trip['total_distance_miles'] for trip in trip_analyses) / total_distance
+        overall_speed_consistency = sum(trip['speed_consistency'] * trip['total_distance_miles'] for trip in trip_analyses) / total_distance
+    else:
+        weighted_behavior_score = sum(trip['behavior_score'] for trip in trip_analyses) / len(trip_analyses)
+        overall_speed_consistency = sum(trip['speed_consistency'] for trip in trip_analyses) / len(trip_analyses)
+    overall_moving_avg_speed = (total_distance / (total_moving_time_minutes / 60)) if total_moving_time_minutes > 0 else 0.0
+    overall_avg_speed = (total_distance / (total_time_minutes / 60)) if total_time_minutes > 0 else 0.0
+    total_harsh_events = sum(trip['total_harsh_events'] for trip in trip_analyses)
+    total_dangerous_events = sum(trip['total_dangerous_events'] for trip in trip_analyses)
+    overall_events_per_100_miles = (total_harsh_events / total_distance) * 100 if total_distance > 0 else 0.0
+    context_distribution = {}
+    for trip in trip_analyses:
+        context = trip.get('driving_context', {}).get('context', 'mixed')
+        context_distribution[context] = context_distribution.get(context, 0) + trip['total_distance_miles']
+    if context_distribution and total_distance > 0:
+        dominant_context = max(context_distribution.keys(), key=lambda k: context_distribution[k])
+        context_confidence = context_distribution[dominant_context] / total_distance
+    else:
+        dominant_context, context_confidence = 'stationary', 1.0
+    if total_distance > 0:
+        overall_weighted_events = sum(
+            trip.get('weighted_events_per_100_miles', trip['events_per_100_miles']) * trip['total_distance_miles']
+            for trip in trip_analyses) / total_distance
+    else:
+        overall_weighted_events = sum(trip.get('weighted_events_per_100_miles', trip['events_per_100_miles'])
+                                      for trip in trip_analyses) / len(trip_analyses)
+    privacy_protected_trips = sum(1 for trip in trip_analyses if trip.get('privacy_protected', False))
+    overall_moving_percentage = (total_moving_time_minutes / total_time_minutes) * 100 if total_time_minutes > 0 else 0
+    return {
+        'total_trips': total_trips,
+        'total_distance_miles': round(total_distance, 2),
+        'total_driving_time_hours': round(total_time_minutes / 60, 2),
+        'formatted_total_time': ad.format_duration_smart(total_time_minutes),
+        'total_moving_time_hours': round(total_moving_time_minutes / 60, 2),
+        'total_stationary_time_hours': round(total_stationary_time_minutes / 60, 2),
+        'overall_moving_percentage': round(overall_moving_percentage, 1),
+        'avg_trip_distance_miles': round(total_distance / total_trips, 2),
+        'avg_trip_duration_minutes': round(total_time_minutes / total_trips, 1),
+        'overall_behavior_score': round(weighted_behavior_score, 1),
+        'behavior_category': ad.get_behavior_category(weighted_behavior_score),
+        'risk_level': ad.get_risk_level_consistent(weighted_behavior_score),
+        'speed_consistency_score': round(overall_speed_consistency, 1),
+        'dominant_driving_context': dominant_context,
+        'context_confidence': round(context_confidence, 2),
+        'context_distribution': {k: round(v, 2) for k, v in context_distribution.items()},
+        'total_harsh_events': total_harsh_events,
+        'total_dangerous_events': total_dangerous_events,
+        'events_per_100_miles': round(overall_events_per_100_miles, 2),
+        'weighted_events_per_100_miles': round(overall_weighted_events, 2),
+        'harsh_events_per_100_miles': round(overall_events_per_100_miles, 2),
+        'industry_rating': ad.DriverAggregate.industry_rating(overall_weighted_events),
+        'overall_avg_speed_mph': round(overall_avg_speed, 1),
+        'overall_moving_avg_speed_mph': round(overall_moving_avg_speed, 1),
+        'overall_max_speed_mph': max(trip['max_speed_mph'] for trip in trip_analyses),
+        'total_dangerous_turns': sum(trip.get('dangerous_turns', 0) for trip in trip_analyses),
+        'safe_turns_percentage': round(
+            sum(trip.get('safe_turns', 0) for trip in trip_analyses) /
+            max(1, sum(trip.get('total_turns', 0) for trip in trip_analyses)) * 100, 1),
+        'privacy_protection_percentage': round((privacy_protected_trips / total_trips) * 100, 1),
+    }
+
+
+def same_field(expected, actual):
+    """
+    Equal, or floats one unit apart in their last rounded digit: the passes add floats and
+    DriverAggregate adds exact millionths, so a total right on a rounding boundary (313.345)
+    can round either way
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(same_field(expected[key], actual[key]) for key in expected)
+    if isinstance(expected, float) and isinstance(actual, float):
+        unit = 10 ** -max(len(repr(value).partition('.')[2]) for value in (expected, actual))
+        return abs(expected - actual) <= unit * 1.000001
+    return expected == actual
+
+
+def best_of(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trips', default='10,100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    aggregate_cls = ad.DriverAggregate
+    print(f"{'trips':>6} " + ' '.join(f'{name + " ms":>12}' for name in ('passes', 'one_pass', 'partials', 'swap', 'stored')))
+    for n_trips in [int(n) for n in args.trips.split(',')]:
+        trips = make_trips(n_trips)
+        changed = dict(trips[n_trips // 2], behavior_score=55.5)
+        updated_trips = trips[:n_trips // 2] + [changed] + trips[n_trips // 2 + 1:]
+        stored = aggregate_cls.from_trips(trips)
+
+        def swap():
+            aggregate = aggregate_cls.from_item(stored.to_item('bench-user'))
+            aggregate.subtract_trip(trips[n_trips // 2])
+            aggregate.add_trip(changed)
+            return aggregate.analytics_fields()
+
+        chunk = max(1, n_trips // 8)
+        variants = {
+            'passes': (lambda: overall_with_passes(ad, trips), trips),
+            'one_pass': (lambda: aggregate_cls.from_trips(trips).analytics_fields(), trips),
+            'partials': (lambda: aggregate_cls.combine([aggregate_cls.from_trips(trips[i:i + chunk])
+                                                        for i in range(0, n_trips, chunk)]).analytics_fields(), trips),
+            'swap': (swap, updated_trips),
+            'stored': (lambda: stored.analytics_fields(), trips),
+        }
+        row = []
+        for name, (call, expected_trips) in variants.items():
+            seconds, fields = best_of(call, args.repeat)
+            expected = overall_with_passes(ad, expected_trips)
+            mismatched = sorted(key for key in expected if not same_field(expected[key], fields.get(key)))
+            if mismatched:
+                raise SystemExit(f'{name} differs from the per-trip passes for {n_trips} trips: {mismatched}')
+            row.append(seconds * 1000)
+        print(f"{n_trips:>6} " + ' '.join(f'{ms:>12.3f}' for ms in row))
+
+
+if __name__ == '__main__':
+    main()
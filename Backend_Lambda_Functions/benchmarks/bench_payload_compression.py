@@ -0,0 +1,149 @@
+"""
+Benchmark: capacity units saved vs CPU spent by each payload codec (PAYLOAD_CODEC)
+
+    deltas       deltas_binary of store-trajectory-batch, per batch of --batch-sizes deltas:
+                 bytes of the attribute, write units of the batch's delta attributes, and
+                 microseconds to compress (at upload) and to decompress (on every read)
+    summaries    DrivingSummaries-Neal entries built by analyze-driver from the corpus analyses:
+                 bytes of the whole item, write and read units (one strongly consistent read),
+                 and microseconds to build the entry and to expand it back on a cache hit.
+                 'attributes' is the entry as one attribute per field (before analysis_blob)
+
+Only installed codecs are listed (zstd needs zstandard, lz4 needs lz4). Every compressed
+payload must decompress to the exact bytes it was built from.
+
+Usage:
+    python benchmarks/bench_payload_compression.py [--sizes 100,2000,20000] [--seeds 2] [--batch-sizes 25,250] [--repeat 5]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from decimal import Decimal
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from bench_delta_encoding import attribute_size, delta_attributes_size, load_store_trajectory_batch  # noqa: E402
+from golden_harness import BASE_POINT, load_analyze_driver, synthetic_corpus  # noqa: E402
+from payload_compression import PAYLOAD_CODECS  # noqa: E402
+
+
+def item_size(item) -> int:
+    return sum(len(name) + attribute_size(value) for name, value in item.items())
+
+
+def best_of(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def codecs():
+    return [('none', None)] + [(codec.name, codec) for codec in PAYLOAD_CODECS.values()]
+
+
+def delta_payloads(stb, corpus, batch_size):
+    """Raw binary payloads of every full batch in the corpus"""
+    payloads = []
+    for trip in corpus:
+        for start in range(0, len(trip['deltas']) - batch_size + 1, batch_size):
+            validated, _ = stb.validate_enhanced_deltas([dict(d) for d in trip['deltas'][start:start + batch_size]])
+            payloads.append(stb.encode_delta_batch(validated))
+    return payloads
+
+
+def bench_deltas(stb, corpus, batch_size, repeat):
+    payloads = delta_payloads(stb, corpus, batch_size)
+    if not payloads:
+        return
+    print(f"\ndeltas, {len(payloads)} batches of {batch_size}")
+    print(f"{'codec':>10} {'bytes':>8} {'WCU':>6} {'compress us':>12} {'decompress us':>14}")
+    for name, codec in codecs():
+        compress_seconds, packed = best_of(lambda: [stb.compress_payload(data, codec) for data in payloads], repeat)
+        decompress_seconds, unpacked = best_of(lambda: [stb.decompress_payload(blob) for blob in packed], repeat)
+        if unpacked != payloads:
+            raise SystemExit(f'{name}: deltas payloads differ after decompression')
+        sizes = [delta_attributes_size({'data_version': stb.BINARY_DELTA_DATA_VERSION, 'deltas_binary': blob,
+                                        'delta_count': Decimal(batch_size)}) for blob in packed]
+        wcu = sum(math.ceil(size / 1024) for size in sizes) / len(sizes)
+        print(f"{name:>10} {sum(sizes) / len(sizes):>8.0f} {wcu:>6.2f} "
+              f"{compress_seconds * 1e6 / len(payloads):>12.1f} {decompress_seconds * 1e6 / len(payloads):>14.1f}")
+
+
+def corpus_analyses(ad, corpus):
+    analyses = []
+    for trip in corpus:
+        analysis = ad.process_trip_with_frontend_values(trip['deltas'], BASE_POINT, trip['trip_quality'])
+        if analysis:
+            analysis.update(trip_id=trip['name'], start_timestamp='2025-01-01T08:00:00Z',
+                            end_timestamp='2025-01-01T08:30:00Z')
+            analyses.append(analysis)
+    return analyses
+
+
+def attribute_entry(ad, entry):
+    """The entry as it was stored before analysis_blob: one attribute per field"""
+    fields = json.loads(ad.decompress_payload(entry['analysis_blob']), parse_float=Decimal)
+    fields.update((name, value) for name, value in entry.items() if name != 'analysis_blob')
+    return fields
+
+
+def without_cached_at(entry):
+    return {name: value for name, value in entry.items() if name != 'analysis_cached_at'}
+
+
+def microseconds(seconds, count):
+    return '-' if seconds is None else f'{seconds * 1e6 / count:.1f}'
+
+
+def bench_summaries(ad, corpus, repeat):
+    analyses = corpus_analyses(ad, corpus)
+    print(f"\nsummaries, {len(analyses)} cache entries")
+    print(f"{'codec':>10} {'bytes':>8} {'WCU':>6} {'RCU':>6} {'build us':>9} {'expand us':>10}")
+    compress_payload, rows = ad.compress_payload, []
+    for name, codec in codecs():
+        # build_cache_entry compresses with PAYLOAD_CODEC; run it with each codec instead
+        ad.compress_payload = lambda data, codec=codec: compress_payload(data, codec)
+        build_seconds, entries = best_of(lambda: [ad.build_cache_entry(analysis, 'bench') for analysis in analyses], repeat)
+        expand_seconds, expanded = best_of(lambda: [ad.expand_cached_summary(entry) for entry in entries], repeat)
+        if not rows:
+            plain = [attribute_entry(ad, entry) for entry in entries]
+            rows.append(('attributes', plain, None, None))
+            reference = [without_cached_at(entry) for entry in expanded]
+        elif [without_cached_at(entry) for entry in expanded] != reference:
+            raise SystemExit(f'{name}: cache entries differ after expanding')
+        rows.append((name, entries, build_seconds, expand_seconds))
+    ad.compress_payload = compress_payload
+    for name, entries, build_seconds, expand_seconds in rows:
+        sizes = [item_size(entry) for entry in entries]
+        wcu = sum(math.ceil(size / 1024) for size in sizes) / len(sizes)
+        rcu = sum(math.ceil(size / 4096) for size in sizes) / len(sizes)
+        print(f"{name:>10} {sum(sizes) / len(sizes):>8.0f} {wcu:>6.2f} {rcu:>6.2f} "
+              f"{microseconds(build_seconds, len(entries)):>9} {microseconds(expand_seconds, len(entries)):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,2000,20000')
+    parser.add_argument('--seeds', type=int, default=2)
+    parser.add_argument('--batch-sizes', default='25,250')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    stb = load_store_trajectory_batch()
+    corpus = synthetic_corpus([int(size) for size in args.sizes.split(',')], args.seeds)
+
+    for batch_size in args.batch_sizes.split(','):
+        bench_deltas(stb, corpus, int(batch_size), args.repeat)
+    bench_summaries(ad, corpus, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
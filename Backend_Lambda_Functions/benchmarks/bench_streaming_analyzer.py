@@ -0,0 +1,127 @@
+"""
+Benchmark: trip analysis at finalize, batch mode vs the streamed StreamingTripAnalyzer state
+
+    batch        analyze-driver's process_trip_with_frontend_values over every delta of the
+                 trip (what finalizing costs today, not counting the batch reads)
+    advance      per uploaded batch in store-trajectory-batch: load the state (compressed
+                 JSON), add_batch, save it (the cost moved to upload time, spread over the trip)
+    state KB     the final state as its DrivingSummaries-Neal item stores it (compress_payload)
+    streamed     StreamingTripAnalyzer.result() from the final state (what finalizing costs)
+
+Every trip of the golden corpus is also streamed in batches of 7 and 25 deltas and in
+random sizes (and of 1 delta up to 2,000 deltas), and each streamed result must equal the
+reference engine field for field (no float tolerance). The vectorized engine only agrees
+with the reference within golden_harness's float tolerance, so it is not the comparison target.
+
+Usage:
+    python benchmarks/bench_streaming_analyzer.py [--sizes 100,2000,20000] [--seeds 2] [--repeat 3]
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from golden_harness import BASE_POINT, analyze_driver_engine, diff_values, load_analyze_driver, synthetic_corpus  # noqa: E402
+from payload_compression import compress_payload, decompress_payload  # noqa: E402
+
+BATCH_SPLITS = (1, 7, 25, 'random')
+# One state round trip per delta is slow for long trips
+MAX_SINGLE_DELTA_TRIP = 2000
+EXACT = {'*': 0.0}
+
+
+def load_store_trajectory_batch():
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    spec = importlib.util.spec_from_file_location('store_trajectory_batch',
+                                                  os.path.join(HERE, '..', 'store-trajectory-batch.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def split_batches(deltas, split, seed=0):
+    if split == 'random':
+        rng = random.Random(seed)
+        batches, index = [], 0
+        while index < len(deltas):
+            size = rng.randint(1, 60)
+            batches.append(deltas[index:index + size])
+            index += size
+        return batches
+    return [deltas[index:index + split] for index in range(0, len(deltas), split)]
+
+
+def stored_state(analyzer):
+    return compress_payload(analyzer.to_json().encode('utf-8'))
+
+
+def stream(stb, batches):
+    """Upload the batches one by one; the state is stored between them, like its DrivingSummaries-Neal item"""
+    state = stored_state(stb.StreamingTripAnalyzer(BASE_POINT))
+    for batch_number, batch in enumerate(batches, start=stb.FIRST_BATCH_NUMBER):
+        analyzer = stb.StreamingTripAnalyzer.from_json(decompress_payload(state).decode('utf-8'))
+        status = analyzer.add_batch(batch_number, batch)
+        if status != 'advanced':
+            raise SystemExit(f'batch {batch_number} not applied: {status} ({analyzer.failed})')
+        state = stored_state(analyzer)
+    return stb.StreamingTripAnalyzer.from_json(decompress_payload(state).decode('utf-8'))
+
+
+def best_of(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,2000,20000')
+    parser.add_argument('--seeds', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    stb = load_store_trajectory_batch()
+    reference = analyze_driver_engine(ad, 'reference')
+    engine = ad.get_analysis_engine()
+
+    corpus = synthetic_corpus([int(size) for size in args.sizes.split(',')], args.seeds)
+    mismatched = []
+    for trip in corpus:
+        expected = reference.analyze(trip['deltas'], BASE_POINT, trip['trip_quality'])
+        for split in BATCH_SPLITS:
+            if split == 1 and len(trip['deltas']) > MAX_SINGLE_DELTA_TRIP:
+                continue
+            analyzer = stream(stb, split_batches(trip['deltas'], split))
+            differences = diff_values(expected, analyzer.result(BASE_POINT, trip['trip_quality']), EXACT)
+            if differences:
+                mismatched.append((trip['name'], split, differences[:3]))
+    if mismatched:
+        for name, split, differences in mismatched:
+            print(f'{name} in batches of {split}: {differences}')
+        raise SystemExit(f'{len(mismatched)} streamed results differ from the reference engine')
+    print(f'{len(corpus)} trips in {len(BATCH_SPLITS)} batch splits: streamed results equal the reference engine')
+
+    print(f"\n{'trip':>22} {'batch (' + engine + ') ms':>22} {'advance ms/batch':>17} {'state KB':>9} {'streamed ms':>12}")
+    for trip in corpus:
+        if trip['trip_quality'] or len(trip['deltas']) < 100:
+            continue
+        batches = split_batches(trip['deltas'], 25)
+        batch_seconds, _ = best_of(lambda: ad.process_trip_with_frontend_values(trip['deltas'], BASE_POINT, {}), args.repeat)
+        advance_seconds, analyzer = best_of(lambda: stream(stb, batches), args.repeat)
+        streamed_seconds, _ = best_of(lambda: analyzer.result(BASE_POINT, {}), args.repeat)
+        print(f"{trip['name']:>22} {batch_seconds * 1000:>22.2f} {advance_seconds * 1000 / len(batches):>17.3f} "
+              f"{len(stored_state(analyzer)) / 1024:>9.1f} {streamed_seconds * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Golden-output harness: every registered analysis engine against the reference engine
+
+Runs process_trip_with_frontend_values-compatible engines over a corpus of trips and diffs
+every output field of each engine against the 'reference' engine (analyze-driver's
+pure-Python loops). Scores that feed pricing (behavior, smoothness, turn safety,
+consistency, frequency) must match exactly; other floats within FLOAT_TOLERANCE unless
+--tolerance overrides them.
+
+For a trip that differs, the intermediate stages of both engines are compared as well and
+the first diverging indices are reported next to the field mismatches: validated speeds are
+per delta, coordinates and bearings per accepted segment. Event mismatches carry the
+event's segment range (speed index == delta index).
+
+Corpus:
+    synthetic  every trip_generator profile x --sizes x --seeds, with and without
+               frontend trip_quality values, plus 1/2/5/7-delta edge cases
+    recorded   --recorded FILE_OR_DIR: JSON files holding a list of deltas, a list of
+               TrajectoryBatches items, or {"deltas": [...], "trip_quality": {...}, "base_point": {...}}
+
+Engines:
+    reference, vectorized (analyze-driver with ANALYSIS_ENGINE set accordingly; vectorized
+    needs NumPy) and any --engine NAME=PATH_OR_MODULE:FUNCTION taking
+    (deltas, base_point, trip_quality) and returning the trip analysis dict
+
+Usage:
+    python benchmarks/golden_harness.py [--sizes 100,2000,20000] [--seeds 2] [--recorded trips/]
+        [--engine candidate=../analyze-driver-next.py:process_trip_with_frontend_values]
+        [--tolerance moving_avg_speed_mph=0.05] [--report golden_report.json]
+
+Exits with status 1 when any engine differs from the reference.
+"""
+import argparse
+import fnmatch
+import importlib
+import importlib.util
+import json
+import math
+import os
+import sys
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, '..'))  # the Lambdas' shared modules (payload_compression.py)
+
+from trip_generator import PROFILES, generate_trip  # noqa: E402
+
+REFERENCE_ENGINE = 'reference'
+DEFAULT_SIZES = (100, 2000, 20000)
+BASE_POINT = {'latitude': 37.7749, 'longitude': -122.4194, 'city': 'San Francisco', 'state': 'CA', 'source': 'golden'}
+FRONTEND_TRIP_QUALITY = {
+    'use_gps_metrics': True,
+    'actual_distance_miles': 12.5,
+    'actual_duration_minutes': 30.0,
+    'actual_start_timestamp': '2025-01-06T08:00:00Z',
+    'actual_end_timestamp': '2025-01-06T08:30:00Z',
+    'gps_max_speed_mph': 70.0,
+    'gps_avg_speed_mph': 30.0,
+}
+
+# Absolute tolerance per field; a key is a dotted path pattern or a bare field name
+FIELD_TOLERANCES = {
+    'behavior_score': 0.0,
+    'smoothness_score': 0.0,
+    'turn_safety_score': 0.0,
+    'speed_consistency': 0.0,
+    'frequency_score': 0.0,
+}
+# Relative tolerance for every other float (summation order may differ between engines)
+FLOAT_TOLERANCE = 1e-9
+MAX_REPORTED_INDICES = 10
+# Module functions stage_trace needs (an analyze-driver.py copy has them all)
+STAGE_FUNCTIONS = ('as_trip_arrays', 'detect_coordinate_format', 'reconstruct_coordinates',
+                   'compute_bearing_kernel', 'extract_and_validate_speeds')
+
+
+class Engine:
+    """An analysis implementation: analyze(deltas, base_point, trip_quality) -> result dict
+
+    trace(deltas, base_point) -> {stage: per-delta list}, optional, localizes divergences
+    """
+
+    def __init__(self, name: str, analyze: Callable, trace: Optional[Callable] = None):
+        self.name = name
+        self.analyze = analyze
+        self.trace = trace
+
+
+_engines: Dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine) -> Engine:
+    _engines[engine.name] = engine
+    return engine
+
+
+def load_analyze_driver(path: str = os.path.join(HERE, '..', 'analyze-driver.py'), name: str = 'analyze_driver'):
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def analyze_driver_engine(ad, engine_name: str) -> Engine:
+    """One of analyze-driver's own engines, selected per call with set_analysis_engine"""
+
+    def with_engine(func, *args):
+        previous = ad.get_analysis_engine()
+        ad.set_analysis_engine(engine_name)
+        try:
+            return func(*args)
+        finally:
+            ad.set_analysis_engine(previous)
+
+    def analyze(deltas, base_point, trip_quality):
+        return with_engine(ad.process_trip_with_frontend_values, deltas, base_point, trip_quality)
+
+    def trace(deltas, base_point):
+        return with_engine(stage_trace, ad, deltas, base_point)
+
+    return Engine(engine_name, analyze, trace)
+
+
+def stage_trace(ad, deltas, base_point) -> Dict[str, list]:
+    """Intermediate per-point outputs of an analyze-driver module"""
+    trip_arrays = ad.as_trip_arrays(deltas)
+    if not len(trip_arrays):
+        return {}
+    _, divisor = ad.detect_coordinate_format(trip_arrays)
+    coordinate_pairs, _ = ad.reconstruct_coordinates(trip_arrays, divisor, base_point['latitude'], base_point['longitude'])
+    bearings, _, _ = ad.compute_bearing_kernel(coordinate_pairs)
+    return {
+        'speeds': list(ad.extract_and_validate_speeds(trip_arrays)),
+        'coordinates': [tuple(pair) for pair in _to_list(coordinate_pairs)],
+        'bearings': list(_to_list(bearings)),
+    }
+
+
+def load_engine_spec(spec: str) -> Engine:
+    """NAME=PATH_OR_MODULE:FUNCTION (a .py path may contain hyphens, like the Lambda files)"""
+    name, _, target = spec.partition('=')
+    location, _, func_name = target.rpartition(':')
+    if not name or not location or not func_name:
+        raise ValueError(f"engine spec must be NAME=PATH_OR_MODULE:FUNCTION, got {spec!r}")
+    if location.endswith('.py'):
+        module = load_analyze_driver(location, f'engine_{name}')
+    else:
+        module = importlib.import_module(location)
+    analyze = getattr(module, func_name)
+    trace = getattr(analyze, 'trace', None)
+    if trace is None and all(hasattr(module, stage) for stage in STAGE_FUNCTIONS):
+        # A modified copy of analyze-driver.py: trace it the same way as the reference
+        def trace(deltas, base_point):
+            return stage_trace(module, deltas, base_point)
+    return Engine(name, analyze, trace)
+
+
+def _to_list(values):
+    return values.tolist() if hasattr(values, 'tolist') else values
+
+
+# ========================================
+# Corpus
+# ========================================
+
+def synthetic_corpus(sizes: List[int], seeds: int) -> List[Dict]:
+    trips = []
+    for profile in PROFILES:
+        for points in sizes:
+            for seed in range(seeds):
+                trip_quality = FRONTEND_TRIP_QUALITY if seed % 2 else {}
+                trips.append({'name': f'{profile}-{points}-s{seed}', 'deltas': generate_trip(profile, points, seed),
+                              'trip_quality': trip_quality})
+    city = generate_trip('city', 50, 0)
+    for length in (1, 2, 5, 7):
+        trips.append({'name': f'edge-{length}', 'deltas': city[:length], 'trip_quality': {}})
+    return trips
+
+
+def recorded_corpus(path: str) -> List[Dict]:
+    files = [path] if os.path.isfile(path) else sorted(
+        os.path.join(path, name) for name in os.listdir(path) if name.endswith('.json'))
+    trips = []
+    for file_path in files:
+        with open(file_path) as f:
+            # Numbers as Decimal, the way DynamoDB returns them
+            data = json.load(f, parse_float=Decimal, parse_int=Decimal)
+        trip = {'name': os.path.basename(file_path), 'trip_quality': {}}
+        if isinstance(data, dict):
+            # Trip-level values arrive as floats in production (decode_trip_record)
+            trip['trip_quality'] = {k: float(v) if isinstance(v, Decimal) else v
+                                    for k, v in data.get('trip_quality', {}).items()}
+            if 'base_point' in data:
+                trip['base_point'] = {k: float(v) if isinstance(v, Decimal) else v for k, v in data['base_point'].items()}
+            data = data.get('deltas', [])
+        if data and isinstance(data[0], dict) and 'deltas' in data[0]:
+            # TrajectoryBatches items
+            data = [delta for batch in sorted(data, key=lambda b: int(b.get('batch_number', 0))) for delta in batch['deltas']]
+        trip['deltas'] = data
+        trips.append(trip)
+    return trips
+
+
+# ========================================
+# Comparison
+# ========================================
+
+def tolerance_for(path: str, tolerances: Dict[str, float]) -> Optional[float]:
+    leaf = path.rsplit('.', 1)[-1].split('[', 1)[0]
+    for pattern, tolerance in tolerances.items():
+        if pattern == leaf or fnmatch.fnmatchcase(path, pattern):
+            return tolerance
+    return None
+
+
+def diff_values(reference, candidate, tolerances: Dict[str, float], path: str = '') -> List[Dict]:
+    """Field-by-field differences between two analysis results"""
+    if isinstance(reference, dict) and isinstance(candidate, dict):
+        mismatches = []
+        for key in sorted(set(reference) | set(candidate), key=str):
+            child = f'{path}.{key}' if path else str(key)
+            if key not in candidate or key not in reference:
+                mismatches.append({'field': child, 'reference': reference.get(key, '<missing>'),
+                                   'candidate': candidate.get(key, '<missing>')})
+            else:
+                mismatches.extend(diff_values(reference[key], candidate[key], tolerances, child))
+        return mismatches
+
+    if isinstance(reference, (list, tuple)) and isinstance(candidate, (list, tuple)):
+        mismatches = []
+        if len(reference) != len(candidate):
+            mismatches.append({'field': f'{path}.length', 'reference': len(reference), 'candidate': len(candidate)})
+        for index, (ref_item, cand_item) in enumerate(zip(reference, candidate)):
+            item_mismatches = diff_values(ref_item, cand_item, tolerances, f'{path}[{index}]')
+            if item_mismatches and isinstance(ref_item, dict) and 'segment_start' in ref_item:
+                # Events carry the speed-segment range they cover (speed index == delta index)
+                for mismatch in item_mismatches:
+                    mismatch['delta_indices'] = [ref_item['segment_start'], ref_item.get('segment_end', ref_item['segment_start'])]
+            mismatches.extend(item_mismatches)
+        return mismatches
+
+    if isinstance(reference, float) and isinstance(candidate, float):
+        tolerance = tolerance_for(path, tolerances)
+        if math.isnan(reference) and math.isnan(candidate):
+            return []
+        if tolerance is None:
+            equal = math.isclose(reference, candidate, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE)
+        else:
+            equal = abs(reference - candidate) <= tolerance
+        return [] if equal else [{'field': path, 'reference': reference, 'candidate': candidate,
+                                  'difference': candidate - reference}]
+
+    if type(reference) is not type(candidate) or reference != candidate:
+        return [{'field': path, 'reference': reference, 'candidate': candidate}]
+    return []
+
+
+def first_divergences(reference_trace: Dict, candidate_trace: Dict) -> List[Dict]:
+    """Per stage, the first indices where the two engines' per-delta values differ"""
+    divergences = []
+    for stage in sorted(set(reference_trace) & set(candidate_trace)):
+        ref_values, cand_values = reference_trace[stage], candidate_trace[stage]
+        indices = [index for index, (a, b) in enumerate(zip(ref_values, cand_values)) if diff_values(a, b, {})]
+        if len(ref_values) != len(cand_values) or indices:
+            first = indices[0] if indices else min(len(ref_values), len(cand_values))
+            divergences.append({
+                'stage': stage,
+                'first_index': first,
+                'indices': indices[:MAX_REPORTED_INDICES],
+                'diverging_count': len(indices),
+                'reference_length': len(ref_values),
+                'candidate_length': len(cand_values),
+                'reference': ref_values[first] if first < len(ref_values) else None,
+                'candidate': cand_values[first] if first < len(cand_values) else None,
+            })
+    return divergences
+
+
+def run_engine(engine: Engine, trip: Dict):
+    try:
+        return engine.analyze(trip['deltas'], trip.get('base_point', BASE_POINT), dict(trip['trip_quality']))
+    except Exception as e:  # an engine crash is a mismatch, not a harness failure
+        return {'__error__': f'{type(e).__name__}: {e}'}
+
+
+def compare_engines(corpus: List[Dict], engines: List[Engine], tolerances: Dict[str, float]) -> Dict:
+    reference = _engines[REFERENCE_ENGINE]
+    report = {'trips': len(corpus), 'engines': {}}
+    for engine in engines:
+        report['engines'][engine.name] = {'trips_compared': 0, 'trips_mismatched': 0, 'mismatches': []}
+
+    for trip in corpus:
+        expected = run_engine(reference, trip)
+        # Fields that change between two reference runs (datetime.now() fallbacks) are not compared
+        unstable = {m['field'] for m in diff_values(expected, run_engine(reference, trip), tolerances)}
+        if unstable:
+            report.setdefault('unstable_fields', {})[trip['name']] = sorted(unstable)
+        for engine in engines:
+            summary = report['engines'][engine.name]
+            summary['trips_compared'] += 1
+            actual = run_engine(engine, trip)
+            field_mismatches = [m for m in diff_values(expected, actual, tolerances) if m['field'] not in unstable]
+            if not field_mismatches:
+                continue
+            summary['trips_mismatched'] += 1
+            entry = {'trip': trip['name'], 'deltas': len(trip['deltas']), 'fields': field_mismatches}
+            if reference.trace and engine.trace:
+                base_point = trip.get('base_point', BASE_POINT)
+                entry['divergence'] = first_divergences(reference.trace(trip['deltas'], base_point),
+                                                        engine.trace(trip['deltas'], base_point))
+            summary['mismatches'].append(entry)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument('--seeds', type=int, default=2)
+    parser.add_argument('--recorded', action='append', default=[], help='JSON trip file or directory (repeatable)')
+    parser.add_argument('--no-synthetic', action='store_true')
+    parser.add_argument('--engine', action='append', default=[], help='NAME=PATH_OR_MODULE:FUNCTION (repeatable)')
+    parser.add_argument('--tolerance', action='append', default=[], help='FIELD=ABSOLUTE_TOLERANCE (repeatable)')
+    parser.add_argument('--report', help='write the full mismatch report as JSON')
+    args = parser.parse_args()
+
+    ad = load_analyze_driver()
+    register_engine(analyze_driver_engine(ad, REFERENCE_ENGINE))
+    if ad.np is not None:
+        register_engine(analyze_driver_engine(ad, 'vectorized'))
+    for spec in args.engine:
+        register_engine(load_engine_spec(spec))
+
+    tolerances = dict(FIELD_TOLERANCES)
+    for item in args.tolerance:
+        field, _, value = item.partition('=')
+        tolerances[field] = float(value)
+
+    corpus = [] if args.no_synthetic else synthetic_corpus([int(size) for size in args.sizes.split(',')], args.seeds)
+    for path in args.recorded:
+        corpus.extend(recorded_corpus(path))
+
+    candidates = [engine for name, engine in _engines.items() if name != REFERENCE_ENGINE]
+    if not candidates:
+        parser.error('no engine to compare against the reference (install NumPy or pass --engine)')
+
+    report = compare_engines(corpus, candidates, tolerances)
+    for name, summary in report['engines'].items():
+        status = 'OK' if not summary['trips_mismatched'] else 'MISMATCH'
+        print(f"{status:8s} {name}: {summary['trips_mismatched']}/{summary['trips_compared']} trips differ from {REFERENCE_ENGINE}")
+        for entry in summary['mismatches'][:MAX_REPORTED_INDICES]:
+            fields = ', '.join(sorted({m['field'] for m in entry['fields']})[:5])
+            where = '; '.join(f"{d['stage']} from index {d['first_index']}" for d in entry.get('divergence', []))
+            print(f"         {entry['trip']} ({entry['deltas']} deltas): {fields}" + (f" [{where}]" if where else ''))
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+    sys.exit(1 if any(s['trips_mismatched'] for s in report['engines'].values()) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""
+Deterministic synthetic trips in the delta format the app uploads
+
+Every delta carries fixed-point delta_lat/delta_long (degrees * 1,000,000, like
+current_trip_page.dart), delta_time in ms, an ISO timestamp, speed_mph and gps_accuracy,
+plus the optional fields store-trajectory-batch scores. The same (profile, n_points, seed)
+always produces the same stream.
+
+Profiles:
+    city          stop-and-go: accelerate, cruise, brake to lights, right-angle turns
+    highway       55-75 mph cruise with lane changes, gentle curves and slowdowns
+    stationary    parked phone: 0-1.5 mph readings and a few units of position jitter
+    spiky         city driving with GPS speed spikes, position jumps, gaps and missing speeds
+    warmup_noisy  a minute of poor-accuracy, jittery readings before city driving
+
+Usage:
+    from trip_generator import generate_trip, iter_batches
+    deltas = generate_trip('city', 5000, seed=1)
+    for batch in iter_batches('highway', 1_000_000, seed=2):  # 25 deltas at a time
+        ...
+"""
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterator, List
+
+PROFILES = ('city', 'highway', 'stationary', 'spiky', 'warmup_noisy')
+
+FIXED_POINT_SCALE = 1000000
+MILES_PER_DEGREE_LAT = 69.0
+DEFAULT_ORIGIN = (37.7749, -122.4194)
+DEFAULT_START = datetime(2025, 1, 6, 8, 0, 0, tzinfo=timezone.utc)
+APP_INTERVAL_MS = 2000  # the app samples every 2 seconds
+BATCH_SIZE = 25
+
+
+class _Vehicle:
+    """True position, speed and heading of the simulated car"""
+
+    def __init__(self, rng: random.Random, origin):
+        self.rng = rng
+        self.lat, self.lon = origin
+        self.speed = 0.0
+        self.heading = rng.uniform(0, 360)
+        # Pulling away: the first delta is non-zero, which analyze-driver's format detection needs
+        self.target = rng.uniform(20, 40)
+        self.phase = 'accelerate'
+        self.phase_left = 0
+        self.rate = rng.uniform(3, 7)  # mph/s for the current accelerate/brake phase
+        self.turn_left = 0
+        self.turn_step = 0.0
+
+    def move(self, interval_ms: float):
+        """Advance the true position and return the fixed-point (delta_lat, delta_long)"""
+        distance_miles = self.speed * interval_ms / 3600000.0
+        heading = math.radians(self.heading)
+        new_lat = self.lat + distance_miles * math.cos(heading) / MILES_PER_DEGREE_LAT
+        new_lon = self.lon + distance_miles * math.sin(heading) / (MILES_PER_DEGREE_LAT * math.cos(math.radians(self.lat)))
+        delta_lat = round(new_lat * FIXED_POINT_SCALE) - round(self.lat * FIXED_POINT_SCALE)
+        delta_long = round(new_lon * FIXED_POINT_SCALE) - round(self.lon * FIXED_POINT_SCALE)
+        self.lat, self.lon = new_lat, new_lon
+        return delta_lat, delta_long
+
+    def start_turn(self, degrees: float, points: int):
+        self.turn_left = points
+        self.turn_step = degrees / points
+
+    def steer(self, drift: float):
+        if self.turn_left:
+            self.heading = (self.heading + self.turn_step) % 360
+            self.turn_left -= 1
+        else:
+            self.heading = (self.heading + self.rng.gauss(0, drift)) % 360
+
+
+def _city_step(car: _Vehicle, seconds: float):
+    """Stop-and-go phases: stopped -> accelerate -> cruise -> brake -> stopped"""
+    rng = car.rng
+    car.phase_left -= 1
+    if car.phase == 'stopped':
+        car.speed = 0.0
+        if car.phase_left <= 0:
+            car.phase = 'accelerate'
+            car.target = rng.uniform(20, 40)
+            # Mostly gentle launches, sometimes an aggressive one
+            car.rate = rng.uniform(8, 10) if rng.random() < 0.05 else rng.uniform(3, 7)
+            if rng.random() < 0.4:
+                car.start_turn(rng.choice((-90, 90)), rng.randint(3, 5))
+    elif car.phase == 'accelerate':
+        car.speed = min(car.target, car.speed + car.rate * seconds)
+        if car.speed >= car.target:
+            car.phase, car.phase_left = 'cruise', rng.randint(8, 40)
+    elif car.phase == 'cruise':
+        car.speed = max(5.0, car.speed + rng.gauss(0, 1.2))
+        if car.phase_left <= 0:
+            car.phase = 'brake'
+            # Mostly normal braking, sometimes a hard stop
+            car.rate = rng.uniform(13, 16) if rng.random() < 0.08 else rng.uniform(3, 7)
+    elif car.phase == 'brake':
+        car.speed = max(0.0, car.speed - car.rate * seconds)
+        if car.speed == 0.0:
+            car.phase, car.phase_left = 'stopped', rng.randint(5, 30)
+    car.steer(2.0)
+
+
+def _highway_step(car: _Vehicle, seconds: float):
+    """Cruise near a target speed; lane changes, curves and the odd slowdown"""
+    rng = car.rng
+    if car.phase == 'accelerate':
+        car.target = max(car.target, 58.0)  # on-ramp
+        car.speed = min(car.target, car.speed + rng.uniform(3, 6) * seconds)
+        if car.speed >= car.target:
+            car.phase = 'cruise'
+    elif car.phase == 'slowdown':
+        car.speed = max(car.target, car.speed - car.rate * seconds)
+        car.phase_left -= 1
+        if car.phase_left <= 0:
+            car.phase, car.target = 'accelerate', rng.uniform(58, 72)
+    else:
+        car.speed = min(85.0, max(45.0, car.speed + rng.gauss(0, 0.8) + (car.target - car.speed) * 0.05))
+        roll = rng.random()
+        if roll < 0.001:
+            # Traffic ahead stops suddenly: sustained hard braking
+            car.phase, car.target, car.phase_left = 'slowdown', rng.uniform(5, 15), rng.randint(10, 30)
+            car.rate = rng.uniform(13, 16)
+        elif roll < 0.004:
+            car.phase, car.target, car.phase_left = 'slowdown', rng.uniform(30, 45), rng.randint(10, 30)
+            car.rate = rng.uniform(2, 5)
+        elif roll < 0.02 and not car.turn_left:
+            car.start_turn(rng.choice((-6, 6)), 2)  # lane change
+        elif roll < 0.03 and not car.turn_left:
+            car.start_turn(rng.uniform(-35, 35), rng.randint(8, 20))  # curve
+    car.steer(0.4)
+
+
+def iter_trip(profile: str, n_points: int, seed: int = 0, origin=DEFAULT_ORIGIN,
+              start: datetime = DEFAULT_START, dynamodb_types: bool = True) -> Iterator[Dict]:
+    """Yield n_points deltas one at a time (constant memory, so 1M-point trips are fine)
+
+    dynamodb_types: numbers as Decimal, the way DynamoDB hands batches back to the Lambdas
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"unknown profile {profile!r} (choose from {', '.join(PROFILES)})")
+
+    rng = random.Random(f'{profile}:{seed}')
+    car = _Vehicle(rng, origin)
+    timestamp = start
+    warmup_points = min(30, n_points // 5) if profile == 'warmup_noisy' else 0
+    jump_back = None
+
+    for sequence in range(n_points):
+        interval_ms = APP_INTERVAL_MS + rng.choice((0, 0, 0, -500, 500))
+        if profile == 'spiky' and rng.random() < 0.01:
+            interval_ms = rng.choice((20000, 45000, 70000))  # signal lost
+        seconds = interval_ms / 1000.0
+        accuracy = rng.choice((3.9, 4.7, 5.0, 6.2, 8.0, 10.5))
+
+        if profile == 'stationary':
+            car.speed = 0.0
+            delta_lat, delta_long = rng.randint(-3, 3), rng.randint(-3, 3)
+            reported_speed = rng.uniform(0, 1.5)
+            accuracy = rng.uniform(5, 20)
+        elif sequence < warmup_points:
+            # Cold GPS: large accuracy radius, wandering fix, meaningless speeds
+            delta_lat, delta_long = rng.randint(-60, 60), rng.randint(-60, 60)
+            reported_speed = rng.uniform(0, 15)
+            accuracy = rng.uniform(35, 150)
+        else:
+            if profile == 'highway':
+                _highway_step(car, seconds)
+            else:
+                _city_step(car, seconds)
+            delta_lat, delta_long = car.move(interval_ms)
+            reported_speed = max(0.0, car.speed + rng.gauss(0, 0.4))
+
+        if profile == 'spiky':
+            if jump_back is not None:
+                delta_lat, delta_long = delta_lat - jump_back[0], delta_long - jump_back[1]
+                jump_back = None
+            elif rng.random() < 0.01:
+                jump_back = (rng.randint(-2500, 2500), rng.randint(-2500, 2500))
+                delta_lat, delta_long = delta_lat + jump_back[0], delta_long + jump_back[1]
+                accuracy = rng.uniform(25, 80)
+            if rng.random() < 0.02:
+                reported_speed += rng.uniform(60, 150)
+
+        timestamp += timedelta(milliseconds=interval_ms)
+        delta = {
+            'delta_lat': delta_lat,
+            'delta_long': delta_long,
+            'delta_time': float(interval_ms),
+            'timestamp': timestamp.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'sequence': sequence,
+            'speed_mph': round(reported_speed, 2),
+            'speed_source': 'gps',
+            'speed_confidence': 0.95,
+            'gps_accuracy': round(accuracy, 1),
+            'is_stationary': reported_speed < 2.0,
+            'data_quality': 'high' if accuracy < 10 else 'medium',
+        }
+        if profile == 'spiky' and rng.random() < 0.03:
+            # Speed missing from the upload, or sent as null
+            if rng.random() < 0.5:
+                del delta['speed_mph']
+            else:
+                delta['speed_mph'] = None
+
+        if dynamodb_types:
+            delta = {key: (Decimal(str(value)) if isinstance(value, (int, float)) and not isinstance(value, bool) else value)
+                     for key, value in delta.items()}
+        yield delta
+
+
+def generate_trip(profile: str, n_points: int, seed: int = 0, **kwargs) -> List[Dict]:
+    """All deltas of one trip as a list (see iter_trip for the options)"""
+    return list(iter_trip(profile, n_points, seed, **kwargs))
+
+
+def iter_batches(profile: str, n_points: int, seed: int = 0, batch_size: int = BATCH_SIZE, **kwargs) -> Iterator[List[Dict]]:
+    """The trip as the app uploads it: lists of batch_size deltas"""
+    batch = []
+    for delta in iter_trip(profile, n_points, seed, **kwargs):
+        batch.append(delta)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def trajectory_batch_items(user_id: str, trip_id: str, deltas: List[Dict], batch_size: int = BATCH_SIZE) -> List[Dict]:
+    """TrajectoryBatches-Neal items (as store-trajectory-batch writes them) for a delta list"""
+    items = []
+    for index in range(0, len(deltas), batch_size):
+        batch_deltas = deltas[index:index + batch_size]
+        batch_number = index // batch_size + 1
+        items.append({
+            'user_id': user_id,
+            'trip_id': trip_id,
+            'batch_number': Decimal(batch_number),
+            'batch_id': f'{trip_id}_batch_{batch_number}',
+            'upload_timestamp': str(batch_deltas[-1].get('timestamp', '')),
+            'batch_size': Decimal(len(batch_deltas)),
+            'deltas': batch_deltas,
+        })
+    return items
@@ -0,0 +1,170 @@
+# delta_encoding.py - Binary delta batch format (deltas_binary) shared by the Lambdas that write or read batches
+# Bundled next to analyze-driver.py, finalize-trip.py and store-trajectory-batch.py in each package
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+from payload_compression import decompress_payload
+
+# 🚀 OPTIMIZATION: A batch's deltas as one Binary attribute (deltas_binary) instead of a list
+# of maps, where every field of every point is a typed attribute. After a format byte and the
+# point count, everything is varints, one column after the other:
+#   utc offset                one per batch: 0 for naive timestamps, else zigzag(seconds) + 1
+#   delta_lat, delta_long     zigzag, the app's fixed-point integers (degrees * 1,000,000)
+#   delta_time                ms
+#   timestamp                 zigzag µs since the previous point (the first: since the epoch)
+#   speed_mph, gps_accuracy   0 when missing, else zigzag(round(value * scale)) + 1
+#   flags                     bit 0 is_stationary, bits 1-3 the enhancement_score numerator
+# sequence, speed_confidence, data_quality and the app's other fields are not kept: no reader
+# uses them, and batch_statistics are computed before encoding. A batch that does not fit
+# (non-integer coordinates or delta_time, unreadable or mixed-offset timestamps) is stored as
+# a list of maps. Readers tell the two apart by data_version.
+
+LEGACY_DELTA_DATA_VERSION = '2.4'
+BINARY_DELTA_DATA_VERSION = '3.0'
+BINARY_DELTA_DATA_VERSIONS = (BINARY_DELTA_DATA_VERSION,)
+DELTA_FORMAT_VERSION = 1
+DELTA_COLUMNS = 7
+SPEED_SCALE = 100      # 0.01 mph
+ACCURACY_SCALE = 10    # 0.1 m
+# store-trajectory-batch's validate_enhanced_deltas scores len(optional_fields) == 7 optional fields
+ENHANCEMENT_FIELDS = 7
+EPOCH_NAIVE = datetime(1970, 1, 1)
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varints(data: bytes, start: int) -> List[int]:
+    """Every varint from data[start:]"""
+    values = []
+    value = shift = 0
+    for byte in data[start:]:
+        if byte < 0x80:
+            values.append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise ValueError("truncated varint in delta batch")
+    return values
+
+def _exact_int(value, field: str) -> int:
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{field} {value} is not an integer")
+    return int(number)
+
+def _quantized(value, scale: int) -> int:
+    """0 for a missing value, else zigzag(round(value * scale)) + 1"""
+    if value is None:
+        return 0
+    try:
+        return _zigzag(round(float(value) * scale)) + 1
+    except OverflowError as e:
+        raise ValueError(f"{value} cannot be quantized: {e}")
+
+def parse_delta_timestamp(raw_timestamp) -> Optional[datetime]:
+    """One delta's timestamp (None when missing or unreadable)"""
+    if isinstance(raw_timestamp, datetime):
+        return raw_timestamp  # decoded from a binary batch
+    if not raw_timestamp:
+        return None
+    try:
+        ts_str = str(raw_timestamp)
+        if ts_str.endswith('Z'):
+            ts_str = ts_str[:-1] + '+00:00'
+        return datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+    except Exception:
+        return None
+
+def encode_delta_batch(deltas: List[Dict]) -> bytes:
+    """Validated deltas as a binary delta batch (ValueError when the batch does not fit the format)"""
+    timestamps = [parse_delta_timestamp(d.get('timestamp')) for d in deltas]
+    if None in timestamps:
+        raise ValueError("unreadable timestamp")
+    offsets = {timestamp.utcoffset() for timestamp in timestamps}
+    if len(offsets) > 1:
+        raise ValueError(f"mixed timestamp offsets {offsets}")
+    offset = offsets.pop() if offsets else None
+    if offset is not None and offset % timedelta(seconds=1):
+        raise ValueError(f"sub-second timestamp offset {offset}")
+    epoch = EPOCH_NAIVE if offset is None else EPOCH_UTC
+
+    out = bytearray([DELTA_FORMAT_VERSION])
+    _write_varint(out, len(deltas))
+    _write_varint(out, 0 if offset is None else _zigzag(int(offset.total_seconds())) + 1)
+    for field in ('delta_lat', 'delta_long'):
+        for d in deltas:
+            _write_varint(out, _zigzag(_exact_int(d[field], field)))
+    for d in deltas:
+        _write_varint(out, _exact_int(d['delta_time'], 'delta_time'))
+    previous = 0
+    for timestamp in timestamps:
+        micros = (timestamp - epoch) // ONE_MICROSECOND
+        _write_varint(out, _zigzag(micros - previous))
+        previous = micros
+    for d in deltas:
+        _write_varint(out, _quantized(d.get('speed_mph'), SPEED_SCALE))
+    for d in deltas:
+        _write_varint(out, _quantized(d.get('gps_accuracy'), ACCURACY_SCALE))
+    for d in deltas:
+        enhancement = round(float(d.get('enhancement_score', 0)) * ENHANCEMENT_FIELDS)
+        _write_varint(out, (1 if d.get('is_stationary') else 0) | (min(max(enhancement, 0), ENHANCEMENT_FIELDS) << 1))
+    return bytes(out)
+
+def decode_delta_columns(blob) -> Dict[str, List]:
+    """
+    Columns of a binary delta batch: delta_lat, delta_long, delta_time (ints), timestamp
+    (datetimes), speed_mph, gps_accuracy (floats, None when missing), is_stationary, enhancement_score
+    """
+    data = decompress_payload(blob)
+    if not data or data[0] != DELTA_FORMAT_VERSION:
+        raise ValueError(f"unsupported delta batch format {data[:1]!r}")
+    values = _read_varints(data, 1)
+    count = values[0] if values else 0
+    if len(values) != 2 + DELTA_COLUMNS * count:
+        raise ValueError(f"delta batch holds {len(values)} values, expected {2 + DELTA_COLUMNS * count}")
+    column = [values[2 + k * count:2 + (k + 1) * count] for k in range(DELTA_COLUMNS)]
+
+    if values[1]:
+        base = EPOCH_UTC.astimezone(timezone(timedelta(seconds=_unzigzag(values[1] - 1))))
+    else:
+        base = EPOCH_NAIVE
+    # Datetimes, not ISO strings: every reader parses the timestamps anyway
+    steps = [(v >> 1) ^ -(v & 1) for v in column[3]]
+    timestamps = [base + timedelta(microseconds=micros) for micros in accumulate(steps)]
+
+    return {
+        'delta_lat': [(v >> 1) ^ -(v & 1) for v in column[0]],
+        'delta_long': [(v >> 1) ^ -(v & 1) for v in column[1]],
+        'delta_time': column[2],
+        'timestamp': timestamps,
+        'speed_mph': [(((v - 1) >> 1) ^ -((v - 1) & 1)) / SPEED_SCALE if v else None for v in column[4]],
+        'gps_accuracy': [(((v - 1) >> 1) ^ -((v - 1) & 1)) / ACCURACY_SCALE if v else None for v in column[5]],
+        'is_stationary': [bool(flags & 1) for flags in column[6]],
+        'enhancement_score': [(flags >> 1) / ENHANCEMENT_FIELDS for flags in column[6]],
+    }
+
+def decode_delta_batch(blob) -> List[Dict]:
+    """A binary delta batch as delta dicts (missing speed/accuracy left out, like the app's deltas)"""
+    columns = decode_delta_columns(blob)
+    deltas = []
+    for values in zip(*columns.values()):
+        delta = {field: value for field, value in zip(columns, values) if value is not None}
+        deltas.append(delta)
+    return deltas
+
+def is_binary_delta_batch(item: Dict) -> bool:
+    return item.get('data_version') in BINARY_DELTA_DATA_VERSIONS and 'deltas_binary' in item
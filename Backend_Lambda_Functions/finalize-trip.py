@@ -1,13 +1,37 @@
 # COMPLETE ENHANCED: finalize_trip.py - Fixed batch aggregation and trip analysis
+import importlib.util
 import json
+import logging
+import os
+import sys
 import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Dict, List
+
+# Shared with the other Lambdas and bundled next to this file
+from delta_encoding import decode_delta_columns, is_binary_delta_batch
+
+# Leveled logging: LOG_LEVEL env var (DEBUG, INFO, WARNING, ERROR), default INFO
+# Messages take %-style arguments so nothing is formatted unless the level is enabled
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO))
 
 dynamodb = boto3.resource('dynamodb')
 trips_table = dynamodb.Table('Trips-Neal')
 trajectory_table = dynamodb.Table('TrajectoryBatches-Neal')
 
+# 🚀 OPTIMIZATION: Batches are read through a trip-keyed GSI (partition trip_id, sort batch_number,
+# projection ALL), so finalizing reads only this trip's items. Without the index, a parallel
+# segmented scan is the fallback.
+TRIP_BATCH_INDEX = 'trip_id-batch_number-index'
+BATCH_SCAN_SEGMENTS = max(1, int(os.environ.get('BATCH_SCAN_SEGMENTS', '8')))
+_trip_batch_index_available = True  # cleared for this container once the index is found missing
+
 def convert_to_decimal(obj):
     """Convert float values to Decimal for DynamoDB storage"""
     if isinstance(obj, dict):
@@ -44,7 +68,7 @@ def parse_and_normalize_timestamp(timestamp_str):
         return utc_dt.isoformat()
         
     except Exception as e:
-        print(f"⚠️ Timestamp parsing error for '{timestamp_str}': {e}")
+        logger.warning("⚠️ Timestamp parsing error for '%s': %s", timestamp_str, e)
         # Fallback to current UTC time
         return datetime.now(timezone.utc).isoformat()
 
@@ -59,52 +83,166 @@ def calculate_accurate_duration(start_timestamp, end_timestamp):
         
         return duration_seconds, duration_minutes
     except Exception as e:
-        print(f"⚠️ Duration calculation error: {e}")
+        logger.warning("⚠️ Duration calculation error: %s", e)
         return 60.0, 1.0  # Fallback to 1 minute
 
+# ========================================
+# 📦 BINARY DELTA BATCHES
+# ========================================
+# store-trajectory-batch writes data_version 3.0 batches as one Binary attribute (deltas_binary),
+# in the format of delta_encoding.py. Batches of either format decode into TripDeltas columns,
+# with the same values and defaults as analyze-driver's TripArrays, so they can be handed to its
+# pipeline as they are.
+
+def _decode_column(deltas: List[Dict], field: str, default, invalid: float = float('nan')) -> array:
+    """Read one delta field into a float array ('invalid' where the value is None or not numeric)"""
+    try:
+        return array('d', [invalid if v is None else float(v) for v in (d.get(field, default) for d in deltas)])
+    except (ValueError, TypeError):
+        # Slow path only for batches containing malformed values
+        column = array('d')
+        for d in deltas:
+            try:
+                column.append(float(d.get(field, default)))
+            except (ValueError, TypeError):
+                column.append(invalid)
+        return column
+
+class TripDeltas:
+    """🚀 OPTIMIZED: A trip's deltas as columns, decoded batch by batch (binary or list of maps)"""
+    __slots__ = ('delta_lat', 'delta_long', 'delta_time', 'speed_mph', 'gps_accuracy', 'timestamps',
+                 'is_stationary', 'enhancement_score')
+
+    def __init__(self):
+        self.delta_lat = array('d')
+        self.delta_long = array('d')
+        self.delta_time = array('d')
+        self.speed_mph = array('d')
+        self.gps_accuracy = array('d')
+        self.timestamps = []
+        self.is_stationary = []
+        self.enhancement_score = array('d')
+
+    def __len__(self):
+        return len(self.delta_lat)
+
+    def extend_item(self, item: Dict) -> int:
+        """Append a TrajectoryBatches-Neal item's deltas; returns how many it held"""
+        before = len(self)
+        if is_binary_delta_batch(item):
+            columns = decode_delta_columns(item['deltas_binary'])
+            self.delta_lat.extend(columns['delta_lat'])
+            self.delta_long.extend(columns['delta_long'])
+            self.delta_time.extend(columns['delta_time'])
+            self.speed_mph.extend(float('nan') if v is None else v for v in columns['speed_mph'])
+            self.gps_accuracy.extend(999.0 if v is None else v for v in columns['gps_accuracy'])
+            self.timestamps.extend(columns['timestamp'])
+            self.is_stationary.extend(columns['is_stationary'])
+            self.enhancement_score.extend(columns['enhancement_score'])
+        else:
+            deltas = item.get('deltas', [])
+            self.delta_lat.extend(_decode_column(deltas, 'delta_lat', 0))
+            self.delta_long.extend(_decode_column(deltas, 'delta_long', 0))
+            self.delta_time.extend(_decode_column(deltas, 'delta_time', 1000))
+            self.speed_mph.extend(_decode_column(deltas, 'speed_mph', None))
+            self.gps_accuracy.extend(_decode_column(deltas, 'gps_accuracy', 999, float('inf')))
+            self.timestamps.extend(d.get('timestamp') for d in deltas)
+            self.is_stationary.extend(bool(d.get('is_stationary', False)) for d in deltas)
+            self.enhancement_score.extend(_decode_column(deltas, 'enhancement_score', 0, 0.0))
+        return len(self) - before
+
+def query_trip_batches(trip_id):
+    """All batches of a trip from the trip_id-batch_number index, paginated and ordered by batch_number"""
+    batches = []
+    query_params = {
+        'IndexName': TRIP_BATCH_INDEX,
+        'KeyConditionExpression': Key('trip_id').eq(trip_id),
+        'ScanIndexForward': True
+    }
+    while True:
+        response = trajectory_table.query(**query_params)
+        batches.extend(response.get('Items', []))
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return batches
+        query_params['ExclusiveStartKey'] = last_evaluated_key
+        logger.info("   Paginating... found %s batches so far", len(batches))
+
+def scan_trip_batches(trip_id):
+    """Fallback without the index: every segment of the table scanned in parallel, filtered to the trip"""
+    def scan_segment(segment):
+        items = []
+        scan_params = {
+            'FilterExpression': 'trip_id = :trip_id',
+            'ExpressionAttributeValues': {':trip_id': trip_id},
+            'Segment': segment,
+            'TotalSegments': BATCH_SCAN_SEGMENTS
+        }
+        while True:
+            response = trajectory_table.scan(**scan_params)
+            items.extend(response.get('Items', []))
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                return items
+            scan_params['ExclusiveStartKey'] = last_evaluated_key
+
+    with ThreadPoolExecutor(max_workers=BATCH_SCAN_SEGMENTS) as executor:
+        segments = list(executor.map(scan_segment, range(BATCH_SCAN_SEGMENTS)))
+    batches = [item for items in segments for item in items]
+    # Segments come back in hash order
+    batches.sort(key=lambda x: int(x.get('batch_number', 0)))
+    return batches
+
+def fetch_trip_batches(trip_id):
+    """This trip's batches ordered by batch_number: index query, or segmented scan without the index"""
+    global _trip_batch_index_available
+    if _trip_batch_index_available:
+        try:
+            return query_trip_batches(trip_id)
+        except ClientError as e:
+            # A missing index is a ValidationException; anything else is a real failure
+            if e.response.get('Error', {}).get('Code') != 'ValidationException':
+                raise
+            logger.warning("⚠️ %s unavailable (%s), scanning TrajectoryBatches-Neal in %s segments",
+                           TRIP_BATCH_INDEX, e, BATCH_SCAN_SEGMENTS)
+            _trip_batch_index_available = False
+    return scan_trip_batches(trip_id)
+
 def get_all_trip_batches(trip_id):
     """CRITICAL: Retrieve all batches for comprehensive trip analysis"""
     try:
-        print(f"🔍 RETRIEVING ALL BATCHES for trip: {trip_id}")
-        
-        # Query all batches for this trip
-        response = trajectory_table.scan(
-            FilterExpression='trip_id = :trip_id',
-            ExpressionAttributeValues={':trip_id': trip_id}
-        )
+        logger.info("🔍 RETRIEVING ALL BATCHES for trip: %s", trip_id)
         
-        batches = response.get('Items', [])
-        print(f"📊 Found {len(batches)} batches for trip {trip_id}")
-        
-        # Sort batches by batch number to ensure proper order
-        batches.sort(key=lambda x: int(x.get('batch_number', 0)))
+        # 🚀 OPTIMIZATION: Read only this trip's batches, already in batch_number order
+        batches = fetch_trip_batches(trip_id)
+        logger.info("📊 Found %s batches for trip %s", len(batches), trip_id)
         
         # Aggregate all deltas from all batches
-        all_deltas = []
+        # 🚀 OPTIMIZATION: Decode straight into columns (binary batches never become delta dicts)
+        all_deltas = TripDeltas()
         total_valid_deltas = 0
         total_original_deltas = 0
         batch_summary = []
         
         for batch in batches:
-            batch_deltas = batch.get('deltas', [])
+            batch_count = all_deltas.extend_item(batch)
             batch_stats = batch.get('batch_statistics', {})
             
-            all_deltas.extend(batch_deltas)
-            total_valid_deltas += len(batch_deltas)
-            total_original_deltas += int(batch.get('original_deltas_count', len(batch_deltas)))
+            total_valid_deltas += batch_count
+            total_original_deltas += int(batch.get('original_deltas_count', batch_count))
             
             batch_info = {
                 'batch_number': batch.get('batch_number'),
-                'deltas_count': len(batch_deltas),
+                'deltas_count': batch_count,
                 'upload_timestamp': batch.get('upload_timestamp'),
                 'movement_points': int(batch_stats.get('movement_points', 0)),
                 'stationary_points': int(batch_stats.get('stationary_points', 0))
             }
             batch_summary.append(batch_info)
             
-            print(f"   Batch {batch.get('batch_number')}: {len(batch_deltas)} deltas")
+            logger.info("   Batch %s: %s deltas", batch.get('batch_number'), batch_count)
         
-        print(f"📈 TOTAL AGGREGATED: {len(all_deltas)} deltas from {len(batches)} batches")
+        logger.info("📈 TOTAL AGGREGATED: %s deltas from %s batches", len(all_deltas), len(batches))
         
         return all_deltas, {
             'total_batches': len(batches),
@@ -116,41 +254,41 @@ def get_all_trip_batches(trip_id):
         }
         
     except Exception as e:
-        print(f"❌ Error retrieving trip batches: {e}")
-        return [], {'error': str(e)}
+        logger.error("❌ Error retrieving trip batches: %s", e)
+        return TripDeltas(), {'error': str(e)}
 
-def analyze_trip_deltas(all_deltas):
+def analyze_trip_deltas(all_deltas: TripDeltas):
     """ENHANCED: Comprehensive trip analysis from all delta coordinates"""
     if not all_deltas:
-        print("⚠️ No deltas available for analysis")
+        logger.warning("⚠️ No deltas available for analysis")
         return {}
     
-    print(f"🔬 ANALYZING {len(all_deltas)} deltas for trip patterns...")
+    logger.info("🔬 ANALYZING %s deltas for trip patterns...", len(all_deltas))
     
     # Basic movement analysis
-    movement_deltas = [d for d in all_deltas if not d.get('is_stationary', False)]
-    stationary_deltas = [d for d in all_deltas if d.get('is_stationary', False)]
+    movement_indices = [i for i, stationary in enumerate(all_deltas.is_stationary) if not stationary]
+    stationary_count = len(all_deltas) - len(movement_indices)
     
-    # Speed analysis
-    speed_data = [float(d.get('speed_mph', 0)) for d in all_deltas if d.get('speed_mph') is not None]
+    # Speed analysis (missing speeds are NaN)
+    speed_data = [speed for speed in all_deltas.speed_mph if speed == speed]
     
     # Time analysis
-    time_intervals = [float(d.get('delta_time', 0)) for d in all_deltas if d.get('delta_time') is not None]
+    time_intervals = [interval for interval in all_deltas.delta_time if interval == interval]
     
     # Coordinate movement analysis
     coordinate_movements = []
-    for d in movement_deltas:
-        lat_delta = abs(float(d.get('delta_lat', 0)))
-        lon_delta = abs(float(d.get('delta_long', 0)))
+    for i in movement_indices:
+        lat_delta = abs(all_deltas.delta_lat[i])
+        lon_delta = abs(all_deltas.delta_long[i])
         total_movement = (lat_delta ** 2 + lon_delta ** 2) ** 0.5
         coordinate_movements.append(total_movement)
     
     # Calculate analysis metrics
     analysis = {
         'total_deltas_analyzed': len(all_deltas),
-        'movement_deltas': len(movement_deltas),
-        'stationary_deltas': len(stationary_deltas),
-        'movement_percentage': (len(movement_deltas) / len(all_deltas)) * 100 if all_deltas else 0,
+        'movement_deltas': len(movement_indices),
+        'stationary_deltas': stationary_count,
+        'movement_percentage': (len(movement_indices) / len(all_deltas)) * 100 if all_deltas else 0,
         
         # Speed metrics
         'speed_points_available': len(speed_data),
@@ -168,8 +306,8 @@ def analyze_trip_deltas(all_deltas):
         'significant_movements': len([m for m in coordinate_movements if m > 0.00001]),  # > ~1 meter
         
         # Quality metrics
-        'high_accuracy_deltas': len([d for d in all_deltas if d.get('gps_accuracy', 999) < 10]),
-        'enhancement_scores': [float(d.get('enhancement_score', 0)) for d in all_deltas],
+        'high_accuracy_deltas': len([accuracy for accuracy in all_deltas.gps_accuracy if accuracy < 10]),
+        'enhancement_scores': all_deltas.enhancement_score.tolist(),
     }
     
     # Calculate overall quality score
@@ -186,14 +324,168 @@ def analyze_trip_deltas(all_deltas):
     analysis['overall_quality_score'] = sum(quality_factors)
     analysis['trip_validity'] = 'valid' if analysis['overall_quality_score'] > 0.6 else 'questionable'
     
-    print(f"📊 ANALYSIS COMPLETE:")
-    print(f"   Movement: {analysis['movement_percentage']:.1f}% ({analysis['movement_deltas']}/{analysis['total_deltas_analyzed']})")
-    print(f"   Speed data: {analysis['speed_points_available']} points, avg: {analysis['average_speed_mph']:.1f} mph")
-    print(f"   Quality score: {analysis['overall_quality_score']:.2f}")
-    print(f"   Trip validity: {analysis['trip_validity']}")
+    logger.info("📊 ANALYSIS COMPLETE:")
+    logger.info("   Movement: %.1f%% (%s/%s)", analysis['movement_percentage'], analysis['movement_deltas'], analysis['total_deltas_analyzed'])
+    logger.info("   Speed data: %s points, avg: %.1f mph", analysis['speed_points_available'], analysis['average_speed_mph'])
+    logger.info("   Quality score: %.2f", analysis['overall_quality_score'])
+    logger.info("   Trip validity: %s", analysis['trip_validity'])
     
     return analysis
 
+# ========================================
+# 🏁 PRECOMPUTED TRIP ANALYSIS
+# ========================================
+# analyze-driver.py (and store-trajectory-batch.py) are deployed in this Lambda's package.
+# Finalizing scores the trip with analyze-driver's own pipeline and writes its
+# DrivingSummaries-Neal entry, so the first analyze-driver request after a trip is a cache hit.
+# PRECOMPUTE_ANALYSIS=off leaves scoring to analyze-driver as before.
+
+BUNDLE_DIR = os.path.dirname(os.path.abspath(__file__))
+_bundled_lambdas = {}
+
+def precompute_enabled() -> bool:
+    return os.environ.get('PRECOMPUTE_ANALYSIS', 'on').lower() != 'off'
+
+def load_bundled_lambda(filename: str):
+    """Another Lambda's module deployed next to this file (None when it is not bundled)"""
+    if filename not in _bundled_lambdas:
+        name = filename[:-3].replace('-', '_')
+        module = sys.modules.get(name)
+        if module is None:
+            try:
+                spec = importlib.util.spec_from_file_location(name, os.path.join(BUNDLE_DIR, filename))
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                # One copy per process: store-trajectory-batch loads the same analyze-driver.py
+                sys.modules[name] = module
+            except Exception as e:
+                logger.warning("⚠️ %s not loaded: %s", filename, e)
+                module = None
+        _bundled_lambdas[filename] = module
+    return _bundled_lambdas[filename]
+
+def streaming_analyzer(trip_id: str):
+    """store-trajectory-batch's StreamingTripAnalyzer for the trip (None without a usable state)"""
+    stb = load_bundled_lambda('store-trajectory-batch.py')
+    if stb is None:
+        return None
+    try:
+        streaming_state, _ = stb.read_streaming_state(trip_id)
+        return stb.StreamingTripAnalyzer.from_json(streaming_state) if streaming_state else None
+    except Exception as e:
+        logger.warning("⚠️ Streamed analysis not usable: %s", e)
+        return None
+
+def discard_streaming_state(trip_id: str):
+    """Delete the trip's streaming state item: the finalized trip no longer needs it"""
+    stb = load_bundled_lambda('store-trajectory-batch.py')
+    if stb is None:
+        return
+    try:
+        stb.delete_streaming_state(trip_id)
+    except Exception as e:
+        logger.warning("⚠️ Streaming state of %s not deleted: %s", trip_id, e)
+
+def streamed_trip_analysis(ad, analyzer, batch_aggregation: dict, batch_count: int, base_point: dict, trip_quality: dict):
+    """
+    The analysis store-trajectory-batch streamed, when it covers exactly the trip's batch_count
+    batches (else None). When every batch was read, they must also be numbered 1..batch_count.
+    """
+    if analyzer is None:
+        return None
+    stb = load_bundled_lambda('store-trajectory-batch.py')
+    batch_numbers = [int(batch['batch_number']) for batch in batch_aggregation.get('batch_summary', [])]
+    expected_numbers = list(range(stb.FIRST_BATCH_NUMBER, stb.FIRST_BATCH_NUMBER + batch_count))
+    if ((len(batch_numbers) == batch_count and batch_numbers != expected_numbers)
+            or analyzer.version != ad.CURRENT_ALGORITHM_VERSION or not analyzer.is_complete(batch_count)):
+        logger.info("🔄 Streamed analysis incomplete (%s, %s of %s batches), scoring the batches",
+                    analyzer.failed or analyzer.version, analyzer.batches, batch_count)
+        return None
+    return analyzer.result(base_point, trip_quality)
+
+def analysis_arrays(ad, all_deltas: TripDeltas):
+    """analyze-driver TripArrays sharing the TripDeltas columns (same values and defaults)"""
+    trip_arrays = ad.TripArrays()
+    for column in ad.TripArrays.__slots__:
+        setattr(trip_arrays, column, getattr(all_deltas, column))
+    return trip_arrays
+
+def store_trip_object(ad, user_id: str, trip_analysis: dict) -> bool:
+    """🪣 Write the trip's object to analyze-driver's analysis store (ANALYSIS_STORE)"""
+    try:
+        ad.analysis_store.put(ad.trip_object_key(user_id, trip_analysis['trip_id']),
+                              ad.trip_analysis_object(trip_analysis, datetime.now(timezone.utc).isoformat()))
+        return True
+    except Exception as e:
+        logger.warning("⚠️ Could not store the analysis object for %s: %s", trip_analysis['trip_id'], e)
+        return False
+
+def precompute_trip_analysis(user_id: str, trip_id: str, trip_item: dict, all_deltas: TripDeltas,
+                             batch_aggregation: dict, stored_batches: int = 0) -> dict:
+    """
+    🏁 Score the finished trip as analyze-driver would and cache it in DrivingSummaries-Neal
+    (and in the analysis store, when ANALYSIS_STORE is set)
+
+    Uses the streamed analysis when it is complete, otherwise runs
+    process_trip_with_frontend_values over all_deltas. The batch index is eventually consistent:
+    when fewer batches were read than the trip has (stored_batches, Trips-Neal's total_batches, or
+    the streamed batches) and the streamed analysis does not cover them all, nothing is cached
+    (reason 'batches_pending') and analyze-driver scores the trip on its next request.
+    Returns a summary for the response.
+    """
+    if not precompute_enabled():
+        return {'cached': False, 'reason': 'disabled'}
+    ad = load_bundled_lambda('analyze-driver.py')
+    if ad is None:
+        return {'cached': False, 'reason': 'analyze-driver.py not bundled'}
+
+    try:
+        base_point = ad.get_user_base_point(user_id)
+        # trip_quality as analyze-driver reads it back from Trips-Neal
+        stored = ad.decode_trip_record({'trip_quality': convert_to_decimal(trip_item.get('trip_quality'))})
+        trip_quality = stored.get('trip_quality', {})
+
+        analyzer = streaming_analyzer(trip_id)
+        batches_read = batch_aggregation.get('total_batches', 0)
+        batch_count = max(batches_read, stored_batches, analyzer.batches if analyzer else 0)
+        source = 'streamed'
+        stats = streamed_trip_analysis(ad, analyzer, batch_aggregation, batch_count, base_point, trip_quality)
+        if stats is None and batches_read < batch_count:
+            logger.warning("⏳ Only %s of %s batches of %s readable yet, not precomputing its analysis",
+                           batches_read, batch_count, trip_id)
+            return {'cached': False, 'reason': 'batches_pending'}
+        if stats is None:
+            source = 'batches'
+            stats = (ad.process_trip_with_frontend_values(analysis_arrays(ad, all_deltas), base_point, trip_quality)
+                     if all_deltas else None)
+        if not stats:
+            logger.warning("⚠️ No analysis precomputed for %s: insufficient data", trip_id)
+            return {'cached': False, 'reason': 'insufficient_data'}
+
+        # Same shape as analyze-driver's complete_trip_analysis (Trips-Neal timestamps)
+        trip_analysis = {
+            'trip_id': trip_id,
+            **stats,
+            'start_timestamp': trip_item['start_timestamp'],
+            'end_timestamp': trip_item['end_timestamp'],
+        }
+        cached = ad.cache_trip_analysis_enhanced(trip_analysis, user_id)
+        logger.info("🏁 Precomputed analysis for %s from %s: %s/100, cached: %s",
+                    trip_id, source, stats['behavior_score'], cached)
+        summary = {
+            'cached': cached,
+            'source': source,
+            'algorithm_version': ad.CURRENT_ALGORITHM_VERSION,
+            'behavior_score': stats['behavior_score'],
+            'behavior_category': stats['behavior_category'],
+        }
+        if ad.analysis_store is not None:
+            summary['stored'] = store_trip_object(ad, user_id, trip_analysis)
+        return summary
+    except Exception as e:
+        logger.error("❌ Precomputing analysis for %s failed: %s", trip_id, e)
+        return {'cached': False, 'reason': str(e)}
+
 def lambda_handler(event, context):
     try:
         body = json.loads(event['body'])
@@ -204,8 +496,8 @@ def lambda_handler(event, context):
         start_timestamp_raw = body.get('start_timestamp')
         trip_quality = body.get('trip_quality', {})
         
-        print(f"🏁 ENHANCED TRIP FINALIZATION: {trip_id} for user: {user_id}")
-        print(f"📱 Raw timestamps - Start: {start_timestamp_raw}, End: {end_timestamp_raw}")
+        logger.info("🏁 ENHANCED TRIP FINALIZATION: %s for user: %s", trip_id, user_id)
+        logger.info("📱 Raw timestamps - Start: %s, End: %s", start_timestamp_raw, end_timestamp_raw)
         
         # CRITICAL FIX: Normalize timestamps properly
         end_timestamp = parse_and_normalize_timestamp(end_timestamp_raw)
@@ -214,7 +506,7 @@ def lambda_handler(event, context):
         existing_trip = trips_table.get_item(Key={'trip_id': trip_id})
         
         if 'Item' not in existing_trip:
-            print(f"⚠️ Trip {trip_id} not found in trips table, creating final record")
+            logger.warning("⚠️ Trip %s not found in trips table, creating final record", trip_id)
             
             # Use provided start timestamp or fallback to end timestamp
             start_timestamp = parse_and_normalize_timestamp(start_timestamp_raw) if start_timestamp_raw else end_timestamp
@@ -257,8 +549,10 @@ def lambda_handler(event, context):
         # CRITICAL: Get ALL batches for complete trip analysis
         all_deltas, batch_aggregation = get_all_trip_batches(trip_id)
         
-        # Update trip with actual batch count
-        trip_item['total_batches'] = batch_aggregation.get('total_batches', 0)
+        # Update trip with actual batch count (never lowered: the batch index is eventually
+        # consistent, a batch stored just before finalization may not be listed yet)
+        stored_batches = int(trip_item.get('total_batches') or 0)
+        trip_item['total_batches'] = max(stored_batches, batch_aggregation.get('total_batches', 0))
         
         # ENHANCED: Calculate accurate duration
         duration_seconds, duration_minutes = calculate_accurate_duration(trip_item['start_timestamp'], trip_item['end_timestamp'])
@@ -292,11 +586,11 @@ def lambda_handler(event, context):
             
             # Log comprehensive metrics
             if trip_quality.get('use_gps_metrics'):
-                print(f"📱 iPhone GPS Metrics:")
-                print(f"   Distance: {trip_quality.get('actual_distance_miles', 0):.3f} miles")
-                print(f"   Duration: {trip_quality.get('actual_duration_minutes', 0):.1f} minutes")
-                print(f"   Max Speed: {trip_quality.get('gps_max_speed_mph', 0):.1f} mph")
-                print(f"   Avg Speed: {trip_quality.get('gps_avg_speed_mph', 0):.1f} mph")
+                logger.info("📱 iPhone GPS Metrics:")
+                logger.info("   Distance: %.3f miles", trip_quality.get('actual_distance_miles', 0))
+                logger.info("   Duration: %.1f minutes", trip_quality.get('actual_duration_minutes', 0))
+                logger.info("   Max Speed: %.1f mph", trip_quality.get('gps_max_speed_mph', 0))
+                logger.info("   Avg Speed: %.1f mph", trip_quality.get('gps_avg_speed_mph', 0))
             
             trip_item['trip_quality'] = trip_quality
         
@@ -304,13 +598,18 @@ def lambda_handler(event, context):
         trip_item_dynamodb = convert_to_decimal(trip_item)
         trips_table.put_item(Item=trip_item_dynamodb)
         
-        print(f"✅ ENHANCED TRIP FINALIZED: {trip_id}")
-        print(f"📅 Duration: {duration_minutes:.1f} minutes ({duration_seconds:.0f} seconds)")
-        print(f"📊 Batches processed: {batch_aggregation.get('total_batches', 0)}")
-        print(f"📈 Total deltas analyzed: {len(all_deltas)}")
-        print(f"🔧 iPhone GPS integration: {'Yes' if trip_quality.get('use_gps_metrics') else 'No'}")
-        print(f"✅ Movement detected: {'Yes' if batch_aggregation.get('movement_detected') else 'No'}")
-        print(f"🎯 Trip validity: {trip_analysis.get('trip_validity', 'unknown')}")
+        # 🏁 Score the trip now and cache it for analyze-driver
+        analysis_precomputed = precompute_trip_analysis(user_id, trip_id, trip_item, all_deltas,
+                                                        batch_aggregation, stored_batches)
+        discard_streaming_state(trip_id)
+
+        logger.info("✅ ENHANCED TRIP FINALIZED: %s", trip_id)
+        logger.info("📅 Duration: %.1f minutes (%.0f seconds)", duration_minutes, duration_seconds)
+        logger.info("📊 Batches processed: %s", batch_aggregation.get('total_batches', 0))
+        logger.info("📈 Total deltas analyzed: %s", len(all_deltas))
+        logger.info("🔧 iPhone GPS integration: %s", 'Yes' if trip_quality.get('use_gps_metrics') else 'No')
+        logger.info("✅ Movement detected: %s", 'Yes' if batch_aggregation.get('movement_detected') else 'No')
+        logger.info("🎯 Trip validity: %s", trip_analysis.get('trip_validity', 'unknown'))
         
         return {
             'statusCode': 200,
@@ -336,14 +635,13 @@ def lambda_handler(event, context):
                     'total_batches': batch_aggregation.get('total_batches', 0),
                     'total_deltas': batch_aggregation.get('total_valid_deltas', 0),
                     'acceptance_rate': f"{batch_aggregation.get('acceptance_rate', 0) * 100:.1f}%"
-                }
+                },
+                'analysis_precomputed': analysis_precomputed
             })
         }
         
     except Exception as e:
-        print(f"❌ ENHANCED FINALIZATION ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ ENHANCED FINALIZATION ERROR: %s", str(e))
         
         return {
             'statusCode': 500,
@@ -1,13 +1,33 @@
 # BULLETPROOF FIXED: store_trajectory_batch.py - Safe decimal conversion that handles ALL edge cases
+import importlib.util
 import json
+import logging
+import os
+import sys
 import boto3
-from datetime import datetime
+import statistics
+from botocore.exceptions import ClientError
+from collections import deque
+from datetime import datetime, timezone
 from decimal import Decimal
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
 import math
 
+# Shared with the other Lambdas and bundled next to this file
+from delta_encoding import (BINARY_DELTA_DATA_VERSION, LEGACY_DELTA_DATA_VERSION, decode_delta_batch,
+                            encode_delta_batch)
+from payload_compression import compress_payload, decompress_payload
+
+# Leveled logging: LOG_LEVEL env var (DEBUG, INFO, WARNING, ERROR), default INFO
+# Messages take %-style arguments so nothing is formatted unless the level is enabled
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO))
+
 dynamodb = boto3.resource('dynamodb')
 trajectory_table = dynamodb.Table('TrajectoryBatches-Neal')
 trips_table = dynamodb.Table('Trips-Neal')
+summaries_table = dynamodb.Table('DrivingSummaries-Neal')
 
 def safe_convert_to_decimal(obj):
     """
@@ -23,39 +43,42 @@ def safe_convert_to_decimal(obj):
     elif isinstance(obj, float):
         # CRITICAL: Handle all problematic float values
         if math.isnan(obj):
-            print(f"⚠️ Converting NaN to 0")
+            logger.warning("⚠️ Converting NaN to 0")
             return Decimal('0')
         elif math.isinf(obj):
             if obj > 0:
-                print(f"⚠️ Converting +Infinity to large number")
+                logger.warning("⚠️ Converting +Infinity to large number")
                 return Decimal('999999999')
             else:
-                print(f"⚠️ Converting -Infinity to large negative number")
+                logger.warning("⚠️ Converting -Infinity to large negative number")
                 return Decimal('-999999999')
         else:
             # Normal float - convert to Decimal safely
             try:
                 return Decimal(str(obj))
             except Exception as e:
-                print(f"⚠️ Float conversion error for {obj}: {e}, using 0")
+                logger.warning("⚠️ Float conversion error for %s: %s, using 0", obj, e)
                 return Decimal('0')
     elif isinstance(obj, int):
         # Convert int to Decimal
         try:
             return Decimal(str(obj))
         except Exception as e:
-            print(f"⚠️ Int conversion error for {obj}: {e}, using 0")
+            logger.warning("⚠️ Int conversion error for %s: %s, using 0", obj, e)
             return Decimal('0')
     elif obj is None:
         # Keep None as None (DynamoDB supports null)
         return None
+    elif isinstance(obj, (bytes, bytearray)):
+        # Binary attribute (deltas_binary)
+        return bytes(obj)
     elif isinstance(obj, bool):
         # Keep boolean as boolean
         return obj
     elif isinstance(obj, str):
         # Keep string as string, but check for problematic string values
         if obj.lower() in ['nan', 'infinity', '-infinity', 'inf', '-inf']:
-            print(f"⚠️ Converting problematic string '{obj}' to '0'")
+            logger.warning("⚠️ Converting problematic string '%s' to '0'", obj)
             return Decimal('0')
         return obj
     else:
@@ -68,12 +91,12 @@ def safe_convert_to_decimal(obj):
             else:
                 return str_value
         except Exception as e:
-            print(f"⚠️ Unknown type conversion error for {obj} (type: {type(obj)}): {e}")
+            logger.warning("⚠️ Unknown type conversion error for %s (type: %s): %s", obj, type(obj), e)
             return str(obj) if obj is not None else None
 
 def validate_enhanced_deltas(deltas):
     """ULTRA LENIENT: Accept almost any delta that has basic structure"""
-    print(f"🔍 ULTRA LENIENT VALIDATION: {len(deltas)} deltas...")
+    logger.info("🔍 ULTRA LENIENT VALIDATION: %s deltas...", len(deltas))
     
     essential_fields = ['delta_lat', 'delta_long', 'delta_time']
     optional_fields = ['speed_mph', 'speed_confidence', 'gps_accuracy', 'is_stationary', 'data_quality', 'sequence', 'timestamp']
@@ -88,7 +111,7 @@ def validate_enhanced_deltas(deltas):
         missing_essential = [field for field in essential_fields if field not in delta or delta[field] is None]
         if missing_essential:
             quality_issues.append(f"{delta_info}: Missing essential fields: {missing_essential}")
-            print(f"❌ {delta_info}: Missing {missing_essential}")
+            logger.debug("❌ %s: Missing %s", delta_info, missing_essential)
             continue
         
         # ULTRA LENIENT: Validate essential field values with minimal restrictions
@@ -100,12 +123,12 @@ def validate_enhanced_deltas(deltas):
             # CRITICAL: Check for problematic float values
             if math.isnan(delta_lat) or math.isnan(delta_lon) or math.isnan(delta_time):
                 quality_issues.append(f"{delta_info}: Contains NaN values")
-                print(f"⚠️ {delta_info}: Contains NaN values - skipping")
+                logger.debug("⚠️ %s: Contains NaN values - skipping", delta_info)
                 continue
                 
             if math.isinf(delta_lat) or math.isinf(delta_lon) or math.isinf(delta_time):
                 quality_issues.append(f"{delta_info}: Contains Infinity values")
-                print(f"⚠️ {delta_info}: Contains Infinity values - skipping")
+                logger.debug("⚠️ %s: Contains Infinity values - skipping", delta_info)
                 continue
             
             # Ultra lenient thresholds
@@ -114,17 +137,17 @@ def validate_enhanced_deltas(deltas):
             
             if abs(delta_lat) > max_reasonable_delta or abs(delta_lon) > max_reasonable_delta:
                 quality_issues.append(f"{delta_info}: Large coordinate change (lat: {delta_lat:.8f}, lon: {delta_lon:.8f})")
-                print(f"⚠️ {delta_info}: Large coordinate change - lat: {delta_lat:.8f}, lon: {delta_lon:.8f}")
+                logger.debug("⚠️ %s: Large coordinate change - lat: %.8f, lon: %.8f", delta_info, delta_lat, delta_lon)
                 # STILL ACCEPT IT - just log the issue
                 
             if delta_time <= 0 or delta_time > max_reasonable_time:
                 quality_issues.append(f"{delta_info}: Invalid time interval: {delta_time}s")
-                print(f"⚠️ {delta_info}: Invalid time interval: {delta_time}s")
+                logger.debug("⚠️ %s: Invalid time interval: %ss", delta_info, delta_time)
                 continue  # Skip negative or too large time intervals
                 
         except (ValueError, TypeError) as e:
             quality_issues.append(f"{delta_info}: Invalid numeric values: {e}")
-            print(f"❌ {delta_info}: Invalid numeric values: {e}")
+            logger.debug("❌ %s: Invalid numeric values: %s", delta_info, e)
             continue
         
         # Calculate enhancement score based on available optional fields
@@ -147,17 +170,17 @@ def validate_enhanced_deltas(deltas):
         # CRITICAL: Clean up any problematic values in the delta before accepting
         cleaned_delta = safe_convert_problematic_values(delta)
         
-        print(f"✅ {delta_info}: lat={delta_lat:.8f}, lon={delta_lon:.8f}, time={delta_time:.1f}s, enhancement={cleaned_delta['enhancement_score']:.2f}")
+        logger.debug("✅ %s: lat=%.8f, lon=%.8f, time=%.1fs, enhancement=%.2f", delta_info, delta_lat, delta_lon, delta_time, cleaned_delta['enhancement_score'])
         
         valid_deltas.append(cleaned_delta)
     
     acceptance_rate = len(valid_deltas) / len(deltas) if deltas else 0
-    print(f"📊 ULTRA LENIENT VALIDATION COMPLETE: {len(valid_deltas)}/{len(deltas)} deltas accepted ({acceptance_rate:.1%})")
+    logger.info("📊 ULTRA LENIENT VALIDATION COMPLETE: %s/%s deltas accepted (%.1f%%)", len(valid_deltas), len(deltas), acceptance_rate * 100)
     
     if quality_issues:
-        print(f"⚠️ Quality issues found: {len(quality_issues)}")
+        logger.warning("⚠️ Quality issues found: %s", len(quality_issues))
         for issue in quality_issues[:5]:  # Show first 5 issues
-            print(f"   - {issue}")
+            logger.info("   - %s", issue)
     
     return valid_deltas, quality_issues
 
@@ -170,10 +193,10 @@ def safe_convert_problematic_values(delta):
     for key, value in delta.items():
         if isinstance(value, float):
             if math.isnan(value):
-                print(f"⚠️ Cleaning NaN value in field '{key}'")
+                logger.warning("⚠️ Cleaning NaN value in field '%s'", key)
                 cleaned_delta[key] = 0.0
             elif math.isinf(value):
-                print(f"⚠️ Cleaning Infinity value in field '{key}'")
+                logger.warning("⚠️ Cleaning Infinity value in field '%s'", key)
                 cleaned_delta[key] = 999999.0 if value > 0 else -999999.0
             else:
                 cleaned_delta[key] = value
@@ -182,6 +205,627 @@ def safe_convert_problematic_values(delta):
     
     return cleaned_delta
 
+# ========================================
+# 📦 BINARY DELTA ENCODING
+# ========================================
+# 🚀 OPTIMIZATION: A batch's deltas as one Binary attribute (deltas_binary) instead of a list
+# of maps; the format is shared with the Lambdas that read batches (delta_encoding.py). A batch
+# that does not fit it is stored as a list of maps, and readers tell the two apart by data_version.
+
+# DELTA_ENCODING=legacy stores every batch as a list of maps (the original format)
+DELTA_ENCODING = os.environ.get('DELTA_ENCODING', 'binary').strip().lower()
+
+def batch_delta_attributes(validated_deltas: List[Dict]) -> Dict:
+    """data_version plus deltas_binary, or the list of maps when binary encoding is off or does not fit"""
+    if DELTA_ENCODING != 'legacy' and validated_deltas:
+        try:
+            return {'data_version': BINARY_DELTA_DATA_VERSION,
+                    'deltas_binary': compress_payload(encode_delta_batch(validated_deltas)),
+                    'delta_count': len(validated_deltas)}
+        except (ValueError, TypeError, KeyError) as e:
+            logger.info("📦 Batch stored as a list of maps: %s", e)
+    return {'data_version': LEGACY_DELTA_DATA_VERSION, 'deltas': validated_deltas}
+
+# ========================================
+# 🚗 STREAMING TRIP ANALYSIS
+# ========================================
+# analyze-driver's per-trip pipeline (process_trip_with_frontend_values, reference engine)
+# advanced one batch at a time as the app uploads them. The state only holds what the next
+# batch needs: position and last bearing, the newest speed (its spike check needs the next
+# reading), the unsmoothed acceleration tail, the open event and turn, the consistency window
+# tail and running sums. Whatever depends on the driving context (thresholds, tolerances,
+# turn safe speeds) is only known for the whole trip, so closed events, turns and window
+# scores are kept in context-free form and judged in result().
+#
+# Only the incremental state machine lives here: constants, context detection, event and turn
+# classification, consistency bands and scoring are analyze-driver's own functions, from the
+# analyze-driver.py deployed with this Lambda. Without it batches are stored as before and
+# finalize-trip (or analyze-driver) scores the trip from its batches.
+
+BUNDLE_DIR = os.path.dirname(os.path.abspath(__file__))
+_bundled_lambdas = {}
+
+def load_bundled_lambda(filename: str):
+    """Another Lambda's module deployed next to this file (None when it is not bundled)"""
+    if filename not in _bundled_lambdas:
+        name = filename[:-3].replace('-', '_')
+        module = sys.modules.get(name)
+        if module is None:
+            try:
+                spec = importlib.util.spec_from_file_location(name, os.path.join(BUNDLE_DIR, filename))
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                # One copy per process, whichever Lambda module loads it first
+                sys.modules[name] = module
+            except Exception as e:
+                logger.warning("⚠️ %s not loaded: %s", filename, e)
+                module = None
+        _bundled_lambdas[filename] = module
+    return _bundled_lambdas[filename]
+
+ad = load_bundled_lambda('analyze-driver.py')
+
+# The state is its own DrivingSummaries-Neal item (trip_id streaming#{trip_id}, like the driver
+# aggregate's aggregate#{user_id}), so saving it rewrites a few compressed KB, not the trip item.
+# It carries user_id, so deleting the account deletes it; finalize-trip deletes it once used.
+STREAMING_STATE_KEY_PREFIX = 'streaming#'
+# Binary attribute holding the state's JSON (compress_payload) and the number of saves before it
+STREAMING_STATE_ATTRIBUTE = 'streaming_analysis'
+STREAMING_REVISION_ATTRIBUTE = 'revision'
+# The app numbers a trip's batches 1, 2, 3, ...
+FIRST_BATCH_NUMBER = 1
+# Window scores are counted per context tolerance (analyze-driver's consistency_tolerances)
+CONSISTENCY_CONTEXTS = ('city', 'highway', 'mixed')
+
+class StreamingTripAnalyzer:
+    """
+    🚗 Resumable per-trip analysis, advanced by each stored batch in upload order
+
+    add_batch() takes batches 1, 2, 3, ...; a repeated batch is ignored and a gap stops the
+    stream (failed is set, and the trip is analyzed from its batches as before). result()
+    returns what analyze-driver's process_trip_with_frontend_values returns for the same
+    deltas, batch boundaries included, without the batches. The state is a few KB (about
+    50 KB after 20,000 deltas of city driving); to_json()/from_json() round-trip it exactly.
+    """
+
+    # Scalars saved as they are; the fields after them need conversion (see to_state)
+    SCALARS = ('version', 'base', 'next_batch', 'batches', 'points', 'failed', 'divisor',
+               'position', 'distance', 'last_pair', 'last_bearing', 'bearing_count', 'significant_turns',
+               'timestamps_parsed', 'first_time', 'last_time', 'interval_total',
+               'pending', 'previous', 'speed_count', 'stop_count', 'highway_count', 'min_speed', 'max_speed',
+               'moving_time_ms', 'stationary_time_ms', 'moving_distance', 'segments', 'segment_tail', 'open_event',
+               'event_candidates', 'stationary_streak', 'filtered_count', 'window', 'open_turn', 'turn_groups')
+
+    def __init__(self, base_point: Dict):
+        self.version = ad.CURRENT_ALGORITHM_VERSION
+        self.base = [float(base_point['latitude']), float(base_point['longitude'])]
+        self.next_batch = FIRST_BATCH_NUMBER
+        self.batches = 0
+        self.points = 0
+        self.failed = None          # reason the stream stopped
+        self.divisor = None         # coordinate format, from the trip's first delta
+        # Coordinates and bearings
+        self.position = list(self.base)
+        self.distance = 0.0
+        self.last_pair = None
+        self.last_bearing = None
+        self.bearing_count = 0
+        self.significant_turns = 0
+        # Timestamps
+        self.timestamps_parsed = 0
+        self.first_time = None
+        self.last_time = None
+        self.interval_total = 0.0
+        # Speeds: pending is [raw speed, delta_time] of the newest point, validated once its
+        # successor arrives; previous is [validated speed, delta_time] of the point before it
+        self.pending = None
+        self.previous = None
+        self.speed_count = 0
+        self.speed_sum = Fraction(0)
+        self.speed_sum_sq = Fraction(0)
+        self.stop_count = 0
+        self.highway_count = 0
+        self.min_speed = None
+        self.max_speed = None
+        # Moving metrics
+        self.moving_time_ms = 0.0
+        self.stationary_time_ms = 0.0
+        self.moving_distance = 0.0
+        # Acceleration: up to two [raw acceleration, speed_from, speed_to, time_ms] segments not
+        # yet smoothed, the open run [kind, start, accelerations, speed_from, speed_to, duration_ms]
+        # and closed runs that could be harsh in some context
+        # [kind, start, count, avg_acceleration, max_acceleration, speed_from, speed_to, duration_ms]
+        self.segments = 0
+        self.segment_tail = []
+        self.open_event = None
+        self.event_candidates = []
+        # Speed consistency: filtered speeds since the next window start, and per tolerance
+        # context the count of each window score
+        self.stationary_streak = 0
+        self.filtered_count = 0
+        self.window = []
+        self.window_scores = {context: {} for context in CONSISTENCY_CONTEXTS}
+        # Turns: validated speeds from index bearing_count on (the speed each new bearing
+        # change is paired with; it grows while stopped, as stops add no bearings), the open
+        # turn [accumulated angle, speeds] and closed turns [total_angle, max_speed, duration_points]
+        self.turn_speeds = deque()
+        self.open_turn = None
+        self.turn_groups = []
+
+    # ---- persistence ----
+
+    def to_state(self) -> Dict:
+        state = {name: getattr(self, name) for name in self.SCALARS}
+        state['speed_sums'] = [[self.speed_sum.numerator, self.speed_sum.denominator],
+                               [self.speed_sum_sq.numerator, self.speed_sum_sq.denominator]]
+        state['window_scores'] = {context: [[score, count] for score, count in scores.items()]
+                                  for context, scores in self.window_scores.items()}
+        state['turn_speeds'] = list(self.turn_speeds)
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'StreamingTripAnalyzer':
+        analyzer = cls({'latitude': state['base'][0], 'longitude': state['base'][1]})
+        for name in cls.SCALARS:
+            setattr(analyzer, name, state[name])
+        (sum_n, sum_d), (sq_n, sq_d) = state['speed_sums']
+        analyzer.speed_sum = Fraction(sum_n, sum_d)
+        analyzer.speed_sum_sq = Fraction(sq_n, sq_d)
+        analyzer.window_scores = {context: {score: count for score, count in scores}
+                                  for context, scores in state['window_scores'].items()}
+        analyzer.turn_speeds = deque(state['turn_speeds'])
+        return analyzer
+
+    def to_json(self) -> str:
+        # repr floats: every value reads back bit for bit
+        return json.dumps(self.to_state(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'StreamingTripAnalyzer':
+        return cls.from_state(json.loads(text))
+
+    def is_complete(self, batch_count: int) -> bool:
+        """True when exactly batch_count batches were applied with this algorithm version"""
+        return not self.failed and self.version == ad.CURRENT_ALGORITHM_VERSION and self.batches == batch_count
+
+    # ---- advancing ----
+
+    def add_batch(self, batch_number: int, deltas: List[Dict]) -> str:
+        """Apply the next batch: 'advanced', 'duplicate' (already applied) or 'stopped'"""
+        if self.failed:
+            return 'stopped'
+        if batch_number < self.next_batch:
+            return 'duplicate'
+        if batch_number > self.next_batch:
+            self.failed = f'batch {batch_number} arrived before batch {self.next_batch}'
+            return 'stopped'
+        try:
+            self.add_deltas(deltas)
+        except Exception as e:
+            # The batch-mode analysis raises on the same input; it will report it
+            self.failed = f'batch {batch_number}: {e}'
+            return 'stopped'
+        self.next_batch += 1
+        self.batches += 1
+        return 'advanced'
+
+    def add_deltas(self, deltas: List[Dict]):
+        """Advance every stage by a run of deltas (stored delta dicts, in trip order)"""
+        if not deltas:
+            return
+        # Decoded as analyze-driver decodes the trip's batches
+        columns = ad.TripArrays.from_deltas(deltas)
+        delta_time = columns.time_intervals()
+
+        if self.divisor is None:
+            # Fixed-point integers or decimal degrees, from the trip's first delta
+            _, self.divisor = ad.detect_coordinate_format(columns)
+
+        self._add_timestamps(columns.timestamps, delta_time)
+        # Speeds first: a new bearing change is paired with a speed validated by then
+        self._add_speeds(columns.delta_lat, columns.delta_long, delta_time, columns.speed_mph, columns.gps_accuracy)
+        self._add_coordinates(columns.delta_lat, columns.delta_long)
+        self.points += len(deltas)
+
+    def _add_timestamps(self, raw_timestamps: List, delta_time: List[float]):
+        first = datetime.fromisoformat(self.first_time) if self.first_time else None
+        last = datetime.fromisoformat(self.last_time) if self.last_time else None
+        for raw_timestamp in raw_timestamps:
+            timestamp = ad.parse_delta_timestamp(raw_timestamp)
+            if timestamp is None:
+                continue
+            self.timestamps_parsed += 1
+            if first is None or timestamp < first:
+                first = timestamp
+            if last is None or timestamp > last:
+                last = timestamp
+        self.first_time = first.isoformat() if first else None
+        self.last_time = last.isoformat() if last else None
+        for interval in delta_time:
+            self.interval_total += interval
+
+    def _add_speeds(self, delta_lat, delta_long, delta_time, speed_mph, gps_accuracy):
+        for k, speed in enumerate(speed_mph):
+            # Phase 1: reported speed when in range, otherwise derived from the delta movement
+            if not 0 <= speed <= 150:
+                speed = 0.0
+                delta_time_ms = delta_time[k]
+                if delta_time_ms > 0:
+                    lat = delta_lat[k] / ad.FIXED_POINT_DIVISOR
+                    lon = delta_long[k] / ad.FIXED_POINT_DIVISOR
+                    time_hours = delta_time_ms / (1000 * 3600)
+                    if lat == lat and lon == lon and time_hours > 0:
+                        lat_distance = lat * 69.0
+                        lon_distance = lon * 69.0 * 0.777
+                        speed = min(math.sqrt(lat_distance**2 + lon_distance**2) / time_hours, 120)
+            # Phase 2: GPS warmup
+            if self.points + k < ad.WARMUP_POINTS and speed > 30.0 and gps_accuracy[k] > 15.0:
+                speed = 0.0
+            # Phase 3: the previous point can be validated now that its successor is known
+            if self.pending is not None:
+                self._add_validated(self._validate(self.pending[0], speed), self.pending[1])
+            self.pending = [speed, delta_time[k]]
+
+    def _validate(self, curr_speed: float, next_speed: Optional[float]) -> float:
+        """Acceleration-based spike correction of one raw speed"""
+        if self.previous is None:
+            return curr_speed
+        prev_speed = self.previous[0]
+        if abs(curr_speed - prev_speed) > ad.MAX_SPEED_CHANGE_PER_INTERVAL and curr_speed > 10.0:
+            if next_speed is not None and abs(next_speed - prev_speed) < abs(next_speed - curr_speed):
+                return (prev_speed + next_speed) / 2.0
+            direction = 1.0 if curr_speed > prev_speed else -1.0
+            clamped = prev_speed + (direction * ad.MAX_SPEED_CHANGE_PER_INTERVAL)
+            return 0.0 if clamped < 0 else clamped
+        return curr_speed
+
+    def _add_validated(self, speed: float, time_ms: float):
+        """Feed one validated speed to the summary, segment, consistency and turn stages"""
+        self.speed_count += 1
+        exact = Fraction(speed)
+        self.speed_sum += exact
+        self.speed_sum_sq += exact * exact
+        if speed < ad.STOP_SPEED_MPH:
+            self.stop_count += 1
+        elif speed > ad.HIGHWAY_SPEED_MPH:
+            self.highway_count += 1
+        if self.min_speed is None or speed < self.min_speed:
+            self.min_speed = speed
+        if self.max_speed is None or speed > self.max_speed:
+            self.max_speed = speed
+
+        if self.previous is not None:
+            self._add_segment(self.previous[0], speed, self.previous[1])
+        self.previous = [speed, time_ms]
+
+        # Consistency: stationary readings past the 4th in a row are dropped
+        if speed < ad.MIN_MOVING_SPEED:
+            self.stationary_streak += 1
+            keep = self.stationary_streak <= 4
+        else:
+            self.stationary_streak = 0
+            keep = True
+        if keep:
+            self.filtered_count += 1
+            self.window.append(speed)
+            if len(self.window) == ad.CONSISTENCY_WINDOW_SIZE:
+                self._score_window(self.window)
+                self.window = self.window[ad.CONSISTENCY_WINDOW_STEP:]
+
+        self.turn_speeds.append(speed)
+
+    def _add_segment(self, current_speed: float, next_speed: float, time_ms: float):
+        # Moving metrics (gaps over a minute are skipped)
+        if 0 < time_ms <= 60000:
+            avg_segment_speed = (current_speed + next_speed) / 2
+            if avg_segment_speed >= ad.MOVING_THRESHOLD_MPH:
+                self.moving_time_ms += time_ms
+                self.moving_distance += avg_segment_speed * (time_ms / (1000 * 3600))
+            else:
+                self.stationary_time_ms += time_ms
+
+        # Raw acceleration; the segment before it can now be smoothed
+        time_seconds = max(0.5, time_ms / 1000.0)
+        if time_seconds > 15.0:
+            raw_acceleration = 0.0
+        else:
+            raw_acceleration = ((next_speed - current_speed) / time_seconds) * ad.MPH_TO_MS2
+        tail = self.segment_tail
+        tail.append([raw_acceleration, current_speed, next_speed, time_ms])
+        self.segments += 1
+        if len(tail) == 2 and self.segments == 2:
+            self._scan(0, (tail[0][0] + tail[1][0]) / 2, tail[0])
+        elif len(tail) == 3:
+            self._scan(self.segments - 2, (tail[0][0] + tail[1][0] + tail[2][0]) / 3, tail[1])
+            del tail[0]
+
+    def _scan(self, index: int, acceleration: float, segment: List):
+        """Event grouping over one smoothed acceleration"""
+        _, speed_from, speed_to, time_ms = segment
+        if acceleration > ad.EVENT_ACCEL_THRESHOLD:
+            kind = 'acceleration'
+        elif acceleration < ad.EVENT_DECEL_THRESHOLD:
+            kind = 'deceleration'
+        else:
+            self._close_event()
+            return
+        event = self.open_event
+        if event is not None and event[0] == kind:
+            event[2].append(acceleration)
+            event[4] = speed_to
+            event[5] += time_ms
+        else:
+            self._close_event()
+            self.open_event = [kind, index, [acceleration], speed_from, speed_to, time_ms]
+
+    def _close_event(self):
+        event = self.open_event
+        if event is None:
+            return
+        self.open_event = None
+        kind, start, accelerations, speed_from, speed_to, duration_ms = event
+        avg_acceleration = sum(accelerations) / len(accelerations)
+        # A run this mild is not harsh in any context, so it is not kept
+        if kind == 'acceleration' and avg_acceleration <= ad.MIN_HARSH_ACCEL:
+            return
+        if kind == 'deceleration' and abs(avg_acceleration) <= ad.MIN_HARSH_DECEL:
+            return
+        self.event_candidates.append([kind, start, len(accelerations), avg_acceleration,
+                                      max(accelerations, key=abs), speed_from, speed_to, duration_ms])
+
+    def _score_window(self, window: List[float]):
+        window_variance = statistics.variance(window)
+        avg_change = statistics.mean([abs(window[i+1] - window[i]) for i in range(len(window) - 1)])
+        for context in CONSISTENCY_CONTEXTS:
+            variance_tolerance, change_tolerance = ad.consistency_tolerances({'context': context})
+            score = ad.consistency_window_score(window_variance / variance_tolerance, avg_change / change_tolerance)
+            scores = self.window_scores[context]
+            scores[score] = scores.get(score, 0) + 1
+
+    def _add_coordinates(self, delta_lat: List[float], delta_long: List[float]):
+        current_lat, current_lon = self.position
+        divisor = self.divisor
+        for raw_lat, raw_lon in zip(delta_lat, delta_long):
+            # Malformed delta (NaN after decoding) is skipped
+            if raw_lat != raw_lat or raw_lon != raw_lon:
+                continue
+            new_lat = current_lat + raw_lat / divisor
+            new_lon = current_lon + raw_lon / divisor
+            segment_distance = ad.haversine_distance_miles(current_lat, current_lon, new_lat, new_lon)
+            if ad.MIN_SEGMENT_DISTANCE_MILES <= segment_distance <= ad.MAX_SEGMENT_DISTANCE_MILES:
+                self.distance += segment_distance
+                if self.last_pair is not None:
+                    self._add_bearing(ad.calculate_bearing(self.last_pair[0], self.last_pair[1], new_lat, new_lon))
+                self.last_pair = [new_lat, new_lon]
+            current_lat, current_lon = new_lat, new_lon
+        self.position = [current_lat, current_lon]
+
+    def _add_bearing(self, bearing: float):
+        # Bearing i is paired with speeds[i], like analyze-driver's turn grouping
+        speed = self.turn_speeds.popleft() if self.turn_speeds else 0
+        if self.bearing_count:
+            bearing_change = abs(bearing - self.last_bearing)
+            if bearing_change > 180:
+                bearing_change = 360 - bearing_change
+            if bearing_change > ad.SIGNIFICANT_TURN_DEGREES:
+                self.significant_turns += 1
+            if bearing_change > ad.TURN_ACCUMULATION_ANGLE:
+                if self.open_turn is None:
+                    self.open_turn = [0, []]
+                self.open_turn[0] += bearing_change
+                self.open_turn[1].append(speed)
+            else:
+                self._close_turn()
+        self.last_bearing = bearing
+        self.bearing_count += 1
+
+    def _close_turn(self):
+        turn = self.open_turn
+        self.open_turn = None
+        if turn is not None and turn[0] >= ad.MIN_TURN_ANGLE:
+            turn_accumulator, speeds = turn
+            self.turn_groups.append([turn_accumulator, max(speeds), len(speeds)])
+
+    def _finish(self):
+        """Validate the last speed and close the smoothing tail, open event and open turn"""
+        if self.pending is not None:
+            self._add_validated(self._validate(self.pending[0], None), self.pending[1])
+            self.pending = None
+        tail = self.segment_tail
+        if self.segments == 1:
+            self._scan(0, tail[0][0], tail[0])
+        elif self.segments > 1:
+            self._scan(self.segments - 1, (tail[-2][0] + tail[-1][0]) / 2, tail[-1])
+        self.segment_tail = []
+        self._close_event()
+        self._close_turn()
+
+    # ---- result ----
+
+    def result(self, user_base_point: Dict, stored_trip_data: Dict = None) -> Optional[Dict]:
+        """The trip analysis process_trip_with_frontend_values returns for the streamed deltas
+
+        None when the stream stopped, fewer than 2 deltas arrived, or user_base_point is not
+        the point the coordinates were reconstructed from.
+        """
+        if self.failed or self.points < 2:
+            return None
+        if [float(user_base_point['latitude']), float(user_base_point['longitude'])] != self.base:
+            logger.warning("⚠️ Base point changed since the trip started, streamed state not usable")
+            return None
+
+        # Finish a copy, so more batches could still be added to this one
+        trip = StreamingTripAnalyzer.from_state(self.to_state())
+        trip._finish()
+        coordinate_format = 'fixed_point' if trip.divisor == ad.FIXED_POINT_DIVISOR else 'decimal'
+
+        if stored_trip_data and stored_trip_data.get('use_gps_metrics'):
+            total_distance_miles = stored_trip_data.get('actual_distance_miles', 0.0)
+            duration_minutes = stored_trip_data.get('actual_duration_minutes', 1.0)
+            start_timestamp = stored_trip_data.get('actual_start_timestamp', datetime.now(timezone.utc).isoformat())
+            end_timestamp = stored_trip_data.get('actual_end_timestamp', datetime.now(timezone.utc).isoformat())
+            max_speed = stored_trip_data.get('gps_max_speed_mph', 0.0)
+            avg_speed = stored_trip_data.get('gps_avg_speed_mph', 0.0)
+            coordinate_format = "frontend_direct"
+        else:
+            total_distance_miles = trip.distance
+            start_timestamp, end_timestamp, duration_minutes = trip._timestamps()
+            max_speed = 0.0
+            avg_speed = 0.0
+
+        if total_distance_miles <= 0:
+            return ad.stationary_trip_analysis(start_timestamp, end_timestamp, duration_minutes, max_speed,
+                                               user_base_point, stored_trip_data, coordinate_format)
+
+        speed_summary = trip._speed_summary()
+        moving_metrics = ad.moving_metrics_from_totals(trip.moving_time_ms, trip.stationary_time_ms,
+                                                       trip.moving_distance)
+        context_info = ad.driving_context_from_summary(speed_summary, total_distance_miles, trip.significant_turns)
+        acceleration_analysis = trip._acceleration_analysis(total_distance_miles, context_info)
+        speed_consistency = trip._speed_consistency(context_info)
+        frequency_analysis = ad.calculate_frequency_metrics_fixed(acceleration_analysis['total_harsh_events'],
+                                                                  acceleration_analysis['total_dangerous_events'],
+                                                                  total_distance_miles, context_info)
+        turn_analysis = trip._turn_analysis(context_info)
+
+        speed_stats = (avg_speed or speed_summary['avg_speed'], max_speed or speed_summary['max_speed'],
+                       speed_summary['min_speed'])
+        return ad.moving_trip_analysis(start_timestamp, end_timestamp, duration_minutes, total_distance_miles,
+                                       speed_stats, moving_metrics, acceleration_analysis, speed_consistency,
+                                       frequency_analysis, turn_analysis,
+                                       user_base_point, stored_trip_data, coordinate_format)
+
+    def _timestamps(self) -> Tuple[str, str, float]:
+        if self.timestamps_parsed >= 2:
+            start_time = datetime.fromisoformat(self.first_time)
+            end_time = datetime.fromisoformat(self.last_time)
+            duration_minutes = max(1.0, (end_time - start_time).total_seconds() / 60)
+        else:
+            duration_minutes = max(1.0, self.interval_total / (1000 * 60))
+            now = datetime.now(timezone.utc)
+            start_time = now.replace(minute=max(0, now.minute - int(duration_minutes)))
+            end_time = now
+        return start_time.isoformat(), end_time.isoformat(), duration_minutes
+
+    def _speed_summary(self) -> Dict:
+        """analyze-driver's summarize_speeds from the running sums (exact, like statistics)"""
+        count = self.speed_count
+        speed_stdev = 0
+        if count > 1:
+            sum_of_squares = (count * self.speed_sum_sq - self.speed_sum * self.speed_sum) / count
+            speed_stdev = ad.sqrt_of_fraction(sum_of_squares / (count - 1))
+        return {
+            'count': count,
+            'avg_speed': float(self.speed_sum / count),
+            'speed_stdev': speed_stdev,
+            'stop_count': self.stop_count,
+            'highway_count': self.highway_count,
+            'min_speed': self.min_speed,
+            'max_speed': self.max_speed
+        }
+
+    def _acceleration_analysis(self, total_distance_miles: float, context_info: Dict) -> Dict:
+        """analyze-driver's analyze_acceleration_events_fixed over the kept event runs"""
+        acceleration_events = []
+        deceleration_events = []
+        for kind, start, count, avg_acceleration, max_acceleration, start_speed, end_speed, duration_ms in self.event_candidates:
+            event = ad.classify_event_run(kind, start, count, avg_acceleration, max_acceleration,
+                                          start_speed, end_speed, duration_ms / 1000.0, context_info)
+            if event is not None:
+                (acceleration_events if kind == 'acceleration' else deceleration_events).append(event)
+        return ad.summarize_acceleration_events(acceleration_events, deceleration_events, self.segments,
+                                                total_distance_miles, context_info)
+
+    def _speed_consistency(self, context_info: Dict) -> float:
+        """analyze-driver's calculate_speed_consistency_adaptive from the window score counts"""
+        if self.speed_count < 6:
+            return 75.0
+        if self.filtered_count < 5:
+            return 70.0
+        context = context_info['context'] if context_info['context'] in CONSISTENCY_CONTEXTS else 'mixed'
+        return round(ad.consistency_score_from_counts(self.window_scores[context]), 1)
+
+    def _turn_analysis(self, context_info: Dict) -> Dict:
+        """analyze-driver's analyze_turn_safety_adaptive over the closed turn groups"""
+        if not self.bearing_count:
+            return ad.no_turn_analysis(85.0)
+        if self.bearing_count < 3 or self.speed_count < 3:
+            return ad.no_turn_analysis(95.0)
+        turns = [ad.classify_turn(turn_angle, turn_speed, duration_points, context_info['context'])
+                 for turn_angle, turn_speed, duration_points in self.turn_groups]
+        return ad.summarize_turn_safety(turns)
+
+def streaming_state_key(trip_id: str) -> Dict:
+    return {'trip_id': STREAMING_STATE_KEY_PREFIX + trip_id}
+
+def read_streaming_state(trip_id: str) -> Tuple[Optional[str], int]:
+    """The trip's saved state (JSON, None when there is none) and its revision"""
+    response = summaries_table.get_item(Key=streaming_state_key(trip_id), ConsistentRead=True)
+    item = response.get('Item')
+    if not item or STREAMING_STATE_ATTRIBUTE not in item:
+        return None, 0
+    return (decompress_payload(item[STREAMING_STATE_ATTRIBUTE]).decode('utf-8'),
+            int(item.get(STREAMING_REVISION_ATTRIBUTE, 0)))
+
+def delete_streaming_state(trip_id: str):
+    summaries_table.delete_item(Key=streaming_state_key(trip_id))
+
+def advance_streaming_analysis(user_id: str, trip_id: str, batch_number, deltas: List[Dict]) -> str:
+    """
+    🚗 Apply a stored batch to the trip's streaming state and save it
+
+    The write is conditional on the state's revision still being the one read, so concurrent
+    uploads cannot both advance it. Returns 'advanced', 'duplicate', 'stopped', 'conflict',
+    'error' (the state could not be read or saved) or 'unavailable' (analyze-driver.py is not
+    bundled).
+    """
+    if ad is None:
+        return 'unavailable'
+    try:
+        saved, revision = read_streaming_state(trip_id)
+    except Exception as e:
+        logger.error("❌ Streaming state for %s not read: %s", trip_id, e)
+        return 'error'
+    try:
+        batch_number = int(batch_number)
+        if saved:
+            analyzer = StreamingTripAnalyzer.from_json(saved)
+        else:
+            analyzer = StreamingTripAnalyzer(ad.get_user_base_point(user_id))
+    except (TypeError, ValueError, KeyError) as e:
+        logger.warning("⚠️ Streaming analysis not advanced for %s: %s", trip_id, e)
+        return 'stopped'
+
+    was_failed = analyzer.failed
+    status = analyzer.add_batch(batch_number, deltas)
+    if status == 'duplicate' or (status == 'stopped' and was_failed):
+        return status
+    if status == 'stopped':
+        logger.warning("⚠️ Streaming analysis stopped for %s: %s", trip_id, analyzer.failed)
+
+    state_item = {
+        **streaming_state_key(trip_id),
+        'user_id': user_id,
+        STREAMING_STATE_ATTRIBUTE: compress_payload(analyzer.to_json().encode('utf-8')),
+        STREAMING_REVISION_ATTRIBUTE: revision + 1,
+    }
+    condition = {'ConditionExpression': '#revision = :revision',
+                 'ExpressionAttributeNames': {'#revision': STREAMING_REVISION_ATTRIBUTE},
+                 'ExpressionAttributeValues': {':revision': revision}} if saved else {
+                 'ConditionExpression': 'attribute_not_exists(trip_id)'}
+    try:
+        summaries_table.put_item(Item=state_item, **condition)
+    except Exception as e:
+        if isinstance(e, ClientError) and e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            # Another upload changed the state first; the next batch finds the gap if one was left
+            logger.warning("⚠️ Streaming state for %s changed by another upload, not saved", trip_id)
+            return 'conflict'
+        logger.error("❌ Streaming state for %s not saved: %s", trip_id, e)
+        return 'error'
+
+    logger.info("🚗 Streaming analysis %s: %s batches, %s deltas", status, analyzer.batches, analyzer.points)
+    return status
+
 def store_or_update_trip_metadata(user_id, trip_id, batch_number, first_point_timestamp, last_point_timestamp):
     """Store or update trip metadata in Trips table"""
     try:
@@ -201,7 +845,7 @@ def store_or_update_trip_metadata(user_id, trip_id, batch_number, first_point_ti
                 'total_batches': 1
             }
             trips_table.put_item(Item=trip_item)
-            print(f"✅ NEW TRIP CREATED: {trip_id} starting at {first_point_timestamp}")
+            logger.info("✅ NEW TRIP CREATED: %s starting at %s", trip_id, first_point_timestamp)
         else:
             # Update existing trip with latest end timestamp
             trips_table.update_item(
@@ -213,22 +857,22 @@ def store_or_update_trip_metadata(user_id, trip_id, batch_number, first_point_ti
                     ':inc': 1
                 }
             )
-            print(f"✅ TRIP UPDATED: {trip_id} batch #{batch_number}, end time: {last_point_timestamp}")
+            logger.info("✅ TRIP UPDATED: %s batch #%s, end time: %s", trip_id, batch_number, last_point_timestamp)
             
     except Exception as e:
-        print(f"❌ Error storing trip metadata: {e}")
+        logger.error("❌ Error storing trip metadata: %s", e)
         # DON'T FAIL - continue processing
 
 def lambda_handler(event, context):
     try:
-        print(f"🚀 BULLETPROOF PROCESSING - Headers: {event.get('headers', {})}")
-        print(f"📊 Body size: {len(str(event.get('body', '')))} characters")
+        logger.info("🚀 BULLETPROOF PROCESSING - Headers: %s", event.get('headers', {}))
+        logger.info("📊 Body size: %s characters", len(str(event.get('body', ''))))
         
         # Parse JSON body with proper error handling
         try:
             body = json.loads(event['body'])
         except json.JSONDecodeError as e:
-            print(f"❌ JSON DECODE ERROR: {str(e)}")
+            logger.warning("❌ JSON DECODE ERROR: %s", str(e))
             return {
                 'statusCode': 400,
                 'headers': {
@@ -248,15 +892,15 @@ def lambda_handler(event, context):
         last_point_timestamp = body.get('last_point_timestamp')
         deltas = body.get('deltas', [])
         
-        print(f"🚀 PROCESSING BATCH: Trip {trip_id}, Batch #{batch_number}, {len(deltas)} deltas")
-        print(f"👤 User: {user_id}")
+        logger.info("🚀 PROCESSING BATCH: Trip %s, Batch #%s, %s deltas", trip_id, batch_number, len(deltas))
+        logger.info("👤 User: %s", user_id)
         
         # Extract enhanced quality metrics if available
         quality_metrics = body.get('quality_metrics', {})
         
         # Validate required fields
         if not all([user_id, trip_id, deltas]):
-            print(f"❌ Missing required fields: user_id={bool(user_id)}, trip_id={bool(trip_id)}, deltas={bool(deltas)}")
+            logger.warning("❌ Missing required fields: user_id=%s, trip_id=%s, deltas=%s", bool(user_id), bool(trip_id), bool(deltas))
             return {
                 'statusCode': 400,
                 'headers': {
@@ -268,16 +912,16 @@ def lambda_handler(event, context):
             }
         
         # CRITICAL: Show first few deltas for debugging
-        print(f"📊 SAMPLE DELTAS (first 3):")
+        logger.debug("📊 SAMPLE DELTAS (first 3):")
         for i, delta in enumerate(deltas[:3]):
-            print(f"   Delta {i}: {delta}")
+            logger.debug("   Delta %s: %s", i, delta)
         
         # BULLETPROOF: Validate deltas with safe handling
         validated_deltas, quality_issues = validate_enhanced_deltas(deltas)
         
         if not validated_deltas:
-            print(f"❌ NO VALID DELTAS FOUND after bulletproof validation")
-            print(f"📊 Quality issues: {quality_issues}")
+            logger.error("❌ NO VALID DELTAS FOUND after bulletproof validation")
+            logger.info("📊 Quality issues: %s", quality_issues)
             return {
                 'statusCode': 400,
                 'headers': {
@@ -345,7 +989,7 @@ def lambda_handler(event, context):
         }
         
         # BULLETPROOF: Apply safe decimal conversion to EVERYTHING
-        print(f"💾 BULLETPROOF CONVERSION - Converting all data to safe DynamoDB format...")
+        logger.info("💾 BULLETPROOF CONVERSION - Converting all data to safe DynamoDB format...")
         
         item = {
             'batch_id': batch_id,
@@ -356,10 +1000,10 @@ def lambda_handler(event, context):
             'first_point_timestamp': first_point_timestamp,
             'last_point_timestamp': last_point_timestamp,
             'upload_timestamp': datetime.utcnow().isoformat(),
-            'deltas': validated_deltas,  # Will be converted below
+            # 📦 deltas_binary (data_version 3.0) or the deltas list of maps (2.4)
+            **batch_delta_attributes(validated_deltas),
             'processed': False,
             # Enhanced metadata
-            'data_version': '2.4',  # Updated version for bulletproof conversion
             'quality_metrics': quality_metrics,  # Will be converted below
             'batch_statistics': batch_statistics,  # Will be converted below
             'quality_issues': quality_issues,
@@ -372,9 +1016,9 @@ def lambda_handler(event, context):
         # CRITICAL: Apply bulletproof safe decimal conversion to the ENTIRE item
         try:
             item_dynamodb = safe_convert_to_decimal(item)
-            print(f"✅ Safe conversion completed successfully")
+            logger.info("✅ Safe conversion completed successfully")
         except Exception as conversion_error:
-            print(f"❌ CRITICAL: Safe conversion failed: {conversion_error}")
+            logger.error("❌ CRITICAL: Safe conversion failed: %s", conversion_error)
             # Even our safe conversion failed - this should never happen
             return {
                 'statusCode': 500,
@@ -390,13 +1034,13 @@ def lambda_handler(event, context):
                 })
             }
         
-        print(f"💾 STORING BATCH: {batch_id}")
+        logger.info("💾 STORING BATCH: %s", batch_id)
         
         try:
             trajectory_table.put_item(Item=item_dynamodb)
-            print(f"✅ BATCH STORED SUCCESSFULLY: {batch_id}")
+            logger.info("✅ BATCH STORED SUCCESSFULLY: %s", batch_id)
         except Exception as dynamo_error:
-            print(f"❌ DynamoDB storage error: {dynamo_error}")
+            logger.error("❌ DynamoDB storage error: %s", dynamo_error)
             return {
                 'statusCode': 500,
                 'headers': {
@@ -411,8 +1055,14 @@ def lambda_handler(event, context):
                 })
             }
         
-        print(f"📊 Final batch stats: {batch_statistics}")
-        print(f"🔢 Delta summary: {len(validated_deltas)} valid deltas from {len(deltas)} originals")
+        # 🚗 Advance the trip's analysis by this batch, so finalizing does not re-read every batch
+        # (decoded from the stored binary, so it sees the same values as analyze-driver)
+        stored_deltas = (decode_delta_batch(item_dynamodb['deltas_binary']) if 'deltas_binary' in item_dynamodb
+                         else item_dynamodb['deltas'])
+        streaming_status = advance_streaming_analysis(user_id, trip_id, batch_number, stored_deltas)
+
+        logger.info("📊 Final batch stats: %s", batch_statistics)
+        logger.info("🔢 Delta summary: %s valid deltas from %s originals", len(validated_deltas), len(deltas))
         
         return {
             'statusCode': 200,
@@ -428,18 +1078,18 @@ def lambda_handler(event, context):
                 'original_deltas_count': len(deltas),
                 'acceptance_rate': f"{(len(validated_deltas) / len(deltas) * 100):.1f}%" if deltas else "0%",
                 'enhancement_level': item['enhancement_level'],
+                'data_version': item['data_version'],
                 'quality_score': quality_metrics.get('gps_quality_score', 0),
                 'batch_statistics': batch_statistics,
                 'quality_issues_count': len(quality_issues),
                 'movement_detected': batch_statistics['movement_points'] > 0,
-                'validation_method': 'bulletproof_with_safe_conversion'
+                'validation_method': 'bulletproof_with_safe_conversion',
+                'streaming_analysis': streaming_status
             })
         }
         
     except Exception as e:
-        print(f"❌ UNEXPECTED ERROR in bulletproof handler: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ UNEXPECTED ERROR in bulletproof handler: %s", str(e))
         
         return {
             'statusCode': 500,
@@ -0,0 +1,75 @@
+"""
+Regression tests for DriverAggregate's running sums
+
+Usage:
+    python -m pytest Backend_Lambda_Functions/tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from golden_harness import load_analyze_driver  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def ad():
+    return load_analyze_driver()
+
+
+def trip(trip_id, distance, score, consistency, max_speed=30.0, context='city'):
+    return {
+        'trip_id': trip_id,
+        'total_distance_miles': distance,
+        'duration_minutes': 10.0,
+        'moving_time_minutes': 8.0,
+        'stationary_time_minutes': 2.0,
+        'behavior_score': score,
+        'speed_consistency': consistency,
+        'events_per_100_miles': 0.0,
+        'total_harsh_events': 0,
+        'total_dangerous_events': 0,
+        'max_speed_mph': max_speed,
+        'driving_context': {'context': context},
+    }
+
+
+def test_swapping_trips_down_to_zero_distance_leaves_no_residue(ad):
+    stored_trips = [trip('t1', 0.1, 40.0, 60.0), trip('t2', 0.2, 50.0, 70.0),
+                    trip('t3', 0.0, 80.0, 80.0, max_speed=50.0, context='highway')]
+    stamps = {'t1': 'a1', 't2': 'a2', 't3': 'a3'}
+    stored = ad.DriverAggregate.from_item(ad.DriverAggregate.from_trips(stored_trips, stamps).to_item('u1'))
+
+    # t1 and t2 re-analyzed to 0 miles (the stored analyses are subtracted, the new ones added)
+    reanalyzed = [trip('t1', 0.0, 40.0, 60.0), trip('t2', 0.0, 50.0, 70.0)]
+    new_stamps = {'t1': 'b1', 't2': 'b2', 't3': 'a3'}
+    previous = {'t1': (stored_trips[0], 'a1'), 't2': (stored_trips[1], 'a2')}
+    aggregate, status = ad.reconcile_driver_aggregate(stored, reanalyzed + [stored_trips[2]], new_stamps, previous)
+
+    assert status == 'updated'
+    assert aggregate.sums['distance'] == 0
+    fields = aggregate.analytics_fields()
+    assert fields == ad.DriverAggregate.from_trips(reanalyzed + [stored_trips[2]]).analytics_fields()
+    assert fields['overall_behavior_score'] == 56.7
+    assert fields['speed_consistency_score'] == 70.0
+    assert fields['dominant_driving_context'] == 'stationary'
+
+
+def test_add_then_subtract_is_exact(ad):
+    aggregate = ad.DriverAggregate.from_trips([trip('t0', 1.0, 70.0, 70.0, max_speed=90.0)])
+    before = (dict(aggregate.sums), {name: list(entry) for name, entry in aggregate.contexts.items()})
+    for index in range(1, 200):
+        extra = trip(f't{index}', 0.1 * index, 55.3, 61.7)
+        aggregate.add_trip(extra)
+        aggregate.subtract_trip(extra)
+    assert (aggregate.sums, aggregate.contexts) == before
+    assert not aggregate.needs_rebuild
+
+
+def test_float_sum_aggregates_are_not_reused(ad):
+    item = ad.DriverAggregate.from_trips([trip('t1', 0.1, 40.0, 60.0)]).to_item('u1')
+    assert ad.DriverAggregate.is_current_item(item)
+    del item['sum_scale']
+    assert not ad.DriverAggregate.is_current_item(item)
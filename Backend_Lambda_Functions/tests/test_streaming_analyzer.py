@@ -0,0 +1,93 @@
+"""
+Regression tests for store-trajectory-batch's StreamingTripAnalyzer
+
+Usage:
+    python -m pytest Backend_Lambda_Functions/tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from golden_harness import BASE_POINT, analyze_driver_engine, diff_values, load_analyze_driver, synthetic_corpus  # noqa: E402
+from bench_streaming_analyzer import EXACT, load_store_trajectory_batch, split_batches, stream  # noqa: E402
+from trip_generator import generate_trip  # noqa: E402
+
+# Single-delta batches only for the shorter trips, as the benchmark does
+SINGLE_DELTA_MAX = 100
+
+
+@pytest.fixture(scope='module')
+def stb():
+    return load_store_trajectory_batch()
+
+
+@pytest.fixture(scope='module')
+def reference():
+    return analyze_driver_engine(load_analyze_driver(), 'reference')
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return synthetic_corpus([100, 400], 1)
+
+
+@pytest.mark.parametrize('split', [1, 7, 25, 'random'])
+def test_streamed_result_equals_reference_engine(stb, reference, corpus, split):
+    for trip in corpus:
+        if split == 1 and len(trip['deltas']) > SINGLE_DELTA_MAX:
+            continue
+        expected = reference.analyze(trip['deltas'], BASE_POINT, trip['trip_quality'])
+        batches = split_batches(trip['deltas'], split, seed=len(trip['deltas']))
+        analyzer = stream(stb, batches)
+        assert analyzer.is_complete(len(batches))
+        assert diff_values(expected, analyzer.result(BASE_POINT, trip['trip_quality']), EXACT) == [], trip['name']
+
+
+def test_state_round_trips_through_json(stb):
+    batches = split_batches(generate_trip('city', 300, 1), 25)
+    analyzer = stb.StreamingTripAnalyzer(BASE_POINT)
+    for batch_number, batch in enumerate(batches[:5], start=stb.FIRST_BATCH_NUMBER):
+        analyzer.add_batch(batch_number, batch)
+
+    restored = stb.StreamingTripAnalyzer.from_json(analyzer.to_json())
+    assert restored.to_json() == analyzer.to_json()
+    # Both continue the same way from there
+    for batch_number, batch in enumerate(batches[5:], start=stb.FIRST_BATCH_NUMBER + 5):
+        assert analyzer.add_batch(batch_number, batch) == restored.add_batch(batch_number, batch) == 'advanced'
+    assert diff_values(analyzer.result(BASE_POINT, {}), restored.result(BASE_POINT, {}), EXACT) == []
+
+
+def test_repeated_batch_is_a_duplicate(stb, reference):
+    deltas = generate_trip('highway', 150, 2)
+    batches = split_batches(deltas, 25)
+    analyzer = stb.StreamingTripAnalyzer(BASE_POINT)
+    assert analyzer.add_batch(1, batches[0]) == 'advanced'
+    assert analyzer.add_batch(2, batches[1]) == 'advanced'
+    state = analyzer.to_json()
+
+    # A retried upload of an applied batch changes nothing
+    assert analyzer.add_batch(2, batches[1]) == 'duplicate'
+    assert analyzer.add_batch(1, batches[0]) == 'duplicate'
+    assert analyzer.to_json() == state
+
+    for batch_number, batch in enumerate(batches[2:], start=3):
+        assert analyzer.add_batch(batch_number, batch) == 'advanced'
+    assert analyzer.is_complete(len(batches))
+    assert diff_values(reference.analyze(deltas, BASE_POINT, {}), analyzer.result(BASE_POINT, {}), EXACT) == []
+
+
+def test_gap_in_batch_numbers_stops_the_stream(stb):
+    batches = split_batches(generate_trip('city', 100, 3), 25)
+    analyzer = stb.StreamingTripAnalyzer(BASE_POINT)
+    assert analyzer.add_batch(1, batches[0]) == 'advanced'
+
+    assert analyzer.add_batch(3, batches[2]) == 'stopped'
+    assert analyzer.failed
+    # Stopped for good: the trip is scored from its batches instead
+    assert analyzer.add_batch(2, batches[1]) == 'stopped'
+    assert stb.StreamingTripAnalyzer.from_json(analyzer.to_json()).failed == analyzer.failed
+    assert not analyzer.is_complete(1)
+    assert not analyzer.is_complete(len(batches))
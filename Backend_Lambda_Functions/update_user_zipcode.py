@@ -1,9 +1,16 @@
 # backend/update_user_zipcode.py - New Lambda function for updating user zipcode
 import json
+import logging
+import os
 import boto3
 from datetime import datetime
 from decimal import Decimal
 
+# Leveled logging: LOG_LEVEL env var (DEBUG, INFO, WARNING, ERROR), default INFO
+# Messages take %-style arguments so nothing is formatted unless the level is enabled
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO))
+
 dynamodb = boto3.resource('dynamodb')
 users_table = dynamodb.Table('Users-Neal')
 
@@ -26,7 +33,7 @@ def validate_base_point(base_point):
     try:
         required_fields = ['latitude', 'longitude', 'city', 'state', 'source']
         if not all(field in base_point for field in required_fields):
-            print(f"Base point missing required fields: {required_fields}")
+            logger.warning("Base point missing required fields: %s", required_fields)
             return None
             
         # Validate coordinate ranges
@@ -34,7 +41,7 @@ def validate_base_point(base_point):
         lon = float(base_point['longitude'])
         
         if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
-            print(f"Invalid coordinates: lat={lat}, lon={lon}")
+            logger.warning("Invalid coordinates: lat=%s, lon=%s", lat, lon)
             return None
             
         validated = {
@@ -49,7 +56,7 @@ def validate_base_point(base_point):
         
         return validated
     except Exception as e:
-        print(f"Error validating base point: {e}")
+        logger.error("Error validating base point: %s", e)
         return None
 
 def validate_privacy_settings(privacy_settings):
@@ -73,7 +80,7 @@ def validate_privacy_settings(privacy_settings):
             
         return validated
     except Exception as e:
-        print(f"Error validating privacy settings: {e}")
+        logger.error("Error validating privacy settings: %s", e)
         return None
 
 def lambda_handler(event, context):
@@ -84,7 +91,7 @@ def lambda_handler(event, context):
         base_point = body['base_point']
         privacy_settings = body.get('privacy_settings')
 
-        print(f"Updating zipcode for user: {user_id} to {zipcode}")
+        logger.info("Updating zipcode for user: %s to %s", user_id, zipcode)
         
         # Validate inputs
         if not user_id or not zipcode or not base_point:
@@ -150,8 +157,8 @@ def lambda_handler(event, context):
             ExpressionAttributeValues=expression_values
         )
 
-        print(f"Successfully updated user {user_id} with new zipcode: {zipcode}")
-        print(f"New base point: {validated_base_point['city']}, {validated_base_point['state']}")
+        logger.info("Successfully updated user %s with new zipcode: %s", user_id, zipcode)
+        logger.info("New base point: %s, %s", validated_base_point['city'], validated_base_point['state'])
 
         return {
             'statusCode': 200,
@@ -171,7 +178,7 @@ def lambda_handler(event, context):
         }
 
     except KeyError as e:
-        print(f"Missing required field: {str(e)}")
+        logger.info("Missing required field: %s", str(e))
         return {
             'statusCode': 400,
             'headers': {
@@ -183,9 +190,7 @@ def lambda_handler(event, context):
         }
 
     except Exception as e:
-        print(f"Error updating user zipcode: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error updating user zipcode: %s", str(e))
 
         return {
             'statusCode': 500,